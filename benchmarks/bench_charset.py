@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Measure the parse time saved by decoding article pages before BeautifulSoup.
+
+Builds a corpus of pages in several encodings whose charset is declared in the
+Content-Type header only, in a <meta> tag, or nowhere, then parses each page
+from raw bytes, as extract_content used to, and from the string decode_html
+returns.
+
+Usage:
+    python benchmarks/bench_charset.py --pages 60 --page-size 200000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+SRC_ROOT = Path(__file__).resolve().parents[1] / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+import bs4  # noqa: E402
+
+from feed_to_somewhere.charsets import decode_html  # noqa: E402
+
+SAMPLES = {
+    "utf-8": "Grüße aus Köln – naïve café, 東京の天気, Привет мир. ",
+    "windows-1252": "Café crème – naïve façade, “quoted” über. ",
+    "iso-8859-2": "Zażółć gęślą jaźń, Příliš žluťoučký kůň. ",
+    "shift_jis": "東京都の天気は晴れです。今日は良い日ですね。",
+    "koi8-r": "Съешь же ещё этих мягких французских булок. ",
+}
+DECLARATIONS = ("header", "meta", "none")
+
+
+def build_page(encoding: str, declaration: str, page_size: int) -> str:
+    """Build an article page of about ``page_size`` bytes."""
+    meta = f'<meta charset="{encoding}">' if declaration == "meta" else ""
+    paragraph = "<p>" + SAMPLES[encoding] * 8 + "</p>\n"
+    body = paragraph * max(1, page_size // len(paragraph.encode(encoding)))
+    return f"<html><head>{meta}<title>Article</title></head><body>{body}</body></html>"
+
+
+def build_corpus(page_count: int, page_size: int):
+    """Build pages cycling through every encoding and declaration style."""
+    styles = [(encoding, declaration) for declaration in DECLARATIONS for encoding in SAMPLES]
+    corpus = []
+    for index in range(page_count):
+        encoding, declaration = styles[index % len(styles)]
+        content_type = f"text/html; charset={encoding}" if declaration == "header" else "text/html"
+        page = build_page(encoding, declaration, page_size)
+        corpus.append((declaration, content_type, page.encode(encoding), parse_text(page)))
+    return corpus
+
+
+def parse_text(markup) -> str:
+    """Parse a page and extract its paragraphs, as extract_content does."""
+    soup = bs4.BeautifulSoup(markup, "html.parser")
+    return " ".join(p.get_text(" ", strip=True) for p in soup.find_all("p"))
+
+
+def measure(corpus, decode: bool):
+    """Return the seconds spent per declaration style and the number of pages extracted correctly."""
+    seconds = dict.fromkeys(DECLARATIONS, 0.0)
+    correct = 0
+    for declaration, content_type, content, expected in corpus:
+        started_at = time.perf_counter()
+        markup = decode_html(content, content_type) if decode else content
+        text = parse_text(markup)
+        seconds[declaration] += time.perf_counter() - started_at
+        correct += text == expected
+    return seconds, correct
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=30, help="Pages in the corpus (default: 30)")
+    parser.add_argument("--page-size", type=int, default=100_000, help="Approximate bytes per page (default: 100000)")
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.pages, args.page_size)
+    print(f"corpus: {len(corpus)} pages, {sum(len(page[2]) for page in corpus) / 1e6:.2f} MB")
+
+    raw_seconds, raw_correct = measure(corpus, decode=False)
+    decoded_seconds, decoded_correct = measure(corpus, decode=True)
+
+    print(f"{'declared in':<12} {'raw bytes':>10} {'decode_html':>12} {'speedup':>8}")
+    for declaration in DECLARATIONS:
+        raw, decoded = raw_seconds[declaration], decoded_seconds[declaration]
+        print(f"{declaration:<12} {raw:>9.3f}s {decoded:>11.3f}s {raw / decoded:>7.1f}x")
+    raw_total, decoded_total = sum(raw_seconds.values()), sum(decoded_seconds.values())
+    print(f"{'total':<12} {raw_total:>9.3f}s {decoded_total:>11.3f}s {raw_total / decoded_total:>7.1f}x")
+    print(f"{'correct':<12} {raw_correct:>10} {decoded_correct:>12}   of {len(corpus)} pages")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Measure the memory retained by parsed feed entries.
+
+Compares keeping feedparser's entries alive, as the pipeline used to, with
+projecting them into compact FeedEntry records and dropping the parsed feed.
+
+Usage:
+    python benchmarks/bench_entry_memory.py --entries 5000 --body-size 4000
+"""
+
+import argparse
+import gc
+import sys
+import tracemalloc
+from pathlib import Path
+
+SRC_ROOT = Path(__file__).resolve().parents[1] / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+import feedparser  # noqa: E402
+
+from feed_to_somewhere.feed_entries import FeedEntry  # noqa: E402
+
+
+def build_feed(entry_count: int, body_size: int) -> str:
+    """Build a synthetic RSS document with rich entries."""
+    paragraph = "<p>" + ("Lorem ipsum dolor sit amet. " * (body_size // 28 + 1))[:body_size] + "</p>"
+    items = []
+    for index in range(entry_count):
+        items.append(
+            f"""<item>
+  <title>Entry {index}</title>
+  <link>https://example.com/posts/{index}</link>
+  <guid>https://example.com/posts/{index}</guid>
+  <pubDate>Mon, 02 Jan 2023 03:04:05 GMT</pubDate>
+  <category>news</category><category>tech</category>
+  <description><![CDATA[{paragraph[:200]}]]></description>
+  <content:encoded><![CDATA[{paragraph}]]></content:encoded>
+</item>"""
+        )
+
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/">'
+        "<channel><title>Benchmark</title><link>https://example.com/</link>"
+        + "".join(items)
+        + "</channel></rss>"
+    )
+
+
+def measure(label: str, document: str, project: bool) -> None:
+    """Parse the document and report retained and peak memory."""
+    gc.collect()
+    tracemalloc.start()
+
+    entries = feedparser.parse(document).entries
+    if project:
+        entries = [FeedEntry.from_mapping(entry) for entry in entries]
+    gc.collect()
+
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<10} entries={len(entries):<6} retained={retained / 1e6:8.2f} MB  peak={peak / 1e6:8.2f} MB")
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=2000, help="Entries in the synthetic feed (default: 2000)")
+    parser.add_argument("--body-size", type=int, default=2000, help="Characters per entry body (default: 2000)")
+    args = parser.parse_args()
+
+    document = build_feed(args.entries, args.body_size)
+    print(f"feed size: {len(document) / 1e6:.2f} MB")
+    measure("raw", document, project=False)
+    measure("compact", document, project=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
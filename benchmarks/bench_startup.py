@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Measure cold-start import time of the CLI entry point.
+
+Runs ``python -X importtime`` in fresh interpreters, reports the median
+cumulative import time of ``feed_to_somewhere.main`` and lists the slowest
+modules it pulls in. The wall time of ``--version`` is reported as well.
+
+Usage:
+    python benchmarks/bench_startup.py --runs 10 --top 15
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+SRC_ROOT = Path(__file__).resolve().parents[1] / "src"
+ENTRY_MODULE = "feed_to_somewhere.main"
+
+
+def child_env() -> Dict[str, str]:
+    """Return an environment that imports the package from the source tree."""
+    python_path = os.pathsep.join(filter(None, [str(SRC_ROOT), os.environ.get("PYTHONPATH")]))
+    return dict(os.environ, PYTHONPATH=python_path)
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """Parse ``-X importtime`` output into (module, self_us, cumulative_us) rows."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        rows.append((fields[2].strip(), int(fields[0]), int(fields[1])))
+    return rows
+
+
+def measure_imports(runs: int) -> Tuple[List[int], Dict[str, List[int]]]:
+    """Import the entry point in fresh interpreters and collect timings."""
+    totals = []
+    per_module: Dict[str, List[int]] = {}
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {ENTRY_MODULE}"],
+            capture_output=True,
+            text=True,
+            env=child_env(),
+            check=True,
+        )
+        for module, _, cumulative_us in parse_importtime(result.stderr):
+            per_module.setdefault(module, []).append(cumulative_us)
+            if module == ENTRY_MODULE:
+                totals.append(cumulative_us)
+    return totals, per_module
+
+
+def measure_version(runs: int) -> List[float]:
+    """Time ``--version`` end to end, including interpreter startup."""
+    timings = []
+    for _ in range(runs):
+        started_at = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", ENTRY_MODULE, "--version"],
+            capture_output=True,
+            env=child_env(),
+            check=True,
+        )
+        timings.append(time.perf_counter() - started_at)
+    return timings
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per measurement (default: 5)")
+    parser.add_argument("--top", type=int, default=10, help="Slowest modules to list (default: 10)")
+    args = parser.parse_args()
+
+    totals, per_module = measure_imports(args.runs)
+    print(f"import {ENTRY_MODULE}: median {statistics.median(totals) / 1000:.1f} ms over {args.runs} runs")
+
+    slowest = sorted(
+        ((statistics.median(values), module) for module, values in per_module.items() if module != ENTRY_MODULE),
+        reverse=True,
+    )
+    for cumulative_us, module in slowest[:args.top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {module}")
+
+    version_timings = measure_version(args.runs)
+    print(f"--version wall time: median {statistics.median(version_timings) * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""Cross-process write claims for Feed to Somewhere."""
+
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Callable, Optional
+
+
+class ClaimLedger:
+    """
+    Claim links in a SQLite database shared by all processes writing to a target.
+
+    A link is claimed with a single unique insert, so two processes can never
+    both pass the duplicate check for the same link, while claims on different
+    links never wait for each other beyond that insert. A claim is released when
+    the write fails or finds the page already there. After a page is created its
+    claim is kept until it expires after ``ttl`` seconds, since other processes
+    may still hold an earlier check that found the link missing. Claims left
+    behind by a crashed process expire the same way.
+
+    Like the work queue, the database runs in WAL mode and must be on a local
+    filesystem shared by the processes.
+    """
+
+    FILE_NAME = "claims.db"
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS claims (
+            key TEXT PRIMARY KEY,
+            owner TEXT NOT NULL,
+            claimed_at REAL NOT NULL
+        )
+    """
+
+    def __init__(self, path: str, ttl: float = 600.0, clock: Callable[[], float] = time.time):
+        """
+        Initialize the ledger.
+
+        Args:
+            path: The SQLite database file.
+            ttl: Seconds after which an unreleased claim may be taken over.
+            clock: Time source returning epoch seconds.
+        """
+        if ttl <= 0:
+            raise ValueError("ttl must be a positive number")
+
+        self.path = path
+        self.ttl = ttl
+        self.clock = clock
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex}"
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_state_dir(cls, state_dir: str, **kwargs) -> "ClaimLedger":
+        """Create a ledger stored in a state directory."""
+        return cls(os.path.join(state_dir, cls.FILE_NAME), **kwargs)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use, enable WAL and create the schema."""
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(self.SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def try_claim(self, key: str) -> bool:
+        """
+        Claim a key unless another live claim holds it.
+
+        Args:
+            key: The key to claim, such as a target and link.
+
+        Returns:
+            True if this ledger now holds the claim.
+        """
+        now = self.clock()
+        with self._lock:
+            connection = self._connect()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.execute("DELETE FROM claims WHERE key = ? AND claimed_at <= ?", (key, now - self.ttl))
+                cursor = connection.execute(
+                    "INSERT OR IGNORE INTO claims (key, owner, claimed_at) VALUES (?, ?, ?)",
+                    (key, self.owner, now),
+                )
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+        return cursor.rowcount == 1
+
+    def release(self, key: str) -> None:
+        """Release a claim held by this ledger."""
+        with self._lock:
+            self._connect().execute("DELETE FROM claims WHERE key = ? AND owner = ?", (key, self.owner))
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
@@ -0,0 +1,156 @@
+"""Adaptive concurrency limits for Feed to Somewhere."""
+
+import contextlib
+import threading
+import time
+from typing import Callable, Iterator, Optional
+
+from .metrics import RunStats
+
+
+class Permit:
+    """One unit of concurrency held while a request runs."""
+
+    def __init__(self, epoch: int):
+        self.epoch = epoch
+        self.overloaded = False
+
+    def mark_overloaded(self) -> None:
+        """Report that the request was rejected or failed because the service is overloaded."""
+        self.overloaded = True
+
+
+class AdaptiveLimiter:
+    """
+    Limit concurrent requests with additive increase, multiplicative decrease.
+
+    Each request that succeeds within the latency tolerance raises the limit by
+    ``1 / limit``, so the limit grows by about one per window of requests. A
+    request marked as overloaded, or one much slower than the recent average,
+    multiplies the limit by ``backoff``. Requests started before a decrease do
+    not decrease it again, so one burst of failures cuts the limit only once.
+    """
+
+    def __init__(
+        self,
+        initial_limit: float = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        backoff: float = 0.5,
+        latency_tolerance: float = 2.0,
+        min_samples: int = 10,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            initial_limit: Concurrency allowed before any feedback.
+            min_limit: Lowest limit a decrease may reach.
+            max_limit: Highest limit an increase may reach.
+            backoff: Factor the limit is multiplied by on overload.
+            latency_tolerance: Multiple of the average latency counted as a spike.
+            min_samples: Successful requests to observe before detecting spikes.
+            clock: Monotonic time source.
+        """
+        if min_limit <= 0:
+            raise ValueError("min_limit must be a positive integer")
+        if max_limit < min_limit:
+            raise ValueError("max_limit must not be smaller than min_limit")
+        if not 0 < backoff < 1:
+            raise ValueError("backoff must be between 0 and 1")
+        if latency_tolerance <= 1:
+            raise ValueError("latency_tolerance must be greater than 1")
+
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.min_samples = min_samples
+        self.clock = clock
+        self.stats = RunStats()
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._in_flight = 0
+        self._epoch = 0
+        self._samples = 0
+        self._average_latency: Optional[float] = None
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        """The current number of requests allowed at once."""
+        with self._condition:
+            return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """The number of requests currently running."""
+        with self._condition:
+            return self._in_flight
+
+    @contextlib.contextmanager
+    def slot(self, timeout: Optional[float] = None) -> Iterator[Permit]:
+        """
+        Wait for capacity and hold it while the block runs.
+
+        The block's duration is its latency. Mark the yielded permit as
+        overloaded when the service rejects or fails the request because of
+        load, such as an HTTP 429 or 5xx response or a timeout.
+
+        Args:
+            timeout: Seconds to wait for capacity, or None to wait indefinitely.
+
+        Yields:
+            The permit for the request.
+
+        Raises:
+            TimeoutError: If no capacity became free within ``timeout``.
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._in_flight < int(self._limit), timeout):
+                raise TimeoutError(f"No concurrency slot became free within {timeout:g} seconds")
+            self._in_flight += 1
+            permit = Permit(self._epoch)
+
+        started_at = self.clock()
+        succeeded = False
+        try:
+            yield permit
+            succeeded = True
+        finally:
+            self._finish(permit, self.clock() - started_at, succeeded)
+
+    def _finish(self, permit: Permit, latency: float, succeeded: bool) -> None:
+        """Release a permit and adjust the limit from its outcome."""
+        with self._condition:
+            self._in_flight -= 1
+            if permit.overloaded or (succeeded and self._is_latency_spike(latency)):
+                self._decrease(permit)
+            elif succeeded:
+                self._record_latency(latency)
+                self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+            self._condition.notify_all()
+
+    def _is_latency_spike(self, latency: float) -> bool:
+        """Whether a latency is far above the recent average."""
+        return (
+            self._samples >= self.min_samples
+            and self._average_latency is not None
+            and latency > self._average_latency * self.latency_tolerance
+        )
+
+    def _record_latency(self, latency: float) -> None:
+        """Fold a healthy latency into the moving average."""
+        self._samples += 1
+        if self._average_latency is None:
+            self._average_latency = latency
+        else:
+            self._average_latency += 0.1 * (latency - self._average_latency)
+
+    def _decrease(self, permit: Permit) -> None:
+        """Cut the limit once per window of requests."""
+        if permit.epoch != self._epoch:
+            return
+        self._epoch += 1
+        self._limit = max(float(self.min_limit), self._limit * self.backoff)
+        self.stats.increment("decreases")
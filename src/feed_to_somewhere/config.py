@@ -2,17 +2,21 @@
 
 import os
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 
 def _load_dotenv() -> None:
     """Load a project-local ``.env`` file when python-dotenv is available."""
+    env_path = Path(__file__).resolve().parents[2] / ".env"
+    # Skip importing python-dotenv when there is nothing to load.
+    if not env_path.is_file():
+        return
+
     try:
         from dotenv import load_dotenv
     except ImportError:
         return
 
-    env_path = Path(__file__).resolve().parents[2] / ".env"
     load_dotenv(dotenv_path=env_path)
 
 
@@ -26,6 +30,7 @@ class Config:
         self.database_id: Optional[str] = os.getenv("NOTION_DATABASE_ID")
         self.feed_list_path: str = os.getenv("FEED_LIST_PATH", "feed_list.csv")
         self._chunk_size: str = os.getenv("CHUNK_SIZE", "2000")
+        self.state_dir: Optional[str] = os.getenv("STATE_DIR")
 
     @property
     def chunk_size(self) -> int:
@@ -77,6 +82,19 @@ def require_one_of(*candidates: tuple[Optional[str], str]) -> str:
     raise ValueError(f"Environment variable {joined_names} is required")
 
 
+def split_tokens(value: Optional[str]) -> List[str]:
+    """
+    Split a comma-separated list of API tokens.
+
+    Args:
+        value: One token, or several separated by commas.
+
+    Returns:
+        The non-empty tokens in their original order.
+    """
+    return [token.strip() for token in (value or "").split(",") if token.strip()]
+
+
 def require_positive_int(value: str, name: str) -> int:
     """
     Validate that a setting resolves to a positive integer.
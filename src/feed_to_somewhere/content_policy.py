@@ -0,0 +1,65 @@
+"""Content quality policy for Feed to Somewhere."""
+
+import re
+
+
+class ContentPolicy:
+    """
+    Decide whether the body provided by a feed is good enough to keep.
+
+    Feed bodies that are shorter than ``min_length`` or that look truncated,
+    such as summaries ending in an ellipsis or a "Read more" link, are
+    considered insufficient, and the full article page is fetched instead.
+    """
+
+    TRUNCATION_TAIL_LENGTH = 80
+    TRUNCATION_RE = re.compile(
+        r"(?:\.\.\.|…"
+        r"|\b(?:read more|keep reading|continue reading|read the (?:full|rest)(?: (?:article|story|post))?)\b"
+        r"|続きを読む)"
+        r"[\s\W]*$",
+        re.IGNORECASE,
+    )
+
+    def __init__(self, min_length: int = 0, detect_truncation: bool = True):
+        """
+        Initialize the policy.
+
+        Args:
+            min_length: Minimum number of characters a feed body needs.
+            detect_truncation: Whether to treat bodies with truncation markers as
+                insufficient.
+        """
+        if min_length < 0:
+            raise ValueError("min_length must not be negative")
+
+        self.min_length = min_length
+        self.detect_truncation = detect_truncation
+
+    def is_truncated(self, text: str) -> bool:
+        """
+        Check whether text ends with a truncation marker.
+
+        Args:
+            text: Plain text extracted from a feed entry.
+
+        Returns:
+            True if the text ends in an ellipsis or a "Read more" style link.
+        """
+        tail = text[-self.TRUNCATION_TAIL_LENGTH:]
+        return bool(self.TRUNCATION_RE.search(tail))
+
+    def is_sufficient(self, text: str) -> bool:
+        """
+        Decide whether a feed body can be used without fetching the article.
+
+        Args:
+            text: Plain text extracted from a feed entry.
+
+        Returns:
+            True if the text is long enough and does not look truncated.
+        """
+        if not text or len(text) < self.min_length:
+            return False
+
+        return not (self.detect_truncation and self.is_truncated(text))
@@ -0,0 +1,74 @@
+"""Compact feed entry records for Feed to Somewhere."""
+
+from dataclasses import dataclass
+from typing import Any, Mapping, Optional, Tuple, Union
+
+
+@dataclass(frozen=True, slots=True)
+class FeedEntry:
+    """
+    The parts of a feed entry the pipeline needs.
+
+    Parsed feeds carry sanitized HTML, link lists, tags and detail dicts for
+    every entry. Projecting entries into this record as soon as a feed is parsed
+    lets the parsed document be freed before any entry is processed.
+    """
+
+    title: str
+    link: str
+    guid: str = ""
+    body_candidates: Tuple[str, ...] = ()
+    published_parsed: Optional[Any] = None
+    alternate_link: str = ""
+
+    @classmethod
+    def from_mapping(cls, entry: Mapping[str, Any]) -> "FeedEntry":
+        """
+        Project a feedparser entry or a plain dict into a compact record.
+
+        Body candidates keep the feed's own order of preference: full content
+        items first, then the summary and the description. The alternate link
+        is the original article URL FeedBurner recorded, or another
+        ``rel="alternate"`` link of the entry.
+
+        Args:
+            entry: The parsed entry.
+
+        Returns:
+            The compact record.
+        """
+        candidates = []
+        for item in entry.get("content") or []:
+            value = item.get("value") if hasattr(item, "get") else None
+            if value and value not in candidates:
+                candidates.append(value)
+
+        for key in ("summary", "description"):
+            value = entry.get(key)
+            if value and value not in candidates:
+                candidates.append(value)
+
+        link = (entry.get("link") or "").strip()
+        alternate_link = (entry.get("feedburner_origlink") or "").strip()
+        if not alternate_link:
+            for item in entry.get("links") or []:
+                href = (item.get("href") or "").strip() if hasattr(item, "get") else ""
+                if href and href != link and item.get("rel", "alternate") == "alternate":
+                    alternate_link = href
+                    break
+
+        return cls(
+            title=entry.get("title") or "",
+            link=link,
+            guid=entry.get("id") or "",
+            body_candidates=tuple(candidates),
+            published_parsed=entry.get("published_parsed"),
+            alternate_link="" if alternate_link == link else alternate_link,
+        )
+
+    @classmethod
+    def coerce(cls, entry: Union["FeedEntry", Mapping[str, Any]]) -> "FeedEntry":
+        """Return the entry as a FeedEntry, projecting mappings when needed."""
+        if isinstance(entry, cls):
+            return entry
+        return cls.from_mapping(entry)
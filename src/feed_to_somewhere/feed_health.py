@@ -0,0 +1,285 @@
+"""Persistent feed health tracking for Feed to Somewhere."""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from .logger import logger
+
+
+def _format_timestamp(value: Optional[float]) -> str:
+    """Format an epoch timestamp for reports."""
+    if not value:
+        return "-"
+    return datetime.fromtimestamp(value, tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+class FeedHealthStore:
+    """
+    Track per-feed fetch health across runs and back off from failing feeds.
+
+    A feed that fails ``failure_threshold`` times in a row trips its circuit
+    breaker. It is then skipped until an exponentially growing delay has passed,
+    after which a single attempt is allowed. Success closes the circuit again.
+    """
+
+    FILE_NAME = "feed_health.json"
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        failure_threshold: int = 3,
+        base_backoff_seconds: float = 3600,
+        max_backoff_seconds: float = 7 * 24 * 3600,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize the health store.
+
+        Args:
+            path: JSON file used to persist health state. If None, state is kept
+                in memory only.
+            failure_threshold: Consecutive failures that open the circuit.
+            base_backoff_seconds: Delay after the circuit first opens.
+            max_backoff_seconds: Upper bound for the backoff delay.
+            clock: Time source returning epoch seconds.
+        """
+        if failure_threshold <= 0:
+            raise ValueError("failure_threshold must be a positive integer")
+
+        self.path = path
+        self.failure_threshold = failure_threshold
+        self.base_backoff_seconds = base_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.clock = clock
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+        if self.path:
+            self.load()
+
+    @classmethod
+    def from_state_dir(cls, state_dir: str, **kwargs: Any) -> "FeedHealthStore":
+        """Create a store persisted inside a state directory."""
+        return cls(os.path.join(state_dir, cls.FILE_NAME), **kwargs)
+
+    def load(self) -> None:
+        """Load persisted health state, ignoring missing or unreadable files."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                records = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable feed health state %s: %s", self.path, e)
+            return
+
+        if isinstance(records, dict):
+            with self._lock:
+                self._records = records
+
+    def save(self) -> None:
+        """Persist health state atomically."""
+        if not self.path:
+            return
+
+        with self._lock:
+            payload = json.dumps(self._records, indent=2, sort_keys=True)
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        temp_path = f"{self.path}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.error("Failed to save feed health state to %s: %s", self.path, e)
+
+    def get(self, url: str) -> Dict[str, Any]:
+        """Return a copy of the health record for a feed."""
+        with self._lock:
+            return dict(self._records.get(url, {}))
+
+    def _record(self, url: str) -> Dict[str, Any]:
+        """Return the mutable record for a feed, creating it if needed."""
+        return self._records.setdefault(
+            url,
+            {
+                "attempts": 0,
+                "consecutive_failures": 0,
+                "average_latency": 0.0,
+                "last_attempt": None,
+                "last_success": None,
+                "last_failure": None,
+                "last_error": None,
+                "retry_after": None,
+            },
+        )
+
+    def _update_latency(self, record: Dict[str, Any], latency: float) -> None:
+        """Fold a new latency sample into the running average."""
+        record["attempts"] += 1
+        record["last_attempt"] = self.clock()
+        average = record.get("average_latency") or 0.0
+        record["average_latency"] = average + (latency - average) / record["attempts"]
+
+    def backoff_seconds(self, consecutive_failures: int) -> float:
+        """
+        Return the backoff delay for a number of consecutive failures.
+
+        Args:
+            consecutive_failures: Current consecutive failure count.
+
+        Returns:
+            Zero while the circuit is closed, otherwise the capped exponential delay.
+        """
+        if consecutive_failures < self.failure_threshold:
+            return 0.0
+
+        exponent = consecutive_failures - self.failure_threshold
+        return min(self.base_backoff_seconds * (2 ** min(exponent, 32)), self.max_backoff_seconds)
+
+    def should_attempt(self, url: str) -> bool:
+        """
+        Decide whether a feed should be fetched now.
+
+        Args:
+            url: The feed URL.
+
+        Returns:
+            False while the feed's circuit is open and its backoff has not expired.
+        """
+        with self._lock:
+            record = self._records.get(url)
+            if not record:
+                return True
+
+            retry_after = record.get("retry_after")
+            return not retry_after or self.clock() >= retry_after
+
+    def is_due(self, url: str, poll_interval_seconds: float) -> bool:
+        """
+        Decide whether a feed's poll interval has elapsed since its last fetch.
+
+        Args:
+            url: The feed URL.
+            poll_interval_seconds: Minimum delay between two fetches of the feed.
+
+        Returns:
+            True if the feed was never fetched or the interval has elapsed.
+        """
+        with self._lock:
+            last_attempt = self._records.get(url, {}).get("last_attempt")
+            return not last_attempt or self.clock() - last_attempt >= poll_interval_seconds
+
+    def get_last_seen(self, url: str) -> Optional[str]:
+        """Return the link of the newest entry fully processed from a feed."""
+        with self._lock:
+            return self._records.get(url, {}).get("last_seen_entry")
+
+    def record_last_seen(self, url: str, link: str) -> None:
+        """
+        Remember the newest entry fully processed from a feed.
+
+        Args:
+            url: The feed URL.
+            link: Link of the feed's newest entry.
+        """
+        with self._lock:
+            self._record(url)["last_seen_entry"] = link
+
+    def record_success(self, url: str, latency: float) -> None:
+        """
+        Record a successful fetch and close the feed's circuit.
+
+        Args:
+            url: The feed URL.
+            latency: Fetch duration in seconds.
+        """
+        with self._lock:
+            record = self._record(url)
+            self._update_latency(record, latency)
+            record["consecutive_failures"] = 0
+            record["last_success"] = self.clock()
+            record["retry_after"] = None
+
+    def record_failure(self, url: str, latency: float, error: str) -> None:
+        """
+        Record a failed fetch and open the circuit once the threshold is hit.
+
+        Args:
+            url: The feed URL.
+            latency: Fetch duration in seconds.
+            error: Short description of the failure.
+        """
+        with self._lock:
+            record = self._record(url)
+            self._update_latency(record, latency)
+            record["consecutive_failures"] += 1
+            record["last_failure"] = self.clock()
+            record["last_error"] = error
+
+            failures = record["consecutive_failures"]
+            delay = self.backoff_seconds(failures)
+            record["retry_after"] = record["last_failure"] + delay if delay else None
+
+        if delay:
+            logger.warning(
+                "Feed %s failed %s times in a row; backing off for %s seconds",
+                url,
+                failures,
+                int(delay),
+            )
+
+    def format_report(self) -> str:
+        """
+        Build a plain-text health report, least healthy feeds first.
+
+        Returns:
+            The formatted report.
+        """
+        with self._lock:
+            records = {url: dict(record) for url, record in self._records.items()}
+
+        if not records:
+            return "No feed health data recorded yet."
+
+        now = self.clock()
+        rows: List[List[str]] = [
+            ["STATUS", "FAILURES", "AVG LATENCY", "LAST SUCCESS", "RETRY AFTER", "FEED", "LAST ERROR"]
+        ]
+        ordered = sorted(
+            records.items(),
+            key=lambda item: (-item[1].get("consecutive_failures", 0), item[0]),
+        )
+        for url, record in ordered:
+            retry_after = record.get("retry_after")
+            if retry_after and now < retry_after:
+                status = "OPEN"
+            elif record.get("consecutive_failures"):
+                status = "FAILING"
+            else:
+                status = "OK"
+
+            rows.append([
+                status,
+                str(record.get("consecutive_failures", 0)),
+                f"{record.get('average_latency') or 0.0:.2f}s",
+                _format_timestamp(record.get("last_success")),
+                _format_timestamp(retry_after),
+                url,
+                (record.get("last_error") or "-") if status != "OK" else "-",
+            ])
+
+        widths = [max(len(row[index]) for row in rows) for index in range(len(rows[0]) - 1)]
+        lines = []
+        for row in rows:
+            cells = [cell.ljust(width) for cell, width in zip(row, widths)]
+            lines.append("  ".join(cells + [row[-1]]))
+        return "\n".join(lines)
@@ -1,18 +1,43 @@
 """Feed processing module for Feed to Somewhere."""
 
+import calendar
 import csv
 import concurrent.futures
-from typing import Any, Dict, List, Optional
+import contextlib
+import dataclasses
+import sqlite3
+import threading
+import time
+import xml.etree.ElementTree as ElementTree
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Set, Tuple, Union
 from urllib.parse import urlparse
 
-import feedparser
-import requests
-from bs4 import BeautifulSoup
-from requests.exceptions import RequestException
-
-from .logger import logger
-from .utils import clean_text, format_date, get_current_date_iso
+from .charsets import decode_html
+from .concurrency import AdaptiveLimiter, Permit
+from .content_policy import ContentPolicy
+from .feed_entries import FeedEntry
+from .feed_health import FeedHealthStore
+from .feed_sources import FeedSource
+from .feed_stream import UnsupportedFeedFormat, stream_feed_entries
+from .fingerprints import FingerprintIndex
+from .fetching import Deadline, DeadlineExceeded, fetch_page, resolve_redirects
+from .hedging import HedgePolicy, hedged_fetch_page
+from .logger import SAMPLED, logger
+from .metrics import RunStats
+from .profiling import PipelineProfiler, profile_stage
+from .redirects import RedirectCache, canonicalize_url
+from .routing import RoutingRule, route_entry
+from .sharding import ShardSpec, filter_shards
+from .shutdown import PendingEntryJournal, ShutdownController
+from .token_pool import TokenPool
+from .utils import clean_text, format_date, get_current_date_iso, lazy_import
 from .notion_client import NotionClient
+from .sinks import EntryRecord, NotionSink, Sink, SinkDispatcher
+from .work_queue import WorkQueue
+
+bs4 = lazy_import("bs4")
+feedparser = lazy_import("feedparser")
+requests = lazy_import("requests")
 
 
 class FeedProcessor:
@@ -26,6 +51,23 @@ class FeedProcessor:
         max_workers: int = 10,
         dry_run: bool = False,
         max_entries_per_feed: Optional[int] = None,
+        health_store: Optional[FeedHealthStore] = None,
+        content_policy: Optional[ContentPolicy] = None,
+        sinks: Optional[List[Sink]] = None,
+        stream_feeds: bool = False,
+        profiler: Optional[PipelineProfiler] = None,
+        time_budget: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        shutdown: Optional[ShutdownController] = None,
+        journal: Optional[PendingEntryJournal] = None,
+        article_timeout: Optional[float] = 60.0,
+        entry_timeout: Optional[float] = 120.0,
+        hedge_policy: Optional[HedgePolicy] = None,
+        shards: Sequence[ShardSpec] = (),
+        adaptive_concurrency: bool = False,
+        routing_rules: Sequence[RoutingRule] = (),
+        fingerprint_index: Optional[FingerprintIndex] = None,
+        redirect_cache: Optional[RedirectCache] = None,
     ):
         """
         Initialize the feed processor.
@@ -35,6 +77,46 @@ class FeedProcessor:
             max_workers: Maximum number of worker threads to use.
             dry_run: Whether to log planned work without writing to Notion.
             max_entries_per_feed: Optional per-feed entry limit.
+            health_store: Optional store that tracks feed failures and skips
+                feeds whose circuit breaker is open.
+            content_policy: Policy deciding when feed-provided content is good
+                enough to skip fetching the article page.
+            sinks: Output sinks for processed entries. If None, entries are
+                written to Notion through ``notion_client``.
+            stream_feeds: Whether to parse RSS and Atom feeds incrementally and
+                stop reading once enough new entries have been collected.
+            profiler: Optional profiler recording the fetch, extract and write
+                stages.
+            time_budget: Optional run duration in seconds. Entries of all feeds
+                are then processed highest priority and newest first, and no new
+                work is started once the budget runs out.
+            clock: Monotonic time source used for the time budget.
+            shutdown: Optional controller signalling that the run must stop.
+                No new work starts after a request, queued entries are cancelled
+                and running writes finish.
+            journal: Optional journal keeping entries that were extracted but
+                not written when shutdown was requested. They are written first
+                on the next run.
+            article_timeout: Total seconds an article fetch may take, including
+                redirects and reading the body, or None for no limit.
+            entry_timeout: Total seconds extracting a single entry may take,
+                including waiting for a host slot, or None for no limit.
+            hedge_policy: Optional policy sending a second request for article
+                fetches that are slow to respond.
+            shards: Shards of the feed list this process owns, such as its node
+                shard and its process shard. Feeds read from a CSV file that
+                another shard owns are skipped.
+            adaptive_concurrency: Whether to adapt the number of concurrent
+                article fetches per host, up to ``max_workers``, backing off
+                when a host answers with 429 or 5xx, times out or slows down.
+            routing_rules: Rules sending matching entries to additional data
+                sources, on top of the feed's own data sources.
+            fingerprint_index: Optional index of body fingerprints. Entries
+                whose body nearly matches one already written to the same data
+                source under another link are skipped.
+            redirect_cache: Optional cache of the canonical URLs entry links
+                redirect to. When given, entries are fetched and stored under
+                their canonical URL.
         """
         if max_workers <= 0:
             raise ValueError("max_workers must be a positive integer")
@@ -42,13 +124,92 @@ class FeedProcessor:
         if max_entries_per_feed is not None and max_entries_per_feed <= 0:
             raise ValueError("max_entries_per_feed must be a positive integer")
 
+        if time_budget is not None and time_budget <= 0:
+            raise ValueError("time_budget must be a positive number")
+
+        if article_timeout is not None and article_timeout <= 0:
+            raise ValueError("article_timeout must be a positive number")
+
+        if entry_timeout is not None and entry_timeout <= 0:
+            raise ValueError("entry_timeout must be a positive number")
+
         self.notion_client = notion_client
         self.max_workers = max_workers
         self.dry_run = dry_run
         self.max_entries_per_feed = max_entries_per_feed
-
-        if not self.dry_run and self.notion_client is None:
-            self.notion_client = NotionClient()
+        self.health_store = health_store
+        self.content_policy = content_policy or ContentPolicy()
+        self.stream_feeds = stream_feeds
+        self.profiler = profiler
+        self.time_budget = time_budget
+        self.clock = clock
+        self._entry_seconds = 0.0
+        self._entry_count = 0
+        self._entry_timing_lock = threading.Lock()
+        self.shutdown = shutdown
+        self.journal = journal
+        self.article_timeout = article_timeout
+        self.entry_timeout = entry_timeout
+        self.stats = RunStats()
+        self.deadline_hits = RunStats()
+        self.hedge_policy = hedge_policy
+        self.shards = tuple(shards)
+        self._hedge_executor = None
+        if hedge_policy is not None:
+            # Both requests of a hedged fetch run here while the entry worker waits.
+            self._hedge_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=2 * max_workers,
+                thread_name_prefix="hedge",
+            )
+        self._host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_semaphores_lock = threading.Lock()
+        self.adaptive_concurrency = adaptive_concurrency
+        self._host_limiters: Dict[str, AdaptiveLimiter] = {}
+        self.routing_rules = tuple(routing_rules)
+        self.fingerprint_index = fingerprint_index
+        self.redirect_cache = redirect_cache
+        self._lease_lost: Optional[threading.Event] = None
+        self._queue_deadline: Optional[float] = None
+
+        if sinks is None:
+            sinks = []
+            if not self.dry_run:
+                if self.notion_client is None:
+                    self.notion_client = NotionClient()
+                sinks.append(NotionSink(self.notion_client, max_workers=max_workers))
+
+        self.sinks = sinks
+        self.dispatcher = SinkDispatcher(self.sinks, stats=self.stats, profiler=self.profiler)
+
+    def _stopping(self) -> bool:
+        """Whether shutdown has been requested."""
+        return self.shutdown is not None and self.shutdown.requested
+
+    def _out_of_queue_time(self) -> bool:
+        """Whether the time budget of a work queue run has run out."""
+        return self._queue_deadline is not None and self.clock() >= self._queue_deadline
+
+    def _lost_lease(self) -> bool:
+        """Whether the work queue lease on the feed being processed was lost to another worker."""
+        return self._lease_lost is not None and self._lease_lost.is_set()
+
+    @contextlib.contextmanager
+    def _cancel_on_shutdown(self, futures: Iterable[concurrent.futures.Future]) -> Iterator[None]:
+        """Cancel queued futures if shutdown is requested while they are pending."""
+        if self.shutdown is None:
+            yield
+            return
+
+        def cancel_queued() -> None:
+            cancelled = sum(1 for future in futures if future.cancel())
+            if cancelled:
+                self.stats.increment("entries_cancelled", cancelled)
+
+        self.shutdown.add_callback(cancel_queued)
+        try:
+            yield
+        finally:
+            self.shutdown.remove_callback(cancel_queued)
 
     @staticmethod
     def is_supported_url(url: str) -> bool:
@@ -74,7 +235,22 @@ class FeedProcessor:
         Returns:
             A list of feed URLs.
         """
-        urls = []
+        return [source.url for source in self.read_feed_sources(csv_file)]
+
+    def read_feed_sources(self, csv_file: str) -> List[FeedSource]:
+        """
+        Read feed URLs and their per-feed options from a CSV file.
+
+        The first column holds the feed URL. Any further columns are optional
+        ``key=value`` settings such as ``max_entries=5`` or ``skip_extraction=true``.
+
+        Args:
+            csv_file: Path to the CSV file.
+
+        Returns:
+            A list of feed sources in file order.
+        """
+        sources = []
         seen_urls = set()
         try:
             with open(csv_file, "r", encoding="utf-8", newline="") as f:
@@ -85,48 +261,140 @@ class FeedProcessor:
 
                     url = feed[0].strip()
                     if not url:
-                        logger.warning(f"Skipping invalid feed URL on line {line_number} in {csv_file}")
+                        logger.warning("Skipping invalid feed URL on line %s in %s", line_number, csv_file)
                         continue
 
                     if url.startswith("#"):
                         continue
 
                     if not self.is_supported_url(url):
-                        logger.warning(f"Skipping unsupported feed URL on line {line_number} in {csv_file}")
+                        logger.warning("Skipping unsupported feed URL on line %s in %s", line_number, csv_file)
                         continue
 
                     if url in seen_urls:
-                        logger.info(f"Skipping duplicate feed URL on line {line_number} in {csv_file}")
+                        logger.info("Skipping duplicate feed URL on line %s in %s", line_number, csv_file)
+                        continue
+
+                    try:
+                        source = FeedSource.from_cells(url, feed[1:])
+                    except ValueError as e:
+                        logger.warning("Skipping feed on line %s in %s: %s", line_number, csv_file, e)
                         continue
 
                     seen_urls.add(url)
-                    urls.append(url)
-            logger.info(f"Read {len(urls)} feed URLs from {csv_file}")
+                    sources.append(source)
+            logger.info("Read %s feed URLs from %s", len(sources), csv_file)
+
+            if self.shards:
+                owned = filter_shards(sources, self.shards, key=lambda source: source.url)
+                shard_names = ", ".join(str(shard) for shard in self.shards)
+                logger.info("Shard %s owns %s of %s feeds", shard_names, len(owned), len(sources))
+                sources = owned
         except IOError as e:
-            logger.error(f"Failed to read feed URLs from {csv_file}: {e}")
+            logger.error("Failed to read feed URLs from %s: %s", csv_file, e)
+
+        return sources
+
+    @staticmethod
+    def get_feed_failure(feed: Any) -> Optional[str]:
+        """
+        Describe why a parsed feed counts as a failed fetch.
+
+        Args:
+            feed: The result returned by feedparser.
+
+        Returns:
+            A short error description, or None if the fetch succeeded.
+        """
+        status = getattr(feed, "status", None)
+        if isinstance(status, int) and status >= 400:
+            return f"HTTP {status}"
+
+        if getattr(feed, "bozo", False) and not feed.entries:
+            return str(getattr(feed, "bozo_exception", "malformed feed"))
+
+        return None
+
+    def _record_feed_health(self, url: str, started_at: float, error: Optional[str]) -> None:
+        """Record the outcome of a feed fetch when health tracking is enabled."""
+        if self.health_store is None:
+            return
 
-        return urls
+        latency = time.monotonic() - started_at
+        if error is None:
+            self.health_store.record_success(url, latency)
+        else:
+            self.health_store.record_failure(url, latency, error)
 
-    def fetch_feed_entries(self, url: str) -> List[Dict[str, Any]]:
+    def fetch_feed_entries(self, url: str) -> List[FeedEntry]:
         """
         Fetch entries from a feed URL.
 
+        Entries are projected into compact records right away so the parsed
+        feed document can be freed before the entries are processed.
+
         Args:
             url: The feed URL.
 
         Returns:
             A list of feed entries.
         """
+        started_at = time.monotonic()
         try:
             feed = feedparser.parse(url)
             if getattr(feed, "bozo", False):
-                logger.warning(f"Feed parser reported malformed content for {url}: {feed.bozo_exception}")
-            logger.info(f"Fetched {len(feed.entries)} entries from {url}")
-            return feed.entries
+                logger.warning("Feed parser reported malformed content for %s: %s", url, feed.bozo_exception)
+            self._record_feed_health(url, started_at, self.get_feed_failure(feed))
+            entries = [FeedEntry.from_mapping(entry) for entry in feed.entries]
+            logger.info("Fetched %s entries from %s", len(entries), url)
+            return entries
+        except Exception as e:
+            self._record_feed_health(url, started_at, str(e) or type(e).__name__)
+            logger.error("Failed to fetch feed from %s: %s", url, e)
+            return []
+
+    def fetch_feed_entries_streaming(
+        self,
+        url: str,
+        max_entries: Optional[int] = None,
+        stop_at: Optional[str] = None,
+    ) -> List[FeedEntry]:
+        """
+        Fetch entries with the incremental parser, reading only what is needed.
+
+        Documents that are not plain RSS or Atom XML are parsed with feedparser
+        instead, which copes with more formats and malformed markup.
+
+        Args:
+            url: The feed URL.
+            max_entries: Optional limit on the number of entries to read.
+            stop_at: Link of the newest entry processed in an earlier run.
+
+        Returns:
+            A list of feed entries.
+        """
+        started_at = time.monotonic()
+        try:
+            entries = stream_feed_entries(
+                url,
+                max_entries=max_entries,
+                stop_at={stop_at} if stop_at else (),
+                headers=self.ARTICLE_REQUEST_HEADERS,
+            )
+        except (UnsupportedFeedFormat, ElementTree.ParseError) as e:
+            logger.info("Falling back to feedparser for %s: %s", url, e)
+            self.stats.increment("feed_stream_fallbacks")
+            return self.fetch_feed_entries(url)
         except Exception as e:
-            logger.error(f"Failed to fetch feed from {url}: {e}")
+            status = getattr(getattr(e, "response", None), "status_code", None)
+            self._record_feed_health(url, started_at, f"HTTP {status}" if status else str(e) or type(e).__name__)
+            logger.error("Failed to fetch feed from %s: %s", url, e)
             return []
 
+        self._record_feed_health(url, started_at, None)
+        logger.info("Streamed %s entries from %s", len(entries), url)
+        return entries
+
     @staticmethod
     def html_to_text(html: str) -> str:
         """
@@ -141,14 +409,18 @@ class FeedProcessor:
         if not html:
             return ""
 
-        soup = BeautifulSoup(html, "html.parser")
+        # Plain-text bodies need no parsing; entities and tags do.
+        if "<" not in html and "&" not in html:
+            return html.strip()
+
+        soup = bs4.BeautifulSoup(html, "html.parser")
         paragraphs = [p.get_text(" ", strip=True) for p in soup.find_all("p")]
         if paragraphs:
             return " ".join(paragraph for paragraph in paragraphs if paragraph)
 
         return soup.get_text(" ", strip=True)
 
-    def extract_entry_content(self, entry: Dict[str, Any]) -> str:
+    def extract_entry_content(self, entry: Union[FeedEntry, Mapping[str, Any]]) -> str:
         """
         Extract the most useful body content from the feed entry itself.
 
@@ -158,123 +430,581 @@ class FeedProcessor:
         Returns:
             Extracted body text if available.
         """
-        for item in entry.get("content", []):
-            content = self.html_to_text(item.get("value", ""))
-            if content:
-                return content
-
-        for key in ("summary", "description"):
-            content = self.html_to_text(entry.get(key, ""))
+        for candidate in FeedEntry.coerce(entry).body_candidates:
+            content = self.html_to_text(candidate)
             if content:
                 return content
 
         return ""
 
-    def extract_content(self, url: str) -> str:
+    def extract_content(
+        self,
+        url: str,
+        deadline: Optional[Deadline] = None,
+        alternate_url: Optional[str] = None,
+    ) -> str:
         """
         Extract text content from a URL.
 
         Args:
             url: The URL to extract content from.
+            deadline: Optional deadline of the entry being processed. The fetch
+                stops at this deadline or after ``article_timeout`` seconds,
+                whichever comes first.
+            alternate_url: Optional other URL of the same article, used for
+                the second request of a hedged fetch.
 
         Returns:
             The extracted text content.
         """
+        deadline = (deadline or Deadline(clock=self.clock)).within(self.article_timeout)
         try:
-            response = requests.get(url, headers=self.ARTICLE_REQUEST_HEADERS, timeout=30)
-            response.raise_for_status()
+            with self._origin_slot(url, deadline) as permit:
+                try:
+                    if self.hedge_policy is not None:
+                        page = hedged_fetch_page(
+                            url,
+                            deadline,
+                            self.hedge_policy,
+                            self._hedge_executor,
+                            headers=self.ARTICLE_REQUEST_HEADERS,
+                            alternate_url=alternate_url,
+                        )
+                    else:
+                        page = fetch_page(url, deadline, headers=self.ARTICLE_REQUEST_HEADERS)
+                except Exception as e:
+                    if self._is_origin_overload(e):
+                        permit.mark_overloaded()
+                    raise
 
-            soup = BeautifulSoup(response.content, "html.parser")
+            soup = bs4.BeautifulSoup(decode_html(page.content, page.content_type), "html.parser")
             paragraphs = [p.get_text(" ", strip=True) for p in soup.find_all("p")]
             content = " ".join(paragraph for paragraph in paragraphs if paragraph)
             if not content:
                 content = soup.get_text(" ", strip=True)
 
-            logger.debug(f"Extracted {len(content)} characters from {url}")
+            logger.debug("Extracted %d characters from %s", len(content), url, extra=SAMPLED)
             return content
-        except RequestException as e:
-            logger.error(f"Failed to extract content from {url}: {e}")
+        except DeadlineExceeded as e:
+            self._record_deadline_hit(url)
+            logger.warning("Failed to extract content from %s: %s", url, e)
+            return ""
+        except requests.exceptions.RequestException as e:
+            logger.error("Failed to extract content from %s: %s", url, e)
             return ""
         except Exception as e:
-            logger.error(f"Unexpected error extracting content from {url}: {e}")
+            logger.error("Unexpected error extracting content from %s: %s", url, e)
             return ""
 
-    def process_entry(self, entry: Dict[str, Any], current_date: str) -> bool:
+    def _record_deadline_hit(self, url: str) -> None:
+        """Count an article fetch that ran out of time, by host."""
+        self.stats.increment("article_deadline_exceeded")
+        self.deadline_hits.increment(urlparse(url).netloc.lower())
+
+    @staticmethod
+    def _is_origin_overload(exc: Exception) -> bool:
+        """Whether a fetch error means the origin is rate limiting or overloaded."""
+        if isinstance(exc, (DeadlineExceeded, requests.exceptions.Timeout, requests.exceptions.ConnectionError)):
+            return True
+        response = getattr(exc, "response", None)
+        status = getattr(response, "status_code", None)
+        return isinstance(status, int) and (status == 429 or status >= 500)
+
+    @contextlib.contextmanager
+    def _origin_slot(self, url: str, deadline: Optional[Deadline] = None) -> Iterator[Permit]:
+        """
+        Hold one of the URL host's adaptive fetch slots.
+
+        Args:
+            url: The article URL.
+            deadline: Optional deadline for getting a slot.
+
+        Yields:
+            The permit to mark when the host is overloaded.
+
+        Raises:
+            DeadlineExceeded: If no slot became free before the deadline.
+        """
+        if not self.adaptive_concurrency:
+            yield Permit(0)
+            return
+
+        host = urlparse(url).netloc.lower()
+        with self._host_semaphores_lock:
+            limiter = self._host_limiters.get(host)
+            if limiter is None:
+                limiter = AdaptiveLimiter(initial_limit=4, max_limit=self.max_workers)
+                self._host_limiters[host] = limiter
+
+        with contextlib.ExitStack() as stack:
+            try:
+                permit = stack.enter_context(
+                    limiter.slot(timeout=deadline.remaining() if deadline is not None else None)
+                )
+            except TimeoutError:
+                raise DeadlineExceeded(url, deadline.seconds) from None
+            yield permit
+
+    def concurrency_limits(self) -> Dict[str, int]:
+        """
+        Return the current adaptive concurrency limits.
+
+        Returns:
+            The Notion limit under ``notion`` and each origin host's limit.
+        """
+        limits = {}
+        notion_limiter = getattr(self.notion_client, "limiter", None)
+        if isinstance(notion_limiter, AdaptiveLimiter):
+            limits["notion"] = notion_limiter.limit
+        with self._host_semaphores_lock:
+            limiters = dict(self._host_limiters)
+        limits.update((host, limiter.limit) for host, limiter in sorted(limiters.items()))
+        return limits
+
+    @contextlib.contextmanager
+    def _host_slot(self, url: str, limit: Optional[int], deadline: Optional[Deadline] = None) -> Iterator[None]:
+        """
+        Limit concurrent article fetches to the URL's host.
+
+        Args:
+            url: The article URL.
+            limit: Maximum concurrent fetches for the host, or None for no limit.
+            deadline: Optional deadline for getting a slot.
+
+        Raises:
+            DeadlineExceeded: If no slot became free before the deadline.
+        """
+        if not limit:
+            yield
+            return
+
+        host = urlparse(url).netloc.lower()
+        with self._host_semaphores_lock:
+            semaphore = self._host_semaphores.setdefault(host, threading.BoundedSemaphore(limit))
+
+        if not semaphore.acquire(timeout=deadline.remaining() if deadline is not None else None):
+            raise DeadlineExceeded(url, deadline.seconds)
+        try:
+            yield
+        finally:
+            semaphore.release()
+
+    def select_body(
+        self,
+        entry: Union[FeedEntry, Mapping[str, Any]],
+        link: str,
+        source: FeedSource,
+        deadline: Optional[Deadline] = None,
+    ) -> str:
+        """
+        Pick the entry body, fetching the article only when the feed body falls short.
+
+        Args:
+            entry: The feed entry.
+            link: The entry link.
+            source: Options of the feed the entry belongs to.
+            deadline: Optional deadline for extracting the entry.
+
+        Returns:
+            The best body text available, or an empty string.
+        """
+        feed_body = self.extract_entry_content(entry)
+        if self.content_policy.is_sufficient(feed_body):
+            self.stats.increment("article_fetches_saved")
+            return feed_body
+
+        if source.skip_extraction:
+            return feed_body
+
+        if feed_body:
+            self.stats.increment("feed_content_insufficient")
+            logger.debug("Feed content for %s is too short or truncated; fetching the article", link, extra=SAMPLED)
+
+        self.stats.increment("article_fetches")
+        try:
+            with self._host_slot(link, source.host_concurrency, deadline):
+                article_body = self.extract_content(
+                    link,
+                    deadline=deadline,
+                    alternate_url=FeedEntry.coerce(entry).alternate_link or None,
+                )
+        except DeadlineExceeded as e:
+            self._record_deadline_hit(link)
+            logger.warning("Failed to extract content from %s: %s", link, e)
+            return feed_body
+
+        # An article page that yields less text than the feed is usually boilerplate.
+        return article_body if len(article_body) > len(feed_body) else feed_body
+
+    def _cached_link(self, link: str) -> Optional[str]:
+        """Look up a link's canonical URL without resolving it."""
+        if self.redirect_cache is None or not link:
+            return None
+        try:
+            return self.redirect_cache.get(link)
+        except sqlite3.Error as e:
+            logger.warning("Could not read the redirect cache: %s", e)
+            return None
+
+    def resolve_link(self, link: str, deadline: Optional[Deadline] = None) -> str:
+        """
+        Return the canonical URL an entry link redirects to.
+
+        Cached links are returned without a request. Other links are resolved
+        by following their redirect chain and the result is cached. Only links
+        that redirect are canonicalized; a link that is already final is kept
+        as it is, so its identity does not change.
+
+        Args:
+            link: The entry link.
+            deadline: Optional deadline of the entry being processed.
+
+        Returns:
+            The canonical URL, or the link itself if there is no redirect cache
+            or resolving fails.
+        """
+        if self.redirect_cache is None:
+            return link
+
+        cached = self._cached_link(link)
+        if cached is not None:
+            self.stats.increment("redirect_cache_hits")
+            return cached
+
+        deadline = (deadline or Deadline(clock=self.clock)).within(self.article_timeout)
+        try:
+            final_url = resolve_redirects(link, deadline, headers=self.ARTICLE_REQUEST_HEADERS)
+        except (DeadlineExceeded, requests.exceptions.RequestException) as e:
+            logger.warning("Failed to resolve redirects of %s: %s", link, e, extra=SAMPLED)
+            return link
+
+        self.stats.increment("redirects_resolved")
+        canonical_url = canonicalize_url(final_url) if final_url != link else link
+        if canonical_url != link:
+            logger.debug("Resolved %s to %s", link, canonical_url, extra=SAMPLED)
+        try:
+            self.redirect_cache.put(link, canonical_url)
+        except sqlite3.Error as e:
+            logger.warning("Could not write the redirect cache: %s", e)
+        return canonical_url
+
+    def _defer_record(self, record: EntryRecord) -> None:
+        """Keep an extracted entry for the next run instead of writing it during shutdown."""
+        if self.journal is None:
+            logger.info("Dropping '%s' because shutdown was requested", record.title, extra=SAMPLED)
+            return
+
+        self.journal.append(record)
+        self.stats.increment("entries_journaled")
+
+    def replay_pending_entries(self) -> int:
+        """
+        Write the entries an interrupted run extracted but did not write.
+
+        Entries that are written, or that every sink reports it already holds,
+        are discarded from the journal. Only entries whose write failed, raised
+        or was cancelled by another shutdown stay pending.
+
+        Returns:
+            The number of entries written or found to exist already.
+        """
+        if self.journal is None or self.dry_run:
+            return 0
+
+        records = self.journal.load()
+        if not records:
+            return 0
+
+        logger.info("Writing %s entries saved by an interrupted run", len(records))
+        written = 0
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(self.max_workers, len(records))) as executor:
+            futures = {executor.submit(self.dispatcher.write, record): record for record in records}
+            with self._cancel_on_shutdown(futures):
+                for future in concurrent.futures.as_completed(futures):
+                    record = futures[future]
+                    try:
+                        if future.result():
+                            self.journal.discard(record)
+                            written += 1
+                    except concurrent.futures.CancelledError:
+                        continue
+                    except Exception as e:
+                        logger.error("Error writing saved entry %s: %s", record.link, e)
+
+        self.stats.increment("journaled_entries_written", written)
+        return written
+
+    def process_entry(
+        self,
+        entry: Union[FeedEntry, Mapping[str, Any]],
+        current_date: str,
+        source: Optional[FeedSource] = None,
+    ) -> bool:
         """
         Process a single feed entry.
 
         Args:
             entry: The feed entry to process.
             current_date: The current date in ISO format.
+            source: Options of the feed the entry belongs to.
 
         Returns:
             True if the entry was processed successfully, False otherwise.
         """
+        source = source or FeedSource(url="")
         try:
-            title = clean_text(entry.get("title", "Untitled"))
-            title = title.strip() or "Untitled"
-            link = entry.get("link", "").strip()
+            entry = FeedEntry.coerce(entry)
+            title = self._entry_title(entry)
+            link = entry.link
 
             if not link:
-                logger.warning(f"Entry '{title}' has no link, skipping")
+                logger.warning("Entry '%s' has no link, skipping", title)
                 return False
 
             if self.dry_run:
-                logger.info(f"[DRY RUN] Would process '{title}' ({link})")
+                logger.info("[DRY RUN] Would process '%s' (%s)", title, link, extra=SAMPLED)
                 return True
 
-            body = self.extract_entry_content(entry)
-            if not body:
-                body = self.extract_content(link)
+            if self._stopping() or self._lost_lease():
+                return False
+
+            if self._out_of_queue_time():
+                # The feed is released and its remaining entries are written by the next claim.
+                self.stats.increment("entries_deferred")
+                return False
 
+            deadline = Deadline(self.entry_timeout, clock=self.clock)
+            with profile_stage(self.profiler, "extract"):
+                link = self.resolve_link(link, deadline=deadline)
+                body = self.select_body(entry, link, source, deadline=deadline)
+
+            extracted = bool(body)
             if not body:
-                logger.warning(f"Failed to extract content for '{title}', using empty body")
+                logger.warning("Failed to extract content for '%s', using empty body", title)
                 body = "No content extracted"
 
             safe_body = clean_text(body)
-            date_struct = entry.get("published_parsed")
-            date_str = format_date(date_struct, current_date)
+            published = format_date(entry.published_parsed, "")
+
+            if not self.sinks:
+                logger.error("No output sinks are configured")
+                return False
 
-            if self.notion_client is None:
-                logger.error("Notion client is not configured")
+            record = EntryRecord(
+                title=title,
+                link=link,
+                body=safe_body,
+                date=published or current_date,
+                feed_url=source.url,
+                dated=bool(published),
+            )
+            records = [
+                dataclasses.replace(record, data_source_id=target)
+                for target in route_entry(title, link, source, self.routing_rules)
+            ]
+            if self._stopping():
+                for record in records:
+                    self._defer_record(record)
                 return False
 
-            result = self.notion_client.add_page(title, link, safe_body, date_str)
-            return result is not None
+            if self._lost_lease():
+                # Another worker now owns the feed and writes its entries.
+                logger.info("Not writing '%s' because the feed lease was lost", title, extra=SAMPLED)
+                return False
+
+            fingerprint = None
+            if extracted:
+                records, fingerprint = self._drop_near_duplicates(records)
+
+            # Write every target even if an earlier one fails.
+            results = []
+            for record in records:
+                written = False
+                try:
+                    written = self.dispatcher.write(record)
+                finally:
+                    if fingerprint is not None:
+                        self._settle_fingerprint(fingerprint, record, written)
+                results.append(written)
+            return all(results)
 
         except Exception as e:
-            logger.error(f"Failed to process entry: {e}")
+            logger.error("Failed to process entry: %s", e)
             return False
 
-    def process_feed(self, url: str) -> int:
+    def _drop_near_duplicates(self, records: List[EntryRecord]) -> Tuple[List[EntryRecord], Optional[int]]:
         """
-        Process a single feed.
+        Drop the records whose body nearly matches one already written to their data source.
+
+        Syndicated stories reach feeds under different URLs, such as AMP pages,
+        mirrors and tracking redirects, which the link checks cannot catch.
 
         Args:
-            url: The feed URL to process.
+            records: The entry's record for each target data source.
 
         Returns:
-            The number of successfully processed entries.
+            The records to write and the body fingerprint reserved for them, or
+            None if the body is not compared. The reservation keeps concurrent
+            near-duplicates out until :meth:`_settle_fingerprint` runs.
         """
-        entries = self.fetch_feed_entries(url)
+        if self.fingerprint_index is None:
+            return records, None
+
+        fingerprint = self.fingerprint_index.fingerprint(records[0].body)
+        if fingerprint is None:
+            return records, None
+
+        kept = []
+        for record in records:
+            try:
+                duplicate_of = self.fingerprint_index.reserve(fingerprint, record.link, record.data_source_id or "")
+            except sqlite3.Error as e:
+                logger.warning("Could not check near-duplicates of %s: %s", record.link, e)
+                duplicate_of = None
+
+            if duplicate_of is None:
+                kept.append(record)
+            else:
+                logger.info(
+                    "Skipping '%s' (%s), a near-duplicate of %s",
+                    record.title,
+                    record.link,
+                    duplicate_of,
+                    extra=SAMPLED,
+                )
+                self.stats.increment("near_duplicates_skipped")
+        return kept, fingerprint
+
+    def _settle_fingerprint(self, fingerprint: int, record: EntryRecord, written: bool) -> None:
+        """Store the reserved fingerprint of a written record, or release it if the write failed."""
+        if not written:
+            self.fingerprint_index.release(record.link, record.data_source_id or "")
+            return
+        try:
+            self.fingerprint_index.add(fingerprint, record.link, record.data_source_id or "")
+        except sqlite3.Error as e:
+            logger.warning("Could not remember the fingerprint of %s: %s", record.link, e)
+
+    @staticmethod
+    def _entry_title(entry: FeedEntry) -> str:
+        """Return the cleaned title an entry is written with."""
+        return clean_text(entry.title).strip() or "Untitled"
+
+    def _find_existing_links(self, entries: Sequence[FeedEntry], source: FeedSource) -> Set[str]:
+        """
+        Find the links that already exist in every data source they are routed to.
+
+        Args:
+            entries: The feed's entries.
+            source: Options of the feed.
+
+        Returns:
+            The links that need no write.
+        """
+        entry_targets: Dict[str, List[Optional[str]]] = {}
+        links_by_target: Dict[Optional[str], List[str]] = {}
+        for entry in entries:
+            if not entry.link:
+                continue
+            targets = route_entry(self._entry_title(entry), entry.link, source, self.routing_rules)
+            entry_targets[entry.link] = targets
+            for target in targets:
+                links_by_target.setdefault(target, []).append(entry.link)
+
+        existing_by_target = {
+            target: self.dispatcher.find_existing(links, target)
+            for target, links in links_by_target.items()
+        }
+        return {
+            link for link, targets in entry_targets.items()
+            if all(link in existing_by_target[target] for target in targets)
+        }
+
+    def _record_last_seen(self, url: str, link: Optional[str]) -> None:
+        """Remember where the next streamed read of a feed can stop."""
+        if self.stream_feeds and self.health_store is not None and link and not self.dry_run:
+            self.health_store.record_last_seen(url, link)
+
+    def prepare_feed_entries(self, url: str, source: FeedSource) -> Tuple[List[FeedEntry], Optional[str]]:
+        """
+        Fetch a feed and select the entries that still need processing.
+
+        Duplicate links are dropped, the entry limits applied and entries that
+        every sink already holds are skipped.
+
+        Args:
+            url: The feed URL.
+            source: Per-feed options.
+
+        Returns:
+            The entries to process and the link of the feed's newest entry.
+        """
+        entry_limits = [limit for limit in (self.max_entries_per_feed, source.max_entries) if limit is not None]
+        max_entries = min(entry_limits) if entry_limits else None
+
+        with profile_stage(self.profiler, "fetch"):
+            if self.stream_feeds:
+                last_seen = self.health_store.get_last_seen(url) if self.health_store is not None else None
+                entries = self.fetch_feed_entries_streaming(url, max_entries=max_entries, stop_at=last_seen)
+            else:
+                entries = self.fetch_feed_entries(url)
         if not entries:
-            return 0
+            return [], None
 
         deduplicated_entries = []
         seen_links = set()
-        for entry in entries:
-            link = entry.get("link", "").strip()
+        newest_link = None
+        for entry in map(FeedEntry.coerce, entries):
+            newest_link = newest_link or entry.link or None
+            cached_link = self._cached_link(entry.link)
+            if cached_link is not None:
+                # Known redirects are checked and written under their canonical URL.
+                entry = dataclasses.replace(entry, link=cached_link)
+            link = entry.link
             if link and link in seen_links:
-                logger.info(f"Skipping duplicate entry link '{link}' from {url}")
+                logger.info("Skipping duplicate entry link '%s' from %s", link, url, extra=SAMPLED)
                 continue
 
             if link:
                 seen_links.add(link)
             deduplicated_entries.append(entry)
+        del entries
+
+        if max_entries is not None and len(deduplicated_entries) > max_entries:
+            logger.info("Limiting entries from %s to first %s", url, max_entries)
+            deduplicated_entries = deduplicated_entries[:max_entries]
+
+        existing_links = self._find_existing_links(deduplicated_entries, source)
+        if existing_links:
+            logger.info("Skipping %s entries from %s that already exist", len(existing_links), url)
+            self.stats.increment("existing_entries_skipped", len(existing_links))
+            deduplicated_entries = [
+                entry for entry in deduplicated_entries
+                if entry.link not in existing_links
+            ]
+            if not deduplicated_entries:
+                self._record_last_seen(url, newest_link)
+
+        return deduplicated_entries, newest_link
+
+    def process_feed(self, url: str, source: Optional[FeedSource] = None) -> int:
+        """
+        Process a single feed.
 
-        if self.max_entries_per_feed is not None and len(deduplicated_entries) > self.max_entries_per_feed:
-            logger.info(f"Limiting entries from {url} to first {self.max_entries_per_feed}")
-            deduplicated_entries = deduplicated_entries[:self.max_entries_per_feed]
+        Args:
+            url: The feed URL to process.
+            source: Per-feed options. If None, the processor defaults apply.
+
+        Returns:
+            The number of successfully processed entries.
+        """
+        source = source or FeedSource(url=url)
+        deduplicated_entries, newest_link = self.prepare_feed_entries(url, source)
+        if not deduplicated_entries:
+            return 0
+
+        if self._stopping():
+            return 0
 
         current_date = get_current_date_iso()
         success_count = 0
@@ -282,21 +1012,140 @@ class FeedProcessor:
 
         with concurrent.futures.ThreadPoolExecutor(max_workers=worker_count) as executor:
             futures = {
-                executor.submit(self.process_entry, entry, current_date): entry
+                executor.submit(self.process_entry, entry, current_date, source): entry
                 for entry in deduplicated_entries
             }
 
-            for future in concurrent.futures.as_completed(futures):
-                entry = futures[future]
-                try:
-                    if future.result():
-                        success_count += 1
-                except Exception as e:
-                    logger.error(f"Error processing entry {entry.get('title', 'Unknown')}: {e}")
+            with self._cancel_on_shutdown(futures):
+                for future in concurrent.futures.as_completed(futures):
+                    entry = futures[future]
+                    try:
+                        if future.result():
+                            success_count += 1
+                    except concurrent.futures.CancelledError:
+                        continue
+                    except Exception as e:
+                        logger.error("Error processing entry %s: %s", entry.title or "Unknown", e)
 
-        logger.info(f"Successfully processed {success_count}/{len(deduplicated_entries)} entries from {url}")
+        if success_count == len(deduplicated_entries):
+            self._record_last_seen(url, newest_link)
+
+        logger.info("Successfully processed %s/%s entries from %s", success_count, len(deduplicated_entries), url)
         return success_count
 
+    @staticmethod
+    def _schedule_key(entry: FeedEntry, source: FeedSource) -> Tuple[int, float]:
+        """Sort key putting higher-priority feeds, then newer entries, first."""
+        published = entry.published_parsed
+        try:
+            timestamp = float(calendar.timegm(published)) if published else float("-inf")
+        except (TypeError, ValueError, OverflowError):
+            timestamp = float("-inf")
+        return -source.priority, -timestamp
+
+    def _timed_process_entry(self, entry: FeedEntry, current_date: str, source: FeedSource) -> bool:
+        """Process an entry and fold its duration into the running average."""
+        started_at = self.clock()
+        try:
+            return self.process_entry(entry, current_date, source)
+        finally:
+            elapsed = self.clock() - started_at
+            with self._entry_timing_lock:
+                self._entry_count += 1
+                self._entry_seconds += (elapsed - self._entry_seconds) / self._entry_count
+
+    def _has_time_for_entry(self, deadline: float) -> bool:
+        """Check whether an average entry would still finish before the deadline."""
+        with self._entry_timing_lock:
+            expected = self._entry_seconds
+        return self.clock() + expected < deadline
+
+    def _process_sources_within_budget(self, sources: List[FeedSource], deadline: float) -> int:
+        """
+        Process feeds entry by entry in value order until the deadline.
+
+        All due feeds are fetched first. Their entries are then processed highest
+        feed priority first and newest first. New entries are started only while
+        an average entry would still finish before the deadline, and entries
+        that are already running always finish.
+
+        Args:
+            sources: Feed sources in priority order.
+            deadline: Clock value after which no new work starts.
+
+        Returns:
+            The number of feeds with at least one successfully processed entry.
+        """
+        work: List[Tuple[FeedEntry, FeedSource]] = []
+        newest_links: Dict[str, Optional[str]] = {}
+        entry_counts: Dict[str, int] = {}
+
+        for index, source in enumerate(sources):
+            if self._stopping():
+                logger.warning("Shutdown requested; skipping %s remaining feeds", len(sources) - index)
+                break
+
+            if self.clock() >= deadline:
+                logger.warning("Time budget exhausted; skipping %s remaining feeds", len(sources) - index)
+                self.stats.increment("feeds_deferred", len(sources) - index)
+                break
+
+            if not self._is_feed_due(source):
+                continue
+
+            try:
+                entries, newest_links[source.url] = self.prepare_feed_entries(source.url, source)
+            except Exception as e:
+                logger.error("Error processing feed %s: %s", source.url, e)
+                continue
+
+            entry_counts[source.url] = len(entries)
+            work.extend((entry, source) for entry in entries)
+
+        # sort() is stable, so entries without dates keep their feed order.
+        work.sort(key=lambda item: self._schedule_key(*item))
+
+        current_date = get_current_date_iso()
+        successes: Dict[str, int] = {}
+        queue = iter(work)
+        in_flight: Dict[concurrent.futures.Future, Tuple[FeedEntry, FeedSource]] = {}
+        deferred = 0
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while True:
+                while len(in_flight) < self.max_workers:
+                    item = next(queue, None)
+                    if item is None:
+                        break
+                    if self._stopping() or not self._has_time_for_entry(deadline):
+                        deferred = 1 + sum(1 for _ in queue)
+                        break
+                    entry, source = item
+                    in_flight[executor.submit(self._timed_process_entry, entry, current_date, source)] = item
+
+                if not in_flight:
+                    break
+
+                done, _ = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    entry, source = in_flight.pop(future)
+                    try:
+                        if future.result():
+                            successes[source.url] = successes.get(source.url, 0) + 1
+                    except Exception as e:
+                        logger.error("Error processing entry %s: %s", entry.title or "Unknown", e)
+
+        if deferred:
+            reason = "Shutdown requested" if self._stopping() else "Time budget exhausted"
+            logger.warning("%s; deferred %s entries to the next run", reason, deferred)
+            self.stats.increment("entries_deferred", deferred)
+
+        for url, count in entry_counts.items():
+            if successes.get(url, 0) == count:
+                self._record_last_seen(url, newest_links.get(url))
+
+        return len(successes)
+
     def process_feed_urls(self, urls: List[str], max_feeds: Optional[int] = None) -> int:
         """
         Process a list of feed URLs.
@@ -308,27 +1157,190 @@ class FeedProcessor:
         Returns:
             The number of successfully processed feeds.
         """
-        if not urls:
+        return self.process_feed_sources([FeedSource(url=url) for url in urls], max_feeds=max_feeds)
+
+    def _is_feed_due(self, source: FeedSource) -> bool:
+        """Check the circuit breaker and poll interval of a feed."""
+        if self.health_store is None:
+            return True
+
+        if not self.health_store.should_attempt(source.url):
+            logger.info("Skipping feed %s while its circuit breaker is open", source.url)
+            return False
+
+        if source.poll_interval and not self.health_store.is_due(source.url, source.poll_interval * 60):
+            logger.info(
+                "Skipping feed %s until its %s minute poll interval elapses", source.url, source.poll_interval
+            )
+            return False
+
+        return True
+
+    def process_feed_sources(self, sources: List[FeedSource], max_feeds: Optional[int] = None) -> int:
+        """
+        Process feeds with their per-feed options, highest priority first.
+
+        Args:
+            sources: Feed sources to process.
+            max_feeds: Optional limit on the number of feeds to process. The
+                feeds with the highest priority are kept.
+
+        Returns:
+            The number of successfully processed feeds.
+        """
+        if not sources:
             logger.warning("No feed URLs were provided")
             return 0
 
-        selected_urls = urls
-        if max_feeds is not None and len(urls) > max_feeds:
-            logger.info(f"Limiting feeds to first {max_feeds} URLs")
-            selected_urls = urls[:max_feeds]
+        # sorted() is stable, so feeds with equal priority keep their file order.
+        selected_sources = sorted(sources, key=lambda source: -source.priority)
+        if max_feeds is not None and len(selected_sources) > max_feeds:
+            logger.info("Limiting feeds to the %s with the highest priority", max_feeds)
+            selected_sources = selected_sources[:max_feeds]
 
         success_count = 0
-        for url in selected_urls:
-            try:
-                processed = self.process_feed(url)
-                if processed > 0:
-                    success_count += 1
-            except Exception as e:
-                logger.error(f"Error processing feed {url}: {e}")
+        try:
+            self.replay_pending_entries()
+
+            if self.time_budget is not None:
+                deadline = self.clock() + self.time_budget
+                success_count = self._process_sources_within_budget(selected_sources, deadline)
+            else:
+                for source in selected_sources:
+                    if self._stopping():
+                        logger.warning("Shutdown requested; skipping the remaining feeds")
+                        break
+
+                    if not self._is_feed_due(source):
+                        continue
 
-        logger.info(f"Successfully processed {success_count}/{len(selected_urls)} feeds")
+                    try:
+                        processed = self.process_feed(source.url, source)
+                        if processed > 0:
+                            success_count += 1
+                    except Exception as e:
+                        logger.error("Error processing feed %s: %s", source.url, e)
+        finally:
+            self._finish_run()
+
+        self._log_run_summary(success_count, len(selected_sources))
         return success_count
 
+    def _finish_run(self) -> None:
+        """Flush buffered writes and persist run state."""
+        self.dispatcher.flush()
+        if self.health_store is not None and not self.dry_run:
+            self.health_store.save()
+        if self.journal is not None:
+            self.journal.save()
+
+    def _log_run_summary(self, success_count: int, feed_count: int) -> None:
+        """Log how many feeds succeeded and how article bodies were obtained."""
+        logger.info("Successfully processed %s/%s feeds", success_count, feed_count)
+        logger.info(
+            "Used feed content for %s entries and fetched %s article pages",
+            self.stats.get("article_fetches_saved"),
+            self.stats.get("article_fetches"),
+        )
+        if self.hedge_policy is not None:
+            hedges = self.hedge_policy.snapshot()
+            logger.info(
+                "Hedged %s of %s article fetches; %s hedges won and %s were over budget",
+                hedges.get("hedges", 0),
+                hedges.get("fetches", 0),
+                hedges.get("hedge_wins", 0),
+                hedges.get("hedges_denied", 0),
+            )
+        if self.stats.get("near_duplicates_skipped"):
+            logger.info("Skipped %s near-duplicate entries", self.stats.get("near_duplicates_skipped"))
+        if self.stats.get("article_deadline_exceeded"):
+            logger.warning("Article fetches that ran out of time, by host: %s", self.deadline_hits.format_summary())
+        token_pool = getattr(self.notion_client, "token_pool", None)
+        if isinstance(token_pool, TokenPool) and len(token_pool) > 1:
+            logger.info("Notion requests by token: %s", token_pool.stats.format_summary())
+        limits = self.concurrency_limits()
+        if limits:
+            logger.info(
+                "Adaptive concurrency limits: %s", ", ".join(f"{name}={limit}" for name, limit in limits.items())
+            )
+
+    def process_work_queue(self, queue: WorkQueue, max_feeds: Optional[int] = None) -> int:
+        """
+        Claim and process feeds from a shared work queue until it is empty.
+
+        Each feed is leased while it is processed and the lease is renewed in
+        the background. Processed feeds are marked done; feeds interrupted by
+        shutdown or an unexpected error are released for another worker. Once a
+        lease is lost, no further entries of the feed are written and the feed
+        is left to the worker that holds it.
+
+        With a time budget, no feed is claimed once it has run out, and entries
+        of the feed being processed are not started any more. That feed is
+        released so its remaining entries are written by the next claim.
+
+        Args:
+            queue: The shared work queue.
+            max_feeds: Optional limit on the number of feeds to claim.
+
+        Returns:
+            The number of successfully processed feeds.
+        """
+        success_count = 0
+        claimed = 0
+        if self.time_budget is not None:
+            self._queue_deadline = self.clock() + self.time_budget
+        try:
+            self.replay_pending_entries()
+
+            while max_feeds is None or claimed < max_feeds:
+                if self._stopping():
+                    logger.warning("Shutdown requested; claiming no more feeds")
+                    break
+
+                if self._out_of_queue_time():
+                    logger.warning("Time budget exhausted; claiming no more feeds")
+                    break
+
+                lease = queue.claim()
+                if lease is None:
+                    break
+                claimed += 1
+                self.stats.increment("feeds_claimed")
+                source = lease.source
+                deferred = self.stats.get("entries_deferred")
+
+                try:
+                    with queue.keep_alive(lease) as lost:
+                        self._lease_lost = lost
+                        if self._is_feed_due(source) and self.process_feed(source.url, source) > 0:
+                            success_count += 1
+                except Exception as e:
+                    logger.error("Error processing feed %s: %s", source.url, e)
+                    queue.release(lease)
+                    continue
+                finally:
+                    self._lease_lost = None
+
+                if lost.is_set():
+                    # The feed belongs to another worker now, which completes it.
+                    self.stats.increment("leases_lost")
+                elif self._stopping() or self.stats.get("entries_deferred") > deferred:
+                    queue.release(lease, failed=False)
+                else:
+                    queue.complete(lease)
+        finally:
+            self._queue_deadline = None
+            self._finish_run()
+
+        self._log_run_summary(success_count, claimed)
+        return success_count
+
+    def close(self) -> None:
+        """Flush buffered sink writes and release sink and hedging resources."""
+        self.dispatcher.close()
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False)
+
     def process_feeds(self, csv_file: str, max_feeds: Optional[int] = None) -> int:
         """
         Process all feeds from a CSV file.
@@ -340,9 +1352,9 @@ class FeedProcessor:
         Returns:
             The number of successfully processed feeds.
         """
-        urls = self.read_feed_urls(csv_file)
-        if not urls:
-            logger.warning(f"No feed URLs found in {csv_file}")
+        sources = self.read_feed_sources(csv_file)
+        if not sources:
+            logger.warning("No feed URLs found in %s", csv_file)
             return 0
 
-        return self.process_feed_urls(urls, max_feeds=max_feeds)
+        return self.process_feed_sources(sources, max_feeds=max_feeds)
@@ -0,0 +1,115 @@
+"""Feed list entries and per-feed options for Feed to Somewhere."""
+
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Tuple
+
+
+def _parse_bool(value: str) -> bool:
+    """Parse a boolean option value."""
+    normalized = value.strip().lower()
+    if normalized in {"1", "true", "yes", "on"}:
+        return True
+    if normalized in {"0", "false", "no", "off"}:
+        return False
+    raise ValueError("must be true or false")
+
+
+def _parse_positive_int(value: str) -> int:
+    """Parse a positive integer option value."""
+    parsed_value = int(value)
+    if parsed_value <= 0:
+        raise ValueError("must be a positive integer")
+    return parsed_value
+
+
+def _parse_targets(value: str) -> str:
+    """Parse one or more ``|``-separated target IDs."""
+    targets = [target.strip() for target in value.split("|")]
+    if not all(targets):
+        raise ValueError("must not be empty")
+    return "|".join(targets)
+
+
+@dataclass(frozen=True)
+class FeedSource:
+    """A feed URL together with its per-feed processing options."""
+
+    url: str
+    max_entries: Optional[int] = None
+    skip_extraction: bool = False
+    data_source_id: Optional[str] = None
+    poll_interval: Optional[int] = None
+    priority: int = 0
+    host_concurrency: Optional[int] = None
+
+    OPTION_PARSERS = {
+        "max_entries": _parse_positive_int,
+        "skip_extraction": _parse_bool,
+        "data_source": _parse_targets,
+        "poll_interval": _parse_positive_int,
+        "priority": int,
+        "host_concurrency": _parse_positive_int,
+    }
+    OPTION_FIELDS = {"data_source": "data_source_id"}
+
+    @classmethod
+    def from_cells(cls, url: str, cells: Iterable[str]) -> "FeedSource":
+        """
+        Build a feed source from a URL and ``key=value`` option cells.
+
+        Args:
+            url: The feed URL.
+            cells: Additional CSV cells such as ``max_entries=5``.
+
+        Returns:
+            The parsed feed source.
+
+        Raises:
+            ValueError: If an option is unknown or its value is invalid.
+        """
+        options: Dict[str, Any] = {}
+        for cell in cells:
+            cell = cell.strip()
+            if not cell:
+                continue
+
+            key, separator, value = cell.partition("=")
+            key = key.strip().lower().replace("-", "_")
+            parser: Optional[Callable[[str], Any]] = cls.OPTION_PARSERS.get(key)
+            if not separator or parser is None:
+                raise ValueError(f"unknown feed option '{cell}'")
+
+            try:
+                options[cls.OPTION_FIELDS.get(key, key)] = parser(value)
+            except ValueError as exc:
+                raise ValueError(f"invalid value for {key}: {exc}") from exc
+
+        return cls(url=url, **options)
+
+    @property
+    def data_source_ids(self) -> Tuple[str, ...]:
+        """The data sources the feed's entries are written to, empty for the default."""
+        if not self.data_source_id:
+            return ()
+        return tuple(self.data_source_id.split("|"))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the feed source as a JSON-serializable dict."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "FeedSource":
+        """
+        Rebuild a feed source from ``to_dict`` output.
+
+        Keys of options that no longer exist are ignored, so stored sources stay
+        readable across versions.
+
+        Args:
+            data: The stored feed source.
+
+        Returns:
+            The feed source.
+        """
+        known = {field.name for field in fields(cls)}
+        return cls(**{key: value for key, value in data.items() if key in known})
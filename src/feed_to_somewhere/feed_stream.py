@@ -0,0 +1,198 @@
+"""Incremental RSS and Atom parsing for Feed to Somewhere."""
+
+import time
+import xml.etree.ElementTree as ElementTree
+from datetime import datetime, timezone
+from typing import BinaryIO, Container, Iterator, List, Mapping, Optional
+
+from .feed_entries import FeedEntry
+from .utils import lazy_import
+
+email_utils = lazy_import("email.utils")
+requests = lazy_import("requests")
+
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+RDF_NS = "{http://www.w3.org/1999/02/22-rdf-syntax-ns#}"
+RSS1_NS = "{http://purl.org/rss/1.0/}"
+CONTENT_NS = "{http://purl.org/rss/1.0/modules/content/}"
+DC_NS = "{http://purl.org/dc/elements/1.1/}"
+
+# Root element -> the element wrapping a single entry.
+ITEM_TAGS = {
+    "rss": "item",
+    f"{ATOM_NS}feed": f"{ATOM_NS}entry",
+    f"{RDF_NS}RDF": f"{RSS1_NS}item",
+}
+
+
+class UnsupportedFeedFormat(ValueError):
+    """Raised when a document is not RSS 2.0, RSS 1.0 or Atom."""
+
+
+def parse_feed_date(value: Optional[str]) -> Optional[time.struct_time]:
+    """
+    Parse an RFC 822 or ISO 8601 feed date into a UTC time tuple.
+
+    Args:
+        value: The date text from the feed.
+
+    Returns:
+        The parsed date, or None if it cannot be parsed.
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    try:
+        parsed = email_utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.utctimetuple()
+
+
+def _text(element: Optional[ElementTree.Element]) -> str:
+    """Return all text inside an element, including nested XHTML content."""
+    if element is None:
+        return ""
+    return "".join(element.itertext()).strip()
+
+
+def _atom_link(item: ElementTree.Element) -> str:
+    """Return the alternate link of an Atom entry."""
+    for link in item.iter(f"{ATOM_NS}link"):
+        if link.get("rel", "alternate") == "alternate" and link.get("href"):
+            return link.get("href", "")
+    return ""
+
+
+def _build_entry(item: ElementTree.Element, root_tag: str) -> FeedEntry:
+    """Project a parsed item element into a feed entry."""
+    if root_tag == f"{ATOM_NS}feed":
+        fields = {
+            "title": _text(item.find(f"{ATOM_NS}title")),
+            "link": _atom_link(item),
+            "id": _text(item.find(f"{ATOM_NS}id")),
+            "content": [{"value": _text(item.find(f"{ATOM_NS}content"))}],
+            "summary": _text(item.find(f"{ATOM_NS}summary")),
+            "date": _text(item.find(f"{ATOM_NS}published")) or _text(item.find(f"{ATOM_NS}updated")),
+        }
+    else:
+        namespace = RSS1_NS if root_tag == f"{RDF_NS}RDF" else ""
+        fields = {
+            "title": _text(item.find(f"{namespace}title")),
+            "link": _text(item.find(f"{namespace}link")),
+            "id": _text(item.find("guid")) or item.get(f"{RDF_NS}about", ""),
+            "content": [{"value": _text(item.find(f"{CONTENT_NS}encoded"))}],
+            "description": _text(item.find(f"{namespace}description")),
+            "date": _text(item.find("pubDate")) or _text(item.find(f"{DC_NS}date")),
+        }
+
+    fields["published_parsed"] = parse_feed_date(fields.pop("date"))
+    return FeedEntry.from_mapping(fields)
+
+
+def iter_feed_entries(stream: BinaryIO) -> Iterator[FeedEntry]:
+    """
+    Yield entries from an RSS or Atom document while it is being read.
+
+    Each item is released as soon as it has been projected, so memory use stays
+    flat regardless of the document size, and callers can stop reading early.
+
+    Args:
+        stream: Binary stream of the feed document.
+
+    Yields:
+        The feed's entries in document order.
+
+    Raises:
+        UnsupportedFeedFormat: If the root element is not a known feed format.
+        xml.etree.ElementTree.ParseError: If the document is not well-formed XML.
+    """
+    parents: List[ElementTree.Element] = []
+    root_tag = None
+    item_tag = None
+
+    for event, element in ElementTree.iterparse(stream, events=("start", "end")):
+        if event == "start":
+            if root_tag is None:
+                root_tag = element.tag
+                item_tag = ITEM_TAGS.get(root_tag)
+                if item_tag is None:
+                    raise UnsupportedFeedFormat(f"unsupported feed root element {root_tag}")
+            parents.append(element)
+            continue
+
+        parents.pop()
+        if element.tag == item_tag:
+            entry = _build_entry(element, root_tag)
+            if parents:
+                parents[-1].remove(element)
+            yield entry
+
+
+def stream_feed_entries(
+    url: str,
+    max_entries: Optional[int] = None,
+    stop_at: Container[str] = (),
+    headers: Optional[Mapping[str, str]] = None,
+    timeout: float = 30,
+) -> List[FeedEntry]:
+    """
+    Download a feed and parse it incrementally.
+
+    Reading stops once ``max_entries`` distinct links have been collected or an
+    entry whose link or guid is in ``stop_at`` is reached, so the rest of the
+    document is never downloaded. Stopping at a seen entry assumes the feed
+    lists its newest entries first, so it only happens while every entry read
+    so far is dated no later than the one before it; once an entry is undated
+    or out of order, ``stop_at`` is ignored and the whole document is read.
+
+    Args:
+        url: The feed URL.
+        max_entries: Optional limit on the number of entries to collect.
+        stop_at: Links or guids of entries seen in earlier runs.
+        headers: Optional request headers.
+        timeout: Connect and read timeout in seconds.
+
+    Returns:
+        The collected entries in document order.
+
+    Raises:
+        requests.exceptions.RequestException: If the download fails.
+        UnsupportedFeedFormat: If the document is not RSS or Atom.
+        xml.etree.ElementTree.ParseError: If the document is not well-formed XML.
+    """
+    response = requests.get(url, headers=dict(headers or {}), timeout=timeout, stream=True)
+    try:
+        response.raise_for_status()
+        response.raw.decode_content = True
+
+        entries: List[FeedEntry] = []
+        links = set()
+        newest_first = True
+        previous_date = None
+        for entry in iter_feed_entries(response.raw):
+            date = entry.published_parsed
+            if date is None or (previous_date is not None and date > previous_date):
+                newest_first = False
+            previous_date = date
+            if newest_first and (
+                (entry.link and entry.link in stop_at) or (entry.guid and entry.guid in stop_at)
+            ):
+                break
+
+            entries.append(entry)
+            if entry.link:
+                links.add(entry.link)
+            if max_entries is not None and len(links) >= max_entries:
+                break
+
+        return entries
+    finally:
+        response.close()
@@ -0,0 +1,259 @@
+"""Deadline-bounded HTTP fetching for Feed to Somewhere."""
+
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Mapping, Optional
+from urllib.parse import urljoin
+
+from .utils import lazy_import
+
+requests = lazy_import("requests")
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a fetch runs past its total deadline."""
+
+    def __init__(self, url: str, seconds: Optional[float] = None):
+        self.url = url
+        detail = f" of {seconds:g} seconds" if seconds is not None else ""
+        super().__init__(f"Deadline{detail} exceeded fetching {url}")
+
+
+class Deadline:
+    """
+    A point in time by which a piece of work must be finished.
+
+    Socket timeouts only bound a single connect or read, so a server sending a
+    byte every few seconds can keep a request open indefinitely. A deadline
+    bounds the wall-clock time across redirects and body reads instead.
+    """
+
+    def __init__(self, seconds: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the deadline.
+
+        Args:
+            seconds: Seconds from now, or None for no deadline.
+            clock: Monotonic time source.
+        """
+        if seconds is not None and seconds <= 0:
+            raise ValueError("seconds must be a positive number")
+
+        self.seconds = seconds
+        self.clock = clock
+        self.expires_at = None if seconds is None else clock() + seconds
+        self.cancelled = False
+
+    def remaining(self) -> Optional[float]:
+        """Return the seconds left, never negative, or None without a deadline."""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - self.clock())
+
+    @property
+    def expired(self) -> bool:
+        """Whether the deadline has passed or the work was cancelled."""
+        if self.cancelled:
+            return True
+        return self.expires_at is not None and self.clock() >= self.expires_at
+
+    def cancel(self) -> None:
+        """Expire the deadline now, stopping the work at its next check."""
+        self.cancelled = True
+
+    def within(self, seconds: Optional[float]) -> "Deadline":
+        """
+        Return a deadline that is at most ``seconds`` away and no later than this one.
+
+        Args:
+            seconds: Upper bound for the new deadline, or None to keep this one.
+
+        Returns:
+            The earlier of the two deadlines.
+        """
+        if seconds is None:
+            return self
+
+        nested = Deadline(seconds, clock=self.clock)
+        if self.expires_at is not None and self.expires_at < nested.expires_at:
+            nested.expires_at = self.expires_at
+            nested.seconds = self.seconds
+        return nested
+
+    def timeout(self, limit: float) -> float:
+        """
+        Return a socket timeout that does not reach past the deadline.
+
+        Args:
+            limit: The timeout used when plenty of time is left.
+
+        Returns:
+            The smaller of ``limit`` and the remaining time.
+        """
+        remaining = self.remaining()
+        if remaining is None:
+            return limit
+        # Socket timeouts must be positive even if the deadline just passed.
+        return max(min(limit, remaining), 0.001)
+
+    def check(self, url: str) -> None:
+        """
+        Raise if the deadline has passed.
+
+        Args:
+            url: The URL being fetched, for the error message.
+
+        Raises:
+            DeadlineExceeded: If the deadline has passed.
+        """
+        if self.expired:
+            raise DeadlineExceeded(url, None if self.cancelled else self.seconds)
+
+
+@dataclass(frozen=True)
+class FetchedPage:
+    """A downloaded page."""
+
+    url: str
+    status_code: int
+    headers: Mapping[str, str]
+    content: bytes
+
+    @property
+    def content_type(self) -> Optional[str]:
+        """The ``Content-Type`` header, looked up case-insensitively."""
+        return next((value for name, value in self.headers.items() if name.lower() == "content-type"), None)
+
+
+def _read_body(response, deadline: Deadline, url: str, chunk_size: int) -> bytes:
+    """Read a streamed response body, checking the deadline between reads."""
+    raw = response.raw
+    raw.decode_content = True
+    # read1 returns as soon as any data arrives, so a slow server cannot hold a
+    # single read open until a full chunk has trickled in.
+    read = getattr(raw, "read1", None) or raw.read
+
+    chunks = []
+    while True:
+        deadline.check(url)
+        chunk = read(chunk_size)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def fetch_page(
+    url: str,
+    deadline: Deadline,
+    headers: Optional[Dict[str, str]] = None,
+    connect_timeout: float = 10,
+    read_timeout: float = 30,
+    max_redirects: int = 10,
+    chunk_size: int = 65536,
+    on_headers: Optional[Callable[[], None]] = None,
+) -> FetchedPage:
+    """
+    Download a page within a total deadline.
+
+    Redirects are followed one request at a time so the deadline covers every
+    hop, and the body is streamed so the deadline is checked between reads.
+    Socket timeouts are capped by the remaining time, so a fetch overruns its
+    deadline by at most one blocked read.
+
+    Args:
+        url: The page URL.
+        deadline: The deadline for the whole fetch.
+        headers: Optional request headers.
+        connect_timeout: Connect timeout per request in seconds.
+        read_timeout: Timeout per socket read in seconds.
+        max_redirects: Maximum number of redirects to follow.
+        chunk_size: Maximum bytes per body read.
+        on_headers: Optional function called when the first response headers
+            arrive, including those of a redirect.
+
+    Returns:
+        The downloaded page.
+
+    Raises:
+        DeadlineExceeded: If the deadline passes before the body is read.
+        requests.exceptions.RequestException: If a request fails.
+    """
+    current_url = url
+    for _ in range(max_redirects + 1):
+        deadline.check(current_url)
+        response = requests.get(
+            current_url,
+            headers=headers,
+            timeout=(deadline.timeout(connect_timeout), deadline.timeout(read_timeout)),
+            stream=True,
+            allow_redirects=False,
+        )
+        if on_headers is not None:
+            on_headers()
+            on_headers = None
+        try:
+            if response.is_redirect:
+                current_url = urljoin(current_url, response.headers["location"])
+                continue
+
+            response.raise_for_status()
+            content = _read_body(response, deadline, current_url, chunk_size)
+            return FetchedPage(
+                url=current_url,
+                status_code=response.status_code,
+                headers=dict(response.headers),
+                content=content,
+            )
+        finally:
+            response.close()
+
+    raise requests.exceptions.TooManyRedirects(f"Exceeded {max_redirects} redirects fetching {url}")
+
+
+def resolve_redirects(
+    url: str,
+    deadline: Deadline,
+    headers: Optional[Dict[str, str]] = None,
+    connect_timeout: float = 10,
+    read_timeout: float = 30,
+    max_redirects: int = 10,
+) -> str:
+    """
+    Follow a URL's redirect chain without downloading the final page.
+
+    Each hop is a HEAD request, so redirectors such as feed proxies, link
+    shorteners and newsletter trackers are resolved without fetching a body.
+
+    Args:
+        url: The URL to resolve.
+        deadline: The deadline for the whole chain.
+        headers: Optional request headers.
+        connect_timeout: Connect timeout per request in seconds.
+        read_timeout: Read timeout per request in seconds.
+        max_redirects: Maximum number of redirects to follow.
+
+    Returns:
+        The URL the chain ends at.
+
+    Raises:
+        DeadlineExceeded: If the deadline passes before the chain ends.
+        requests.exceptions.RequestException: If a request fails.
+    """
+    current_url = url
+    for _ in range(max_redirects + 1):
+        deadline.check(current_url)
+        response = requests.head(
+            current_url,
+            headers=headers,
+            timeout=(deadline.timeout(connect_timeout), deadline.timeout(read_timeout)),
+            allow_redirects=False,
+        )
+        try:
+            if not response.is_redirect:
+                return current_url
+            current_url = urljoin(current_url, response.headers["location"])
+        finally:
+            response.close()
+
+    raise requests.exceptions.TooManyRedirects(f"Exceeded {max_redirects} redirects resolving {url}")
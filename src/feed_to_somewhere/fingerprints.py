@@ -0,0 +1,268 @@
+"""Near-duplicate detection with SimHash fingerprints for Feed to Somewhere."""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+FINGERPRINT_BITS = 64
+BANDS = 4
+BAND_BITS = FINGERPRINT_BITS // BANDS
+SHINGLE_WORDS = 3
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def _shingle_hash(shingle: str) -> int:
+    """Hash a shingle to 64 bits."""
+    return int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(words: List[str]) -> int:
+    """
+    Compute the 64-bit SimHash of a text's word shingles.
+
+    Texts that share most of their three-word shingles get fingerprints that
+    differ in only a few bits, so small edits, boilerplate and tracking
+    parameters barely move the fingerprint.
+
+    Args:
+        words: The lowercased words of the text.
+
+    Returns:
+        The fingerprint.
+    """
+    weights = [0] * FINGERPRINT_BITS
+    shingles = {" ".join(words[index:index + SHINGLE_WORDS]) for index in range(len(words) - SHINGLE_WORDS + 1)}
+    for shingle in shingles:
+        value = _shingle_hash(shingle)
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def hamming_distance(first: int, second: int) -> int:
+    """Return the number of bits in which two fingerprints differ."""
+    return bin(first ^ second).count("1")
+
+
+def _bands(fingerprint: int) -> List[int]:
+    """Split a fingerprint into its bands."""
+    mask = (1 << BAND_BITS) - 1
+    return [fingerprint >> (band * BAND_BITS) & mask for band in range(BANDS)]
+
+
+def _to_signed(fingerprint: int) -> int:
+    """Convert a fingerprint to the signed 64-bit range SQLite stores."""
+    return fingerprint - (1 << FINGERPRINT_BITS) if fingerprint >= 1 << (FINGERPRINT_BITS - 1) else fingerprint
+
+
+class FingerprintIndex:
+    """
+    Remember body fingerprints and find near-duplicates by Hamming distance.
+
+    Fingerprints are split into four 16-bit bands, each indexed in SQLite. Two
+    fingerprints at most three bits apart agree on at least one whole band, so
+    a lookup only compares the candidates sharing a band instead of every
+    stored fingerprint. Fingerprints are scoped per data source, since the same
+    story may belong in several.
+    """
+
+    FILE_NAME = "fingerprints.db"
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS fingerprints (
+            scope TEXT NOT NULL,
+            link TEXT NOT NULL,
+            fingerprint INTEGER NOT NULL,
+            band0 INTEGER NOT NULL,
+            band1 INTEGER NOT NULL,
+            band2 INTEGER NOT NULL,
+            band3 INTEGER NOT NULL,
+            added_at REAL NOT NULL,
+            PRIMARY KEY (scope, link)
+        )
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_distance: int = 3,
+        min_words: int = 50,
+        retention_days: float = 30,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize the index.
+
+        Args:
+            path: The SQLite database file.
+            max_distance: Largest Hamming distance counted as a near-duplicate,
+                at most three.
+            min_words: Bodies with fewer words are not fingerprinted, since
+                short texts collide too easily.
+            retention_days: Fingerprints older than this are forgotten.
+            clock: Time source returning epoch seconds.
+        """
+        if not 0 <= max_distance < BANDS:
+            raise ValueError(f"max_distance must be between 0 and {BANDS - 1}")
+        if min_words < SHINGLE_WORDS:
+            raise ValueError(f"min_words must be at least {SHINGLE_WORDS}")
+
+        self.path = path
+        self.max_distance = max_distance
+        self.min_words = min_words
+        self.retention_days = retention_days
+        self.clock = clock
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._reserved: Dict[Tuple[str, str], int] = {}
+
+    @classmethod
+    def from_state_dir(cls, state_dir: str, **kwargs) -> "FingerprintIndex":
+        """Create an index stored in a state directory."""
+        return cls(os.path.join(state_dir, cls.FILE_NAME), **kwargs)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use, create the schema and drop expired fingerprints."""
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(self.SCHEMA)
+            for band in range(BANDS):
+                connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS fingerprints_band{band} ON fingerprints (scope, band{band})"
+                )
+            connection.execute(
+                "DELETE FROM fingerprints WHERE added_at < ?",
+                (self.clock() - self.retention_days * 86400,),
+            )
+            self._connection = connection
+        return self._connection
+
+    def fingerprint(self, text: str) -> Optional[int]:
+        """
+        Fingerprint a body.
+
+        Args:
+            text: The extracted body text.
+
+        Returns:
+            The fingerprint, or None if the body is too short to compare.
+        """
+        words = _WORD_PATTERN.findall(text.lower())
+        if len(words) < self.min_words:
+            return None
+        return simhash(words)
+
+    def _find_duplicate(self, fingerprint: int, link: str, scope: str) -> Optional[str]:
+        """Find a stored or reserved near-duplicate under another link. Caller holds the lock."""
+        candidates = self._connect().execute(
+            """
+            SELECT link, fingerprint FROM fingerprints
+            WHERE scope = ? AND link != ?
+                AND (band0 = ? OR band1 = ? OR band2 = ? OR band3 = ?)
+            """,
+            (scope, link, *_bands(fingerprint)),
+        ).fetchall()
+        candidates.extend(
+            (reserved_link, reserved)
+            for (reserved_scope, reserved_link), reserved in self._reserved.items()
+            if reserved_scope == scope and reserved_link != link
+        )
+
+        for candidate_link, candidate in candidates:
+            if hamming_distance(fingerprint, candidate % (1 << FINGERPRINT_BITS)) <= self.max_distance:
+                return candidate_link
+        return None
+
+    def check(self, fingerprint: int, link: str, scope: str = "") -> Optional[str]:
+        """
+        Find a near-duplicate of a fingerprint.
+
+        Args:
+            fingerprint: The body fingerprint.
+            link: The entry link. Earlier fingerprints of the same link are not
+                counted as duplicates.
+            scope: The data source the entry is written to.
+
+        Returns:
+            The link of the near-duplicate, or None if the entry is new.
+        """
+        with self._lock:
+            return self._find_duplicate(fingerprint, link, scope)
+
+    def reserve(self, fingerprint: int, link: str, scope: str = "") -> Optional[str]:
+        """
+        Find a near-duplicate of a fingerprint, or reserve it while the entry is written.
+
+        The lookup and the reservation happen under one lock, so of two
+        near-duplicates checked at the same time in this process only one is
+        let through. Confirm a reservation with :meth:`add` once the entry is
+        written, or drop it with :meth:`release` if the write failed.
+
+        Args:
+            fingerprint: The body fingerprint.
+            link: The entry link. Earlier fingerprints of the same link are not
+                counted as duplicates.
+            scope: The data source the entry is written to.
+
+        Returns:
+            The link of the near-duplicate, or None if the fingerprint was reserved.
+        """
+        with self._lock:
+            duplicate_of = self._find_duplicate(fingerprint, link, scope)
+            if duplicate_of is None:
+                self._reserved[(scope, link)] = fingerprint
+            return duplicate_of
+
+    def release(self, link: str, scope: str = "") -> None:
+        """
+        Drop the reservation of an entry whose write failed.
+
+        Args:
+            link: The entry link.
+            scope: The data source the entry was to be written to.
+        """
+        with self._lock:
+            self._reserved.pop((scope, link), None)
+
+    def add(self, fingerprint: int, link: str, scope: str = "") -> None:
+        """
+        Remember the fingerprint of a written entry and drop its reservation.
+
+        Only entries that were written are added, so an entry whose write failed
+        is not skipped as a near-duplicate of itself under another link on the
+        next run.
+
+        Args:
+            fingerprint: The body fingerprint.
+            link: The entry link. An earlier fingerprint of the link is replaced.
+            scope: The data source the entry was written to.
+        """
+        with self._lock:
+            try:
+                self._connect().execute(
+                    """
+                    INSERT OR REPLACE INTO fingerprints
+                        (scope, link, fingerprint, band0, band1, band2, band3, added_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (scope, link, _to_signed(fingerprint), *_bands(fingerprint), self.clock()),
+                )
+            finally:
+                self._reserved.pop((scope, link), None)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
@@ -0,0 +1,177 @@
+"""Hedged article fetches for Feed to Somewhere."""
+
+import collections
+import concurrent.futures
+import copy
+import math
+import threading
+import time
+from typing import Callable, Deque, Dict, Optional
+
+from .fetching import Deadline, FetchedPage, fetch_page
+from .metrics import RunStats
+
+
+class HedgePolicy:
+    """
+    Decide when a slow article fetch gets a second, competing request.
+
+    The hedge delay is a percentile of recently observed times to the first
+    response headers, so only the slowest fetches are hedged. A budget caps
+    hedges at a fraction of all fetches, which keeps the extra load small even
+    when a whole origin slows down.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        budget: float = 0.05,
+        min_samples: int = 20,
+        min_delay: float = 0.05,
+        window: int = 500,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            percentile: Percentile of header latencies after which a fetch is hedged.
+            budget: Maximum hedges as a fraction of all fetches.
+            min_samples: Latencies to observe before hedging starts.
+            min_delay: Lower bound for the hedge delay in seconds.
+            window: Number of recent latencies the percentile is taken over.
+            clock: Monotonic time source.
+        """
+        if not 0 < percentile < 100:
+            raise ValueError("percentile must be between 0 and 100")
+        if not 0 <= budget <= 1:
+            raise ValueError("budget must be between 0 and 1")
+        if min_samples <= 0:
+            raise ValueError("min_samples must be a positive integer")
+
+        self.percentile = percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.clock = clock
+        self.stats = RunStats()
+        self._latencies: Deque[float] = collections.deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record_latency(self, seconds: float) -> None:
+        """
+        Record the time a fetch took to receive its first response headers.
+
+        Args:
+            seconds: The observed latency.
+        """
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def delay(self) -> Optional[float]:
+        """
+        Return how long to wait for headers before hedging.
+
+        Returns:
+            The hedge delay in seconds, or None while too few latencies are known.
+        """
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            latencies = sorted(self._latencies)
+
+        index = min(len(latencies) - 1, math.ceil(len(latencies) * self.percentile / 100) - 1)
+        return max(self.min_delay, latencies[index])
+
+    def start_fetch(self) -> None:
+        """Count a fetch towards the hedge budget."""
+        self.stats.increment("fetches")
+
+    def try_acquire(self) -> bool:
+        """
+        Take a hedge from the budget.
+
+        Returns:
+            True if a hedge may be sent.
+        """
+        with self._lock:
+            hedges = self.stats.get("hedges")
+            if hedges + 1 > self.budget * self.stats.get("fetches"):
+                self.stats.increment("hedges_denied")
+                return False
+            self.stats.increment("hedges")
+            return True
+
+    def snapshot(self) -> Dict[str, int]:
+        """Return the fetch, hedge, denied-hedge and winning-hedge counts."""
+        return self.stats.snapshot()
+
+
+def hedged_fetch_page(
+    url: str,
+    deadline: Deadline,
+    policy: HedgePolicy,
+    executor: concurrent.futures.Executor,
+    headers: Optional[Dict[str, str]] = None,
+    alternate_url: Optional[str] = None,
+) -> FetchedPage:
+    """
+    Download a page, sending a second request if the first is slow to respond.
+
+    The first request runs on ``executor``. If it has neither produced response
+    headers nor finished within the policy's hedge delay, and the hedge budget
+    allows it, a second request for ``alternate_url`` (or the same URL) starts.
+    The first request to download its page wins and the other one is cancelled
+    at its next deadline check.
+
+    Args:
+        url: The page URL.
+        deadline: The deadline shared by both requests.
+        policy: The hedging policy.
+        executor: Executor running the requests.
+        headers: Optional request headers.
+        alternate_url: Optional other URL of the same page to hedge with.
+
+    Returns:
+        The downloaded page.
+
+    Raises:
+        DeadlineExceeded: If the deadline passes before any request finishes.
+        requests.exceptions.RequestException: If every request fails.
+    """
+    policy.start_fetch()
+    started_at = policy.clock()
+    responded = threading.Event()
+
+    def on_headers() -> None:
+        policy.record_latency(policy.clock() - started_at)
+        responded.set()
+
+    primary_deadline = copy.copy(deadline)
+    primary = executor.submit(fetch_page, url, primary_deadline, headers=headers, on_headers=on_headers)
+    primary.add_done_callback(lambda _: responded.set())
+    attempts = {primary: primary_deadline}
+
+    delay = policy.delay()
+    if delay is not None and not responded.wait(deadline.timeout(delay)) and policy.try_acquire():
+        hedge_deadline = copy.copy(deadline)
+        hedge = executor.submit(fetch_page, alternate_url or url, hedge_deadline, headers=headers)
+        attempts[hedge] = hedge_deadline
+
+    errors: Dict[concurrent.futures.Future, BaseException] = {}
+    pending = set(attempts)
+    while pending:
+        done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+        for future in done:
+            error = future.exception()
+            if error is not None:
+                errors[future] = error
+                continue
+
+            for other in pending:
+                attempts[other].cancel()
+            if future is not primary:
+                policy.stats.increment("hedge_wins")
+            return future.result()
+
+    raise errors.get(primary) or next(iter(errors.values()))
@@ -1,16 +1,144 @@
 """Logging configuration for Feed to Somewhere."""
 
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
+import queue
 import sys
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Mapping, Optional, TextIO
 
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 
-def setup_logger(name: str = "feed_to_somewhere", level: int = logging.INFO) -> logging.Logger:
+# Pass as ``extra`` on noisy per-entry messages so they can be sampled.
+SAMPLED = {"sampled": True}
+
+_listeners: Dict[str, logging.handlers.QueueListener] = {}
+_listeners_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Format a record as JSON.
+
+        Args:
+            record: The log record.
+
+        Returns:
+            The JSON line.
+        """
+        payload = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exception"] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False)
+
+
+class LevelSampler(logging.Filter):
+    """
+    Keep a fixed share of sampled records per level.
+
+    Only records logged with ``extra=SAMPLED`` are sampled; everything else
+    passes. Sampling is deterministic: a rate of 0.1 keeps every tenth record.
+    """
+
+    def __init__(self, rates: Mapping[int, float]):
+        """
+        Initialize the sampler.
+
+        Args:
+            rates: Share of sampled records to keep, by level number.
+        """
+        super().__init__()
+        self._every: Dict[int, int] = {}
+        for level, rate in rates.items():
+            if not 0 <= rate <= 1:
+                raise ValueError("sample rates must be between 0 and 1")
+            self._every[level] = 0 if rate == 0 else max(1, round(1 / rate))
+        self._counts: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Return whether the record should be logged."""
+        every = self._every.get(record.levelno, 1)
+        if every == 1 or not getattr(record, "sampled", False):
+            return True
+        if every == 0:
+            return False
+
+        with self._lock:
+            count = self._counts.get(record.levelno, 0)
+            self._counts[record.levelno] = count + 1
+        return count % every == 0
+
+
+class _DeferredFormatQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue records for the listener thread without formatting them.
+
+    The message is merged with its arguments here, so later changes to the
+    arguments cannot leak into the log, but timestamps, layout and JSON encoding
+    are left to the listener's formatter.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _stop_listener(name: str) -> None:
+    """Stop a logger's listener after it has written every queued record."""
+    with _listeners_lock:
+        listener = _listeners.pop(name, None)
+    if listener is not None:
+        listener.stop()
+
+
+def shutdown_logging() -> None:
+    """Write every queued record and stop all listener threads."""
+    with _listeners_lock:
+        names = list(_listeners)
+    for name in names:
+        _stop_listener(name)
+
+
+def setup_logger(
+    name: str = "feed_to_somewhere",
+    level: int = logging.INFO,
+    json_format: bool = False,
+    sample_rates: Optional[Mapping[int, float]] = None,
+    stream: Optional[TextIO] = None,
+) -> logging.Logger:
     """
     Set up and configure a logger.
 
+    Records are put on an in-memory queue and written by a listener thread, so
+    worker threads never wait on the output stream.
+
     Args:
         name: The name of the logger.
         level: The logging level.
+        json_format: Whether to write one JSON object per line instead of text.
+        sample_rates: Optional share of per-entry messages to keep, by level.
+        stream: The output stream. Defaults to stdout.
 
     Returns:
         A configured logger instance.
@@ -19,21 +147,33 @@ def setup_logger(name: str = "feed_to_somewhere", level: int = logging.INFO) ->
     logger.setLevel(level)
     logger.propagate = False
 
-    formatter = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    )
+    formatter = JsonFormatter() if json_format else logging.Formatter(TEXT_FORMAT)
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(formatter)
 
-    # Create console handler if not already added
+    # Create the queue handler if not already added
     if not logger.handlers:
-        handler = logging.StreamHandler(sys.stdout)
+        handler = _DeferredFormatQueueHandler(queue.SimpleQueue())
         logger.addHandler(handler)
     else:
         handler = logger.handlers[0]
 
     handler.setLevel(level)
-    handler.setFormatter(formatter)
+
+    for existing in [f for f in logger.filters if isinstance(f, LevelSampler)]:
+        logger.removeFilter(existing)
+    if sample_rates:
+        logger.addFilter(LevelSampler(sample_rates))
+
+    _stop_listener(name)
+    listener = logging.handlers.QueueListener(handler.queue, output)
+    with _listeners_lock:
+        _listeners[name] = listener
+    listener.start()
     return logger
 
 
+atexit.register(shutdown_logging)
+
 # Create a default logger instance
 logger = setup_logger()
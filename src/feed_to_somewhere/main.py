@@ -1,14 +1,39 @@
 """Main entry point for Feed to Somewhere."""
 
+import os
 import sys
+import time
 import argparse
-from typing import List, Optional
+import logging
+from typing import List, Optional, Tuple
 
 from . import __version__
+from .claims import ClaimLedger
+from .concurrency import AdaptiveLimiter
 from .config import config
+from .content_policy import ContentPolicy
+from .feed_health import FeedHealthStore
+from .feed_sources import FeedSource
+from .fingerprints import FingerprintIndex
 from .logger import logger, setup_logger
 from .notion_client import NotionClient
+from .profiling import PipelineProfiler
+from .redirects import RedirectCache
+from .routing import RoutingRule
 from .feed_processor import FeedProcessor
+from .hedging import HedgePolicy
+from .sharding import ShardSpec, run_shard_processes
+from .shutdown import PendingEntryJournal, ShutdownController
+from .sinks import PlanSink, build_sink
+from .work_queue import WorkQueue
+
+LOG_LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL,
+}
 
 
 def positive_int(value: str) -> int:
@@ -19,6 +44,63 @@ def positive_int(value: str) -> int:
     return parsed_value
 
 
+def non_negative_int(value: str) -> int:
+    """Parse an argparse integer value and reject negative inputs."""
+    parsed_value = int(value)
+    if parsed_value < 0:
+        raise argparse.ArgumentTypeError("must be a non-negative integer")
+    return parsed_value
+
+
+def non_negative_float(value: str) -> float:
+    """Parse an argparse number and reject negative inputs."""
+    parsed_value = float(value)
+    if parsed_value < 0:
+        raise argparse.ArgumentTypeError("must be a non-negative number")
+    return parsed_value
+
+
+def positive_float(value: str) -> float:
+    """Parse an argparse number and reject non-positive inputs."""
+    parsed_value = float(value)
+    if parsed_value <= 0:
+        raise argparse.ArgumentTypeError("must be a positive number")
+    return parsed_value
+
+
+def percentile(value: str) -> float:
+    """Parse an argparse percentile strictly between 0 and 100."""
+    parsed_value = float(value)
+    if not 0 < parsed_value < 100:
+        raise argparse.ArgumentTypeError("must be between 0 and 100")
+    return parsed_value
+
+
+def fraction(value: str) -> float:
+    """Parse an argparse fraction between 0 and 1."""
+    parsed_value = float(value)
+    if not 0 <= parsed_value <= 1:
+        raise argparse.ArgumentTypeError("must be between 0 and 1")
+    return parsed_value
+
+
+def log_sample(value: str) -> Tuple[int, float]:
+    """Parse an argparse ``LEVEL=RATE`` log sampling rule."""
+    level_name, separator, rate_text = value.partition("=")
+    level = LOG_LEVELS.get(level_name.strip().upper())
+    if not separator or level is None:
+        raise argparse.ArgumentTypeError("must look like INFO=0.1")
+    return level, fraction(rate_text)
+
+
+def routing_rule(value: str) -> RoutingRule:
+    """Parse an argparse ``DATA_SOURCE:FIELD=REGEX`` routing rule."""
+    try:
+        return RoutingRule.parse(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from exc
+
+
 def parse_args(args: Optional[List[str]] = None) -> argparse.Namespace:
     """
     Parse command line arguments.
@@ -59,11 +141,66 @@ def parse_args(args: Optional[List[str]] = None) -> argparse.Namespace:
         help="Maximum number of worker threads (default: 10)"
     )
 
+    parser.add_argument(
+        "--adaptive-concurrency",
+        action="store_true",
+        help="Adapt concurrent Notion requests and article fetches per host up to --max-workers, "
+             "backing off on 429, 5xx, timeouts and latency spikes"
+    )
+
+    parser.add_argument(
+        "--shard-index",
+        type=non_negative_int,
+        default=None,
+        help="Process only the feeds of this shard of the feed file, counting from 0; requires --shard-count"
+    )
+
+    parser.add_argument(
+        "--shard-count",
+        type=positive_int,
+        default=None,
+        help="Number of shards the feed file is split into across nodes"
+    )
+
+    parser.add_argument(
+        "--processes",
+        type=positive_int,
+        default=1,
+        help="Split this node's feeds over this many processes (default: 1)"
+    )
+
+    parser.add_argument(
+        "--process-shard",
+        default=None,
+        help=argparse.SUPPRESS
+    )
+
+    parser.add_argument(
+        "--work-queue",
+        default=None,
+        metavar="PATH",
+        help="Claim feeds from a shared SQLite work queue instead of reading the feed file"
+    )
+
+    parser.add_argument(
+        "--enqueue",
+        action="store_true",
+        help="Add the feeds of --feed-file or --feed-url to the --work-queue and exit"
+    )
+
+    parser.add_argument(
+        "--lease-seconds",
+        type=positive_float,
+        default=300.0,
+        metavar="SECONDS",
+        help="How long a claimed feed stays leased without renewal (default: 300)"
+    )
+
     parser.add_argument(
         "--max-feeds",
         type=positive_int,
         default=None,
-        help="Process at most this many feeds"
+        help="Process at most this many feeds, keeping those with the highest priority"
     )
 
     parser.add_argument(
@@ -73,20 +210,294 @@ def parse_args(args: Optional[List[str]] = None) -> argparse.Namespace:
         help="Process at most this many entries per feed"
     )
 
+    parser.add_argument(
+        "--time-budget",
+        type=positive_float,
+        default=None,
+        metavar="SECONDS",
+        help=(
+            "Finish the run within this many seconds: process entries of all feeds by priority "
+            "and newest first, and start no new work once the budget runs out"
+        )
+    )
+
+    parser.add_argument(
+        "--article-timeout",
+        type=positive_float,
+        default=60.0,
+        metavar="SECONDS",
+        help="Total time an article fetch may take, including redirects and the body (default: 60)"
+    )
+
+    parser.add_argument(
+        "--entry-timeout",
+        type=positive_float,
+        default=120.0,
+        metavar="SECONDS",
+        help="Total time extracting a single entry may take (default: 120)"
+    )
+
+    parser.add_argument(
+        "--hedge-percentile",
+        type=percentile,
+        default=None,
+        metavar="PERCENTILE",
+        help=(
+            "Send a second request for article fetches that have not received response headers "
+            "within this percentile of observed header latencies (e.g. 95)"
+        )
+    )
+
+    parser.add_argument(
+        "--hedge-budget",
+        type=fraction,
+        default=0.05,
+        metavar="FRACTION",
+        help="With --hedge-percentile, hedge at most this fraction of article fetches (default: 0.05)"
+    )
+
+    parser.add_argument(
+        "--grace-period",
+        type=non_negative_float,
+        default=30.0,
+        metavar="SECONDS",
+        help="On SIGTERM or SIGINT, let in-flight writes finish for this many seconds before exiting (default: 30)"
+    )
+
+    parser.add_argument(
+        "--min-content-length",
+        type=non_negative_int,
+        default=0,
+        help="Fetch the article page when feed content is shorter than this many characters (default: 0)"
+    )
+
+    parser.add_argument(
+        "--no-truncation-detection",
+        dest="detect_truncation",
+        action="store_false",
+        help="Keep feed content that ends in an ellipsis or a 'Read more' link"
+    )
+
+    parser.add_argument(
+        "--stream-feeds",
+        action="store_true",
+        help="Parse RSS and Atom feeds incrementally and stop reading once enough new entries are found"
+    )
+
     parser.add_argument(
         "--dry-run",
+        nargs="?",
+        const="fetch",
+        default=None,
+        choices=["fetch", "extract"],
+        help=(
+            "Run without writing anything. 'fetch' (the default) only reads feeds and logs "
+            "the entries; 'extract' also extracts and chunks every entry and reports the "
+            "Notion writes a real run would make"
+        )
+    )
+
+    parser.add_argument(
+        "--route",
+        action="append",
+        dest="routes",
+        type=routing_rule,
+        default=[],
+        metavar="DATA_SOURCE:FIELD=REGEX",
+        help=(
+            "Also write entries whose title, link or feed matches REGEX to DATA_SOURCE, "
+            "such as team_b:title=(?i)kubernetes. Can be specified multiple times"
+        )
+    )
+
+    parser.add_argument(
+        "--sink",
+        action="append",
+        dest="sinks",
+        default=[],
+        metavar="SPEC",
+        help=(
+            "Write entries to a sink: notion, jsonl:PATH, sqlite:PATH or webhook:URL. "
+            "Can be specified multiple times (default: notion)"
+        )
+    )
+
+    parser.add_argument(
+        "--update-existing",
+        action="store_true",
+        help="Update existing Notion pages whose content changed instead of skipping them"
+    )
+
+    parser.add_argument(
+        "--state-dir",
+        type=str,
+        default=config.state_dir,
+        help="Directory for persistent run state such as feed health (default: value from STATE_DIR)"
+    )
+
+    parser.add_argument(
+        "--claim-ledger",
+        default=None,
+        metavar="PATH",
+        help="SQLite file shared by all processes writing to Notion, so only one creates each page "
+             "(default: claims.db in --state-dir)"
+    )
+
+    parser.add_argument(
+        "--skip-near-duplicates",
+        action="store_true",
+        help="Skip entries whose extracted body nearly matches one already written under another link, "
+             "such as AMP pages, mirrors and syndicated copies"
+    )
+
+    parser.add_argument(
+        "--near-duplicate-distance",
+        type=int,
+        choices=range(4),
+        default=3,
+        metavar="BITS",
+        help="Largest number of differing fingerprint bits, 0 to 3, counted as a near-duplicate (default: 3)"
+    )
+
+    parser.add_argument(
+        "--fingerprint-index",
+        default=None,
+        metavar="PATH",
+        help="SQLite file of body fingerprints for --skip-near-duplicates (default: fingerprints.db in --state-dir)"
+    )
+
+    parser.add_argument(
+        "--resolve-redirects",
         action="store_true",
-        help="Validate feeds and log what would be processed without writing to Notion"
+        help="Follow entry links through redirectors and store entries under the canonical URL, "
+             "caching resolved links in --state-dir"
+    )
+
+    parser.add_argument(
+        "--redirect-cache-ttl",
+        type=positive_float,
+        default=168.0,
+        metavar="HOURS",
+        help="How long a resolved entry link is trusted before it is resolved again (default: 168)"
+    )
+
+    parser.add_argument(
+        "--health-report",
+        action="store_true",
+        help="Print the recorded feed health from --state-dir and exit"
+    )
+
+    parser.add_argument(
+        "--profile",
+        type=str,
+        default=None,
+        metavar="DIR",
+        help="Profile the fetch, extract and write stages and write the report to DIR "
+        "(from Python 3.12 on, one cProfile profile covers the whole run instead of each stage)"
+    )
+
+    parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        help="With --profile, also record peak traced memory per stage and the top allocation sites"
     )
 
     parser.add_argument(
         "--log-level",
-        choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
+        choices=list(LOG_LEVELS),
         default="INFO",
         help="Set the logging level (default: INFO)"
     )
 
-    return parser.parse_args(args)
+    parser.add_argument(
+        "--log-format",
+        choices=["text", "json"],
+        default="text",
+        help="Write log lines as text or as one JSON object per line (default: text)"
+    )
+
+    parser.add_argument(
+        "--log-sample",
+        type=log_sample,
+        action="append",
+        default=[],
+        metavar="LEVEL=RATE",
+        help="Keep only this share of per-entry log messages at a level, e.g. INFO=0.1; can be repeated"
+    )
+
+    parsed_args = parser.parse_args(args)
+
+    if (parsed_args.shard_index is None) != (parsed_args.shard_count is None):
+        parser.error("--shard-index and --shard-count must be used together")
+    if parsed_args.shard_count is not None and parsed_args.shard_index >= parsed_args.shard_count:
+        parser.error("--shard-index must be smaller than --shard-count")
+    if parsed_args.enqueue and not parsed_args.work_queue:
+        parser.error("--enqueue requires --work-queue")
+    if parsed_args.processes > 1 and parsed_args.feed_urls and not parsed_args.work_queue:
+        parser.error("--processes only splits the feed file and cannot be combined with --feed-url")
+    if parsed_args.processes > 1 and parsed_args.work_queue and parsed_args.state_dir:
+        # Queued feeds move between processes, so per-process state directories
+        # would each hold part of a feed's history, and the state files cannot
+        # be shared between processes.
+        parser.error(
+            "--processes cannot be combined with --work-queue and a state directory, because queued "
+            "feeds move between processes and their state would be split; run one process per state "
+            "directory, or pass --state-dir ''"
+        )
+
+    return parsed_args
+
+
+def build_shards(parsed_args: argparse.Namespace) -> List[ShardSpec]:
+    """
+    Build the node and process shards selected on the command line.
+
+    Args:
+        parsed_args: The parsed command line arguments.
+
+    Returns:
+        The shards this process owns, node shard first.
+    """
+    shards = []
+    if parsed_args.shard_count is not None:
+        shards.append(ShardSpec(parsed_args.shard_index, parsed_args.shard_count))
+    if parsed_args.process_shard:
+        shards.append(ShardSpec.parse(parsed_args.process_shard, salt="process"))
+    return shards
+
+
+def enqueue_feeds(parsed_args: argparse.Namespace) -> int:
+    """
+    Add the selected feeds to the work queue.
+
+    Args:
+        parsed_args: The parsed command line arguments.
+
+    Returns:
+        Exit code (0 if any feed was enqueued, 1 otherwise).
+    """
+    if parsed_args.feed_urls:
+        sources = [FeedSource(url=url) for url in parsed_args.feed_urls]
+    else:
+        reader = FeedProcessor(sinks=[], shards=build_shards(parsed_args))
+        sources = reader.read_feed_sources(parsed_args.feed_file)
+    if parsed_args.max_feeds is not None:
+        # sorted() is stable, so feeds with equal priority keep their file order.
+        sources = sorted(sources, key=lambda source: -source.priority)[:parsed_args.max_feeds]
+
+    if not sources:
+        logger.warning("No feeds to enqueue")
+        return 1
+
+    work_queue = WorkQueue(parsed_args.work_queue, lease_seconds=parsed_args.lease_seconds)
+    try:
+        enqueued = work_queue.enqueue(sources)
+        counts = ", ".join(f"{state}={count}" for state, count in sorted(work_queue.counts().items()))
+    finally:
+        work_queue.close()
+
+    logger.info("Enqueued %s feeds in %s (%s)", enqueued, parsed_args.work_queue, counts)
+    return 0
 
 
 def main(args: Optional[List[str]] = None) -> int:
@@ -102,42 +513,207 @@ def main(args: Optional[List[str]] = None) -> int:
     parsed_args = parse_args(args)
 
     # Set up logging with the specified level
-    log_level = getattr(sys.modules["logging"], parsed_args.log_level)
-    setup_logger(level=log_level)
+    setup_logger(
+        level=LOG_LEVELS[parsed_args.log_level],
+        json_format=parsed_args.log_format == "json",
+        sample_rates=dict(parsed_args.log_sample),
+    )
 
     try:
+        health_store = None
+        if parsed_args.state_dir:
+            health_store = FeedHealthStore.from_state_dir(parsed_args.state_dir)
+
+        if parsed_args.health_report:
+            if health_store is None:
+                logger.error("--health-report requires --state-dir or STATE_DIR")
+                return 1
+            print(health_store.format_report())
+            return 0
+
+        if parsed_args.enqueue:
+            return enqueue_feeds(parsed_args)
+
+        if parsed_args.dry_run:
+            # A dry run must not record streaming positions or feed health that
+            # would make the next real run skip the entries it only looked at.
+            health_store = None
+
+        claim_ledger_path = parsed_args.claim_ledger
+        if claim_ledger_path is None and parsed_args.state_dir:
+            claim_ledger_path = os.path.join(parsed_args.state_dir, ClaimLedger.FILE_NAME)
+
+        fingerprint_index_path = None
+        if parsed_args.skip_near_duplicates and not parsed_args.dry_run:
+            fingerprint_index_path = parsed_args.fingerprint_index
+            if fingerprint_index_path is None and parsed_args.state_dir:
+                fingerprint_index_path = os.path.join(parsed_args.state_dir, FingerprintIndex.FILE_NAME)
+            if fingerprint_index_path is None:
+                logger.error("--skip-near-duplicates requires --fingerprint-index, --state-dir or STATE_DIR")
+                return 1
+
+        if parsed_args.processes > 1:
+            argv = list(sys.argv[1:] if args is None else args)
+            if claim_ledger_path and not parsed_args.claim_ledger:
+                # Children get their own state directories but must share one ledger.
+                argv += ["--claim-ledger", claim_ledger_path]
+            if fingerprint_index_path and not parsed_args.fingerprint_index:
+                argv += ["--fingerprint-index", fingerprint_index_path]
+            return run_shard_processes(
+                argv,
+                parsed_args.processes,
+                state_dir=parsed_args.state_dir,
+                profile_dir=parsed_args.profile,
+            )
+
         if parsed_args.feed_urls:
-            logger.info(f"Processing {len(parsed_args.feed_urls)} feed URLs provided on the command line")
+            logger.info("Processing %s feed URLs provided on the command line", len(parsed_args.feed_urls))
 
         if parsed_args.dry_run:
-            logger.info("Running in dry-run mode; Notion will not be modified")
+            logger.info("Running in %s dry-run mode; Notion will not be modified", parsed_args.dry_run)
+
+        # Initialize the Notion client only when a Notion sink is requested.
+        notion_client = None
+        claim_ledger = None
+
+        def get_notion_client() -> NotionClient:
+            nonlocal notion_client, claim_ledger
+            if notion_client is None:
+                if claim_ledger_path:
+                    claim_ledger = ClaimLedger(claim_ledger_path)
+                notion_limiter = None
+                if parsed_args.adaptive_concurrency:
+                    notion_limiter = AdaptiveLimiter(initial_limit=4, max_limit=parsed_args.max_workers)
+                notion_client = NotionClient(
+                    update_existing=parsed_args.update_existing,
+                    claim_ledger=claim_ledger,
+                    limiter=notion_limiter,
+                )
+            return notion_client
+
+        plan_sink = None
+        sinks = []
+        if parsed_args.dry_run == "extract":
+            plan_sink = PlanSink(chunk_size=config.chunk_size, max_workers=parsed_args.max_workers)
+            sinks = [plan_sink]
+        elif not parsed_args.dry_run:
+            sinks = [
+                build_sink(spec, get_notion_client, max_workers=parsed_args.max_workers)
+                for spec in parsed_args.sinks or ["notion"]
+            ]
+
+        journal = None
+        if parsed_args.state_dir and not parsed_args.dry_run:
+            journal = PendingEntryJournal.from_state_dir(parsed_args.state_dir)
 
-        # Initialize the Notion client only when writes are enabled.
-        notion_client = None if parsed_args.dry_run else NotionClient()
+        shutdown = ShutdownController(grace_period=parsed_args.grace_period)
+        if health_store is not None:
+            shutdown.add_force_exit_hook(health_store.save)
+        if journal is not None:
+            shutdown.add_force_exit_hook(journal.save)
+
+        profiler = None
+        if parsed_args.profile:
+            profiler = PipelineProfiler(parsed_args.profile, trace_memory=parsed_args.profile_memory)
+
+        hedge_policy = None
+        if parsed_args.hedge_percentile is not None:
+            hedge_policy = HedgePolicy(percentile=parsed_args.hedge_percentile, budget=parsed_args.hedge_budget)
+
+        redirect_cache = None
+        if parsed_args.resolve_redirects and not parsed_args.dry_run:
+            # Without a state directory, links are still resolved but only cached for this run.
+            redirect_cache = RedirectCache(
+                os.path.join(parsed_args.state_dir, RedirectCache.FILE_NAME) if parsed_args.state_dir else ":memory:",
+                ttl=parsed_args.redirect_cache_ttl * 3600,
+            )
+
+        fingerprint_index = None
+        if fingerprint_index_path:
+            fingerprint_index = FingerprintIndex(
+                fingerprint_index_path,
+                max_distance=parsed_args.near_duplicate_distance,
+            )
 
         # Initialize the feed processor
         processor = FeedProcessor(
             notion_client=notion_client,
             max_workers=parsed_args.max_workers,
-            dry_run=parsed_args.dry_run,
+            dry_run=parsed_args.dry_run == "fetch",
             max_entries_per_feed=parsed_args.max_entries,
+            health_store=health_store,
+            sinks=sinks,
+            stream_feeds=parsed_args.stream_feeds,
+            profiler=profiler,
+            time_budget=parsed_args.time_budget,
+            article_timeout=parsed_args.article_timeout,
+            entry_timeout=parsed_args.entry_timeout,
+            hedge_policy=hedge_policy,
+            shards=build_shards(parsed_args),
+            adaptive_concurrency=parsed_args.adaptive_concurrency,
+            routing_rules=parsed_args.routes,
+            fingerprint_index=fingerprint_index,
+            redirect_cache=redirect_cache,
+            shutdown=shutdown,
+            journal=journal,
+            content_policy=ContentPolicy(
+                min_length=parsed_args.min_content_length,
+                detect_truncation=parsed_args.detect_truncation,
+            ),
         )
 
+        work_queue = None
+        if parsed_args.work_queue:
+            work_queue = WorkQueue(parsed_args.work_queue, lease_seconds=parsed_args.lease_seconds)
+
         # Process feeds
-        if parsed_args.feed_urls:
-            success_count = processor.process_feed_urls(parsed_args.feed_urls, max_feeds=parsed_args.max_feeds)
-        else:
-            success_count = processor.process_feeds(parsed_args.feed_file, max_feeds=parsed_args.max_feeds)
+        started_at = time.monotonic()
+        shutdown.install()
+        try:
+            if work_queue is not None:
+                success_count = processor.process_work_queue(work_queue, max_feeds=parsed_args.max_feeds)
+            elif parsed_args.feed_urls:
+                success_count = processor.process_feed_urls(parsed_args.feed_urls, max_feeds=parsed_args.max_feeds)
+            else:
+                success_count = processor.process_feeds(parsed_args.feed_file, max_feeds=parsed_args.max_feeds)
+        finally:
+            processor.close()
+            if work_queue is not None:
+                work_queue.close()
+            if claim_ledger is not None:
+                claim_ledger.close()
+            if fingerprint_index is not None:
+                fingerprint_index.close()
+            if redirect_cache is not None:
+                redirect_cache.close()
+            if notion_client is not None:
+                notion_client.close()
+            if profiler is not None:
+                profiler.write_report()
+                profiler.close()
+            shutdown.complete()
+            shutdown.restore()
+
+        if shutdown.requested:
+            logger.warning("Run stopped early after %s", shutdown.reason)
+            return 1
+
+        if plan_sink is not None:
+            print(plan_sink.format_report(time.monotonic() - started_at))
+
+        if work_queue is not None and not processor.stats.get("feeds_claimed"):
+            logger.info("The work queue has no feeds left to claim")
+            return 0
 
         if success_count > 0:
-            logger.info(f"Successfully processed {success_count} feeds")
+            logger.info("Successfully processed %s feeds", success_count)
             return 0
         else:
             logger.warning("No feeds were successfully processed")
             return 1
 
     except Exception as e:
-        logger.error(f"An error occurred: {e}", exc_info=True)
+        logger.error("An error occurred: %s", e, exc_info=True)
         return 1
 
 
@@ -0,0 +1,38 @@
+"""Run metrics for Feed to Somewhere."""
+
+import threading
+from typing import Dict
+
+
+class RunStats:
+    """Thread-safe counters collected during a run."""
+
+    def __init__(self):
+        """Initialize an empty set of counters."""
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        """
+        Increase a counter.
+
+        Args:
+            name: The counter name.
+            amount: The amount to add.
+        """
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def get(self, name: str) -> int:
+        """Return the current value of a counter, or zero if it was never set."""
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def snapshot(self) -> Dict[str, int]:
+        """Return a copy of every counter."""
+        with self._lock:
+            return dict(self._counters)
+
+    def format_summary(self) -> str:
+        """Format every counter as ``name=value`` pairs in name order."""
+        return ", ".join(f"{name}={value}" for name, value in sorted(self.snapshot().items()))
@@ -1,44 +1,80 @@
 """Notion API client for Feed to Somewhere."""
 
+import functools
+import sqlite3
 import threading
-from typing import Any, Dict, Optional, Set
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
-from notion_client import Client
-from notion_client.errors import APIResponseError
+from .claims import ClaimLedger
+from .concurrency import AdaptiveLimiter
+from .config import config, require, require_one_of, split_tokens
+from .logger import SAMPLED, logger
+from .token_pool import TokenPool
+from .utils import chunk_text, content_hash, get_current_date_iso, lazy_import
 
-from .config import config, require, require_one_of
-from .logger import logger
-from .utils import chunk_text
+httpx = lazy_import("httpx")
+notion_sdk = lazy_import("notion_client")
 
 
 class NotionClient:
     """Client for interacting with the Notion API."""
 
+    CONTENT_HASH_PROPERTY = "Content Hash"
+    # Notion accepts at most 100 conditions in a compound filter.
+    EXISTENCE_BATCH_SIZE = 100
+
     def __init__(
         self,
         token: Optional[str] = None,
         database_id: Optional[str] = None,
         data_source_id: Optional[str] = None,
+        update_existing: bool = False,
+        claim_ledger: Optional[ClaimLedger] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
     ):
         """
         Initialize the Notion client.
 
         Args:
-            token: Notion API token. If None, uses the token from config.
+            token: Notion API token, or several separated by commas. If None,
+                uses the tokens from config. Requests are spread over the tokens
+                round-robin, and requests rate limited on one token are retried
+                on the others.
             database_id: Notion database ID. Used to resolve a child data source when
                 a data source ID is not provided.
-            data_source_id: Notion data source ID. Preferred over database_id.
+            data_source_id: Default Notion data source ID. Preferred over
+                database_id. Other data sources can be targeted per call; each
+                has its own cached schema and existence index, and all share one
+                HTTP connection pool.
+            update_existing: Whether to update existing pages whose content hash
+                changed instead of skipping them. Requires a rich text property
+                named ``Content Hash`` in the data source.
+            claim_ledger: Optional ledger shared with other processes writing to
+                the same data source, so only one of them creates a page per link.
+            limiter: Optional adaptive limit on concurrent Notion API requests.
         """
-        self.token = require(token or config.notion_token, "NOTION_API_KEY")
-        self.client = Client(auth=self.token)
+        self.tokens = split_tokens(token or config.notion_token)
+        self.token = require(self.tokens[0] if self.tokens else None, "NOTION_API_KEY")
+        # One connection pool for every token and data source; tokens are sent per request.
+        self.http = httpx.Client()
+        self.client = notion_sdk.Client(client=self.http)
+        self.token_pool = TokenPool(len(self.tokens))
+        self.limiter = limiter
         self.database_id = database_id or config.database_id
         self.data_source_id = self._resolve_data_source_id(
             data_source_id or config.notion_data_source_id,
             self.database_id,
         )
         self.chunk_size = config.chunk_size
-        self._pending_links: Set[str] = set()
+        self.update_existing = update_existing
+        self._pending_links: Set[Tuple[str, str]] = set()
         self._pending_links_lock = threading.Lock()
+        self.claim_ledger = claim_ledger
+        self._known_pages: Dict[Tuple[str, str], Dict[str, Optional[str]]] = {}
+        self._known_missing: Set[Tuple[str, str]] = set()
+        self._known_pages_lock = threading.Lock()
+        self._schemas: Dict[str, Dict[str, str]] = {}
+        self._schemas_lock = threading.Lock()
 
     def _resolve_data_source_id(
         self,
@@ -67,8 +103,8 @@ class NotionClient:
         )
 
         try:
-            database = self.client.databases.retrieve(database_id=resolved_database_id)
-        except APIResponseError as exc:
+            database = self._call("databases.retrieve", database_id=resolved_database_id)
+        except notion_sdk.APIResponseError as exc:
             raise ValueError(
                 f"Failed to retrieve Notion database '{resolved_database_id}' to resolve a data source ID"
             ) from exc
@@ -90,50 +126,286 @@ class NotionClient:
                 f"Notion database '{resolved_database_id}' returned an invalid data source payload"
             ) from exc
 
-    def _mark_link_pending(self, link: str) -> bool:
+    @staticmethod
+    def _is_overload(exc: Exception) -> bool:
+        """Whether an API error means Notion is rate limiting or overloaded."""
+        status = getattr(exc, "status", None)
+        if isinstance(status, int) and (status == 429 or status >= 500):
+            return True
+        return isinstance(exc, notion_sdk.errors.RequestTimeoutError)
+
+    @staticmethod
+    def _retry_after(exc: Exception) -> Optional[float]:
+        """Read the Retry-After seconds of a rate-limited response, if any."""
+        headers = getattr(exc, "headers", None) or {}
+        try:
+            return float(headers.get("retry-after"))
+        except (TypeError, ValueError):
+            return None
+
+    def _request(self, endpoint: str, **kwargs: Any) -> Any:
+        """
+        Send a request with the next token, failing over on rate limits.
+
+        Args:
+            endpoint: The API method path on the SDK client, such as ``pages.create``.
+            **kwargs: Arguments for the method.
+
+        Returns:
+            The API response.
         """
-        Track links currently being created to avoid duplicate writes in this process.
+        tried: List[int] = []
+        index = self.token_pool.next_index()
+        while True:
+            method = functools.reduce(getattr, endpoint.split("."), self.client)
+            try:
+                return method(auth=self.tokens[index], **kwargs)
+            except Exception as e:
+                if getattr(e, "status", None) != 429:
+                    raise
+                self.token_pool.throttle(index, self._retry_after(e))
+                tried.append(index)
+                index = self.token_pool.next_index(exclude=tried)
+                if index is None:
+                    raise
+                logger.debug("Notion token %d was rate limited; retrying %s with another token", tried[-1] + 1, endpoint)
+
+    def _call(self, endpoint: str, **kwargs: Any) -> Any:
+        """
+        Call a Notion API method within the adaptive concurrency limit.
+
+        Args:
+            endpoint: The API method path on the SDK client, such as ``pages.create``.
+            **kwargs: Arguments for the method.
+
+        Returns:
+            The API response.
+        """
+        if self.limiter is None:
+            return self._request(endpoint, **kwargs)
+
+        with self.limiter.slot() as permit:
+            try:
+                return self._request(endpoint, **kwargs)
+            except Exception as e:
+                if self._is_overload(e):
+                    permit.mark_overloaded()
+                raise
+
+    def _page_key(self, link: str, data_source_id: Optional[str] = None) -> Tuple[str, str]:
+        """Build the key identifying a link within a target data source."""
+        return (data_source_id or self.data_source_id, link)
+
+    def _mark_link_pending(self, link: str, data_source_id: Optional[str] = None) -> bool:
+        """
+        Track links currently being created to avoid duplicate writes.
+
+        Links are tracked in this process and, with a claim ledger, across all
+        processes sharing it. If the ledger fails, only this process is protected.
 
         Args:
             link: The page URL.
+            data_source_id: Target data source. Defaults to the client's data source.
 
         Returns:
             True when the link was marked, False when it is already pending.
         """
+        key = self._page_key(link, data_source_id)
         with self._pending_links_lock:
-            if link in self._pending_links:
+            if key in self._pending_links:
                 return False
 
-            self._pending_links.add(link)
+            self._pending_links.add(key)
+
+        if self.claim_ledger is None:
+            return True
+
+        try:
+            claimed = self.claim_ledger.try_claim("\0".join(key))
+        except sqlite3.Error as e:
+            logger.warning("Failed to claim '%s' in %s: %s", link, self.claim_ledger.path, e)
             return True
 
-    def _clear_pending_link(self, link: str) -> None:
-        """Release a link previously marked as pending."""
+        if not claimed:
+            with self._pending_links_lock:
+                self._pending_links.discard(key)
+        return claimed
+
+    def _clear_pending_link(self, link: str, data_source_id: Optional[str] = None, keep_claim: bool = False) -> None:
+        """
+        Release a link previously marked as pending.
+
+        Args:
+            link: The page URL.
+            data_source_id: Target data source. Defaults to the client's data source.
+            keep_claim: Whether to leave the ledger claim in place until it
+                expires, as done after creating the page. Other processes may
+                still believe the link is missing from an earlier batch check,
+                and the claim keeps them from creating it again.
+        """
+        key = self._page_key(link, data_source_id)
+        if self.claim_ledger is not None and not keep_claim:
+            try:
+                self.claim_ledger.release("\0".join(key))
+            except sqlite3.Error as e:
+                logger.warning("Failed to release '%s' in %s: %s", link, self.claim_ledger.path, e)
+
         with self._pending_links_lock:
-            self._pending_links.discard(link)
+            self._pending_links.discard(key)
 
-    def check_page_exists(self, link: str) -> Optional[bool]:
+    @classmethod
+    def _read_content_hash(cls, page: Dict[str, Any]) -> Optional[str]:
+        """
+        Read the stored content hash from a page payload.
+
+        Args:
+            page: A page object returned by the Notion API.
+
+        Returns:
+            The stored hash, or None when the page does not carry one.
+        """
+        prop = page.get("properties", {}).get(cls.CONTENT_HASH_PROPERTY) or {}
+        for item in prop.get("rich_text") or []:
+            text = item.get("plain_text") or item.get("text", {}).get("content")
+            if text:
+                return text
+        return None
+
+    def _remember_page(
+        self,
+        link: str,
+        page: Dict[str, Any],
+        data_source_id: Optional[str] = None,
+    ) -> None:
+        """Record the page ID and content hash found for a link."""
+        key = self._page_key(link, data_source_id)
+        with self._known_pages_lock:
+            self._known_missing.discard(key)
+            self._known_pages[key] = {
+                "id": page.get("id"),
+                "hash": self._read_content_hash(page),
+            }
+
+    def get_known_page(
+        self,
+        link: str,
+        data_source_id: Optional[str] = None,
+    ) -> Optional[Dict[str, Optional[str]]]:
+        """
+        Return the page ID and content hash last seen for a link.
+
+        Args:
+            link: The page URL.
+            data_source_id: Target data source. Defaults to the client's data source.
+
+        Returns:
+            A dict with ``id`` and ``hash`` keys, or None if the link is unknown.
+        """
+        with self._known_pages_lock:
+            return self._known_pages.get(self._page_key(link, data_source_id))
+
+    def find_existing_links(
+        self,
+        links: Iterable[str],
+        data_source_id: Optional[str] = None,
+    ) -> Optional[Set[str]]:
+        """
+        Check many links for existing pages with as few queries as possible.
+
+        Links are checked in groups of up to ``EXISTENCE_BATCH_SIZE`` using an
+        ``or`` compound filter. The outcome for every link is remembered, so later
+        calls to :meth:`check_page_exists` for these links need no query.
+
+        Args:
+            links: The URLs to check.
+            data_source_id: Target data source. Defaults to the client's data source.
+
+        Returns:
+            The subset of links that already have a page, or None if a query failed.
+        """
+        unique_links = list(dict.fromkeys(link for link in links if link))
+        existing_links: Set[str] = set()
+
+        try:
+            for start in range(0, len(unique_links), self.EXISTENCE_BATCH_SIZE):
+                batch = unique_links[start:start + self.EXISTENCE_BATCH_SIZE]
+                batch_links = set(batch)
+                query_filter = {
+                    "or": [{"property": "URL", "url": {"equals": link}} for link in batch]
+                }
+                start_cursor = None
+                while True:
+                    kwargs: Dict[str, Any] = {
+                        "data_source_id": data_source_id or self.data_source_id,
+                        "filter": query_filter,
+                        "page_size": 100,
+                    }
+                    if start_cursor:
+                        kwargs["start_cursor"] = start_cursor
+                    response = self._call("data_sources.query", **kwargs)
+
+                    for page in response.get("results", []):
+                        link = (page.get("properties", {}).get("URL") or {}).get("url")
+                        if link in batch_links:
+                            existing_links.add(link)
+                            self._remember_page(link, page, data_source_id)
+
+                    if not response.get("has_more"):
+                        break
+                    start_cursor = response.get("next_cursor")
+
+                with self._known_pages_lock:
+                    self._known_missing.update(
+                        self._page_key(link, data_source_id)
+                        for link in batch_links - existing_links
+                    )
+        except notion_sdk.APIResponseError as e:
+            logger.error("Failed to check existing pages: %s", e)
+            return None
+        except Exception as e:
+            logger.error("Unexpected error checking existing pages: %s", e)
+            return None
+
+        return existing_links
+
+    def check_page_exists(self, link: str, data_source_id: Optional[str] = None) -> Optional[bool]:
         """
         Check if a page with the specified URL exists in the database.
 
+        The page ID and content hash of a match are remembered so that update
+        mode can reuse them without another query. Links already checked by
+        :meth:`find_existing_links` are answered without a query.
+
         Args:
             link: The URL to check.
+            data_source_id: Target data source. Defaults to the client's data source.
 
         Returns:
             True if the page exists, False if it does not, or None if the
             existence check failed.
         """
+        key = self._page_key(link, data_source_id)
+        with self._known_pages_lock:
+            if key in self._known_pages:
+                return True
+            if key in self._known_missing:
+                return False
+
         try:
-            query = self.client.data_sources.query(
-                data_source_id=self.data_source_id,
+            query = self._call(
+                "data_sources.query",
+                data_source_id=data_source_id or self.data_source_id,
                 filter={"property": "URL", "url": {"equals": link}}
             )
-            return len(query.get("results", [])) > 0
-        except APIResponseError as e:
-            logger.error(f"Failed to check if page exists: {e}")
+            results = query.get("results", [])
+            if results:
+                self._remember_page(link, results[0], data_source_id)
+            return len(results) > 0
+        except notion_sdk.APIResponseError as e:
+            logger.error("Failed to check if page exists: %s", e)
             return None
         except Exception as e:
-            logger.error(f"Unexpected error checking if page exists: {e}")
+            logger.error("Unexpected error checking if page exists: %s", e)
             return None
 
     def add_text_chunks_to_page(self, page_id: str, text: str) -> bool:
@@ -151,7 +423,8 @@ class NotionClient:
 
         for chunk in chunks:
             try:
-                self.client.blocks.children.append(
+                self._call(
+                    "blocks.children.append",
                     block_id=page_id,
                     children=[
                         {
@@ -163,63 +436,345 @@ class NotionClient:
                         }
                     ],
                 )
-            except APIResponseError as e:
-                logger.error(f"Failed to add text chunk to page: {e}")
+            except notion_sdk.APIResponseError as e:
+                logger.error("Failed to add text chunk to page: %s", e)
                 return False
             except Exception as e:
-                logger.error(f"Unexpected error adding text chunk to page: {e}")
+                logger.error("Unexpected error adding text chunk to page: %s", e)
                 return False
 
         return True
 
-    def add_page(self, title: str, link: str, body: str, date: str) -> Optional[Dict[str, Any]]:
+    def clear_page_body(self, page_id: str) -> bool:
+        """
+        Remove every child block from a page.
+
+        Args:
+            page_id: The ID of the page to clear.
+
+        Returns:
+            True if all blocks were removed, False otherwise.
+        """
+        try:
+            block_ids: List[str] = []
+            start_cursor = None
+            while True:
+                kwargs: Dict[str, Any] = {"block_id": page_id, "page_size": 100}
+                if start_cursor:
+                    kwargs["start_cursor"] = start_cursor
+                response = self._call("blocks.children.list", **kwargs)
+                block_ids.extend(block["id"] for block in response.get("results", []))
+                if not response.get("has_more"):
+                    break
+                start_cursor = response.get("next_cursor")
+
+            for block_id in block_ids:
+                self._call("blocks.delete", block_id=block_id)
+            return True
+        except notion_sdk.APIResponseError as e:
+            logger.error("Failed to clear page body: %s", e)
+            return False
+        except Exception as e:
+            logger.error("Unexpected error clearing page body: %s", e)
+            return False
+
+    def get_schema(self, data_source_id: Optional[str] = None) -> Dict[str, str]:
+        """
+        Return the property types of a data source, retrieved once per run.
+
+        Args:
+            data_source_id: Target data source. Defaults to the client's data source.
+
+        Returns:
+            Property names mapped to their types, or an empty dict if the schema
+            could not be retrieved.
+        """
+        data_source_id = data_source_id or self.data_source_id
+        with self._schemas_lock:
+            schema = self._schemas.get(data_source_id)
+        if schema is not None:
+            return schema
+
+        try:
+            response = self._call("data_sources.retrieve", data_source_id=data_source_id)
+            properties = response.get("properties", {}) if isinstance(response, dict) else {}
+            schema = {
+                name: definition.get("type", "")
+                for name, definition in properties.items()
+                if isinstance(definition, dict)
+            }
+        except Exception as e:
+            logger.warning("Failed to retrieve the schema of data source '%s': %s", data_source_id, e)
+            schema = {}
+
+        with self._schemas_lock:
+            return self._schemas.setdefault(data_source_id, schema)
+
+    def _title_property(self, data_source_id: Optional[str] = None) -> str:
+        """Return the name of a data source's title property, ``Name`` if unknown."""
+        schema = self.get_schema(data_source_id)
+        return next((name for name, kind in schema.items() if kind == "title"), "Name")
+
+    def _build_properties(
+        self,
+        title: str,
+        link: str,
+        date: Optional[str],
+        page_hash: Optional[str],
+        data_source_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Build the Notion property payload for a feed entry, leaving out a missing date."""
+        properties: Dict[str, Any] = {
+            self._title_property(data_source_id): {"title": [{"text": {"content": title}}]},
+            "URL": {"url": link},
+        }
+        if date is not None:
+            properties["Date"] = {"date": {"start": date}}
+        if page_hash is not None:
+            properties[self.CONTENT_HASH_PROPERTY] = {
+                "rich_text": [{"text": {"content": page_hash}}]
+            }
+        return properties
+
+    def close(self) -> None:
+        """Close the shared HTTP connection pool."""
+        self.http.close()
+
+    @staticmethod
+    def build_content_hash(title: str, body: str, date: Optional[str]) -> str:
+        """
+        Build the hash stored on a page in update mode.
+
+        The value holds separate digests for the properties and the body so that
+        a changed title or date does not force the body to be rewritten.
+
+        Args:
+            title: The page title.
+            body: The page body.
+            date: The entry's own date in ISO format, or None if it has none.
+                The date a page was created with for an undated entry is not
+                part of the hash, so the hash does not change from day to day.
+
+        Returns:
+            The combined hash in ``<properties>.<body>`` form.
+        """
+        return f"{content_hash(title, date or '')}.{content_hash(body)}"
+
+    def update_page(
+        self,
+        page_id: str,
+        title: str,
+        link: str,
+        body: str,
+        date: Optional[str],
+        previous_hash: Optional[str] = None,
+        data_source_id: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Update an existing page when its content hash changed.
+
+        Args:
+            page_id: The ID of the page to update.
+            title: The title of the page.
+            link: The URL associated with the page.
+            body: The content of the page.
+            date: The entry's own date in ISO format (YYYY-MM-DD), or None to
+                keep the page's date.
+            previous_hash: The content hash currently stored on the page.
+            data_source_id: Data source holding the page. Defaults to the client's
+                data source.
+
+        Returns:
+            The updated page data, or None if nothing changed or the update failed.
+        """
+        outcome, page = self._update_page(page_id, title, link, body, date, previous_hash, data_source_id)
+        return page if outcome else None
+
+    def _update_page(
+        self,
+        page_id: str,
+        title: str,
+        link: str,
+        body: str,
+        date: Optional[str],
+        previous_hash: Optional[str],
+        data_source_id: Optional[str],
+    ) -> Tuple[Optional[bool], Optional[Dict[str, Any]]]:
+        """
+        Update an existing page and report whether anything was written.
+
+        Pages created before content hashes were stored carry no hash. They are
+        only stamped with the current hash, since rewriting every one of them
+        on the first update run would be expensive and their content is most
+        likely unchanged.
+
+        Returns:
+            True and the page if it was updated, None if nothing had to change
+            or only the missing hash was stored, and False if the update failed.
+        """
+        page_hash = self.build_content_hash(title, body, date)
+        if page_hash == previous_hash:
+            logger.info("Page for URL '%s' is unchanged.", link, extra=SAMPLED)
+            return None, None
+
+        try:
+            if previous_hash is None:
+                stamped_page = self._call(
+                    "pages.update",
+                    page_id=page_id,
+                    properties={self.CONTENT_HASH_PROPERTY: {"rich_text": [{"text": {"content": page_hash}}]}},
+                )
+                self._remember_page(link, stamped_page, data_source_id)
+                logger.info("Stored the content hash of page '%s'", title, extra=SAMPLED)
+                return None, stamped_page
+
+            previous_body_hash = previous_hash.partition(".")[2]
+            if page_hash.partition(".")[2] != previous_body_hash:
+                if not self.clear_page_body(page_id):
+                    logger.error("Failed to clear body content for page '%s'", title)
+                    return False, None
+
+                if not self.add_text_chunks_to_page(page_id, body):
+                    logger.error("Failed to replace body content for page '%s'", title)
+                    return False, None
+
+            # The hash is written last so a failed body replacement is retried next run.
+            updated_page = self._call(
+                "pages.update",
+                page_id=page_id,
+                properties=self._build_properties(title, link, date, page_hash, data_source_id),
+            )
+            self._remember_page(link, updated_page, data_source_id)
+
+            logger.info("Updated page '%s'", title, extra=SAMPLED)
+            return True, updated_page
+
+        except notion_sdk.APIResponseError as e:
+            logger.error("Failed to update page '%s'. Error: %s", title, e)
+            return False, None
+        except Exception as e:
+            logger.error("Unexpected error updating page '%s': %s", title, e)
+            return False, None
+
+    def add_page(
+        self,
+        title: str,
+        link: str,
+        body: str,
+        date: Optional[str],
+        data_source_id: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
         """
         Add a new page to Notion. Skip if it already exists.
 
+        In update mode an existing page is updated instead when its stored
+        content hash differs from the new content.
+
         Args:
             title: The title of the page.
             link: The URL to associate with the page.
             body: The content of the page.
-            date: The date to associate with the page in ISO format (YYYY-MM-DD).
+            date: The entry's own date in ISO format (YYYY-MM-DD), or None if
+                it has none. New pages of undated entries get today's date.
+            data_source_id: Target data source. Defaults to the client's data source.
 
         Returns:
             The created page data if successful, None otherwise.
         """
-        if not self._mark_link_pending(link):
-            logger.info(f"Page for URL '{link}' is already being created.")
-            return None
+        outcome, page = self._write_page(title, link, body, date, data_source_id)
+        return page if outcome else None
+
+    def write_page(
+        self,
+        title: str,
+        link: str,
+        body: str,
+        date: Optional[str],
+        data_source_id: Optional[str] = None,
+    ) -> Optional[bool]:
+        """
+        Create or, in update mode, update the page of an entry.
 
+        Args:
+            title: The title of the page.
+            link: The URL to associate with the page.
+            body: The content of the page.
+            date: The entry's own date in ISO format (YYYY-MM-DD), or None if
+                it has none.
+            data_source_id: Target data source. Defaults to the client's data source.
+
+        Returns:
+            True if a page was created or updated, None if the page already
+            exists and needs no change or is being created by another writer,
+            and False if the write failed.
+        """
+        return self._write_page(title, link, body, date, data_source_id)[0]
+
+    def _write_page(
+        self,
+        title: str,
+        link: str,
+        body: str,
+        date: Optional[str],
+        data_source_id: Optional[str],
+    ) -> Tuple[Optional[bool], Optional[Dict[str, Any]]]:
+        """Write the page of an entry and return the outcome and the page, as in :meth:`write_page`."""
+        if not self._mark_link_pending(link, data_source_id):
+            logger.info("Page for URL '%s' is already being created.", link, extra=SAMPLED)
+            return None, None
+
+        if self.claim_ledger is not None:
+            # Another process may have created the page since the batch check
+            # found it missing, so only a live query is trusted here.
+            with self._known_pages_lock:
+                self._known_missing.discard(self._page_key(link, data_source_id))
+
+        created = False
         try:
-            page_exists = self.check_page_exists(link)
+            page_exists = self.check_page_exists(link, data_source_id)
             if page_exists is None:
-                logger.error(f"Skipping page '{title}' because the duplicate check failed.")
-                return None
+                logger.error("Skipping page '%s' because the duplicate check failed.", title)
+                return False, None
 
             if page_exists:
-                logger.info(f"Page for URL '{link}' already exists.")
-                return None
-
-            new_page = self.client.pages.create(
-                parent={"data_source_id": self.data_source_id},
-                properties={
-                    "Name": {"title": [{"text": {"content": title}}]},
-                    "URL": {"url": link},
-                    "Date": {"date": {"start": date}},
-                },
+                known_page = self.get_known_page(link, data_source_id) if self.update_existing else None
+                if known_page and known_page.get("id"):
+                    return self._update_page(
+                        known_page["id"],
+                        title,
+                        link,
+                        body,
+                        date,
+                        known_page.get("hash"),
+                        data_source_id,
+                    )
+
+                logger.info("Page for URL '%s' already exists.", link, extra=SAMPLED)
+                return None, None
+
+            page_hash = self.build_content_hash(title, body, date) if self.update_existing else None
+            new_page = self._call(
+                "pages.create",
+                parent={"data_source_id": data_source_id or self.data_source_id},
+                properties=self._build_properties(
+                    title, link, date or get_current_date_iso(), page_hash, data_source_id
+                ),
             )
 
             if not self.add_text_chunks_to_page(new_page["id"], body):
-                logger.error(f"Failed to add body content for page '{title}'")
-                return None
+                logger.error("Failed to add body content for page '%s'", title)
+                return False, None
 
-            logger.info(f"Added page '{title}'")
-            return new_page
+            self._remember_page(link, new_page, data_source_id)
+            created = True
+            logger.info("Added page '%s'", title, extra=SAMPLED)
+            return True, new_page
 
-        except APIResponseError as e:
-            logger.error(f"Failed to add page '{title}'. Error: {e}")
-            return None
+        except notion_sdk.APIResponseError as e:
+            logger.error("Failed to add page '%s'. Error: %s", title, e)
+            return False, None
         except Exception as e:
-            logger.error(f"Unexpected error adding page '{title}': {e}")
-            return None
+            logger.error("Unexpected error adding page '%s': %s", title, e)
+            return False, None
         finally:
-            self._clear_pending_link(link)
+            self._clear_pending_link(link, data_source_id, keep_claim=created)
@@ -0,0 +1,240 @@
+"""Per-stage pipeline profiling for Feed to Somewhere."""
+
+import contextlib
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Any, ContextManager, Dict, Iterator, List, Optional, Tuple
+
+from .logger import logger
+
+
+class PipelineProfiler:
+    """
+    Profile pipeline stages across worker threads.
+
+    Every thread gets its own cProfile profiler per stage, and the profiles of a
+    stage are merged when the report is written. Stage timings are always
+    collected. With ``trace_memory``, tracemalloc records the peak traced memory
+    while each stage runs. Peaks are process-wide and every stage start resets
+    them, so for stages running concurrently the figure is a lower bound.
+
+    From Python 3.12 on, cProfile is built on ``sys.monitoring``, which allows
+    only one active profiler per interpreter, but that profiler sees every
+    thread. There, a single profile covering the whole run is collected instead
+    of one per stage, next to the stage timings and memory.
+    """
+
+    PER_THREAD_PROFILING = sys.version_info < (3, 12)
+    RUN_PROFILE = "run"
+    REPORT_FILE = "stages.txt"
+    SUMMARY_FILE = "stages.json"
+    MEMORY_FILE = "memory.txt"
+    TOP_FUNCTIONS = 40
+    TOP_ALLOCATIONS = 25
+
+    def __init__(self, output_dir: str, trace_memory: bool = False):
+        """
+        Initialize the profiler.
+
+        Args:
+            output_dir: Directory the report is written to.
+            trace_memory: Whether to trace allocations with tracemalloc.
+        """
+        self.output_dir = output_dir
+        self.trace_memory = trace_memory
+        self.cprofile_enabled = self.PER_THREAD_PROFILING
+        self._profiles: Dict[Tuple[int, str], cProfile.Profile] = {}
+        self._run_profile: Optional[cProfile.Profile] = None
+        self._timings: Dict[str, Dict[str, float]] = {}
+        self._active = threading.local()
+        self._lock = threading.Lock()
+        self._started_tracing = False
+
+        if not self.cprofile_enabled:
+            self._start_run_profile()
+
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def _start_run_profile(self) -> None:
+        """Profile the whole run with one profiler where per-stage profilers are unavailable."""
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as e:
+            logger.warning("cProfile is unavailable (%s); collecting stage timings only", e)
+            return
+        self._run_profile = profile
+        logger.warning(
+            "Per-stage cProfile is unavailable on this Python version; "
+            "writing one profile of the whole run as %s.pstats",
+            self.RUN_PROFILE,
+        )
+
+    def _stop_run_profile(self) -> None:
+        """Stop the whole-run profiler, if it is running."""
+        if self._run_profile is not None:
+            self._run_profile.disable()
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Profile a block of work as part of a pipeline stage.
+
+        Nested stages in the same thread are timed, but their calls are only
+        profiled as part of the outermost stage.
+
+        Args:
+            name: The stage name.
+        """
+        profile = None
+        if self.cprofile_enabled and not getattr(self._active, "profiling", False):
+            key = (threading.get_ident(), name)
+            with self._lock:
+                profile = self._profiles.setdefault(key, cProfile.Profile())
+            self._active.profiling = True
+            profile.enable()
+
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started_at
+            if profile is not None:
+                profile.disable()
+                self._active.profiling = False
+            self._record(name, elapsed)
+
+    def _record(self, name: str, elapsed: float) -> None:
+        """Fold a stage run into the stage totals."""
+        peak = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else 0
+        with self._lock:
+            timing = self._timings.setdefault(name, {"calls": 0, "total": 0.0, "max": 0.0, "peak_memory": 0})
+            timing["calls"] += 1
+            timing["total"] += elapsed
+            timing["max"] = max(timing["max"], elapsed)
+            timing["peak_memory"] = max(timing["peak_memory"], peak)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Return per-stage call counts, durations and peak memory, by stage name."""
+        with self._lock:
+            return {name: dict(self._timings[name]) for name in sorted(self._timings)}
+
+    def _merged_stats(self) -> Dict[str, pstats.Stats]:
+        """Merge the per-thread profiles of every stage, or return the whole-run profile."""
+        with self._lock:
+            profiles = list(self._profiles.items())
+        if self._run_profile is not None:
+            profiles.append(((0, self.RUN_PROFILE), self._run_profile))
+
+        merged: Dict[str, pstats.Stats] = {}
+        for (_, name), profile in profiles:
+            try:
+                if name in merged:
+                    merged[name].add(profile)
+                else:
+                    merged[name] = pstats.Stats(profile)
+            except TypeError:
+                # Profiles that never recorded a call cannot be loaded.
+                continue
+        return merged
+
+    def format_summary(self) -> str:
+        """
+        Build the plain-text stage table.
+
+        Returns:
+            The formatted table, one stage per line in name order.
+        """
+        rows: List[List[str]] = [["STAGE", "CALLS", "TOTAL", "MEAN", "MAX", "PEAK MEMORY"]]
+        for name, timing in self.summary().items():
+            calls = int(timing["calls"])
+            rows.append([
+                name,
+                str(calls),
+                f"{timing['total']:.3f}s",
+                f"{timing['total'] / calls:.4f}s",
+                f"{timing['max']:.4f}s",
+                f"{timing['peak_memory'] / 1e6:.1f} MB" if self.trace_memory else "-",
+            ])
+
+        widths = [max(len(row[index]) for row in rows) for index in range(len(rows[0]))]
+        return "\n".join("  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip() for row in rows)
+
+    def write_report(self) -> List[str]:
+        """
+        Write the profiling report to the output directory.
+
+        The directory receives the stage table as text and JSON, one merged
+        ``.pstats`` file and one text listing per stage, or for the whole run
+        from Python 3.12 on, and the top allocation sites when memory tracing
+        is enabled. File paths are stripped from the listings so reports from
+        different checkouts can be diffed.
+
+        Returns:
+            The paths of the written files.
+        """
+        self._stop_run_profile()
+        os.makedirs(self.output_dir, exist_ok=True)
+        written = []
+
+        def write_text(file_name: str, text: str) -> None:
+            path = os.path.join(self.output_dir, file_name)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text if text.endswith("\n") else text + "\n")
+            written.append(path)
+
+        write_text(self.REPORT_FILE, self.format_summary())
+        write_text(self.SUMMARY_FILE, json.dumps(self.summary(), indent=2, sort_keys=True))
+
+        for name, stats in sorted(self._merged_stats().items()):
+            stats_path = os.path.join(self.output_dir, f"{name}.pstats")
+            stats.dump_stats(stats_path)
+            written.append(stats_path)
+
+            listing = io.StringIO()
+            stats.stream = listing
+            stats.strip_dirs().sort_stats("cumulative").print_stats(self.TOP_FUNCTIONS)
+            write_text(f"{name}.txt", listing.getvalue())
+
+        if self.trace_memory and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            top_stats = snapshot.statistics("lineno")[:self.TOP_ALLOCATIONS]
+            write_text(self.MEMORY_FILE, "\n".join(str(stat) for stat in top_stats))
+
+        logger.info("Wrote profiling report to %s", self.output_dir)
+        return written
+
+    def close(self) -> None:
+        """Stop the whole-run profiler and memory tracing started by the profiler."""
+        self._stop_run_profile()
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+
+def profile_stage(profiler: Optional[PipelineProfiler], name: str) -> ContextManager[None]:
+    """
+    Return a context manager profiling a stage, or a no-op without a profiler.
+
+    Args:
+        profiler: The active profiler, if any.
+        name: The stage name.
+
+    Returns:
+        The stage context manager.
+    """
+    if profiler is None:
+        return contextlib.nullcontext()
+    return profiler.stage(name)
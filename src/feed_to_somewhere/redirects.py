@@ -0,0 +1,138 @@
+"""Persistent redirect resolution cache for Feed to Somewhere."""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Optional
+from urllib.parse import unquote_plus, urlsplit, urlunsplit
+
+TRACKING_PARAMETERS = frozenset({"fbclid", "gclid", "mc_cid", "mc_eid", "igshid", "yclid", "_hsenc", "_hsmi"})
+
+
+def _is_tracking_parameter(parameter: str) -> bool:
+    """Tell whether a raw ``name=value`` query parameter only tracks the click."""
+    name = unquote_plus(parameter.split("=", 1)[0]).lower()
+    return name.startswith("utm_") or name in TRACKING_PARAMETERS
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalize a resolved URL so copies of one article share a link.
+
+    The scheme and host are lowercased, the fragment is dropped and tracking
+    parameters such as ``utm_source`` are removed from the query string. The
+    remaining parameters are kept as they are, without decoding or reordering
+    them, since servers may tell ``a=`` from ``a`` or ``%20`` from ``+``.
+
+    Args:
+        url: The URL at the end of a redirect chain.
+
+    Returns:
+        The canonical URL.
+    """
+    parts = urlsplit(url)
+    query = "&".join(
+        parameter for parameter in parts.query.split("&") if not _is_tracking_parameter(parameter)
+    )
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, query, ""))
+
+
+class RedirectCache:
+    """
+    Map entry links to the canonical URL their redirect chain ends at.
+
+    Cached links are fetched and stored under their canonical URL without
+    following the chain again, and copies of an article reached through
+    different redirectors are recognized as the same link. Mappings expire
+    after ``ttl`` seconds, since redirectors may be repointed.
+    """
+
+    FILE_NAME = "redirects.db"
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS redirects (
+            link TEXT PRIMARY KEY,
+            canonical_url TEXT NOT NULL,
+            resolved_at REAL NOT NULL
+        )
+    """
+
+    def __init__(self, path: str, ttl: float = 7 * 86400, clock: Callable[[], float] = time.time):
+        """
+        Initialize the cache.
+
+        Args:
+            path: The SQLite database file, or ``:memory:`` for a cache that
+                lasts one run.
+            ttl: Seconds a resolved link is trusted.
+            clock: Time source returning epoch seconds.
+        """
+        if ttl <= 0:
+            raise ValueError("ttl must be a positive number")
+
+        self.path = path
+        self.ttl = ttl
+        self.clock = clock
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_state_dir(cls, state_dir: str, **kwargs) -> "RedirectCache":
+        """Create a cache stored in a state directory."""
+        return cls(os.path.join(state_dir, cls.FILE_NAME), **kwargs)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use, create the schema and drop expired links."""
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(self.SCHEMA)
+            connection.execute("DELETE FROM redirects WHERE resolved_at < ?", (self.clock() - self.ttl,))
+            self._connection = connection
+        return self._connection
+
+    def get(self, link: str) -> Optional[str]:
+        """
+        Look up the canonical URL of a link.
+
+        Args:
+            link: The entry link.
+
+        Returns:
+            The canonical URL, or None if the link is not cached or expired.
+        """
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT canonical_url FROM redirects WHERE link = ? AND resolved_at >= ?",
+                (link, self.clock() - self.ttl),
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, link: str, canonical_url: str) -> None:
+        """
+        Remember the canonical URL of a link.
+
+        The canonical URL is also cached as its own, so entries already
+        rewritten to it are not resolved again.
+
+        Args:
+            link: The entry link.
+            canonical_url: The canonical URL its redirect chain ends at.
+        """
+        now = self.clock()
+        with self._lock:
+            self._connect().executemany(
+                "INSERT OR REPLACE INTO redirects (link, canonical_url, resolved_at) VALUES (?, ?, ?)",
+                {(link, canonical_url, now), (canonical_url, canonical_url, now)},
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
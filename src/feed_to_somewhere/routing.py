@@ -0,0 +1,78 @@
+"""Entry routing to data sources for Feed to Somewhere."""
+
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Pattern, Sequence
+
+from .feed_sources import FeedSource
+
+
+@dataclass(frozen=True)
+class RoutingRule:
+    """Send entries whose title, link or feed URL matches a pattern to a data source."""
+
+    data_source_id: str
+    field: str
+    pattern: Pattern[str]
+
+    FIELDS = ("title", "link", "feed")
+
+    @classmethod
+    def parse(cls, value: str) -> "RoutingRule":
+        """
+        Parse a ``DATA_SOURCE:FIELD=REGEX`` rule.
+
+        Args:
+            value: The rule, such as ``team_b:title=(?i)kubernetes``.
+
+        Returns:
+            The rule.
+
+        Raises:
+            ValueError: If the rule is malformed or the pattern is invalid.
+        """
+        data_source_id, separator, condition = value.partition(":")
+        field, equals, expression = condition.partition("=")
+        field = field.strip().lower()
+        if not separator or not equals or not data_source_id.strip():
+            raise ValueError("route must look like DATA_SOURCE:FIELD=REGEX")
+        if field not in cls.FIELDS:
+            raise ValueError(f"route field must be one of {', '.join(cls.FIELDS)}")
+        try:
+            pattern = re.compile(expression)
+        except re.error as exc:
+            raise ValueError(f"invalid route pattern: {exc}") from exc
+        return cls(data_source_id.strip(), field, pattern)
+
+    def matches(self, title: str, link: str, feed_url: str) -> bool:
+        """Return whether an entry matches the rule."""
+        value = {"title": title, "link": link, "feed": feed_url}[self.field]
+        return self.pattern.search(value) is not None
+
+
+def route_entry(
+    title: str,
+    link: str,
+    source: FeedSource,
+    rules: Sequence[RoutingRule] = (),
+) -> List[Optional[str]]:
+    """
+    Pick the data sources an entry is written to.
+
+    The feed's own data sources come first, or the default data source (None)
+    when the feed names none. Every matching rule adds its data source.
+
+    Args:
+        title: The entry title.
+        link: The entry link.
+        source: Options of the feed the entry belongs to.
+        rules: Routing rules to apply.
+
+    Returns:
+        The target data sources without duplicates.
+    """
+    targets: List[Optional[str]] = list(source.data_source_ids) or [None]
+    for rule in rules:
+        if rule.data_source_id not in targets and rule.matches(title, link, source.url):
+            targets.append(rule.data_source_id)
+    return targets
@@ -0,0 +1,142 @@
+"""Static sharding of the feed list for Feed to Somewhere."""
+
+import hashlib
+import os
+import signal
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Sequence, TypeVar
+
+from .logger import logger
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class ShardSpec:
+    """
+    One shard of the feed list.
+
+    Feeds are assigned with rendezvous (highest random weight) hashing: every
+    shard scores every URL and the highest score owns it. A feed's owner depends
+    only on its URL and the shard count, so adding or removing feeds never moves
+    other feeds, and changing the shard count moves only about one feed in
+    ``count``.
+    """
+
+    index: int
+    count: int
+    salt: str = ""
+
+    def __post_init__(self):
+        if self.count <= 0:
+            raise ValueError("shard count must be a positive integer")
+        if not 0 <= self.index < self.count:
+            raise ValueError(f"shard index must be between 0 and {self.count - 1}")
+
+    @classmethod
+    def parse(cls, value: str, salt: str = "") -> "ShardSpec":
+        """
+        Parse an ``INDEX/COUNT`` shard description.
+
+        Args:
+            value: The shard description, such as ``0/4``.
+            salt: Hash salt separating independent levels of sharding.
+
+        Returns:
+            The shard.
+
+        Raises:
+            ValueError: If the description is malformed.
+        """
+        index, separator, count = value.partition("/")
+        if not separator:
+            raise ValueError("shard must look like INDEX/COUNT")
+        return cls(int(index), int(count), salt)
+
+    def _score(self, shard: int, key: str) -> int:
+        """Return the rendezvous weight of a shard for a key."""
+        digest = hashlib.blake2b(f"{self.salt}\0{shard}\0{key}".encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "big")
+
+    def owner(self, key: str) -> int:
+        """Return the index of the shard owning a key."""
+        return max(range(self.count), key=lambda shard: self._score(shard, key))
+
+    def owns(self, key: str) -> bool:
+        """Return whether this shard owns a key."""
+        return self.count == 1 or self.owner(key) == self.index
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+
+def filter_shards(items: Iterable[T], shards: Sequence[ShardSpec], key=lambda item: item) -> List[T]:
+    """
+    Keep the items owned by every given shard.
+
+    Args:
+        items: The items to filter.
+        shards: Shards of successive levels, such as node and process.
+        key: Function returning the hash key of an item.
+
+    Returns:
+        The owned items in their original order.
+    """
+    return [item for item in items if all(shard.owns(key(item)) for shard in shards)]
+
+
+def run_shard_processes(
+    argv: Sequence[str],
+    processes: int,
+    state_dir: Optional[str] = None,
+    profile_dir: Optional[str] = None,
+) -> int:
+    """
+    Run one child process per process shard and wait for all of them.
+
+    Every child runs the same command line with ``--process-shard K/N`` added.
+    Children get their own subdirectory of the state and profile directories,
+    since each owns a stable subset of the feeds. SIGTERM and SIGINT are
+    forwarded so the children can shut down gracefully.
+
+    Args:
+        argv: The command line arguments of this process.
+        processes: The number of child processes.
+        state_dir: Optional state directory to split per child.
+        profile_dir: Optional profile directory to split per child.
+
+    Returns:
+        Zero if every child succeeded, otherwise the first non-zero exit code.
+    """
+    children: List[subprocess.Popen] = []
+    for index in range(processes):
+        shard = f"{index}/{processes}"
+        # Later options win in argparse, so appending overrides the parent's values.
+        args = list(argv) + ["--processes", "1", "--process-shard", shard]
+        if state_dir:
+            args += ["--state-dir", os.path.join(state_dir, f"process-{index}-of-{processes}")]
+        if profile_dir:
+            args += ["--profile", os.path.join(profile_dir, f"process-{index}-of-{processes}")]
+        children.append(subprocess.Popen([sys.executable, "-m", "feed_to_somewhere.main", *args]))
+
+    logger.info("Started %s feed processes", processes)
+
+    def forward(signum, frame):
+        for child in children:
+            if child.poll() is None:
+                child.send_signal(signum)
+
+    previous = {signum: signal.signal(signum, forward) for signum in (signal.SIGTERM, signal.SIGINT)}
+    try:
+        exit_codes = [child.wait() for child in children]
+    finally:
+        for signum, handler in previous.items():
+            signal.signal(signum, handler)
+
+    failed = [code for code in exit_codes if code != 0]
+    if failed:
+        logger.error("%s of %s feed processes failed", len(failed), processes)
+        return failed[0]
+    return 0
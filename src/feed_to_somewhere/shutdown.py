@@ -0,0 +1,256 @@
+"""Graceful shutdown handling for Feed to Somewhere."""
+
+import json
+import os
+import signal
+import threading
+from typing import Any, Callable, Iterable, List, Optional
+
+from .logger import logger, shutdown_logging
+from .sinks import EntryRecord
+
+
+class ShutdownController:
+    """
+    Turn termination signals into an orderly stop.
+
+    The first SIGTERM or SIGINT only marks shutdown as requested: workers stop
+    taking new work, queued work is cancelled through the registered callbacks,
+    and running writes may finish. If the run has not completed within the grace
+    period, or a second signal arrives, the force-exit hooks save what they can
+    and the process exits.
+
+    Signal handlers only set an event. Callbacks and the grace timer run on a
+    watcher thread, so they never run inside code the signal interrupted.
+    """
+
+    def __init__(
+        self,
+        grace_period: float = 30.0,
+        exit_func: Callable[[int], Any] = os._exit,
+    ):
+        """
+        Initialize the controller.
+
+        Args:
+            grace_period: Seconds in-flight work may take after shutdown is requested.
+            exit_func: Function terminating the process when the grace period expires.
+        """
+        if grace_period < 0:
+            raise ValueError("grace_period must not be negative")
+
+        self.grace_period = grace_period
+        self.exit_func = exit_func
+        self.reason: Optional[str] = None
+        self._requested = threading.Event()
+        self._completed = threading.Event()
+        self._wake = threading.Event()
+        self._callbacks_ran = False
+        self._callbacks: List[Callable[[], None]] = []
+        self._force_exit_hooks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+        self._previous_handlers: dict = {}
+        self._watcher = threading.Thread(target=self._watch, name="shutdown-watcher", daemon=True)
+        self._watcher.start()
+
+    @property
+    def requested(self) -> bool:
+        """Whether shutdown has been requested."""
+        return self._requested.is_set()
+
+    def install(self, signals: Iterable[int] = (signal.SIGTERM, signal.SIGINT)) -> None:
+        """
+        Handle the given signals. Must be called from the main thread.
+
+        Args:
+            signals: The signals that request shutdown.
+        """
+        for signum in signals:
+            self._previous_handlers[signum] = signal.signal(signum, self._handle_signal)
+
+    def restore(self) -> None:
+        """Restore the signal handlers that were active before ``install``."""
+        for signum, handler in self._previous_handlers.items():
+            signal.signal(signum, handler)
+        self._previous_handlers.clear()
+
+    def _handle_signal(self, signum: int, frame: Any) -> None:
+        """Request shutdown on the first signal and cut the grace period short on the second."""
+        self.reason = self.reason or signal.Signals(signum).name
+        self._requested.set()
+        self._wake.set()
+
+    def request(self, reason: str = "requested") -> None:
+        """
+        Request shutdown without a signal.
+
+        Args:
+            reason: Short description for the log.
+        """
+        self.reason = self.reason or reason
+        self._requested.set()
+        self._wake.set()
+
+    def add_callback(self, callback: Callable[[], None]) -> None:
+        """
+        Run a callback when shutdown is requested, or right away if it already was.
+
+        Args:
+            callback: Function cancelling queued work.
+        """
+        with self._lock:
+            self._callbacks.append(callback)
+            run_now = self._callbacks_ran
+        if run_now:
+            self._run_callback(callback)
+
+    def remove_callback(self, callback: Callable[[], None]) -> None:
+        """Stop running a previously added callback."""
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def add_force_exit_hook(self, hook: Callable[[], None]) -> None:
+        """
+        Run a hook right before the process is forced to exit.
+
+        Args:
+            hook: Function saving state that would otherwise be lost.
+        """
+        with self._lock:
+            self._force_exit_hooks.append(hook)
+
+    def complete(self) -> None:
+        """Mark the orderly shutdown, or the whole run, as finished."""
+        self._completed.set()
+        self._wake.set()
+
+    @staticmethod
+    def _run_callback(callback: Callable[[], None]) -> None:
+        """Run a callback, logging instead of raising errors."""
+        try:
+            callback()
+        except Exception as e:
+            logger.error("Shutdown callback failed: %s", e)
+
+    def _watch(self) -> None:
+        """Wait for a shutdown request, cancel queued work and enforce the grace period."""
+        self._wake.wait()
+        if self._completed.is_set():
+            return
+        self._wake.clear()
+
+        logger.warning(
+            "Shutdown requested (%s); finishing in-flight writes for up to %g seconds",
+            self.reason,
+            self.grace_period,
+        )
+        with self._lock:
+            self._callbacks_ran = True
+            callbacks = list(self._callbacks)
+        for callback in callbacks:
+            self._run_callback(callback)
+
+        # Wakes early when the run completes or a second signal arrives.
+        self._wake.wait(self.grace_period)
+        if self._completed.is_set():
+            return
+
+        logger.error("Grace period expired; exiting before in-flight work finished")
+        with self._lock:
+            hooks = list(self._force_exit_hooks)
+        for hook in hooks:
+            self._run_callback(hook)
+        # os._exit skips the atexit handler that drains the log queue.
+        shutdown_logging()
+        self.exit_func(1)
+
+
+class PendingEntryJournal:
+    """
+    Keep extracted entries that could not be written before shutdown.
+
+    Entries are held in memory during the run and saved to a JSON Lines file in
+    the state directory. The next run writes them first, without fetching or
+    extracting them again.
+    """
+
+    FILE_NAME = "pending_entries.jsonl"
+
+    def __init__(self, path: str):
+        """
+        Initialize the journal.
+
+        Args:
+            path: JSON Lines file holding pending entries.
+        """
+        self.path = path
+        self._records: List[EntryRecord] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_state_dir(cls, state_dir: str) -> "PendingEntryJournal":
+        """Create a journal persisted inside a state directory."""
+        return cls(os.path.join(state_dir, cls.FILE_NAME))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._records)
+
+    def append(self, record: EntryRecord) -> None:
+        """Add an entry that still needs to be written."""
+        with self._lock:
+            self._records.append(record)
+
+    def discard(self, record: EntryRecord) -> None:
+        """Remove an entry once it has been written."""
+        with self._lock:
+            if record in self._records:
+                self._records.remove(record)
+
+    def load(self) -> List[EntryRecord]:
+        """
+        Load the entries saved by an earlier run.
+
+        The loaded entries stay pending until they are discarded, so entries
+        that fail again are saved again.
+
+        Returns:
+            The saved entries, oldest first.
+        """
+        records: List[EntryRecord] = []
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        records.append(EntryRecord(**json.loads(line)))
+        except FileNotFoundError:
+            return []
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning("Ignoring unreadable pending entries in %s: %s", self.path, e)
+            return []
+
+        with self._lock:
+            self._records = records + self._records
+        return records
+
+    def save(self) -> None:
+        """Persist the pending entries atomically, removing the file when empty."""
+        with self._lock:
+            lines = "".join(json.dumps(record.to_dict(), ensure_ascii=False) + "\n" for record in self._records)
+
+        try:
+            if not lines:
+                if os.path.exists(self.path):
+                    os.remove(self.path)
+                return
+
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(lines)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.error("Failed to save pending entries to %s: %s", self.path, e)
@@ -0,0 +1,617 @@
+"""Output sinks for Feed to Somewhere."""
+
+import concurrent.futures
+import json
+import math
+import os
+import sqlite3
+import statistics
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from .logger import logger
+from .metrics import RunStats
+from .notion_client import NotionClient
+from .profiling import PipelineProfiler, profile_stage
+from .utils import chunk_text, lazy_import
+
+requests = lazy_import("requests")
+
+
+@dataclass(frozen=True)
+class EntryRecord:
+    """
+    A processed feed entry ready to be written to a sink.
+
+    ``date`` falls back to the processing date for entries without one, in
+    which case ``dated`` is False.
+    """
+
+    title: str
+    link: str
+    body: str
+    date: str
+    feed_url: str = ""
+    data_source_id: Optional[str] = None
+    dated: bool = True
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the record as a JSON-serializable dict."""
+        return asdict(self)
+
+
+class Sink(ABC):
+    """
+    Destination for processed entries.
+
+    Sinks with a ``batch_size`` of 1 are written synchronously for every entry,
+    and the entry only counts as processed when the write succeeds. Sinks with a
+    larger batch size buffer entries and are flushed in the background.
+
+    Sinks with ``new_entries_only`` set, such as notification endpoints, only
+    receive entries that every other unbatched sink has just written, not ones
+    those sinks already held or failed to write.
+    """
+
+    name = "sink"
+    batch_size = 1
+    max_workers = 1
+    new_entries_only = False
+
+    @abstractmethod
+    def write_batch(self, records: List[EntryRecord]) -> List[Optional[bool]]:
+        """
+        Write a batch of records.
+
+        Args:
+            records: The records to write.
+
+        Returns:
+            One result per record: True if it was written, None if the sink
+            already held it and skipped it, and False if the write failed.
+        """
+
+    def find_existing(self, links: List[str], data_source_id: Optional[str] = None) -> Optional[Set[str]]:
+        """
+        Report which links the sink already holds.
+
+        Args:
+            links: The entry links of a feed.
+            data_source_id: Target data source of the feed's entries.
+
+        Returns:
+            The links that need no write, or None if the sink cannot tell.
+            Sinks that cannot tell do not keep other sinks from skipping a
+            link, so a sink that must see every entry returns an empty set.
+        """
+        return None
+
+    def close(self) -> None:
+        """Release resources held by the sink."""
+
+
+class NotionSink(Sink):
+    """Sink that creates a Notion page per entry."""
+
+    name = "notion"
+
+    def __init__(self, notion_client: NotionClient, max_workers: int = 10):
+        """
+        Initialize the sink.
+
+        Args:
+            notion_client: The Notion client used to create pages.
+            max_workers: Maximum number of concurrent page writes.
+        """
+        self.notion_client = notion_client
+        self.max_workers = max_workers
+
+    def find_existing(self, links: List[str], data_source_id: Optional[str] = None) -> Optional[Set[str]]:
+        """
+        Look up a feed's links in one batched query.
+
+        In update mode existing pages may still need a write, so the lookup only
+        warms the client's page index and no link is reported as done. An empty
+        set rather than None is returned then, and when the query fails, so that
+        other sinks holding a link cannot make the dispatcher skip it.
+        """
+        existing_links = self.notion_client.find_existing_links(links, data_source_id)
+        if self.notion_client.update_existing or existing_links is None:
+            return set()
+        return existing_links
+
+    def write_batch(self, records: List[EntryRecord]) -> List[Optional[bool]]:
+        """Create one page per record, skipping existing pages."""
+        return [
+            self.notion_client.write_page(
+                record.title,
+                record.link,
+                record.body,
+                record.date if record.dated else None,
+                data_source_id=record.data_source_id,
+            )
+            for record in records
+        ]
+
+
+class JsonlSink(Sink):
+    """Sink that appends entries to a JSON Lines file."""
+
+    name = "jsonl"
+
+    def __init__(self, path: str, batch_size: int = 50):
+        """
+        Initialize the sink.
+
+        Args:
+            path: The JSON Lines file to append to.
+            batch_size: Number of entries written per append.
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self._links: Optional[Set[Tuple[str, str]]] = None
+        self._links_lock = threading.Lock()
+
+    def _load_links(self) -> Set[Tuple[str, str]]:
+        """Read the data source and link of every entry already in the file."""
+        links: Set[Tuple[str, str]] = set()
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        links.add((entry.get("data_source_id") or "", entry["link"]))
+                    except (ValueError, KeyError, AttributeError):
+                        continue
+        except FileNotFoundError:
+            pass
+        return links
+
+    def find_existing(self, links: List[str], data_source_id: Optional[str] = None) -> Optional[Set[str]]:
+        """
+        Look up links in an index of the file's entries.
+
+        The index is read from the file on first use and kept up to date by
+        later writes.
+        """
+        with self._links_lock:
+            if self._links is None:
+                try:
+                    self._links = self._load_links()
+                except OSError as e:
+                    logger.error("Failed to read existing entries from %s: %s", self.path, e)
+                    return set()
+            return {link for link in links if (data_source_id or "", link) in self._links}
+
+    def write_batch(self, records: List[EntryRecord]) -> List[bool]:
+        """Append the records as one JSON object per line."""
+        lines = "".join(json.dumps(record.to_dict(), ensure_ascii=False) + "\n" for record in records)
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+        except OSError as e:
+            logger.error("Failed to write %s entries to %s: %s", len(records), self.path, e)
+            return [False] * len(records)
+
+        with self._links_lock:
+            if self._links is not None:
+                self._links.update((record.data_source_id or "", record.link) for record in records)
+        return [True] * len(records)
+
+
+class SqliteSink(Sink):
+    """Sink that upserts entries into a local SQLite database."""
+
+    name = "sqlite"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS entries (
+            link TEXT NOT NULL,
+            data_source_id TEXT NOT NULL DEFAULT '',
+            title TEXT NOT NULL,
+            body TEXT NOT NULL,
+            date TEXT NOT NULL,
+            feed_url TEXT NOT NULL,
+            written_at TEXT NOT NULL,
+            PRIMARY KEY (link, data_source_id)
+        )
+    """
+    UPSERT = """
+        INSERT INTO entries (link, data_source_id, title, body, date, feed_url, written_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (link, data_source_id) DO UPDATE SET
+            title = excluded.title,
+            body = excluded.body,
+            date = excluded.date,
+            feed_url = excluded.feed_url,
+            written_at = excluded.written_at
+    """
+    LOOKUP_BATCH_SIZE = 500
+
+    def __init__(self, path: str, batch_size: int = 50):
+        """
+        Initialize the sink.
+
+        Args:
+            path: The SQLite database file.
+            batch_size: Number of entries written per transaction.
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use and create the schema."""
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute(self.SCHEMA)
+        return self._connection
+
+    def find_existing(self, links: List[str], data_source_id: Optional[str] = None) -> Optional[Set[str]]:
+        """Look up links through the table's primary key."""
+        existing_links: Set[str] = set()
+        try:
+            with self._lock:
+                connection = self._connect()
+                for start in range(0, len(links), self.LOOKUP_BATCH_SIZE):
+                    batch = links[start:start + self.LOOKUP_BATCH_SIZE]
+                    rows = connection.execute(
+                        f"SELECT link FROM entries WHERE data_source_id = ? "
+                        f"AND link IN ({', '.join('?' * len(batch))})",
+                        [data_source_id or "", *batch],
+                    )
+                    existing_links.update(row[0] for row in rows)
+        except sqlite3.Error as e:
+            logger.error("Failed to read existing entries from %s: %s", self.path, e)
+            return set()
+        return existing_links
+
+    def write_batch(self, records: List[EntryRecord]) -> List[bool]:
+        """Upsert the records in a single transaction."""
+        written_at = datetime.now(timezone.utc).isoformat()
+        rows = [
+            (
+                record.link,
+                record.data_source_id or "",
+                record.title,
+                record.body,
+                record.date,
+                record.feed_url,
+                written_at,
+            )
+            for record in records
+        ]
+        try:
+            with self._lock:
+                connection = self._connect()
+                with connection:
+                    connection.executemany(self.UPSERT, rows)
+            return [True] * len(records)
+        except sqlite3.Error as e:
+            logger.error("Failed to write %s entries to %s: %s", len(records), self.path, e)
+            return [False] * len(records)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+class WebhookSink(Sink):
+    """Sink that posts batches of new entries to an HTTP endpoint as JSON."""
+
+    name = "webhook"
+    new_entries_only = True
+
+    def __init__(self, url: str, batch_size: int = 20, timeout: float = 30):
+        """
+        Initialize the sink.
+
+        Args:
+            url: The endpoint receiving ``{"entries": [...]}`` POST requests.
+            batch_size: Number of entries per request.
+            timeout: Request timeout in seconds.
+        """
+        self.url = url
+        self.batch_size = batch_size
+        self.timeout = timeout
+
+    def write_batch(self, records: List[EntryRecord]) -> List[bool]:
+        """Post the records in a single request."""
+        try:
+            response = requests.post(
+                self.url,
+                json={"entries": [record.to_dict() for record in records]},
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            return [True] * len(records)
+        except requests.exceptions.RequestException as e:
+            logger.error("Failed to post %s entries to %s: %s", len(records), self.url, e)
+            return [False] * len(records)
+
+
+class PlanSink(Sink):
+    """
+    Sink that records what would be written to Notion without writing anything.
+
+    Used by the extraction dry run: entries go through fetching, extraction and
+    chunking as usual, and the sink tallies body sizes, blocks and the Notion
+    requests a real run would make.
+    """
+
+    name = "plan"
+
+    def __init__(self, chunk_size: int = 2000, max_workers: int = 10):
+        """
+        Initialize the sink.
+
+        Args:
+            chunk_size: Characters per paragraph block, as used by the Notion client.
+            max_workers: Maximum number of concurrent writes.
+        """
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.existence_queries = 0
+        self._entries: List[Tuple[str, int, int]] = []
+        self._lock = threading.Lock()
+
+    def find_existing(self, links: List[str], data_source_id: Optional[str] = None) -> Optional[Set[str]]:
+        """Count the batched existence queries without running them."""
+        with self._lock:
+            self.existence_queries += math.ceil(len(links) / NotionClient.EXISTENCE_BATCH_SIZE)
+        return None
+
+    def write_batch(self, records: List[EntryRecord]) -> List[bool]:
+        """Record the body size and block count of each entry."""
+        planned = [
+            (record.link, len(record.body), len(chunk_text(record.body, self.chunk_size)))
+            for record in records
+        ]
+        with self._lock:
+            self._entries.extend(planned)
+        return [True] * len(records)
+
+    def estimated_requests(self) -> int:
+        """
+        Estimate the Notion requests a real run would make.
+
+        Each new page takes one create request and one append request per
+        block, and each feed takes one existence query per 100 links.
+
+        Returns:
+            The estimated request count.
+        """
+        with self._lock:
+            return self.existence_queries + sum(1 + blocks for _, _, blocks in self._entries)
+
+    def format_report(self, elapsed_seconds: Optional[float] = None) -> str:
+        """
+        Build a plain-text report of the planned writes.
+
+        Args:
+            elapsed_seconds: Optional run duration to report throughput.
+
+        Returns:
+            The formatted report.
+        """
+        with self._lock:
+            entries = list(self._entries)
+
+        if not entries:
+            return "No entries would be written."
+
+        lines = ["BODY CHARS  BLOCKS  LINK"]
+        lines.extend(f"{size:>10}  {blocks:>6}  {link}" for link, size, blocks in entries)
+
+        sizes = [size for _, size, _ in entries]
+        lines.append("")
+        lines.append(f"Entries: {len(entries)}")
+        lines.append(
+            f"Body chars: total={sum(sizes)} min={min(sizes)} "
+            f"median={int(statistics.median(sizes))} max={max(sizes)}"
+        )
+        lines.append(f"Blocks: {sum(blocks for _, _, blocks in entries)} (chunk size {self.chunk_size})")
+        lines.append(f"Estimated Notion requests: {self.estimated_requests()}")
+        if elapsed_seconds:
+            lines.append(f"Elapsed: {elapsed_seconds:.1f}s ({len(entries) / elapsed_seconds:.2f} entries/s)")
+        return "\n".join(lines)
+
+
+def build_sink(
+    spec: str,
+    notion_client_factory: Callable[[], NotionClient],
+    max_workers: int = 10,
+) -> Sink:
+    """
+    Build a sink from a command-line specification.
+
+    Supported forms are ``notion``, ``jsonl:PATH``, ``sqlite:PATH`` and
+    ``webhook:URL``.
+
+    Args:
+        spec: The sink specification.
+        notion_client_factory: Callable creating the Notion client on demand.
+        max_workers: Maximum concurrent writes for the Notion sink.
+
+    Returns:
+        The configured sink.
+
+    Raises:
+        ValueError: If the specification is not recognized.
+    """
+    kind, _, target = spec.partition(":")
+    kind = kind.strip().lower()
+
+    if kind == "notion" and not target:
+        return NotionSink(notion_client_factory(), max_workers=max_workers)
+
+    if not target:
+        raise ValueError(f"Sink '{spec}' requires a target, for example {kind}:PATH")
+
+    if kind == "jsonl":
+        return JsonlSink(target)
+    if kind == "sqlite":
+        return SqliteSink(target)
+    if kind == "webhook":
+        return WebhookSink(target)
+
+    raise ValueError(f"Unknown sink '{spec}'")
+
+
+class SinkDispatcher:
+    """
+    Write each entry to every sink in parallel.
+
+    Every sink gets its own thread pool, so a slow sink never holds up the
+    others. Batched sinks buffer records and are flushed from their own pool.
+    """
+
+    def __init__(
+        self,
+        sinks: List[Sink],
+        stats: Optional[RunStats] = None,
+        profiler: Optional[PipelineProfiler] = None,
+    ):
+        """
+        Initialize the dispatcher.
+
+        Args:
+            sinks: The sinks to write to.
+            stats: Optional counters for written and failed records per sink.
+            profiler: Optional profiler recording each sink's writes as a stage.
+        """
+        self.sinks = sinks
+        self.stats = stats or RunStats()
+        self.profiler = profiler
+        self._executors = {
+            id(sink): concurrent.futures.ThreadPoolExecutor(
+                max_workers=max(1, sink.max_workers),
+                thread_name_prefix=f"sink-{sink.name}",
+            )
+            for sink in sinks
+        }
+        self._buffers: Dict[int, List[EntryRecord]] = {id(sink): [] for sink in sinks}
+        self._pending_batches: List[concurrent.futures.Future] = []
+        self._lock = threading.Lock()
+
+    def _write(self, sink: Sink, records: List[EntryRecord]) -> List[Optional[bool]]:
+        """Write records to one sink and count the outcome."""
+        try:
+            with profile_stage(self.profiler, f"write_{sink.name}"):
+                results = sink.write_batch(records)
+        except Exception as e:
+            logger.error("Unexpected error writing %s entries to %s sink: %s", len(records), sink.name, e)
+            results = [False] * len(records)
+
+        written = sum(1 for result in results if result)
+        skipped = sum(1 for result in results if result is None)
+        self.stats.increment(f"sink_{sink.name}_written", written)
+        self.stats.increment(f"sink_{sink.name}_skipped", skipped)
+        self.stats.increment(f"sink_{sink.name}_failed", len(records) - written - skipped)
+        return results
+
+    def _submit_batch(self, sink: Sink, records: List[EntryRecord]) -> None:
+        """Schedule a buffered batch on the sink's pool. Caller holds the lock."""
+        future = self._executors[id(sink)].submit(self._write, sink, records)
+        self._pending_batches.append(future)
+
+    def write(self, record: EntryRecord) -> bool:
+        """
+        Write a record to every sink.
+
+        Args:
+            record: The record to write.
+
+        Returns:
+            True if every unbatched sink wrote or already held the record.
+            Batched sinks only buffer the record here, so their outcome is
+            reported in the stats. Sinks taking new entries only get the
+            record after the other unbatched sinks have written it.
+        """
+        results = self._dispatch([sink for sink in self.sinks if not sink.new_entries_only], record)
+        if all(results):
+            results += self._dispatch([sink for sink in self.sinks if sink.new_entries_only], record)
+        return all(result is not False for result in results)
+
+    def _dispatch(self, sinks: List[Sink], record: EntryRecord) -> List[Optional[bool]]:
+        """Write a record to unbatched sinks, buffer it for batched ones and return the unbatched results."""
+        futures = []
+        for sink in sinks:
+            if sink.batch_size <= 1:
+                futures.append(self._executors[id(sink)].submit(self._write, sink, [record]))
+                continue
+
+            with self._lock:
+                buffer = self._buffers[id(sink)]
+                buffer.append(record)
+                if len(buffer) >= sink.batch_size:
+                    self._buffers[id(sink)] = []
+                    self._submit_batch(sink, buffer)
+
+        return [future.result()[0] for future in futures]
+
+    def find_existing(self, links: List[str], data_source_id: Optional[str] = None) -> Set[str]:
+        """
+        Return the links that every sink able to tell already holds.
+
+        Sinks that cannot tell, such as webhooks, are left out, so they do not
+        turn the check off for the others.
+
+        Args:
+            links: The entry links of a feed.
+            data_source_id: Target data source of the feed's entries.
+
+        Returns:
+            Links that can be skipped because no sink needs them.
+        """
+        if not self.sinks or not links:
+            return set()
+
+        existing_links: Optional[Set[str]] = None
+        for sink in self.sinks:
+            try:
+                sink_links = sink.find_existing(links, data_source_id)
+            except Exception as e:
+                logger.error("Unexpected error checking existing entries in %s sink: %s", sink.name, e)
+                sink_links = set()
+            # Keep querying the remaining sinks so they can warm their own indexes.
+            if sink_links is not None:
+                existing_links = set(sink_links) if existing_links is None else existing_links & set(sink_links)
+
+        return existing_links or set()
+
+    def flush(self) -> None:
+        """Write every buffered record and wait for pending batches."""
+        with self._lock:
+            for sink in self.sinks:
+                buffer = self._buffers[id(sink)]
+                if buffer:
+                    self._buffers[id(sink)] = []
+                    self._submit_batch(sink, buffer)
+            pending, self._pending_batches = self._pending_batches, []
+
+        concurrent.futures.wait(pending)
+
+    def close(self) -> None:
+        """Flush buffered records, stop the sink pools and close every sink."""
+        self.flush()
+        for executor in self._executors.values():
+            executor.shutdown(wait=True)
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except Exception as e:
+                logger.error("Failed to close %s sink: %s", sink.name, e)
@@ -0,0 +1,93 @@
+"""Round-robin API token pool for Feed to Somewhere."""
+
+import threading
+import time
+from typing import Callable, Collection, List, Optional
+
+from .metrics import RunStats
+
+
+class TokenPool:
+    """
+    Spread requests over several API tokens and steer around throttled ones.
+
+    Tokens are handed out round-robin. A token that was rate limited is skipped
+    until its ``Retry-After`` time has passed, so requests fail over to the other
+    tokens. When every token is throttled, the one that recovers first is used.
+    Tokens are referred to by index so the secrets never reach logs or metrics.
+    """
+
+    def __init__(self, size: int, default_cooldown: float = 1.0, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the pool.
+
+        Args:
+            size: The number of tokens.
+            default_cooldown: Seconds to skip a throttled token that sent no Retry-After.
+            clock: Monotonic time source.
+        """
+        if size <= 0:
+            raise ValueError("size must be a positive integer")
+
+        self.size = size
+        self.default_cooldown = default_cooldown
+        self.clock = clock
+        self.stats = RunStats()
+        self._throttled_until: List[float] = [0.0] * size
+        self._cursor = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self.size
+
+    @staticmethod
+    def label(index: int) -> str:
+        """Return the name a token is reported under."""
+        return f"token{index + 1}"
+
+    def next_index(self, exclude: Collection[int] = ()) -> Optional[int]:
+        """
+        Pick the token for the next request.
+
+        Args:
+            exclude: Tokens already tried for this request.
+
+        Returns:
+            The index of the next available token. When every remaining token is
+            throttled, the one recovering first is returned for a first attempt
+            and None is returned for a retry.
+        """
+        now = self.clock()
+        with self._lock:
+            candidates = [
+                (self._cursor + offset) % self.size
+                for offset in range(self.size)
+                if (self._cursor + offset) % self.size not in exclude
+            ]
+            if not candidates:
+                return None
+
+            available = [index for index in candidates if self._throttled_until[index] <= now]
+            if available:
+                index = available[0]
+            elif exclude:
+                return None
+            else:
+                index = min(candidates, key=lambda candidate: self._throttled_until[candidate])
+
+            self._cursor = (index + 1) % self.size
+        self.stats.increment(f"{self.label(index)}_requests")
+        return index
+
+    def throttle(self, index: int, retry_after: Optional[float] = None) -> None:
+        """
+        Skip a rate-limited token for a while.
+
+        Args:
+            index: The throttled token.
+            retry_after: Seconds the API asked to wait, if it said.
+        """
+        cooldown = self.default_cooldown if retry_after is None else retry_after
+        with self._lock:
+            self._throttled_until[index] = max(self._throttled_until[index], self.clock() + cooldown)
+        self.stats.increment(f"{self.label(index)}_throttled")
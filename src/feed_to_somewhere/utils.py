@@ -1,7 +1,11 @@
 """Utility functions for Feed to Somewhere."""
 
+import hashlib
+import importlib
 import re
-from typing import List, Optional
+import sys
+import types
+from typing import Any, List, Optional
 from datetime import datetime
 
 INVALID_TEXT_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f\ud800-\udfff]")
@@ -65,3 +69,50 @@ def get_current_date_iso() -> str:
         Current date in ISO format (YYYY-MM-DD).
     """
     return datetime.now().date().isoformat()
+
+
+def content_hash(*parts: str) -> str:
+    """
+    Build a short, stable digest of text values.
+
+    Args:
+        *parts: The text values to hash, in order.
+
+    Returns:
+        A hexadecimal digest that changes whenever any part changes.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8", "surrogatepass"))
+        digest.update(b"\x1f")
+    return digest.hexdigest()[:16]
+
+
+class LazyModule(types.ModuleType):
+    """
+    Stand-in for a module that is imported on first attribute access.
+
+    Attribute lookups are forwarded to the real module, so tests can still patch
+    attributes such as ``feedparser.parse`` through the importing module.
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        # import_module takes the per-module import lock, so concurrent first
+        # accesses from worker threads import the module exactly once.
+        return getattr(importlib.import_module(self.__name__), name)
+
+    def __repr__(self) -> str:
+        return f"<lazy module '{self.__name__}'>"
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """
+    Return a module that is only imported when it is first used.
+
+    Args:
+        name: The absolute module name.
+
+    Returns:
+        The module if it is already imported, otherwise a lazy stand-in.
+    """
+    return sys.modules.get(name) or LazyModule(name)
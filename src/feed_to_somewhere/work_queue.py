@@ -0,0 +1,300 @@
+"""Lease-based feed work queue for Feed to Somewhere."""
+
+import contextlib
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, Optional
+
+from .feed_sources import FeedSource
+from .logger import logger
+
+
+@dataclass(frozen=True)
+class Lease:
+    """A claimed feed job."""
+
+    source: FeedSource
+    owner: str
+    attempts: int
+
+
+class WorkQueue:
+    """
+    Share feed jobs between worker processes through a SQLite database.
+
+    A coordinator enqueues the feed list, and any number of workers claim feeds
+    one at a time. A claim is a lease that expires unless the worker renews it,
+    so feeds held by a crashed worker are claimed again once the lease runs out.
+    Feeds whose lease expired or that failed ``max_attempts`` times are marked
+    failed instead of being retried forever.
+
+    The database runs in WAL mode, which lets workers read while another one
+    writes. WAL needs shared memory between the processes, so the file must be
+    on a local filesystem, such as a volume shared by containers on one host.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            url TEXT PRIMARY KEY,
+            source TEXT NOT NULL,
+            priority INTEGER NOT NULL DEFAULT 0,
+            state TEXT NOT NULL DEFAULT 'pending',
+            lease_owner TEXT,
+            lease_expires REAL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            enqueued_at REAL NOT NULL,
+            finished_at REAL
+        )
+    """
+    INDEX = "CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (state, priority DESC, enqueued_at)"
+
+    def __init__(
+        self,
+        path: str,
+        lease_seconds: float = 300,
+        max_attempts: int = 3,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize the queue.
+
+        Args:
+            path: The SQLite database file.
+            lease_seconds: How long a claim lasts without renewal.
+            max_attempts: Claims after which an unfinished feed is marked failed.
+            clock: Time source returning epoch seconds.
+        """
+        if lease_seconds <= 0:
+            raise ValueError("lease_seconds must be a positive number")
+        if max_attempts <= 0:
+            raise ValueError("max_attempts must be a positive integer")
+
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.clock = clock
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use, enable WAL and create the schema."""
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Autocommit mode, so transactions are only the explicit BEGIN blocks.
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(self.SCHEMA)
+            connection.execute(self.INDEX)
+            self._connection = connection
+        return self._connection
+
+    @contextlib.contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run statements in a write transaction that other workers wait for."""
+        with self._lock:
+            connection = self._connect()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def enqueue(self, sources: Iterable[FeedSource]) -> int:
+        """
+        Add feeds as pending jobs.
+
+        Feeds already in the queue become pending again with their new options,
+        unless a worker currently holds them.
+
+        Args:
+            sources: The feeds to enqueue.
+
+        Returns:
+            The number of feeds enqueued.
+        """
+        now = self.clock()
+        rows = [
+            (source.url, json.dumps(source.to_dict()), source.priority, now)
+            for source in sources
+        ]
+        with self._transaction() as connection:
+            connection.executemany(
+                """
+                INSERT INTO jobs (url, source, priority, state, attempts, enqueued_at)
+                VALUES (?, ?, ?, 'pending', 0, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    source = excluded.source,
+                    priority = excluded.priority,
+                    enqueued_at = excluded.enqueued_at,
+                    state = CASE
+                        WHEN jobs.state = 'leased' AND jobs.lease_expires > excluded.enqueued_at THEN jobs.state
+                        ELSE 'pending'
+                    END,
+                    attempts = CASE
+                        WHEN jobs.state = 'leased' AND jobs.lease_expires > excluded.enqueued_at THEN jobs.attempts
+                        ELSE 0
+                    END
+                """,
+                rows,
+            )
+        return len(rows)
+
+    def claim(self) -> Optional[Lease]:
+        """
+        Lease the next feed, highest priority and longest waiting first.
+
+        Returns:
+            The lease, or None if no feed is available.
+        """
+        now = self.clock()
+        owner = f"{self.worker_id}:{uuid.uuid4().hex}"
+        with self._transaction() as connection:
+            connection.execute(
+                """
+                UPDATE jobs SET state = 'failed', lease_owner = NULL, finished_at = ?
+                WHERE state = 'leased' AND lease_expires <= ? AND attempts >= ?
+                """,
+                (now, now, self.max_attempts),
+            )
+            row = connection.execute(
+                """
+                SELECT url, source, attempts FROM jobs
+                WHERE state = 'pending' OR (state = 'leased' AND lease_expires <= ?)
+                ORDER BY priority DESC, enqueued_at, url
+                LIMIT 1
+                """,
+                (now,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            url, source, attempts = row
+            connection.execute(
+                """
+                UPDATE jobs SET state = 'leased', lease_owner = ?, lease_expires = ?, attempts = attempts + 1
+                WHERE url = ?
+                """,
+                (owner, now + self.lease_seconds, url),
+            )
+
+        return Lease(source=FeedSource.from_dict(json.loads(source)), owner=owner, attempts=attempts + 1)
+
+    def _update_lease(self, lease: Lease, assignments: str, *params) -> bool:
+        """Update a job if the lease still holds it."""
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                f"UPDATE jobs SET {assignments} WHERE url = ? AND lease_owner = ? AND state = 'leased'",
+                (*params, lease.source.url, lease.owner),
+            )
+            return cursor.rowcount == 1
+
+    def renew(self, lease: Lease) -> bool:
+        """
+        Extend a lease.
+
+        Returns:
+            False if the lease was lost, for example because it expired and
+            another worker claimed the feed.
+        """
+        return self._update_lease(lease, "lease_expires = ?", self.clock() + self.lease_seconds)
+
+    def complete(self, lease: Lease) -> bool:
+        """
+        Mark a leased feed as done.
+
+        Returns:
+            False if the lease was lost before completion.
+        """
+        return self._update_lease(
+            lease,
+            "state = 'done', lease_owner = NULL, lease_expires = NULL, finished_at = ?",
+            self.clock(),
+        )
+
+    def release(self, lease: Lease, failed: bool = True) -> bool:
+        """
+        Give a leased feed back so another worker can claim it right away.
+
+        Args:
+            lease: The lease to give back.
+            failed: Whether processing failed. A failed feed counts as an
+                attempt and is marked failed once it used up ``max_attempts``,
+                so a feed that always raises is not claimed again forever. A
+                feed given back for another reason, such as shutdown, gets its
+                attempt back.
+
+        Returns:
+            False if the lease was lost before it was released.
+        """
+        if not failed:
+            return self._update_lease(
+                lease,
+                "state = 'pending', lease_owner = NULL, lease_expires = NULL, attempts = MAX(attempts - 1, 0)",
+            )
+        return self._update_lease(
+            lease,
+            """
+            state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+            finished_at = CASE WHEN attempts >= ? THEN ? ELSE finished_at END,
+            lease_owner = NULL, lease_expires = NULL
+            """,
+            self.max_attempts,
+            self.max_attempts,
+            self.clock(),
+        )
+
+    @contextlib.contextmanager
+    def keep_alive(self, lease: Lease) -> Iterator[threading.Event]:
+        """
+        Renew a lease in the background while the block runs.
+
+        Yields:
+            An event that is set if the lease was lost.
+        """
+        stopped = threading.Event()
+        lost = threading.Event()
+
+        def renew_until_stopped() -> None:
+            while not stopped.wait(self.lease_seconds / 3):
+                try:
+                    renewed = self.renew(lease)
+                except sqlite3.Error as e:
+                    logger.warning("Failed to renew the lease on %s: %s", lease.source.url, e)
+                    continue
+                if not renewed:
+                    logger.warning("Lost the lease on %s; another worker may process it", lease.source.url)
+                    lost.set()
+                    return
+
+        renewer = threading.Thread(target=renew_until_stopped, name="lease-renewer", daemon=True)
+        renewer.start()
+        try:
+            yield lost
+        finally:
+            stopped.set()
+            renewer.join()
+
+    def counts(self) -> Dict[str, int]:
+        """Return the number of jobs in each state."""
+        with self._lock:
+            rows = self._connect().execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall()
+        return dict(rows)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
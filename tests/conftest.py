@@ -7,7 +7,7 @@ from unittest.mock import patch, MagicMock
 @pytest.fixture
 def mock_notion_client():
     """Fixture to mock the Notion client."""
-    with patch('feed_to_somewhere.notion_client.Client') as mock_client_class:
+    with patch('feed_to_somewhere.notion_client.notion_sdk.Client') as mock_client_class:
         mock_client = MagicMock()
         mock_client_class.return_value = mock_client
         yield mock_client
@@ -30,7 +30,7 @@ def mock_requests():
 @pytest.fixture
 def mock_bs4():
     """Fixture to mock BeautifulSoup."""
-    with patch('feed_to_somewhere.feed_processor.BeautifulSoup') as mock_bs:
+    with patch('feed_to_somewhere.feed_processor.bs4.BeautifulSoup') as mock_bs:
         yield mock_bs
 
 
@@ -0,0 +1,79 @@
+"""Tests for the charsets module."""
+
+import codecs
+import unittest
+from unittest.mock import patch
+
+from feed_to_somewhere.charsets import charset_from_content_type, charset_from_meta, decode_html
+
+TEXT = "Café crème – naïve über"
+
+
+class TestCharsetDeclarations(unittest.TestCase):
+    """Test cases for reading declared charsets."""
+
+    def test_charset_from_content_type(self):
+        """Test the charset parameter is read and mapped to a codec."""
+        self.assertEqual(charset_from_content_type("text/html; charset=UTF-8"), "utf_8")
+        self.assertEqual(charset_from_content_type('text/html; charset="Shift_JIS"'), "shift_jis")
+        self.assertEqual(charset_from_content_type("text/html; charset=ISO-8859-1"), "cp1252")
+        self.assertIsNone(charset_from_content_type("text/html"))
+        self.assertIsNone(charset_from_content_type("text/html; charset=bogus"))
+        self.assertIsNone(charset_from_content_type(None))
+
+    def test_charset_from_meta(self):
+        """Test both meta forms are found near the start of the page only."""
+        self.assertEqual(charset_from_meta(b'<head><meta charset="iso-8859-2">'), "iso8859_2")
+        self.assertEqual(
+            charset_from_meta(b'<meta http-equiv="Content-Type" content="text/html; charset=koi8-r">'),
+            "koi8_r",
+        )
+        self.assertEqual(charset_from_meta(b'<meta charset="utf-16">'), "utf_8")
+        self.assertIsNone(charset_from_meta(b" " * 100 + b'<meta charset="koi8-r">', sniff_bytes=50))
+
+
+class TestDecodeHtml(unittest.TestCase):
+    """Test cases for decode_html."""
+
+    def test_byte_order_mark_wins(self):
+        """Test a BOM overrides any declaration."""
+        content = codecs.BOM_UTF16_LE + "<p>{}</p>".format(TEXT).encode("utf-16-le")
+
+        self.assertEqual(decode_html(content, "text/html; charset=iso-8859-1"), f"<p>{TEXT}</p>")
+
+    def test_header_charset_is_trusted(self):
+        """Test the Content-Type charset decodes a page without a meta declaration."""
+        content = f"<p>{TEXT}</p>".encode("cp1252")
+
+        self.assertEqual(decode_html(content, "text/html; charset=windows-1252"), f"<p>{TEXT}</p>")
+
+    def test_meta_charset_is_used_without_header(self):
+        """Test the meta declaration is used when the header names no charset."""
+        content = f'<meta charset="iso-8859-15"><p>{TEXT.replace(chr(0x2013), "-")}</p>'.encode("iso-8859-15")
+
+        self.assertIn("Café", decode_html(content, "text/html"))
+
+    def test_wrong_declaration_falls_through(self):
+        """Test a declaration the bytes do not fit is skipped in favour of the next one."""
+        content = f'<meta charset="windows-1252"><p>{TEXT}</p>'.encode("cp1252")
+
+        self.assertEqual(
+            decode_html(content, "text/html; charset=utf-8"),
+            f'<meta charset="windows-1252"><p>{TEXT}</p>',
+        )
+
+    @patch("feed_to_somewhere.charsets.charset_normalizer")
+    def test_detection_only_runs_as_last_resort(self, mock_charset_normalizer):
+        """Test the detector is skipped for declared or UTF-8 pages and used otherwise."""
+        decode_html(f"<p>{TEXT}</p>".encode("utf-8"))
+        mock_charset_normalizer.from_bytes.assert_not_called()
+
+        mock_charset_normalizer.from_bytes.return_value.best.return_value = "detected"
+        self.assertEqual(decode_html(f"<p>{TEXT}</p>".encode("cp1252")), "detected")
+
+        mock_charset_normalizer.from_bytes.return_value.best.return_value = None
+        self.assertEqual(decode_html(b"<p>\xe9</p>"), "<p>é</p>")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+"""Tests for the claims module."""
+
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+from feed_to_somewhere.claims import ClaimLedger
+
+
+class TestClaimLedger(unittest.TestCase):
+    """Test cases for the ClaimLedger class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.clock = MagicMock(return_value=1000.0)
+        self.ledgers = []
+
+    def tearDown(self):
+        """Tear down test fixtures."""
+        for ledger in self.ledgers:
+            ledger.close()
+        self.temp_dir.cleanup()
+
+    def make_ledger(self, **kwargs):
+        """Open a ledger on the shared database, as another process would."""
+        kwargs.setdefault("clock", self.clock)
+        ledger = ClaimLedger.from_state_dir(self.temp_dir.name, **kwargs)
+        self.ledgers.append(ledger)
+        return ledger
+
+    def test_claims_are_exclusive_until_released(self):
+        """Test only one ledger holds a key, and only its owner can release it."""
+        first = self.make_ledger()
+        second = self.make_ledger()
+
+        self.assertTrue(first.try_claim("source\0https://example.com"))
+        self.assertFalse(second.try_claim("source\0https://example.com"))
+        second.release("source\0https://example.com")
+        self.assertFalse(second.try_claim("source\0https://example.com"))
+
+        first.release("source\0https://example.com")
+        self.assertTrue(second.try_claim("source\0https://example.com"))
+        self.assertEqual(first.path, os.path.join(self.temp_dir.name, "claims.db"))
+
+    def test_expired_claims_are_taken_over(self):
+        """Test claims left behind by a crashed process expire."""
+        crashed = self.make_ledger(ttl=60)
+        other = self.make_ledger(ttl=60)
+        crashed.try_claim("key")
+
+        self.clock.return_value += 59
+        self.assertFalse(other.try_claim("key"))
+        self.clock.return_value += 1
+        self.assertTrue(other.try_claim("key"))
+
+    def test_concurrent_claims_have_one_winner(self):
+        """Test racing ledgers claim each key exactly once."""
+        keys = [f"https://example.com/{index}" for index in range(50)]
+        wins = []
+        wins_lock = threading.Lock()
+
+        def claim_all():
+            ledger = self.make_ledger()
+            for key in keys:
+                if ledger.try_claim(key):
+                    with wins_lock:
+                        wins.append(key)
+
+        workers = [threading.Thread(target=claim_all) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        self.assertEqual(sorted(wins), sorted(keys))
+
+    def test_rejects_non_positive_ttl(self):
+        """Test the claim lifetime must be positive."""
+        with self.assertRaises(ValueError):
+            ClaimLedger("claims.db", ttl=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
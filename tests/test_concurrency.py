@@ -0,0 +1,135 @@
+"""Tests for the concurrency module."""
+
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from feed_to_somewhere.concurrency import AdaptiveLimiter
+
+
+class TestAdaptiveLimiter(unittest.TestCase):
+    """Test cases for the AdaptiveLimiter class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.clock = MagicMock(return_value=0.0)
+
+    def run_request(self, limiter, latency=0.1, overloaded=False):
+        """Run one request through the limiter with a fixed latency."""
+        with limiter.slot() as permit:
+            self.clock.return_value += latency
+            if overloaded:
+                permit.mark_overloaded()
+
+    def test_successes_increase_limit_additively(self):
+        """Test a window of healthy requests raises the limit by about one."""
+        limiter = AdaptiveLimiter(initial_limit=4, max_limit=10, clock=self.clock)
+
+        for _ in range(4):
+            self.run_request(limiter)
+
+        self.assertEqual(limiter.limit, 4)
+        for _ in range(2):
+            self.run_request(limiter)
+        self.assertEqual(limiter.limit, 5)
+
+    def test_limit_stays_within_bounds(self):
+        """Test the limit never exceeds max_limit or drops below min_limit."""
+        limiter = AdaptiveLimiter(initial_limit=2, min_limit=1, max_limit=3, clock=self.clock)
+
+        for _ in range(50):
+            self.run_request(limiter)
+        self.assertEqual(limiter.limit, 3)
+
+        for _ in range(5):
+            self.run_request(limiter, overloaded=True)
+        self.assertEqual(limiter.limit, 1)
+
+    def test_overload_decreases_limit_once_per_window(self):
+        """Test requests started before a decrease do not cut the limit again."""
+        limiter = AdaptiveLimiter(initial_limit=8, clock=self.clock)
+
+        with limiter.slot() as first, limiter.slot() as second:
+            first.mark_overloaded()
+            second.mark_overloaded()
+
+        self.assertEqual(limiter.limit, 4)
+        self.assertEqual(limiter.stats.get("decreases"), 1)
+
+        self.run_request(limiter, overloaded=True)
+        self.assertEqual(limiter.limit, 2)
+
+    def test_latency_spike_decreases_limit(self):
+        """Test a request far slower than the recent average counts as overload."""
+        limiter = AdaptiveLimiter(initial_limit=8, max_limit=8, min_samples=5, clock=self.clock)
+        for _ in range(5):
+            self.run_request(limiter, latency=0.1)
+
+        self.run_request(limiter, latency=0.15)
+        self.assertEqual(limiter.limit, 8)
+        self.run_request(limiter, latency=1.0)
+        self.assertEqual(limiter.limit, 4)
+
+    def test_errors_release_without_changing_limit(self):
+        """Test failures that are not overload only free the slot."""
+        limiter = AdaptiveLimiter(initial_limit=2, clock=self.clock)
+
+        with self.assertRaises(ValueError):
+            with limiter.slot():
+                raise ValueError("not found")
+
+        self.assertEqual(limiter.in_flight, 0)
+        self.assertEqual(limiter.limit, 2)
+
+    def test_slot_waits_for_capacity(self):
+        """Test no more requests than the limit run at once."""
+        limiter = AdaptiveLimiter(initial_limit=2, max_limit=2)
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def request():
+            with limiter.slot():
+                with lock:
+                    running.append(1)
+                    peak.append(len(running))
+                time.sleep(0.01)
+                with lock:
+                    running.pop()
+
+        threads = [threading.Thread(target=request) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(max(peak), 2)
+
+    def test_slot_wait_times_out(self):
+        """Test waiting for capacity gives up after the timeout."""
+        limiter = AdaptiveLimiter(initial_limit=1, max_limit=1)
+
+        with limiter.slot():
+            with self.assertRaises(TimeoutError):
+                with limiter.slot(timeout=0.01):
+                    pass
+
+        self.assertEqual(limiter.in_flight, 0)
+        with limiter.slot(timeout=0):
+            self.assertEqual(limiter.in_flight, 1)
+
+    def test_rejects_invalid_settings(self):
+        """Test bounds and factors are validated."""
+        with self.assertRaises(ValueError):
+            AdaptiveLimiter(min_limit=0)
+        with self.assertRaises(ValueError):
+            AdaptiveLimiter(min_limit=4, max_limit=2)
+        with self.assertRaises(ValueError):
+            AdaptiveLimiter(backoff=1)
+        with self.assertRaises(ValueError):
+            AdaptiveLimiter(latency_tolerance=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
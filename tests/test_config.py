@@ -3,7 +3,7 @@
 import unittest
 from unittest.mock import patch
 
-from feed_to_somewhere.config import Config, require_one_of, require_positive_int
+from feed_to_somewhere.config import Config, require_one_of, require_positive_int, split_tokens
 
 
 class TestConfig(unittest.TestCase):
@@ -19,6 +19,7 @@ class TestConfig(unittest.TestCase):
         self.assertIsNone(config.database_id)
         self.assertEqual(config.feed_list_path, "feed_list.csv")
         self.assertEqual(config.chunk_size, 2000)
+        self.assertIsNone(config.state_dir)
 
     def test_config_reads_data_source_id_when_present(self):
         """Test Config reads a preferred Notion data source ID."""
@@ -35,6 +36,12 @@ class TestConfig(unittest.TestCase):
         with self.assertRaises(ValueError):
             _ = config.chunk_size
 
+    def test_split_tokens(self):
+        """Test comma-separated tokens are split and blanks dropped."""
+        self.assertEqual(split_tokens("secret_a, secret_b,,"), ["secret_a", "secret_b"])
+        self.assertEqual(split_tokens("secret_a"), ["secret_a"])
+        self.assertEqual(split_tokens(None), [])
+
     def test_require_positive_int_rejects_invalid_values(self):
         """Test require_positive_int rejects invalid strings."""
         with self.assertRaises(ValueError):
@@ -0,0 +1,55 @@
+"""Tests for the content_policy module."""
+
+import unittest
+
+from feed_to_somewhere.content_policy import ContentPolicy
+
+
+class TestContentPolicy(unittest.TestCase):
+    """Test cases for the ContentPolicy class."""
+
+    def test_rejects_negative_min_length(self):
+        """Test the policy rejects a negative minimum length."""
+        with self.assertRaises(ValueError):
+            ContentPolicy(min_length=-1)
+
+    def test_is_truncated_detects_common_markers(self):
+        """Test ellipses and read-more links count as truncation."""
+        policy = ContentPolicy()
+
+        for text in (
+            "The story goes on...",
+            "The story goes on …",
+            "The story goes on [...]",
+            "The story goes on. Read more »",
+            "The story goes on. Continue reading →",
+            "The story goes on. Read the full article",
+            "記事の冒頭です。続きを読む",
+        ):
+            with self.subTest(text=text):
+                self.assertTrue(policy.is_truncated(text))
+
+    def test_is_truncated_ignores_complete_text(self):
+        """Test ordinary sentences are not mistaken for truncation."""
+        policy = ContentPolicy()
+
+        for text in ("A complete body.", "This post was already read.", "I read more books now"):
+            with self.subTest(text=text):
+                self.assertFalse(policy.is_truncated(text))
+
+    def test_is_sufficient_applies_min_length(self):
+        """Test short feed bodies are insufficient when a minimum is set."""
+        policy = ContentPolicy(min_length=20)
+
+        self.assertFalse(policy.is_sufficient(""))
+        self.assertFalse(policy.is_sufficient("Too short."))
+        self.assertTrue(policy.is_sufficient("This body is long enough."))
+
+    def test_is_sufficient_can_ignore_truncation(self):
+        """Test truncation detection can be disabled."""
+        self.assertFalse(ContentPolicy().is_sufficient("Teaser..."))
+        self.assertTrue(ContentPolicy(detect_truncation=False).is_sufficient("Teaser..."))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+"""Tests for the feed_entries module."""
+
+import time
+import unittest
+
+from feed_to_somewhere.feed_entries import FeedEntry
+
+
+class TestFeedEntry(unittest.TestCase):
+    """Test cases for the FeedEntry class."""
+
+    def test_from_mapping_projects_used_fields(self):
+        """Test only the fields the pipeline uses are kept."""
+        published = time.struct_time((2023, 1, 2, 3, 4, 5, 0, 2, 0))
+        entry = FeedEntry.from_mapping({
+            "title": "Title",
+            "link": " https://example.com/a ",
+            "id": "tag:example.com,2023:a",
+            "content": [{"value": "<p>Full</p>"}, {"value": ""}],
+            "summary": "<p>Short</p>",
+            "published_parsed": published,
+            "links": [{"href": "https://example.com/a"}],
+            "tags": [{"term": "news"}],
+        })
+
+        self.assertEqual(entry.title, "Title")
+        self.assertEqual(entry.link, "https://example.com/a")
+        self.assertEqual(entry.guid, "tag:example.com,2023:a")
+        self.assertEqual(entry.body_candidates, ("<p>Full</p>", "<p>Short</p>"))
+        self.assertEqual(entry.published_parsed, published)
+        self.assertEqual(entry.alternate_link, "")
+
+    def test_from_mapping_keeps_alternate_link(self):
+        """Test FeedBurner origin links and other alternate links are kept for hedged fetches."""
+        feedburner = FeedEntry.from_mapping({
+            "link": "https://feeds.example.com/~r/a",
+            "feedburner_origlink": "https://example.com/a",
+        })
+        alternate = FeedEntry.from_mapping({
+            "link": "https://example.com/a",
+            "links": [
+                {"rel": "alternate", "href": "https://example.com/a"},
+                {"rel": "enclosure", "href": "https://example.com/a.mp3"},
+                {"rel": "alternate", "href": "https://mirror.example.com/a"},
+            ],
+        })
+
+        self.assertEqual(feedburner.alternate_link, "https://example.com/a")
+        self.assertEqual(alternate.alternate_link, "https://mirror.example.com/a")
+
+    def test_from_mapping_handles_missing_fields(self):
+        """Test entries without optional fields still project cleanly."""
+        entry = FeedEntry.from_mapping({"title": None, "link": None})
+
+        self.assertEqual(entry, FeedEntry(title="", link=""))
+
+    def test_from_mapping_drops_duplicate_summary(self):
+        """Test identical summary and description are stored once."""
+        entry = FeedEntry.from_mapping({"summary": "Same", "description": "Same"})
+
+        self.assertEqual(entry.body_candidates, ("Same",))
+
+    def test_records_use_slots(self):
+        """Test records have no per-instance dict."""
+        entry = FeedEntry(title="Title", link="https://example.com/a")
+
+        self.assertFalse(hasattr(entry, "__dict__"))
+
+    def test_coerce_keeps_existing_records(self):
+        """Test coerce returns FeedEntry instances unchanged."""
+        entry = FeedEntry(title="Title", link="https://example.com/a")
+
+        self.assertIs(FeedEntry.coerce(entry), entry)
+        self.assertEqual(FeedEntry.coerce({"title": "Title", "link": "https://example.com/a"}), entry)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+"""Tests for the feed_health module."""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from feed_to_somewhere.feed_health import FeedHealthStore
+
+
+class FakeClock:
+    """Controllable epoch clock."""
+
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestFeedHealthStore(unittest.TestCase):
+    """Test cases for the FeedHealthStore class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.logger_patcher = patch("feed_to_somewhere.feed_health.logger")
+        self.mock_logger = self.logger_patcher.start()
+        self.clock = FakeClock()
+        self.store = FeedHealthStore(
+            failure_threshold=2,
+            base_backoff_seconds=60,
+            max_backoff_seconds=300,
+            clock=self.clock,
+        )
+        self.url = "https://example.com/feed"
+
+    def tearDown(self):
+        """Tear down test fixtures."""
+        self.logger_patcher.stop()
+
+    def test_unknown_feed_is_attempted(self):
+        """Test feeds without history are always attempted."""
+        self.assertTrue(self.store.should_attempt(self.url))
+
+    def test_circuit_opens_after_threshold(self):
+        """Test the circuit opens once consecutive failures reach the threshold."""
+        self.store.record_failure(self.url, 1.0, "timeout")
+        self.assertTrue(self.store.should_attempt(self.url))
+
+        self.store.record_failure(self.url, 1.0, "timeout")
+        self.assertFalse(self.store.should_attempt(self.url))
+        self.mock_logger.warning.assert_called_once()
+
+        self.clock.now += 60
+        self.assertTrue(self.store.should_attempt(self.url))
+
+    def test_backoff_grows_exponentially_and_is_capped(self):
+        """Test backoff doubles per failure and stops at the maximum."""
+        self.assertEqual(self.store.backoff_seconds(1), 0)
+        self.assertEqual(self.store.backoff_seconds(2), 60)
+        self.assertEqual(self.store.backoff_seconds(3), 120)
+        self.assertEqual(self.store.backoff_seconds(4), 240)
+        self.assertEqual(self.store.backoff_seconds(5), 300)
+        self.assertEqual(self.store.backoff_seconds(500), 300)
+
+    def test_success_closes_circuit_and_tracks_latency(self):
+        """Test success resets failures and updates the average latency."""
+        self.store.record_failure(self.url, 3.0, "timeout")
+        self.store.record_failure(self.url, 3.0, "timeout")
+        self.store.record_success(self.url, 0.0)
+
+        record = self.store.get(self.url)
+        self.assertEqual(record["consecutive_failures"], 0)
+        self.assertEqual(record["last_success"], self.clock.now)
+        self.assertIsNone(record["retry_after"])
+        self.assertAlmostEqual(record["average_latency"], 2.0)
+        self.assertTrue(self.store.should_attempt(self.url))
+
+    def test_is_due_uses_last_attempt(self):
+        """Test poll intervals are measured from the last fetch attempt."""
+        self.assertTrue(self.store.is_due(self.url, 600))
+
+        self.store.record_success(self.url, 0.1)
+        self.assertFalse(self.store.is_due(self.url, 600))
+
+        self.clock.now += 600
+        self.assertTrue(self.store.is_due(self.url, 600))
+
+    def test_last_seen_entry_is_remembered(self):
+        """Test the newest processed entry of a feed is tracked."""
+        self.assertIsNone(self.store.get_last_seen(self.url))
+
+        self.store.record_last_seen(self.url, "https://example.com/newest")
+
+        self.assertEqual(self.store.get_last_seen(self.url), "https://example.com/newest")
+        self.assertTrue(self.store.should_attempt(self.url))
+
+    def test_state_persists_between_instances(self):
+        """Test health state is saved to and loaded from disk."""
+        with tempfile.TemporaryDirectory() as state_dir:
+            store = FeedHealthStore.from_state_dir(state_dir, clock=self.clock)
+            store.record_failure(self.url, 1.0, "HTTP 404")
+            store.save()
+
+            self.assertTrue(os.path.exists(os.path.join(state_dir, FeedHealthStore.FILE_NAME)))
+            reloaded = FeedHealthStore.from_state_dir(state_dir, clock=self.clock)
+
+        self.assertEqual(reloaded.get(self.url)["last_error"], "HTTP 404")
+
+    def test_load_ignores_corrupt_state(self):
+        """Test an unreadable state file does not prevent startup."""
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            f.write("{not json")
+
+        try:
+            store = FeedHealthStore(f.name)
+        finally:
+            os.unlink(f.name)
+
+        self.assertEqual(store.get(self.url), {})
+        self.mock_logger.warning.assert_called_once()
+
+    def test_format_report_lists_failing_feeds_first(self):
+        """Test the report orders feeds by consecutive failures."""
+        self.store.record_success("https://example.com/healthy", 0.5)
+        self.store.record_failure(self.url, 1.0, "HTTP 404")
+        self.store.record_failure(self.url, 1.0, "HTTP 404")
+
+        lines = self.store.format_report().splitlines()
+
+        self.assertIn("STATUS", lines[0])
+        self.assertTrue(lines[1].startswith("OPEN"))
+        self.assertIn(self.url, lines[1])
+        self.assertIn("HTTP 404", lines[1])
+        self.assertTrue(lines[2].startswith("OK"))
+
+    def test_format_report_without_data(self):
+        """Test the report handles an empty store."""
+        self.assertEqual(self.store.format_report(), "No feed health data recorded yet.")
+
+
+if __name__ == "__main__":
+    unittest.main()
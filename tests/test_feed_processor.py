@@ -1,9 +1,26 @@
 """Tests for the feed_processor module."""
 
+import tempfile
+import threading
+import time
 import unittest
-from unittest.mock import patch, MagicMock, mock_open
+from unittest.mock import ANY, patch, MagicMock, mock_open
 
+from requests.exceptions import HTTPError
+
+from feed_to_somewhere.content_policy import ContentPolicy
+from feed_to_somewhere.feed_entries import FeedEntry
 from feed_to_somewhere.feed_processor import FeedProcessor
+from feed_to_somewhere.feed_sources import FeedSource
+from feed_to_somewhere.feed_stream import UnsupportedFeedFormat
+from feed_to_somewhere.fetching import Deadline, DeadlineExceeded, FetchedPage
+from feed_to_somewhere.fingerprints import FingerprintIndex
+from feed_to_somewhere.hedging import HedgePolicy
+from feed_to_somewhere.redirects import RedirectCache
+from feed_to_somewhere.routing import RoutingRule
+from feed_to_somewhere.sharding import ShardSpec
+from feed_to_somewhere.shutdown import PendingEntryJournal
+from feed_to_somewhere.sinks import EntryRecord
 
 
 class TestFeedProcessor(unittest.TestCase):
@@ -85,6 +102,18 @@ class TestFeedProcessor(unittest.TestCase):
             self.assertEqual(urls[1], "http://example.com/feed2")
             self.mock_logger.info.assert_called_once()
 
+    def test_read_feed_urls_keeps_owned_shard(self):
+        """Test sharded processors only read the feeds their shards own."""
+        urls = [f"http://example{index}.com/feed" for index in range(20)]
+        shards = [ShardSpec(0, 2), ShardSpec(1, 2, salt="process")]
+        processor = FeedProcessor(notion_client=self.mock_notion_client, shards=shards)
+
+        with patch("builtins.open", mock_open(read_data="\n".join(urls))):
+            owned = processor.read_feed_urls("feed_list.csv")
+
+        self.assertEqual(owned, [url for url in urls if all(shard.owns(url) for shard in shards)])
+        self.assertLess(len(owned), len(urls))
+
     def test_read_feed_urls_empty_file(self):
         """Test read_feed_urls with an empty CSV file."""
         # Mock open function
@@ -122,6 +151,38 @@ class TestFeedProcessor(unittest.TestCase):
             self.assertEqual(self.mock_logger.warning.call_count, 1)
             self.assertEqual(self.mock_logger.info.call_count, 2)
 
+    def test_read_feed_sources_parses_option_columns(self):
+        """Test read_feed_sources reads per-feed options from extra columns."""
+        csv_content = (
+            "http://example.com/feed1,max_entries=5,skip_extraction=true,priority=2\n"
+            "http://example.com/feed2,data_source=team_b,poll_interval=30,host_concurrency=1\n"
+            "http://example.com/feed3,bogus=1\n"
+        )
+
+        with patch("builtins.open", mock_open(read_data=csv_content)):
+            sources = self.feed_processor.read_feed_sources("feed_list.csv")
+
+        self.assertEqual(
+            sources,
+            [
+                FeedSource("http://example.com/feed1", max_entries=5, skip_extraction=True, priority=2),
+                FeedSource(
+                    "http://example.com/feed2",
+                    data_source_id="team_b",
+                    poll_interval=30,
+                    host_concurrency=1,
+                ),
+            ],
+        )
+        self.mock_logger.warning.assert_called_once()
+
+    def test_read_feed_urls_ignores_option_columns(self):
+        """Test read_feed_urls keeps returning plain URLs."""
+        with patch("builtins.open", mock_open(read_data="http://example.com/feed1,priority=1\n")):
+            urls = self.feed_processor.read_feed_urls("feed_list.csv")
+
+        self.assertEqual(urls, ["http://example.com/feed1"])
+
     def test_read_feed_urls_io_error(self):
         """Test read_feed_urls with an IO error."""
         # Mock open function to raise an IOError
@@ -137,8 +198,16 @@ class TestFeedProcessor(unittest.TestCase):
     def test_fetch_feed_entries_success(self, mock_parse):
         """Test fetch_feed_entries with a valid feed."""
         # Mock feedparser response
-        mock_entry1 = MagicMock()
-        mock_entry2 = MagicMock()
+        mock_entry1 = {
+            "title": "Entry 1",
+            "link": " http://example.com/article1 ",
+            "id": "guid-1",
+            "content": [{"value": "<p>Full</p>"}],
+            "summary": "<p>Summary</p>",
+            "description": "<p>Summary</p>",
+            "tags": [{"term": "unused"}],
+        }
+        mock_entry2 = {"title": "Entry 2", "link": "http://example.com/article2"}
         mock_feed = MagicMock()
         mock_feed.entries = [mock_entry1, mock_entry2]
         mock_feed.bozo = False
@@ -149,8 +218,16 @@ class TestFeedProcessor(unittest.TestCase):
 
         # Assert
         self.assertEqual(len(entries), 2)
-        self.assertEqual(entries[0], mock_entry1)
-        self.assertEqual(entries[1], mock_entry2)
+        self.assertEqual(
+            entries[0],
+            FeedEntry(
+                title="Entry 1",
+                link="http://example.com/article1",
+                guid="guid-1",
+                body_candidates=("<p>Full</p>", "<p>Summary</p>"),
+            ),
+        )
+        self.assertEqual(entries[1].link, "http://example.com/article2")
         mock_parse.assert_called_once_with("http://example.com/feed")
         self.mock_logger.info.assert_called_once()
 
@@ -199,13 +276,109 @@ class TestFeedProcessor(unittest.TestCase):
         mock_parse.assert_called_once_with("http://example.com/feed")
         self.mock_logger.error.assert_called_once()
 
-    @patch("feed_to_somewhere.feed_processor.requests.get")
-    @patch("feed_to_somewhere.feed_processor.BeautifulSoup")
-    def test_extract_content_success(self, mock_bs, mock_get):
+    @patch("feed_to_somewhere.feed_processor.feedparser.parse")
+    def test_fetch_feed_entries_records_health(self, mock_parse):
+        """Test fetch_feed_entries records successes and failures in the health store."""
+        health_store = MagicMock()
+        processor = FeedProcessor(notion_client=self.mock_notion_client, health_store=health_store)
+        mock_feed = MagicMock()
+        mock_feed.entries = [MagicMock()]
+        mock_feed.bozo = False
+        mock_feed.status = 200
+        mock_parse.return_value = mock_feed
+
+        processor.fetch_feed_entries("http://example.com/feed")
+        health_store.record_success.assert_called_once()
+
+        mock_feed.status = 404
+        processor.fetch_feed_entries("http://example.com/feed")
+        health_store.record_failure.assert_called_once()
+        self.assertEqual(health_store.record_failure.call_args.args[2], "HTTP 404")
+
+        mock_parse.side_effect = Exception("DNS failure")
+        entries = processor.fetch_feed_entries("http://example.com/feed")
+        self.assertEqual(entries, [])
+        self.assertEqual(health_store.record_failure.call_count, 2)
+
+    @patch("feed_to_somewhere.feed_processor.stream_feed_entries")
+    def test_fetch_feed_entries_streaming(self, mock_stream):
+        """Test streamed fetches pass the entry limit and last-seen link and record health."""
+        health_store = MagicMock()
+        processor = FeedProcessor(notion_client=self.mock_notion_client, health_store=health_store)
+        mock_stream.return_value = [FeedEntry(title="Entry 1", link="http://example.com/article1")]
+
+        entries = processor.fetch_feed_entries_streaming(
+            "http://example.com/feed", max_entries=5, stop_at="http://example.com/old"
+        )
+
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(mock_stream.call_args.kwargs["max_entries"], 5)
+        self.assertEqual(mock_stream.call_args.kwargs["stop_at"], {"http://example.com/old"})
+        health_store.record_success.assert_called_once()
+
+    @patch("feed_to_somewhere.feed_processor.stream_feed_entries")
+    def test_fetch_feed_entries_streaming_falls_back_to_feedparser(self, mock_stream):
+        """Test documents the streaming parser cannot read go through feedparser."""
+        mock_stream.side_effect = UnsupportedFeedFormat("unsupported feed root element html")
+        fallback_entries = [FeedEntry(title="Entry 1", link="http://example.com/article1")]
+
+        with patch.object(self.feed_processor, "fetch_feed_entries", return_value=fallback_entries) as mock_fetch:
+            entries = self.feed_processor.fetch_feed_entries_streaming("http://example.com/feed")
+
+        self.assertEqual(entries, fallback_entries)
+        mock_fetch.assert_called_once_with("http://example.com/feed")
+        self.assertEqual(self.feed_processor.stats.get("feed_stream_fallbacks"), 1)
+
+    @patch("feed_to_somewhere.feed_processor.stream_feed_entries")
+    def test_fetch_feed_entries_streaming_records_http_failures(self, mock_stream):
+        """Test HTTP errors from streamed fetches are recorded as feed failures."""
+        health_store = MagicMock()
+        processor = FeedProcessor(notion_client=self.mock_notion_client, health_store=health_store)
+        mock_stream.side_effect = HTTPError("404 Client Error", response=MagicMock(status_code=404))
+
+        entries = processor.fetch_feed_entries_streaming("http://example.com/feed")
+
+        self.assertEqual(entries, [])
+        self.assertEqual(health_store.record_failure.call_args.args[2], "HTTP 404")
+
+    def test_get_feed_failure_treats_empty_bozo_feed_as_failure(self):
+        """Test malformed feeds without entries count as failures."""
+        mock_feed = MagicMock()
+        mock_feed.status = None
+        mock_feed.bozo = True
+        mock_feed.bozo_exception = ValueError("bad xml")
+        mock_feed.entries = []
+
+        self.assertEqual(FeedProcessor.get_feed_failure(mock_feed), "bad xml")
+
+        mock_feed.entries = [MagicMock()]
+        self.assertIsNone(FeedProcessor.get_feed_failure(mock_feed))
+
+    @patch("feed_to_somewhere.feed_processor.fetch_page")
+    def test_extract_content_decodes_with_header_charset(self, mock_fetch_page):
+        """Test the page is decoded with the charset of its Content-Type header."""
+        mock_fetch_page.return_value = FetchedPage(
+            url="http://example.com/article",
+            status_code=200,
+            headers={"content-type": "text/html; charset=windows-1252"},
+            content="<p>Caf\u00e9 cr\u00e8me \u2013 na\u00efve</p>".encode("cp1252"),
+        )
+
+        content = self.feed_processor.extract_content("http://example.com/article")
+
+        self.assertEqual(content, "Caf\u00e9 cr\u00e8me \u2013 na\u00efve")
+
+    @patch("feed_to_somewhere.feed_processor.fetch_page")
+    @patch("feed_to_somewhere.feed_processor.bs4.BeautifulSoup")
+    def test_extract_content_success(self, mock_bs, mock_fetch_page):
         """Test extract_content with a valid URL."""
-        # Mock requests response
-        mock_response = MagicMock()
-        mock_get.return_value = mock_response
+        # Mock the downloaded page
+        mock_fetch_page.return_value = FetchedPage(
+            url="http://example.com/article",
+            status_code=200,
+            headers={},
+            content=b"<p>Paragraph 1</p>",
+        )
 
         # Mock BeautifulSoup
         mock_p1 = MagicMock()
@@ -221,33 +394,134 @@ class TestFeedProcessor(unittest.TestCase):
 
         # Assert
         self.assertEqual(content, "Paragraph 1 Paragraph 2")
-        mock_get.assert_called_once_with(
+        mock_fetch_page.assert_called_once_with(
             "http://example.com/article",
+            ANY,
             headers=self.feed_processor.ARTICLE_REQUEST_HEADERS,
-            timeout=30,
         )
-        mock_bs.assert_called_once()
+        self.assertEqual(mock_fetch_page.call_args.args[1].seconds, 60.0)
+        mock_bs.assert_called_once_with("<p>Paragraph 1</p>", "html.parser")
         mock_soup.find_all.assert_called_once_with("p")
 
-    @patch("feed_to_somewhere.feed_processor.requests.get")
-    def test_extract_content_request_error(self, mock_get):
+    @patch("feed_to_somewhere.feed_processor.fetch_page")
+    def test_extract_content_request_error(self, mock_fetch_page):
         """Test extract_content with a request error."""
-        # Mock requests to raise an exception
+        # Mock the fetch to raise an exception
         from requests.exceptions import RequestException
-        mock_get.side_effect = RequestException("Connection error")
+        mock_fetch_page.side_effect = RequestException("Connection error")
 
         # Test
         content = self.feed_processor.extract_content("http://example.com/article")
 
         # Assert
         self.assertEqual(content, "")
-        mock_get.assert_called_once_with(
-            "http://example.com/article",
-            headers=self.feed_processor.ARTICLE_REQUEST_HEADERS,
-            timeout=30,
-        )
+        mock_fetch_page.assert_called_once()
         self.mock_logger.error.assert_called_once()
 
+    @patch("feed_to_somewhere.feed_processor.fetch_page")
+    def test_extract_content_backs_off_overloaded_host(self, mock_fetch_page):
+        """Test adaptive concurrency cuts the limit of a host answering 503, not of other hosts."""
+        processor = FeedProcessor(notion_client=self.mock_notion_client, max_workers=8, adaptive_concurrency=True)
+        mock_fetch_page.side_effect = [
+            HTTPError("Service Unavailable", response=MagicMock(status_code=503)),
+            HTTPError("Not Found", response=MagicMock(status_code=404)),
+        ]
+
+        processor.extract_content("http://slow.example.com/article")
+        processor.extract_content("http://other.example.com/article")
+
+        self.assertEqual(processor.concurrency_limits(), {"other.example.com": 4, "slow.example.com": 2})
+
+    @patch("feed_to_somewhere.feed_processor.fetch_page")
+    def test_extract_content_stops_waiting_for_busy_host_at_deadline(self, mock_fetch_page):
+        """Test waiting for an adaptive host slot ends at the fetch deadline."""
+        processor = FeedProcessor(
+            notion_client=self.mock_notion_client, adaptive_concurrency=True, article_timeout=0.01
+        )
+
+        with processor._origin_slot("http://example.com/a"), processor._origin_slot("http://example.com/b"):
+            with processor._origin_slot("http://example.com/c"), processor._origin_slot("http://example.com/d"):
+                content = processor.extract_content("http://example.com/article")
+
+        self.assertEqual(content, "")
+        mock_fetch_page.assert_not_called()
+        self.assertEqual(processor.deadline_hits.snapshot(), {"example.com": 1})
+
+    @patch("feed_to_somewhere.feed_processor.fetch_page")
+    def test_extract_content_counts_deadline_hits_by_host(self, mock_fetch_page):
+        """Test fetches running out of time are counted per host."""
+        mock_fetch_page.side_effect = DeadlineExceeded("http://slow.example.com/a", 60)
+
+        content = self.feed_processor.extract_content("http://Slow.example.com/a")
+        self.feed_processor.extract_content("http://slow.example.com/b")
+
+        self.assertEqual(content, "")
+        self.assertEqual(self.feed_processor.stats.get("article_deadline_exceeded"), 2)
+        self.assertEqual(self.feed_processor.deadline_hits.snapshot(), {"slow.example.com": 2})
+        self.mock_logger.warning.assert_called()
+        self.mock_logger.error.assert_not_called()
+
+    @patch("feed_to_somewhere.feed_processor.fetch_page")
+    def test_extract_content_uses_earlier_entry_deadline(self, mock_fetch_page):
+        """Test an entry deadline closer than the article timeout bounds the fetch."""
+        clock = MagicMock(return_value=100.0)
+        processor = FeedProcessor(notion_client=self.mock_notion_client, article_timeout=60, clock=clock)
+        mock_fetch_page.return_value = FetchedPage(url="http://example.com/a", status_code=200, headers={}, content=b"")
+
+        processor.extract_content("http://example.com/a", deadline=Deadline(5, clock=clock))
+
+        self.assertEqual(mock_fetch_page.call_args.args[1].remaining(), 5)
+
+    @patch("feed_to_somewhere.feed_processor.hedged_fetch_page")
+    def test_extract_content_hedges_with_policy(self, mock_hedged_fetch_page):
+        """Test a hedge policy routes article fetches through hedged requests."""
+        policy = HedgePolicy()
+        processor = FeedProcessor(notion_client=self.mock_notion_client, hedge_policy=policy)
+        mock_hedged_fetch_page.return_value = FetchedPage(
+            url="http://example.com/a",
+            status_code=200,
+            headers={},
+            content=b"<p>Body</p>",
+        )
+
+        try:
+            content = processor.extract_content("http://feeds.example.com/a", alternate_url="http://example.com/a")
+        finally:
+            processor.close()
+
+        self.assertEqual(content, "Body")
+        args = mock_hedged_fetch_page.call_args
+        self.assertEqual(args.args[0], "http://feeds.example.com/a")
+        self.assertIs(args.args[2], policy)
+        self.assertIs(args.args[3], processor._hedge_executor)
+        self.assertEqual(args.kwargs["alternate_url"], "http://example.com/a")
+
+    def test_select_body_passes_alternate_link(self):
+        """Test the entry's alternate link is offered for hedged fetches."""
+        entry = FeedEntry(title="Title", link="http://feeds.example.com/a", alternate_link="http://example.com/a")
+
+        with patch.object(self.feed_processor, "extract_content", return_value="Body") as mock_extract:
+            self.feed_processor.select_body(entry, entry.link, FeedSource("http://example.com/feed"))
+
+        self.assertEqual(mock_extract.call_args.kwargs["alternate_url"], "http://example.com/a")
+
+    def test_process_entry_passes_entry_deadline(self):
+        """Test process_entry bounds extraction with the entry timeout."""
+        processor = FeedProcessor(notion_client=self.mock_notion_client, entry_timeout=15)
+        entry = FeedEntry(title="Title", link="http://example.com/article")
+
+        with patch.object(processor, "select_body", return_value="Body") as mock_select_body:
+            processor.process_entry(entry, "2023-01-01")
+
+        self.assertEqual(mock_select_body.call_args.kwargs["deadline"].seconds, 15)
+
+    def test_init_rejects_non_positive_timeouts(self):
+        """Test article and entry timeouts must be positive."""
+        with self.assertRaises(ValueError):
+            FeedProcessor(notion_client=self.mock_notion_client, article_timeout=0)
+        with self.assertRaises(ValueError):
+            FeedProcessor(notion_client=self.mock_notion_client, entry_timeout=-1)
+
     def test_extract_entry_content_prefers_content_list(self):
         """Test extract_entry_content prefers the content list over summaries."""
         entry = {
@@ -270,16 +544,28 @@ class TestFeedProcessor(unittest.TestCase):
 
         # Mock extract_content
         with patch.object(self.feed_processor, "extract_content", return_value="Test content"):
-            # Mock add_page
-            self.mock_notion_client.add_page.return_value = {"id": "page_id"}
+            # Mock write_page
+            self.mock_notion_client.write_page.return_value = True
 
             # Test
             result = self.feed_processor.process_entry(mock_entry, "2023-01-01")
 
             # Assert
             self.assertTrue(result)
-            self.feed_processor.extract_content.assert_called_once_with("http://example.com/article")
-            self.mock_notion_client.add_page.assert_called_once()
+            self.feed_processor.extract_content.assert_called_once_with("http://example.com/article", deadline=ANY, alternate_url=None)
+            self.mock_notion_client.write_page.assert_called_once()
+
+    def test_process_entry_profiles_extract_and_write_stages(self):
+        """Test process_entry reports its extraction and sink writes to the profiler."""
+        profiler = MagicMock()
+        processor = FeedProcessor(notion_client=self.mock_notion_client, profiler=profiler)
+        entry = {"title": "Test Title", "link": "http://example.com/article", "summary": "<p>Summary</p>"}
+        self.mock_notion_client.write_page.return_value = True
+
+        self.assertTrue(processor.process_entry(entry, "2023-01-01"))
+
+        stages = [call.args[0] for call in profiler.stage.call_args_list]
+        self.assertEqual(stages, ["extract", "write_notion"])
 
     def test_process_entry_prefers_feed_content(self):
         """Test process_entry uses feed-provided content before fetching the article."""
@@ -291,13 +577,138 @@ class TestFeedProcessor(unittest.TestCase):
         }
 
         with patch.object(self.feed_processor, "extract_content") as mock_extract_content:
-            self.mock_notion_client.add_page.return_value = {"id": "page_id"}
+            self.mock_notion_client.write_page.return_value = True
 
             result = self.feed_processor.process_entry(mock_entry, "2023-01-01")
 
             self.assertTrue(result)
             mock_extract_content.assert_not_called()
-            self.mock_notion_client.add_page.assert_called_once()
+            self.mock_notion_client.write_page.assert_called_once()
+
+    def test_process_entry_skip_extraction_option(self):
+        """Test feeds marked skip_extraction never fetch the article page."""
+        entry = {"title": "Test Title", "link": "http://example.com/article", "published_parsed": None}
+        source = FeedSource("http://example.com/feed", skip_extraction=True)
+
+        with patch.object(self.feed_processor, "extract_content") as mock_extract_content:
+            self.mock_notion_client.write_page.return_value = True
+
+            result = self.feed_processor.process_entry(entry, "2023-01-01", source)
+
+        self.assertTrue(result)
+        mock_extract_content.assert_not_called()
+
+    def test_process_entry_routes_to_feed_data_source(self):
+        """Test process_entry writes to the data source configured for the feed."""
+        entry = {"title": "Test Title", "link": "http://example.com/article", "summary": "Body"}
+        source = FeedSource("http://example.com/feed", data_source_id="team_b")
+        self.mock_notion_client.write_page.return_value = True
+
+        self.feed_processor.process_entry(entry, "2023-01-01", source)
+
+        self.assertEqual(self.mock_notion_client.write_page.call_args.kwargs["data_source_id"], "team_b")
+
+    def test_host_slot_limits_concurrency_per_host(self):
+        """Test _host_slot shares one bounded semaphore per host."""
+        with self.feed_processor._host_slot("http://example.com/a", 1):
+            semaphore = self.feed_processor._host_semaphores["example.com"]
+            self.assertFalse(semaphore.acquire(blocking=False))
+
+        self.assertTrue(semaphore.acquire(blocking=False))
+        semaphore.release()
+
+    def test_host_slot_wait_stops_at_deadline(self):
+        """Test waiting for a busy host gives up when the entry deadline passes."""
+        source = FeedSource(url="http://example.com/feed", host_concurrency=1)
+        entry = {"title": "Test Title", "link": "http://example.com/article", "summary": "<p>Short [&#8230;]</p>"}
+
+        with self.feed_processor._host_slot("http://example.com/other", 1):
+            with self.assertRaises(DeadlineExceeded):
+                with self.feed_processor._host_slot("http://example.com/a", 1, Deadline(0.01)):
+                    pass
+
+            with patch.object(self.feed_processor, "extract_content") as mock_extract:
+                body = self.feed_processor.select_body(entry, entry["link"], source, deadline=Deadline(0.01))
+
+        mock_extract.assert_not_called()
+        self.assertEqual(body, "Short […]")
+        self.assertEqual(self.feed_processor.stats.get("article_deadline_exceeded"), 1)
+
+    def test_process_entry_fetches_article_for_truncated_summary(self):
+        """Test truncated feed summaries fall back to the article page."""
+        entry = {
+            "title": "Test Title",
+            "link": "http://example.com/article",
+            "summary": "<p>The beginning of the story [&#8230;]</p>",
+        }
+        self.mock_notion_client.write_page.return_value = True
+
+        with patch.object(self.feed_processor, "extract_content", return_value="The whole story from the first line to the very last one.") as mock_extract:
+            result = self.feed_processor.process_entry(entry, "2023-01-01")
+
+        self.assertTrue(result)
+        mock_extract.assert_called_once_with("http://example.com/article", deadline=ANY, alternate_url=None)
+        self.assertEqual(self.mock_notion_client.write_page.call_args.args[2], "The whole story from the first line to the very last one.")
+        self.assertEqual(self.feed_processor.stats.get("article_fetches"), 1)
+        self.assertEqual(self.feed_processor.stats.get("feed_content_insufficient"), 1)
+
+    def test_select_body_keeps_feed_body_when_article_is_shorter(self):
+        """Test a thin article page does not replace a longer feed body."""
+        processor = FeedProcessor(
+            notion_client=self.mock_notion_client,
+            content_policy=ContentPolicy(min_length=100),
+        )
+        entry = {"summary": "A reasonably detailed summary."}
+
+        with patch.object(processor, "extract_content", return_value="Cookie banner"):
+            body = processor.select_body(entry, "http://example.com/article", FeedSource("http://example.com/feed"))
+
+        self.assertEqual(body, "A reasonably detailed summary.")
+
+    def test_select_body_counts_saved_fetches(self):
+        """Test sufficient feed content is counted as a saved article fetch."""
+        entry = {"content": [{"value": "<p>Full body</p>"}]}
+
+        with patch.object(self.feed_processor, "extract_content") as mock_extract:
+            body = self.feed_processor.select_body(entry, "http://example.com/a", FeedSource("http://example.com/feed"))
+
+        self.assertEqual(body, "Full body")
+        mock_extract.assert_not_called()
+        self.assertEqual(self.feed_processor.stats.get("article_fetches_saved"), 1)
+
+    @patch("feed_to_somewhere.feed_processor.bs4.BeautifulSoup")
+    def test_html_to_text_skips_parsing_plain_text(self, mock_bs):
+        """Test plain-text bodies are returned without an HTML parse."""
+        self.assertEqual(FeedProcessor.html_to_text("  Just text  "), "Just text")
+        mock_bs.assert_not_called()
+
+    def test_process_entry_writes_to_configured_sinks(self):
+        """Test process_entry writes records to every sink without Notion."""
+        sink = MagicMock()
+        sink.name = "memory"
+        sink.batch_size = 1
+        sink.max_workers = 1
+        sink.write_batch.return_value = [True]
+        processor = FeedProcessor(sinks=[sink])
+        entry = {"title": "Test Title", "link": "http://example.com/article", "summary": "Body"}
+
+        result = processor.process_entry(entry, "2023-01-01", FeedSource("http://example.com/feed"))
+        processor.close()
+
+        self.assertTrue(result)
+        self.assertIsNone(processor.notion_client)
+        self.mock_notion_client_class.assert_called_once()
+        record = sink.write_batch.call_args.args[0][0]
+        self.assertEqual(record.link, "http://example.com/article")
+        self.assertEqual(record.feed_url, "http://example.com/feed")
+
+    def test_process_entry_without_sinks_fails(self):
+        """Test process_entry reports failure when no sink is configured."""
+        processor = FeedProcessor(sinks=[])
+        entry = {"title": "Test Title", "link": "http://example.com/article", "summary": "Body"}
+
+        self.assertFalse(processor.process_entry(entry, "2023-01-01"))
+        self.mock_logger.error.assert_called_once()
 
     def test_process_entry_no_link(self):
         """Test process_entry with an entry that has no link."""
@@ -314,7 +725,7 @@ class TestFeedProcessor(unittest.TestCase):
         # Assert
         self.assertFalse(result)
         self.mock_logger.warning.assert_called_once()
-        self.mock_notion_client.add_page.assert_not_called()
+        self.mock_notion_client.write_page.assert_not_called()
 
     def test_process_entry_dry_run(self):
         """Test process_entry reports success without writing in dry-run mode."""
@@ -340,17 +751,17 @@ class TestFeedProcessor(unittest.TestCase):
 
         # Mock extract_content to return empty string
         with patch.object(self.feed_processor, "extract_content", return_value=""):
-            # Mock add_page
-            self.mock_notion_client.add_page.return_value = {"id": "page_id"}
+            # Mock write_page
+            self.mock_notion_client.write_page.return_value = True
 
             # Test
             result = self.feed_processor.process_entry(mock_entry, "2023-01-01")
 
             # Assert
             self.assertTrue(result)
-            self.feed_processor.extract_content.assert_called_once_with("http://example.com/article")
+            self.feed_processor.extract_content.assert_called_once_with("http://example.com/article", deadline=ANY, alternate_url=None)
             self.mock_logger.warning.assert_called_once()
-            self.mock_notion_client.add_page.assert_called_once()
+            self.mock_notion_client.write_page.assert_called_once()
 
     def test_process_entry_notion_failure(self):
         """Test process_entry when adding to Notion fails."""
@@ -363,16 +774,16 @@ class TestFeedProcessor(unittest.TestCase):
 
         # Mock extract_content
         with patch.object(self.feed_processor, "extract_content", return_value="Test content"):
-            # Mock add_page to return None (failure)
-            self.mock_notion_client.add_page.return_value = None
+            # Mock write_page to report a failed write
+            self.mock_notion_client.write_page.return_value = False
 
             # Test
             result = self.feed_processor.process_entry(mock_entry, "2023-01-01")
 
             # Assert
             self.assertFalse(result)
-            self.feed_processor.extract_content.assert_called_once_with("http://example.com/article")
-            self.mock_notion_client.add_page.assert_called_once()
+            self.feed_processor.extract_content.assert_called_once_with("http://example.com/article", deadline=ANY, alternate_url=None)
+            self.mock_notion_client.write_page.assert_called_once()
 
     @patch("feed_to_somewhere.feed_processor.concurrent.futures.ThreadPoolExecutor")
     def test_process_feed_success(self, mock_executor_class):
@@ -435,6 +846,278 @@ class TestFeedProcessor(unittest.TestCase):
                 self.assertEqual(result, 2)
                 self.assertEqual(mock_executor.submit.call_count, 2)
 
+    @patch("feed_to_somewhere.feed_processor.concurrent.futures.ThreadPoolExecutor")
+    def test_process_feed_skips_entries_that_already_exist(self, mock_executor_class):
+        """Test process_feed checks existence once per feed and skips known entries."""
+        entries = [
+            {"title": "Entry 1", "link": "http://example.com/article1"},
+            {"title": "Entry 2", "link": "http://example.com/article2"},
+        ]
+        self.mock_notion_client.update_existing = False
+        self.mock_notion_client.find_existing_links.return_value = {"http://example.com/article1"}
+        mock_executor = MagicMock()
+        mock_executor_class.return_value.__enter__.return_value = mock_executor
+
+        with patch.object(self.feed_processor, "fetch_feed_entries", return_value=entries):
+            with patch("feed_to_somewhere.feed_processor.concurrent.futures.as_completed", return_value=[]):
+                self.feed_processor.process_feed("http://example.com/feed")
+
+        self.mock_notion_client.find_existing_links.assert_called_once_with(
+            ["http://example.com/article1", "http://example.com/article2"], None
+        )
+        mock_executor.submit.assert_called_once()
+        self.assertEqual(mock_executor.submit.call_args.args[1].link, "http://example.com/article2")
+        self.assertEqual(self.feed_processor.stats.get("existing_entries_skipped"), 1)
+
+    def test_process_entry_fans_out_to_every_target(self):
+        """Test one extraction is written to the feed's data sources and rule matches."""
+        processor = FeedProcessor(
+            notion_client=self.mock_notion_client,
+            routing_rules=[RoutingRule.parse("team_c:title=(?i)kubernetes")],
+        )
+        entry = {"title": "Kubernetes news", "link": "http://example.com/article", "summary": "<p>Summary</p>"}
+        source = FeedSource("http://example.com/feed", data_source_id="team_a|team_b")
+
+        with patch.object(processor.dispatcher, "write", return_value=True) as mock_write:
+            result = processor.process_entry(entry, "2023-01-01", source)
+
+        self.assertTrue(result)
+        self.assertEqual(
+            [call.args[0].data_source_id for call in mock_write.call_args_list],
+            ["team_a", "team_b", "team_c"],
+        )
+        self.assertEqual({call.args[0].body for call in mock_write.call_args_list}, {"Summary"})
+
+    def test_process_entry_skips_near_duplicates(self):
+        """Test a story seen under another link is not written to the same data source again."""
+        body = " ".join(f"word{index}" for index in range(80))
+        with tempfile.TemporaryDirectory() as temp_dir:
+            index = FingerprintIndex.from_state_dir(temp_dir)
+            processor = FeedProcessor(notion_client=self.mock_notion_client, fingerprint_index=index)
+            with patch.object(processor, "select_body", return_value=body), \
+                    patch.object(processor.dispatcher, "write", return_value=True) as mock_write:
+                first = processor.process_entry(
+                    {"title": "Story", "link": "http://example.com/story"},
+                    "2023-01-01",
+                    FeedSource("http://example.com/feed", data_source_id="team_a"),
+                )
+                amp_copy = processor.process_entry(
+                    {"title": "Story", "link": "http://example.com/amp/story?utm_source=rss"},
+                    "2023-01-01",
+                    FeedSource("http://mirror.example.com/feed", data_source_id="team_a|team_b"),
+                )
+            index.close()
+
+        self.assertTrue(first)
+        self.assertTrue(amp_copy)
+        self.assertEqual(
+            [(call.args[0].link, call.args[0].data_source_id) for call in mock_write.call_args_list],
+            [
+                ("http://example.com/story", "team_a"),
+                ("http://example.com/amp/story?utm_source=rss", "team_b"),
+            ],
+        )
+        self.assertEqual(processor.stats.get("near_duplicates_skipped"), 1)
+
+    def test_process_entry_remembers_fingerprint_only_after_write(self):
+        """Test a failed write does not make the entry a near-duplicate of itself on the retry."""
+        body = " ".join(f"word{index}" for index in range(80))
+        entry = {"title": "Story", "link": "http://example.com/story"}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            index = FingerprintIndex.from_state_dir(temp_dir)
+            processor = FeedProcessor(notion_client=self.mock_notion_client, fingerprint_index=index)
+            with patch.object(processor, "select_body", return_value=body), \
+                    patch.object(processor.dispatcher, "write", side_effect=[False, True]):
+                failed = processor.process_entry(entry, "2023-01-01")
+                mirror = processor.process_entry(
+                    {"title": "Story", "link": "http://mirror.example.com/story"}, "2023-01-01"
+                )
+            fingerprint = index.fingerprint(body)
+            duplicate_of = index.check(fingerprint, "http://other.example.com/story")
+            index.close()
+
+        self.assertFalse(failed)
+        self.assertTrue(mirror)
+        self.assertEqual(processor.stats.get("near_duplicates_skipped"), 0)
+        self.assertEqual(duplicate_of, "http://mirror.example.com/story")
+
+    def test_process_entry_skips_near_duplicate_written_concurrently(self):
+        """Test a near-duplicate is skipped while another worker is still writing the first copy."""
+        body = " ".join(f"word{index}" for index in range(80))
+        writing = threading.Event()
+        release = threading.Event()
+
+        def slow_write(record):
+            writing.set()
+            release.wait(5)
+            return True
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            index = FingerprintIndex.from_state_dir(temp_dir)
+            processor = FeedProcessor(notion_client=self.mock_notion_client, fingerprint_index=index)
+            with patch.object(processor, "select_body", return_value=body), \
+                    patch.object(processor.dispatcher, "write", side_effect=slow_write) as mock_write:
+                first = threading.Thread(
+                    target=processor.process_entry,
+                    args=({"title": "Story", "link": "http://example.com/story"}, "2023-01-01"),
+                )
+                first.start()
+                self.assertTrue(writing.wait(5))
+                copy = processor.process_entry({"title": "Story", "link": "http://mirror.example.com/story"}, "2023-01-01")
+                release.set()
+                first.join(5)
+            index.close()
+
+        self.assertTrue(copy)
+        mock_write.assert_called_once()
+        self.assertEqual(processor.stats.get("near_duplicates_skipped"), 1)
+
+    def test_process_entry_does_not_fingerprint_missing_content(self):
+        """Test entries without extracted content are not near-duplicates of each other."""
+        index = MagicMock()
+        processor = FeedProcessor(notion_client=self.mock_notion_client, fingerprint_index=index)
+
+        with patch.object(processor, "select_body", return_value=""), \
+                patch.object(processor.dispatcher, "write", return_value=True) as mock_write:
+            processor.process_entry({"title": "Story", "link": "http://example.com/story"}, "2023-01-01")
+
+        index.fingerprint.assert_not_called()
+        mock_write.assert_called_once()
+
+    @patch("feed_to_somewhere.feed_processor.resolve_redirects")
+    def test_process_entry_stores_canonical_link(self, mock_resolve):
+        """Test a redirector link is resolved once, then fetched and written under its canonical URL."""
+        mock_resolve.return_value = "https://example.com/story?utm_source=feed"
+        cache = RedirectCache(":memory:")
+        processor = FeedProcessor(notion_client=self.mock_notion_client, redirect_cache=cache)
+        entry = {"title": "Story", "link": "http://feedproxy.example.com/~r/x"}
+
+        with patch.object(processor, "select_body", return_value="Body") as mock_select_body, \
+                patch.object(processor.dispatcher, "write", return_value=True) as mock_write:
+            self.assertTrue(processor.process_entry(entry, "2023-01-01"))
+            self.assertTrue(processor.process_entry(entry, "2023-01-01"))
+        cache.close()
+
+        mock_resolve.assert_called_once()
+        self.assertEqual(mock_select_body.call_args.args[1], "https://example.com/story")
+        self.assertEqual(
+            [call.args[0].link for call in mock_write.call_args_list],
+            ["https://example.com/story", "https://example.com/story"],
+        )
+        self.assertEqual(processor.stats.get("redirects_resolved"), 1)
+        self.assertEqual(processor.stats.get("redirect_cache_hits"), 1)
+
+    @patch("feed_to_somewhere.feed_processor.resolve_redirects")
+    def test_resolve_link_keeps_links_that_do_not_redirect(self, mock_resolve):
+        """Test a link that is already final is not canonicalized."""
+        link = "HTTPS://Example.com/story?utm_source=feed&a=#top"
+        mock_resolve.return_value = link
+        cache = RedirectCache(":memory:")
+        processor = FeedProcessor(notion_client=self.mock_notion_client, redirect_cache=cache)
+
+        self.assertEqual(processor.resolve_link(link), link)
+        self.assertEqual(cache.get(link), link)
+        cache.close()
+
+    @patch("feed_to_somewhere.feed_processor.resolve_redirects", side_effect=HTTPError("503 error"))
+    def test_resolve_link_keeps_link_when_resolution_fails(self, mock_resolve):
+        """Test a failed resolution falls back to the entry link without caching it."""
+        cache = RedirectCache(":memory:")
+        processor = FeedProcessor(notion_client=self.mock_notion_client, redirect_cache=cache)
+
+        self.assertEqual(processor.resolve_link("https://t.co/abc"), "https://t.co/abc")
+        self.assertIsNone(cache.get("https://t.co/abc"))
+        cache.close()
+
+    def test_prepare_feed_entries_uses_cached_canonical_links(self):
+        """Test cached links are deduplicated and checked under their canonical URL."""
+        cache = RedirectCache(":memory:")
+        cache.put("https://t.co/abc", "https://example.com/story")
+        processor = FeedProcessor(notion_client=self.mock_notion_client, redirect_cache=cache)
+        entries = [
+            {"title": "Story", "link": "https://t.co/abc"},
+            {"title": "Story", "link": "https://example.com/story"},
+            {"title": "Other", "link": "https://example.com/other"},
+        ]
+
+        with patch.object(processor, "fetch_feed_entries", return_value=entries), \
+                patch.object(processor.dispatcher, "find_existing", return_value=set()) as mock_find_existing:
+            prepared, newest_link = processor.prepare_feed_entries("http://example.com/feed", FeedSource(""))
+        cache.close()
+
+        self.assertEqual(
+            [entry.link for entry in prepared],
+            ["https://example.com/story", "https://example.com/other"],
+        )
+        self.assertEqual(newest_link, "https://t.co/abc")
+        self.assertEqual(
+            mock_find_existing.call_args.args[0],
+            ["https://example.com/story", "https://example.com/other"],
+        )
+
+    def test_prepare_feed_entries_skips_entries_existing_in_every_target(self):
+        """Test an entry is only skipped once every data source it is routed to has it."""
+        processor = FeedProcessor(notion_client=self.mock_notion_client)
+        entries = [
+            {"title": "Entry 1", "link": "http://example.com/article1"},
+            {"title": "Entry 2", "link": "http://example.com/article2"},
+        ]
+        existing = {
+            "team_a": {"http://example.com/article1", "http://example.com/article2"},
+            "team_b": {"http://example.com/article1"},
+        }
+        source = FeedSource("http://example.com/feed", data_source_id="team_a|team_b")
+
+        with patch.object(processor, "fetch_feed_entries", return_value=entries):
+            with patch.object(
+                processor.dispatcher,
+                "find_existing",
+                side_effect=lambda links, target: existing[target],
+            ) as mock_find_existing:
+                prepared, _ = processor.prepare_feed_entries("http://example.com/feed", source)
+
+        self.assertEqual([entry.link for entry in prepared], ["http://example.com/article2"])
+        self.assertEqual(mock_find_existing.call_count, 2)
+
+    def test_process_feed_streaming_records_last_seen_entry(self):
+        """Test streamed feeds resume from the newest entry of the last complete run."""
+        health_store = MagicMock()
+        health_store.get_last_seen.return_value = "http://example.com/old"
+        processor = FeedProcessor(
+            notion_client=self.mock_notion_client,
+            max_entries_per_feed=3,
+            health_store=health_store,
+            stream_feeds=True,
+        )
+        entries = [
+            FeedEntry(title="Entry 2", link="http://example.com/article2"),
+            FeedEntry(title="Entry 1", link="http://example.com/article1"),
+        ]
+
+        with patch.object(processor, "fetch_feed_entries_streaming", return_value=entries) as mock_fetch:
+            with patch.object(processor, "process_entry", side_effect=[True, False]):
+                processor.process_feed("http://example.com/feed")
+            health_store.record_last_seen.assert_not_called()
+
+            with patch.object(processor, "process_entry", return_value=True):
+                processor.process_feed("http://example.com/feed")
+
+        mock_fetch.assert_called_with("http://example.com/feed", max_entries=3, stop_at="http://example.com/old")
+        health_store.record_last_seen.assert_called_once_with("http://example.com/feed", "http://example.com/article2")
+
+    def test_dry_run_does_not_persist_feed_state(self):
+        """Test a dry run neither records the streaming position nor saves feed health."""
+        health_store = MagicMock()
+        health_store.get_last_seen.return_value = None
+        processor = FeedProcessor(dry_run=True, health_store=health_store, stream_feeds=True)
+        entries = [FeedEntry(title="Entry", link="http://example.com/article")]
+
+        with patch.object(processor, "fetch_feed_entries_streaming", return_value=entries):
+            processor.process_feed_sources([FeedSource("http://example.com/feed")])
+
+        health_store.record_last_seen.assert_not_called()
+        health_store.save.assert_not_called()
+
     def test_process_feed_no_entries(self):
         """Test process_feed with a feed that has no entries."""
         # Mock fetch_feed_entries to return empty list
@@ -474,14 +1157,14 @@ class TestFeedProcessor(unittest.TestCase):
 
     def test_process_feeds_success(self):
         """Test process_feeds with valid feeds."""
-        # Mock read_feed_urls
-        with patch.object(self.feed_processor, "read_feed_urls",
-                         return_value=["http://example.com/feed1", "http://example.com/feed2"]):
+        # Mock read_feed_sources
+        with patch.object(self.feed_processor, "read_feed_sources",
+                         return_value=[FeedSource("http://example.com/feed1"), FeedSource("http://example.com/feed2")]):
             with patch.object(self.feed_processor, "process_feed", side_effect=[2, 0]) as mock_process_feed:
                 result = self.feed_processor.process_feeds("feed_list.csv")
 
                 self.assertEqual(result, 1)  # One successful feed
-                self.feed_processor.read_feed_urls.assert_called_once_with("feed_list.csv")
+                self.feed_processor.read_feed_sources.assert_called_once_with("feed_list.csv")
                 self.assertEqual(mock_process_feed.call_count, 2)
                 self.mock_logger.info.assert_called()
 
@@ -496,16 +1179,311 @@ class TestFeedProcessor(unittest.TestCase):
             self.assertEqual(result, 2)
             self.assertEqual(mock_process_feed.call_count, 2)
 
+    def test_process_feed_urls_skips_feeds_with_open_circuit(self):
+        """Test process_feed_urls skips feeds the health store backs off from."""
+        health_store = MagicMock()
+        health_store.should_attempt.side_effect = lambda url: url.endswith("feed2")
+        processor = FeedProcessor(notion_client=self.mock_notion_client, health_store=health_store)
+
+        with patch.object(processor, "process_feed", return_value=1) as mock_process_feed:
+            result = processor.process_feed_urls(["http://example.com/feed1", "http://example.com/feed2"])
+
+        self.assertEqual(result, 1)
+        mock_process_feed.assert_called_once_with(
+            "http://example.com/feed2", FeedSource("http://example.com/feed2")
+        )
+        health_store.save.assert_called_once()
+
+    @patch("feed_to_somewhere.feed_processor.concurrent.futures.ThreadPoolExecutor")
+    def test_process_feed_applies_feed_entry_limit(self, mock_executor_class):
+        """Test the per-feed max_entries option caps submitted entries."""
+        entries = [{"title": f"Entry {i}", "link": f"http://example.com/{i}"} for i in range(3)]
+        mock_executor = MagicMock()
+        mock_executor_class.return_value.__enter__.return_value = mock_executor
+
+        with patch.object(self.feed_processor, "fetch_feed_entries", return_value=entries):
+            with patch("feed_to_somewhere.feed_processor.concurrent.futures.as_completed", return_value=[]):
+                self.feed_processor.process_feed(
+                    "http://example.com/feed",
+                    FeedSource("http://example.com/feed", max_entries=2),
+                )
+
+        self.assertEqual(mock_executor.submit.call_count, 2)
+
+    def test_process_feed_sources_orders_by_priority(self):
+        """Test higher-priority feeds are processed first, ties in file order."""
+        sources = [
+            FeedSource("http://example.com/low"),
+            FeedSource("http://example.com/high", priority=5),
+            FeedSource("http://example.com/low2"),
+        ]
+
+        with patch.object(self.feed_processor, "process_feed", return_value=1) as mock_process_feed:
+            self.feed_processor.process_feed_sources(sources)
+
+        self.assertEqual(
+            [call.args[0] for call in mock_process_feed.call_args_list],
+            ["http://example.com/high", "http://example.com/low", "http://example.com/low2"],
+        )
+
+    def test_process_feed_sources_limits_to_highest_priority_feeds(self):
+        """Test max_feeds keeps the highest-priority feeds, not the first ones in the file."""
+        sources = [
+            FeedSource("http://example.com/low"),
+            FeedSource("http://example.com/low2"),
+            FeedSource("http://example.com/high", priority=5),
+        ]
+
+        with patch.object(self.feed_processor, "process_feed", return_value=1) as mock_process_feed:
+            self.feed_processor.process_feed_sources(sources, max_feeds=2)
+
+        self.assertEqual(
+            [call.args[0] for call in mock_process_feed.call_args_list],
+            ["http://example.com/high", "http://example.com/low"],
+        )
+
+    def test_process_feed_sources_respects_poll_interval(self):
+        """Test feeds are skipped until their poll interval has elapsed."""
+        health_store = MagicMock()
+        health_store.should_attempt.return_value = True
+        health_store.is_due.return_value = False
+        processor = FeedProcessor(notion_client=self.mock_notion_client, health_store=health_store)
+
+        with patch.object(processor, "process_feed") as mock_process_feed:
+            result = processor.process_feed_sources([FeedSource("http://example.com/feed", poll_interval=30)])
+
+        self.assertEqual(result, 0)
+        mock_process_feed.assert_not_called()
+        health_store.is_due.assert_called_once_with("http://example.com/feed", 1800)
+
+    def test_process_feed_sources_with_time_budget_orders_by_priority_and_recency(self):
+        """Test budgeted runs process entries of all feeds by priority, then newest first."""
+        processor = FeedProcessor(notion_client=self.mock_notion_client, max_workers=1, time_budget=60)
+        low = FeedSource("http://example.com/low")
+        high = FeedSource("http://example.com/high", priority=5)
+        entries = {
+            low.url: [
+                FeedEntry(title="low-old", link="http://example.com/1", published_parsed=time.gmtime(100)),
+                FeedEntry(title="low-new", link="http://example.com/2", published_parsed=time.gmtime(300)),
+                FeedEntry(title="low-undated", link="http://example.com/3"),
+            ],
+            high.url: [FeedEntry(title="high-old", link="http://example.com/4", published_parsed=time.gmtime(50))],
+        }
+        processed = []
+
+        def process_entry(entry, current_date, source):
+            processed.append(entry.title)
+            return True
+
+        with patch.object(processor, "prepare_feed_entries", side_effect=lambda url, source: (entries[url], None)):
+            with patch.object(processor, "process_entry", side_effect=process_entry):
+                result = processor.process_feed_sources([low, high])
+
+        self.assertEqual(result, 2)
+        self.assertEqual(processed, ["high-old", "low-new", "low-old", "low-undated"])
+
+    def test_process_feed_sources_with_time_budget_defers_entries(self):
+        """Test no new entries start once an average entry would overrun the deadline."""
+        clock = MagicMock(return_value=0.0)
+        processor = FeedProcessor(
+            notion_client=self.mock_notion_client,
+            max_workers=1,
+            time_budget=25,
+            clock=clock,
+        )
+        entries = [FeedEntry(title=f"Entry {index}", link=f"http://example.com/{index}") for index in range(5)]
+
+        def process_entry(entry, current_date, source):
+            clock.return_value += 10
+            return True
+
+        with patch.object(processor, "prepare_feed_entries", return_value=(entries, None)):
+            with patch.object(processor, "process_entry", side_effect=process_entry) as mock_process_entry:
+                result = processor.process_feed_sources([FeedSource("http://example.com/feed")])
+
+        self.assertEqual(result, 1)
+        self.assertEqual(mock_process_entry.call_count, 2)
+        self.assertEqual(processor.stats.get("entries_deferred"), 3)
+
+    def test_process_feed_sources_stops_when_shutdown_requested(self):
+        """Test no feeds are started once shutdown has been requested."""
+        shutdown = MagicMock(requested=True)
+        processor = FeedProcessor(notion_client=self.mock_notion_client, shutdown=shutdown)
+
+        with patch.object(processor, "process_feed") as mock_process_feed:
+            result = processor.process_feed_sources([FeedSource("http://example.com/feed")])
+
+        self.assertEqual(result, 0)
+        mock_process_feed.assert_not_called()
+
+    def make_work_queue(self, sources, lost=None):
+        """Build a mock work queue that leases the given feeds once each."""
+        queue = MagicMock()
+        queue.claim.side_effect = [MagicMock(source=source) for source in sources] + [None]
+        queue.keep_alive.return_value.__enter__.return_value = lost or threading.Event()
+        return queue
+
+    def test_process_work_queue_completes_claimed_feeds(self):
+        """Test claimed feeds are processed and marked done, failures are released."""
+        sources = [FeedSource("http://example.com/a"), FeedSource("http://example.com/b")]
+        queue = self.make_work_queue(sources)
+        processor = FeedProcessor(notion_client=self.mock_notion_client)
+
+        with patch.object(processor, "process_feed", side_effect=[2, RuntimeError("boom")]):
+            result = processor.process_work_queue(queue)
+
+        self.assertEqual(result, 1)
+        self.assertEqual(processor.stats.get("feeds_claimed"), 2)
+        queue.complete.assert_called_once()
+        self.assertEqual(queue.complete.call_args[0][0].source, sources[0])
+        queue.release.assert_called_once()
+        self.assertEqual(queue.release.call_args[0][0].source, sources[1])
+
+    def test_process_work_queue_honours_time_budget(self):
+        """Test a queue run stops starting entries and claiming feeds once the budget is spent."""
+        sources = [FeedSource("http://example.com/a"), FeedSource("http://example.com/b")]
+        queue = self.make_work_queue(sources)
+        clock = MagicMock(return_value=0.0)
+        processor = FeedProcessor(notion_client=self.mock_notion_client, time_budget=10, clock=clock)
+        written = []
+
+        def process_feed(url, source):
+            written.append(processor.process_entry({"title": "One", "link": f"{url}/1"}, "2023-01-01", source))
+            clock.return_value = 10.0
+            written.append(processor.process_entry({"title": "Two", "link": f"{url}/2"}, "2023-01-01", source))
+            return 1
+
+        with patch.object(processor, "select_body", return_value="Body"), \
+                patch.object(processor.dispatcher, "write", return_value=True), \
+                patch.object(processor, "process_feed", side_effect=process_feed):
+            processor.process_work_queue(queue)
+
+        self.assertEqual(written, [True, False])
+        self.assertEqual(queue.claim.call_count, 1)
+        queue.release.assert_called_once_with(ANY, failed=False)
+        queue.complete.assert_not_called()
+        self.assertEqual(processor.stats.get("entries_deferred"), 1)
+
+    def test_process_work_queue_respects_max_feeds(self):
+        """Test no more than max_feeds feeds are claimed."""
+        queue = self.make_work_queue([FeedSource("http://example.com/a"), FeedSource("http://example.com/b")])
+        processor = FeedProcessor(notion_client=self.mock_notion_client)
+
+        with patch.object(processor, "process_feed", return_value=1):
+            result = processor.process_work_queue(queue, max_feeds=1)
+
+        self.assertEqual(result, 1)
+        queue.claim.assert_called_once()
+
+    def test_process_work_queue_releases_feed_interrupted_by_shutdown(self):
+        """Test a feed cut short by shutdown goes back to the queue."""
+        shutdown = MagicMock(requested=False)
+        queue = self.make_work_queue([FeedSource("http://example.com/a"), FeedSource("http://example.com/b")])
+        processor = FeedProcessor(notion_client=self.mock_notion_client, shutdown=shutdown)
+
+        def process_feed(url, source):
+            shutdown.requested = True
+            return 0
+
+        with patch.object(processor, "process_feed", side_effect=process_feed):
+            processor.process_work_queue(queue)
+
+        queue.claim.assert_called_once()
+        queue.release.assert_called_once_with(ANY, failed=False)
+        queue.complete.assert_not_called()
+
+    def test_process_work_queue_stops_writing_after_lease_is_lost(self):
+        """Test entries of a feed whose lease was lost are not written and the feed is not completed."""
+        lost = threading.Event()
+        queue = self.make_work_queue([FeedSource("http://example.com/a")], lost=lost)
+        processor = FeedProcessor(notion_client=self.mock_notion_client)
+        entry = {"title": "Entry", "link": "http://example.com/a/1", "summary": "Body"}
+
+        def process_feed(url, source):
+            lost.set()
+            return int(processor.process_entry(entry, "2023-01-01", source))
+
+        with patch.object(processor, "process_feed", side_effect=process_feed), \
+                patch.object(processor.dispatcher, "write", return_value=True) as mock_write:
+            result = processor.process_work_queue(queue)
+
+        self.assertEqual(result, 0)
+        mock_write.assert_not_called()
+        queue.complete.assert_not_called()
+        queue.release.assert_not_called()
+        self.assertEqual(processor.stats.get("leases_lost"), 1)
+
+    def test_process_entry_journals_record_when_shutdown_requested(self):
+        """Test an entry extracted after shutdown was requested is journaled instead of written."""
+        shutdown = MagicMock(requested=False)
+        journal = MagicMock()
+        processor = FeedProcessor(notion_client=self.mock_notion_client, shutdown=shutdown, journal=journal)
+        entry = FeedEntry(title="Title", link="http://example.com/1", body_candidates=("<p>Body</p>",))
+
+        def select_body(entry, link, source, deadline=None):
+            shutdown.requested = True
+            return "Body"
+
+        with patch.object(processor, "select_body", side_effect=select_body):
+            with patch.object(processor.dispatcher, "write") as mock_write:
+                result = processor.process_entry(entry, "2024-01-01")
+
+        self.assertFalse(result)
+        mock_write.assert_not_called()
+        journal.append.assert_called_once()
+        self.assertEqual(journal.append.call_args[0][0].link, "http://example.com/1")
+        self.assertEqual(processor.stats.get("entries_journaled"), 1)
+
+    def test_replay_pending_entries_writes_journaled_records(self):
+        """Test entries saved by an interrupted run are written and discarded."""
+        record = EntryRecord(title="Title", link="http://example.com/1", body="Body", date="2024-01-01")
+        journal = MagicMock()
+        journal.load.return_value = [record]
+        processor = FeedProcessor(notion_client=self.mock_notion_client, journal=journal)
+
+        with patch.object(processor.dispatcher, "write", return_value=True) as mock_write:
+            result = processor.replay_pending_entries()
+
+        self.assertEqual(result, 1)
+        mock_write.assert_called_once_with(record)
+        journal.discard.assert_called_once_with(record)
+        self.assertEqual(processor.stats.get("journaled_entries_written"), 1)
+
+    def test_replay_pending_entries_discards_entries_that_already_exist(self):
+        """Test replayed entries the sink already holds are discarded and failed ones kept."""
+        records = [
+            EntryRecord(title=f"Title {index}", link=f"http://example.com/{index}", body="Body", date="2024-01-01")
+            for index in range(3)
+        ]
+        self.mock_notion_client.write_page.side_effect = [True, None, False]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            journal = PendingEntryJournal.from_state_dir(temp_dir)
+            for record in records:
+                journal.append(record)
+            journal.save()
+            processor = FeedProcessor(
+                notion_client=self.mock_notion_client,
+                journal=PendingEntryJournal.from_state_dir(temp_dir),
+                max_workers=1,
+            )
+
+            result = processor.replay_pending_entries()
+            processor.journal.save()
+            remaining = PendingEntryJournal.from_state_dir(temp_dir).load()
+
+        self.assertEqual(result, 2)
+        self.assertEqual(remaining, [records[2]])
+
     def test_process_feeds_no_urls(self):
         """Test process_feeds with no feed URLs."""
-        # Mock read_feed_urls to return empty list
-        with patch.object(self.feed_processor, "read_feed_urls", return_value=[]):
+        # Mock read_feed_sources to return empty list
+        with patch.object(self.feed_processor, "read_feed_sources", return_value=[]):
             # Test
             result = self.feed_processor.process_feeds("feed_list.csv")
 
             # Assert
             self.assertEqual(result, 0)
-            self.feed_processor.read_feed_urls.assert_called_once_with("feed_list.csv")
+            self.feed_processor.read_feed_sources.assert_called_once_with("feed_list.csv")
             self.mock_logger.warning.assert_called_once()
 
 
@@ -0,0 +1,81 @@
+"""Tests for the feed_sources module."""
+
+import unittest
+
+from feed_to_somewhere.feed_sources import FeedSource
+
+
+class TestFeedSource(unittest.TestCase):
+    """Test cases for the FeedSource class."""
+
+    def test_from_cells_defaults(self):
+        """Test a URL without options uses the processor defaults."""
+        source = FeedSource.from_cells("https://example.com/feed", [])
+
+        self.assertEqual(source, FeedSource("https://example.com/feed"))
+        self.assertIsNone(source.max_entries)
+        self.assertFalse(source.skip_extraction)
+        self.assertEqual(source.priority, 0)
+
+    def test_from_cells_parses_every_option(self):
+        """Test every supported option is parsed and normalized."""
+        source = FeedSource.from_cells(
+            "https://example.com/feed",
+            [
+                "max_entries=5",
+                " skip-extraction = yes ",
+                "data_source=abc",
+                "poll_interval=60",
+                "priority=-1",
+                "host_concurrency=2",
+                "",
+            ],
+        )
+
+        self.assertEqual(
+            source,
+            FeedSource(
+                "https://example.com/feed",
+                max_entries=5,
+                skip_extraction=True,
+                data_source_id="abc",
+                poll_interval=60,
+                priority=-1,
+                host_concurrency=2,
+            ),
+        )
+
+    def test_from_cells_rejects_unknown_options(self):
+        """Test unknown option keys and bare values are rejected."""
+        with self.assertRaises(ValueError):
+            FeedSource.from_cells("https://example.com/feed", ["colour=blue"])
+
+        with self.assertRaises(ValueError):
+            FeedSource.from_cells("https://example.com/feed", ["max_entries"])
+
+    def test_from_cells_rejects_invalid_values(self):
+        """Test invalid option values are rejected."""
+        for cell in ("max_entries=0", "skip_extraction=maybe", "priority=high", "data_source= ", "data_source=a||b"):
+            with self.subTest(cell=cell):
+                with self.assertRaises(ValueError):
+                    FeedSource.from_cells("https://example.com/feed", [cell])
+
+    def test_multiple_data_sources(self):
+        """Test a feed can write to several data sources separated by pipes."""
+        source = FeedSource.from_cells("https://example.com/feed", ["data_source=team_a | team_b"])
+
+        self.assertEqual(source.data_source_ids, ("team_a", "team_b"))
+        self.assertEqual(FeedSource("https://example.com/feed").data_source_ids, ())
+
+    def test_dict_round_trip(self):
+        """Test sources survive a round trip through plain dicts."""
+        source = FeedSource("https://example.com/feed", max_entries=5, priority=2, data_source_id="abc")
+
+        data = source.to_dict()
+        data["removed_option"] = True
+
+        self.assertEqual(FeedSource.from_dict(data), source)
+
+
+if __name__ == "__main__":
+    unittest.main()
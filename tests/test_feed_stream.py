@@ -0,0 +1,207 @@
+"""Tests for the feed_stream module."""
+
+import io
+import unittest
+import xml.etree.ElementTree as ElementTree
+from unittest.mock import MagicMock, patch
+
+from requests.exceptions import HTTPError
+
+from feed_to_somewhere.feed_stream import (
+    UnsupportedFeedFormat,
+    iter_feed_entries,
+    parse_feed_date,
+    stream_feed_entries,
+)
+
+RSS_DOCUMENT = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/">
+  <channel>
+    <title>Example</title>
+    <item>
+      <title>First</title>
+      <link> https://example.com/1 </link>
+      <guid>guid-1</guid>
+      <pubDate>Mon, 02 Jan 2023 03:04:05 GMT</pubDate>
+      <description>&lt;p&gt;Summary&lt;/p&gt;</description>
+      <content:encoded><![CDATA[<p>Full body</p>]]></content:encoded>
+    </item>
+    <item>
+      <title>Second</title>
+      <link>https://example.com/2</link>
+    </item>
+    <item>
+      <title>Third</title>
+      <link>https://example.com/3</link>
+    </item>
+  </channel>
+</rss>"""
+
+ATOM_DOCUMENT = b"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Example</title>
+  <entry>
+    <title>Atom entry</title>
+    <link rel="enclosure" href="https://example.com/audio.mp3"/>
+    <link href="https://example.com/atom"/>
+    <id>tag:example.com,2023:atom</id>
+    <updated>2023-01-02T03:04:05Z</updated>
+    <summary>Short</summary>
+    <content type="html">&lt;p&gt;Long&lt;/p&gt;</content>
+  </entry>
+</feed>"""
+
+
+
+def dated_rss_document(*items):
+    """Build an RSS document from (link, pubDate) pairs, with None for an undated item."""
+    body = "".join(
+        f"<item><title>{link}</title><link>{link}</link>"
+        + (f"<pubDate>{date}</pubDate>" if date else "")
+        + "</item>"
+        for link, date in items
+    )
+    return f'<rss version="2.0"><channel><title>Example</title>{body}</channel></rss>'.encode()
+
+
+RDF_DOCUMENT = b"""<?xml version="1.0"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+         xmlns="http://purl.org/rss/1.0/"
+         xmlns:dc="http://purl.org/dc/elements/1.1/">
+  <channel rdf:about="https://example.com/"><title>Example</title></channel>
+  <item rdf:about="https://example.com/rdf">
+    <title>RDF entry</title>
+    <link>https://example.com/rdf</link>
+    <dc:date>2023-01-02T03:04:05+09:00</dc:date>
+  </item>
+</rdf:RDF>"""
+
+
+def make_response(body, status_error=None):
+    """Build a streamed response mock around a document."""
+    response = MagicMock()
+    response.raw = io.BytesIO(body)
+    if status_error is not None:
+        response.raise_for_status.side_effect = status_error
+    return response
+
+
+class TestIterFeedEntries(unittest.TestCase):
+    """Test cases for iter_feed_entries."""
+
+    def test_parses_rss_items(self):
+        """Test RSS 2.0 items are projected into feed entries."""
+        entries = list(iter_feed_entries(io.BytesIO(RSS_DOCUMENT)))
+
+        self.assertEqual([entry.title for entry in entries], ["First", "Second", "Third"])
+        first = entries[0]
+        self.assertEqual(first.link, "https://example.com/1")
+        self.assertEqual(first.guid, "guid-1")
+        self.assertEqual(first.body_candidates, ("<p>Full body</p>", "<p>Summary</p>"))
+        self.assertEqual(tuple(first.published_parsed)[:6], (2023, 1, 2, 3, 4, 5))
+        self.assertIsNone(entries[1].published_parsed)
+
+    def test_parses_atom_entries(self):
+        """Test Atom entries use the alternate link and prefer content over summary."""
+        entries = list(iter_feed_entries(io.BytesIO(ATOM_DOCUMENT)))
+
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0].link, "https://example.com/atom")
+        self.assertEqual(entries[0].guid, "tag:example.com,2023:atom")
+        self.assertEqual(entries[0].body_candidates, ("<p>Long</p>", "Short"))
+        self.assertEqual(tuple(entries[0].published_parsed)[:4], (2023, 1, 2, 3))
+
+    def test_parses_rss1_items(self):
+        """Test RSS 1.0 items are read from the RSS namespace."""
+        entries = list(iter_feed_entries(io.BytesIO(RDF_DOCUMENT)))
+
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0].link, "https://example.com/rdf")
+        self.assertEqual(entries[0].guid, "https://example.com/rdf")
+        self.assertEqual(tuple(entries[0].published_parsed)[:4], (2023, 1, 1, 18))
+
+    def test_rejects_unknown_root(self):
+        """Test documents that are not feeds raise UnsupportedFeedFormat."""
+        with self.assertRaises(UnsupportedFeedFormat):
+            list(iter_feed_entries(io.BytesIO(b"<html><body>Not a feed</body></html>")))
+
+    def test_raises_on_malformed_xml(self):
+        """Test malformed XML raises ParseError."""
+        with self.assertRaises(ElementTree.ParseError):
+            list(iter_feed_entries(io.BytesIO(b"<rss><channel><item></channel></rss>")))
+
+
+class TestParseFeedDate(unittest.TestCase):
+    """Test cases for parse_feed_date."""
+
+    def test_parses_supported_formats(self):
+        """Test RFC 822 and ISO 8601 dates are converted to UTC."""
+        self.assertEqual(tuple(parse_feed_date("Tue, 10 Jun 2003 04:00:00 GMT"))[:4], (2003, 6, 10, 4))
+        self.assertEqual(tuple(parse_feed_date("2003-06-10T04:00:00Z"))[:4], (2003, 6, 10, 4))
+        self.assertEqual(tuple(parse_feed_date("2003-06-10"))[:3], (2003, 6, 10))
+
+    def test_returns_none_for_invalid_dates(self):
+        """Test missing and unparseable dates return None."""
+        self.assertIsNone(parse_feed_date(None))
+        self.assertIsNone(parse_feed_date("yesterday"))
+
+
+class TestStreamFeedEntries(unittest.TestCase):
+    """Test cases for stream_feed_entries."""
+
+    @patch("feed_to_somewhere.feed_stream.requests.get")
+    def test_stops_at_max_entries(self, mock_get):
+        """Test reading stops once enough entries were collected."""
+        response = make_response(RSS_DOCUMENT)
+        mock_get.return_value = response
+
+        entries = stream_feed_entries("https://example.com/feed", max_entries=2)
+
+        self.assertEqual([entry.title for entry in entries], ["First", "Second"])
+        self.assertTrue(mock_get.call_args.kwargs["stream"])
+        response.close.assert_called_once()
+
+    @patch("feed_to_somewhere.feed_stream.requests.get")
+    def test_stops_at_last_seen_entry(self, mock_get):
+        """Test reading stops at an entry processed in an earlier run of a newest-first feed."""
+        mock_get.return_value = make_response(dated_rss_document(
+            ("https://example.com/3", "Wed, 04 Jan 2023 00:00:00 GMT"),
+            ("https://example.com/2", "Tue, 03 Jan 2023 00:00:00 GMT"),
+            ("https://example.com/1", "Mon, 02 Jan 2023 00:00:00 GMT"),
+        ))
+
+        entries = stream_feed_entries("https://example.com/feed", stop_at={"https://example.com/2"})
+
+        self.assertEqual([entry.link for entry in entries], ["https://example.com/3"])
+
+    @patch("feed_to_somewhere.feed_stream.requests.get")
+    def test_reads_whole_feed_when_order_is_not_newest_first(self, mock_get):
+        """Test a seen entry does not stop reading an oldest-first or undated feed."""
+        oldest_first = [
+            ("https://example.com/1", "Mon, 02 Jan 2023 00:00:00 GMT"),
+            ("https://example.com/2", "Tue, 03 Jan 2023 00:00:00 GMT"),
+            ("https://example.com/3", "Wed, 04 Jan 2023 00:00:00 GMT"),
+        ]
+        undated = [("https://example.com/3", None), ("https://example.com/2", None), ("https://example.com/1", None)]
+
+        for items in (oldest_first, undated):
+            with self.subTest(items=items):
+                mock_get.return_value = make_response(dated_rss_document(*items))
+
+                entries = stream_feed_entries("https://example.com/feed", stop_at={"https://example.com/2"})
+
+                self.assertEqual([entry.link for entry in entries], [link for link, _ in items])
+
+    @patch("feed_to_somewhere.feed_stream.requests.get")
+    def test_raises_http_errors(self, mock_get):
+        """Test HTTP errors are raised and the response is closed."""
+        response = make_response(b"", status_error=HTTPError("404 Client Error"))
+        mock_get.return_value = response
+
+        with self.assertRaises(HTTPError):
+            stream_feed_entries("https://example.com/feed")
+        response.close.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,231 @@
+"""Tests for the fetching module."""
+
+import http.server
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from requests.exceptions import HTTPError, TooManyRedirects
+
+from feed_to_somewhere.fetching import Deadline, DeadlineExceeded, fetch_page, resolve_redirects
+
+
+def make_response(status_code=200, chunks=(), location=None):
+    """Build a streamed response mock."""
+    response = MagicMock()
+    response.status_code = status_code
+    response.is_redirect = location is not None
+    response.headers = {"location": location} if location else {"Content-Type": "text/html"}
+    response.raw.read1.side_effect = list(chunks) + [b""]
+    if status_code >= 400:
+        response.raise_for_status.side_effect = HTTPError(f"{status_code} error")
+    return response
+
+
+class SlowDripHandler(http.server.BaseHTTPRequestHandler):
+    """Serve a body one byte at a time, well within any socket read timeout."""
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "1000")
+        self.end_headers()
+        try:
+            for _ in range(1000):
+                self.wfile.write(b"x")
+                self.wfile.flush()
+                time.sleep(0.02)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestDeadline(unittest.TestCase):
+    """Test cases for the Deadline class."""
+
+    def test_remaining_and_expired(self):
+        """Test the remaining time follows the clock."""
+        clock = MagicMock(return_value=10.0)
+        deadline = Deadline(5, clock=clock)
+
+        self.assertEqual(deadline.remaining(), 5)
+        self.assertFalse(deadline.expired)
+
+        clock.return_value = 16.0
+        self.assertEqual(deadline.remaining(), 0)
+        self.assertTrue(deadline.expired)
+        with self.assertRaises(DeadlineExceeded):
+            deadline.check("http://example.com")
+
+    def test_unbounded_deadline(self):
+        """Test a deadline without seconds never expires."""
+        deadline = Deadline()
+
+        self.assertIsNone(deadline.remaining())
+        self.assertFalse(deadline.expired)
+        self.assertEqual(deadline.timeout(30), 30)
+
+    def test_within_returns_earlier_deadline(self):
+        """Test nested deadlines never extend the outer one."""
+        clock = MagicMock(return_value=0.0)
+        outer = Deadline(10, clock=clock)
+
+        self.assertEqual(outer.within(5).remaining(), 5)
+        self.assertEqual(outer.within(60).remaining(), 10)
+        self.assertIs(outer.within(None), outer)
+
+    def test_timeout_is_capped_by_remaining_time(self):
+        """Test socket timeouts never reach past the deadline."""
+        clock = MagicMock(return_value=0.0)
+        deadline = Deadline(10, clock=clock)
+
+        self.assertEqual(deadline.timeout(30), 10)
+        self.assertEqual(deadline.timeout(3), 3)
+
+    def test_rejects_non_positive_seconds(self):
+        """Test a deadline must lie in the future."""
+        with self.assertRaises(ValueError):
+            Deadline(0)
+
+
+class TestFetchPage(unittest.TestCase):
+    """Test cases for fetch_page."""
+
+    @patch("feed_to_somewhere.fetching.requests.get")
+    def test_reads_streamed_body(self, mock_get):
+        """Test the body is read in chunks and the response is closed."""
+        response = make_response(chunks=[b"<p>a", b"b</p>"])
+        mock_get.return_value = response
+
+        deadline = Deadline(20, clock=MagicMock(return_value=0.0))
+        page = fetch_page("http://example.com/a", deadline, headers={"User-Agent": "test"})
+
+        self.assertEqual(page.content, b"<p>ab</p>")
+        self.assertEqual(page.url, "http://example.com/a")
+        self.assertEqual(page.status_code, 200)
+        mock_get.assert_called_once_with(
+            "http://example.com/a",
+            headers={"User-Agent": "test"},
+            timeout=(10, 20),
+            stream=True,
+            allow_redirects=False,
+        )
+        response.close.assert_called_once()
+
+    @patch("feed_to_somewhere.fetching.requests.get")
+    def test_follows_redirects_within_deadline(self, mock_get):
+        """Test redirects are followed one hop at a time, resolving relative locations."""
+        mock_get.side_effect = [
+            make_response(status_code=301, location="/moved"),
+            make_response(chunks=[b"body"]),
+        ]
+
+        page = fetch_page("http://example.com/a", Deadline(30))
+
+        self.assertEqual(page.url, "http://example.com/moved")
+        self.assertEqual(page.content, b"body")
+        self.assertEqual(mock_get.call_args_list[1].args[0], "http://example.com/moved")
+
+    @patch("feed_to_somewhere.fetching.requests.get")
+    def test_too_many_redirects(self, mock_get):
+        """Test redirect loops are cut off."""
+        mock_get.side_effect = lambda *args, **kwargs: make_response(status_code=302, location="/loop")
+
+        with self.assertRaises(TooManyRedirects):
+            fetch_page("http://example.com/a", Deadline(30), max_redirects=2)
+
+        self.assertEqual(mock_get.call_count, 3)
+
+    @patch("feed_to_somewhere.fetching.requests.get")
+    def test_raises_http_errors(self, mock_get):
+        """Test error statuses raise and close the response."""
+        response = make_response(status_code=404)
+        mock_get.return_value = response
+
+        with self.assertRaises(HTTPError):
+            fetch_page("http://example.com/a", Deadline(30))
+
+        response.close.assert_called_once()
+
+    @patch("feed_to_somewhere.fetching.requests.get")
+    def test_deadline_checked_between_reads(self, mock_get):
+        """Test the deadline stops a body that keeps arriving."""
+        clock = MagicMock(return_value=0.0)
+        response = make_response(chunks=[b"a", b"b", b"c"])
+
+        def read1(size):
+            clock.return_value += 4
+            return b"x"
+
+        response.raw.read1.side_effect = read1
+        mock_get.return_value = response
+
+        with self.assertRaises(DeadlineExceeded):
+            fetch_page("http://example.com/a", Deadline(10, clock=clock))
+
+        self.assertEqual(response.raw.read1.call_count, 3)
+        response.close.assert_called_once()
+
+    def test_slow_drip_server_is_cut_off(self):
+        """Test a server trickling bytes faster than the read timeout is stopped at the deadline."""
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), SlowDripHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            started_at = time.monotonic()
+            with self.assertRaises(DeadlineExceeded):
+                fetch_page(f"http://127.0.0.1:{server.server_port}/", Deadline(0.3), read_timeout=5)
+            self.assertLess(time.monotonic() - started_at, 2)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+
+class TestResolveRedirects(unittest.TestCase):
+    """Test cases for resolve_redirects."""
+
+    @patch("feed_to_somewhere.fetching.requests.head")
+    def test_follows_chain_with_head_requests(self, mock_head):
+        """Test every hop is a HEAD request and the chain's last URL is returned."""
+        responses = [
+            make_response(status_code=301, location="https://t.co/abc"),
+            make_response(status_code=302, location="/article"),
+            make_response(status_code=405),
+        ]
+        mock_head.side_effect = responses
+
+        url = resolve_redirects("http://feedproxy.example.com/x", Deadline(30), headers={"User-Agent": "test"})
+
+        self.assertEqual(url, "https://t.co/article")
+        self.assertEqual(
+            [call.args[0] for call in mock_head.call_args_list],
+            ["http://feedproxy.example.com/x", "https://t.co/abc", "https://t.co/article"],
+        )
+        self.assertFalse(mock_head.call_args.kwargs["allow_redirects"])
+        for response in responses:
+            response.close.assert_called_once()
+
+    @patch("feed_to_somewhere.fetching.requests.head")
+    def test_too_many_redirects(self, mock_head):
+        """Test redirect loops are cut off."""
+        mock_head.side_effect = lambda *args, **kwargs: make_response(status_code=302, location="/loop")
+
+        with self.assertRaises(TooManyRedirects):
+            resolve_redirects("http://example.com/a", Deadline(30), max_redirects=2)
+
+        self.assertEqual(mock_head.call_count, 3)
+
+    def test_expired_deadline_stops_resolution(self):
+        """Test no request is sent once the deadline has passed."""
+        deadline = Deadline(30)
+        deadline.cancel()
+
+        with self.assertRaises(DeadlineExceeded):
+            resolve_redirects("http://example.com/a", deadline)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+"""Tests for the fingerprints module."""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from feed_to_somewhere.fingerprints import FingerprintIndex, hamming_distance, simhash
+
+ARTICLE = (
+    "The city council approved a new budget on Tuesday after months of debate over funding for "
+    "public transit, road repairs and the library system. Officials said the plan raises spending "
+    "on buses by ten percent while holding property taxes flat for the third year in a row. "
+    "Residents who spoke at the meeting were divided, with some praising the transit investment "
+    "and others warning that deferred maintenance on bridges would cost more in the long run."
+)
+
+
+class TestSimhash(unittest.TestCase):
+    """Test cases for the simhash function."""
+
+    def test_similar_texts_have_close_fingerprints(self):
+        """Test a small edit moves the fingerprint far less than an unrelated text."""
+        words = ARTICLE.lower().split()
+        edited = words[:-3] + ["read", "more", "here"]
+        unrelated = [f"other{index}" for index in range(len(words))]
+
+        self.assertEqual(simhash(words), simhash(list(words)))
+        self.assertLessEqual(hamming_distance(simhash(words), simhash(edited)), 8)
+        self.assertGreater(hamming_distance(simhash(words), simhash(unrelated)), 16)
+
+    def test_hamming_distance(self):
+        """Test the distance counts differing bits."""
+        self.assertEqual(hamming_distance(0b1011, 0b0001), 2)
+        self.assertEqual(hamming_distance(2**64 - 1, 0), 64)
+
+
+class TestFingerprintIndex(unittest.TestCase):
+    """Test cases for the FingerprintIndex class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.clock = MagicMock(return_value=1_000_000.0)
+        self.indexes = []
+
+    def tearDown(self):
+        """Tear down test fixtures."""
+        for index in self.indexes:
+            index.close()
+        self.temp_dir.cleanup()
+
+    def make_index(self, **kwargs):
+        """Open an index on the shared database, as another process would."""
+        kwargs.setdefault("clock", self.clock)
+        index = FingerprintIndex.from_state_dir(self.temp_dir.name, **kwargs)
+        self.indexes.append(index)
+        return index
+
+    def test_init_validates_arguments(self):
+        """Test distances beyond the banding guarantee and tiny word counts are rejected."""
+        with self.assertRaises(ValueError):
+            FingerprintIndex("fingerprints.db", max_distance=4)
+        with self.assertRaises(ValueError):
+            FingerprintIndex("fingerprints.db", min_words=2)
+
+    def test_short_bodies_are_not_fingerprinted(self):
+        """Test bodies below the word minimum get no fingerprint."""
+        index = self.make_index(min_words=50)
+
+        self.assertIsNone(index.fingerprint("No content extracted"))
+        self.assertIsInstance(index.fingerprint(ARTICLE), int)
+
+    def test_finds_near_duplicates_across_indexes(self):
+        """Test a fingerprint a few bits away is found by another process under another link."""
+        first = self.make_index()
+        second = self.make_index()
+        fingerprint = first.fingerprint(ARTICLE)
+
+        self.assertIsNone(first.check(fingerprint, "https://example.com/story"))
+        first.add(fingerprint, "https://example.com/story")
+        self.assertEqual(
+            second.check(fingerprint ^ 0b101, "https://example.com/amp/story"),
+            "https://example.com/story",
+        )
+        self.assertEqual(first.path, os.path.join(self.temp_dir.name, "fingerprints.db"))
+
+    def test_check_does_not_remember_fingerprints(self):
+        """Test only added fingerprints are found, so unwritten entries are not duplicates."""
+        index = self.make_index()
+
+        self.assertIsNone(index.check(42, "https://example.com/a"))
+        self.assertIsNone(index.check(42, "https://example.com/b"))
+
+    def test_reservations_block_concurrent_near_duplicates_until_released(self):
+        """Test a reserved fingerprint is a duplicate for other links until it is released or added."""
+        index = self.make_index()
+
+        self.assertIsNone(index.reserve(42, "https://example.com/a"))
+        self.assertEqual(index.reserve(42 ^ 1, "https://example.com/b"), "https://example.com/a")
+        self.assertIsNone(index.reserve(42, "https://example.com/b", scope="other"))
+
+        index.release("https://example.com/a")
+        self.assertIsNone(index.reserve(42 ^ 1, "https://example.com/b"))
+        index.add(42 ^ 1, "https://example.com/b")
+
+        self.assertEqual(self.make_index().check(42, "https://example.com/c"), "https://example.com/b")
+
+    def test_finds_distance_in_any_band(self):
+        """Test differences spread over three bands still leave one band to match on."""
+        index = self.make_index()
+        fingerprint = 0xFEDC_BA98_7654_3210
+        index.add(fingerprint, "https://example.com/a")
+
+        near = fingerprint ^ (1 << 63) ^ (1 << 40) ^ (1 << 20)
+        far = near ^ (1 << 5)
+
+        self.assertEqual(index.check(near, "https://example.com/b"), "https://example.com/a")
+        self.assertIsNone(index.check(far, "https://example.com/c"))
+
+    def test_respects_max_distance(self):
+        """Test fingerprints further apart than the maximum distance are distinct."""
+        index = self.make_index(max_distance=1)
+        index.add(0, "https://example.com/a")
+
+        self.assertIsNone(index.check(0b11, "https://example.com/b"))
+        self.assertEqual(index.check(0b100, "https://example.com/c"), "https://example.com/a")
+
+    def test_same_link_and_other_scopes_are_not_duplicates(self):
+        """Test rewriting a link or writing to another data source is not skipped."""
+        index = self.make_index()
+        index.add(42, "https://example.com/a", scope="team_a")
+        index.add(42, "https://example.com/a", scope="team_a")
+
+        self.assertIsNone(index.check(42, "https://example.com/a", scope="team_a"))
+        self.assertIsNone(index.check(42, "https://example.com/b", scope="team_b"))
+
+    def test_expired_fingerprints_are_forgotten(self):
+        """Test fingerprints older than the retention are dropped when the index opens."""
+        self.make_index(retention_days=1).add(42, "https://example.com/a")
+
+        self.clock.return_value += 86401
+        index = self.make_index(retention_days=1)
+
+        self.assertIsNone(index.check(42, "https://example.com/b"))
+
+if __name__ == "__main__":
+    unittest.main()
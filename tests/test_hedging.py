@@ -0,0 +1,172 @@
+"""Tests for the hedging module."""
+
+import concurrent.futures
+import threading
+import unittest
+from unittest.mock import patch
+
+from requests.exceptions import ConnectionError as RequestsConnectionError
+
+from feed_to_somewhere.fetching import Deadline, DeadlineExceeded, FetchedPage
+from feed_to_somewhere.hedging import HedgePolicy, hedged_fetch_page
+
+
+def make_page(url):
+    """Build a downloaded page."""
+    return FetchedPage(url=url, status_code=200, headers={}, content=url.encode())
+
+
+def warmed_policy(latency=0.01, samples=20, **kwargs):
+    """Build a policy that has already observed enough latencies to hedge."""
+    policy = HedgePolicy(min_samples=samples, min_delay=0.01, **kwargs)
+    for _ in range(samples):
+        policy.record_latency(latency)
+        policy.start_fetch()
+    return policy
+
+
+class TestHedgePolicy(unittest.TestCase):
+    """Test cases for the HedgePolicy class."""
+
+    def test_no_delay_until_enough_samples(self):
+        """Test hedging waits for enough observed latencies."""
+        policy = HedgePolicy(min_samples=3)
+        policy.record_latency(0.2)
+        policy.record_latency(0.3)
+
+        self.assertIsNone(policy.delay())
+
+        policy.record_latency(0.4)
+        self.assertEqual(policy.delay(), 0.4)
+
+    def test_delay_is_percentile_of_latencies(self):
+        """Test the delay is the configured percentile of recent latencies."""
+        policy = HedgePolicy(percentile=90, min_samples=10, min_delay=0)
+        for latency in range(1, 101):
+            policy.record_latency(latency / 100)
+
+        self.assertEqual(policy.delay(), 0.9)
+
+    def test_delay_has_lower_bound(self):
+        """Test very fast origins are never hedged immediately."""
+        policy = HedgePolicy(min_samples=1, min_delay=0.05)
+        policy.record_latency(0.001)
+
+        self.assertEqual(policy.delay(), 0.05)
+
+    def test_budget_limits_hedges(self):
+        """Test hedges never exceed the budgeted fraction of fetches."""
+        policy = HedgePolicy(budget=0.1)
+        for _ in range(20):
+            policy.start_fetch()
+
+        granted = sum(policy.try_acquire() for _ in range(5))
+
+        self.assertEqual(granted, 2)
+        self.assertEqual(policy.snapshot()["hedges_denied"], 3)
+
+    def test_rejects_invalid_settings(self):
+        """Test percentile and budget must be in range."""
+        with self.assertRaises(ValueError):
+            HedgePolicy(percentile=100)
+        with self.assertRaises(ValueError):
+            HedgePolicy(budget=1.5)
+
+
+class TestHedgedFetchPage(unittest.TestCase):
+    """Test cases for hedged_fetch_page."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+        self.release = threading.Event()
+
+    def tearDown(self):
+        """Tear down test fixtures."""
+        self.release.set()
+        self.executor.shutdown(wait=True)
+
+    def test_fast_response_is_not_hedged(self):
+        """Test a fetch producing headers before the delay runs alone."""
+        policy = warmed_policy(latency=5)
+
+        def fetch(url, deadline, headers=None, on_headers=None):
+            if on_headers:
+                on_headers()
+            return make_page(url)
+
+        with patch("feed_to_somewhere.hedging.fetch_page", side_effect=fetch) as mock_fetch:
+            page = hedged_fetch_page("http://example.com/a", Deadline(5), policy, self.executor)
+
+        self.assertEqual(page.url, "http://example.com/a")
+        self.assertEqual(mock_fetch.call_count, 1)
+        self.assertNotIn("hedges", policy.snapshot())
+
+    def test_slow_response_is_hedged_to_alternate_link(self):
+        """Test a slow primary gets a hedge, which wins and cancels the primary."""
+        policy = warmed_policy(budget=0.5)
+        primary_deadlines = []
+
+        def fetch(url, deadline, headers=None, on_headers=None):
+            if url == "http://slow.example.com/a":
+                primary_deadlines.append(deadline)
+                self.release.wait(5)
+                deadline.check(url)
+            return make_page(url)
+
+        with patch("feed_to_somewhere.hedging.fetch_page", side_effect=fetch):
+            page = hedged_fetch_page(
+                "http://slow.example.com/a",
+                Deadline(5),
+                policy,
+                self.executor,
+                alternate_url="http://example.com/a",
+            )
+
+        self.assertEqual(page.url, "http://example.com/a")
+        self.assertTrue(primary_deadlines[0].cancelled)
+        self.assertEqual(policy.snapshot()["hedges"], 1)
+        self.assertEqual(policy.snapshot()["hedge_wins"], 1)
+
+    def test_hedge_over_budget_is_skipped(self):
+        """Test no hedge is sent once the budget is used up."""
+        policy = warmed_policy(budget=0)
+
+        def fetch(url, deadline, headers=None, on_headers=None):
+            self.release.wait(0.1)
+            return make_page(url)
+
+        with patch("feed_to_somewhere.hedging.fetch_page", side_effect=fetch) as mock_fetch:
+            page = hedged_fetch_page("http://example.com/a", Deadline(5), policy, self.executor)
+
+        self.assertEqual(page.url, "http://example.com/a")
+        self.assertEqual(mock_fetch.call_count, 1)
+        self.assertEqual(policy.snapshot()["hedges_denied"], 1)
+
+    def test_primary_error_raised_when_all_attempts_fail(self):
+        """Test the primary's error is raised when both requests fail."""
+        policy = warmed_policy(budget=0.5)
+
+        def fetch(url, deadline, headers=None, on_headers=None):
+            if on_headers:
+                self.release.wait(0.1)
+                raise RequestsConnectionError("primary failed")
+            raise DeadlineExceeded(url, 5)
+
+        with patch("feed_to_somewhere.hedging.fetch_page", side_effect=fetch):
+            with self.assertRaises(RequestsConnectionError):
+                hedged_fetch_page("http://example.com/a", Deadline(5), policy, self.executor)
+
+    def test_fast_failure_is_not_hedged(self):
+        """Test a primary failing before the delay is reported without a hedge."""
+        policy = warmed_policy(latency=5)
+
+        with patch("feed_to_somewhere.hedging.fetch_page", side_effect=RequestsConnectionError("refused")) as mock_fetch:
+            with self.assertRaises(RequestsConnectionError):
+                hedged_fetch_page("http://example.com/a", Deadline(10), policy, self.executor)
+
+        self.assertEqual(mock_fetch.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
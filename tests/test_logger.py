@@ -1,14 +1,22 @@
 """Tests for the logger module."""
 
+import io
+import json
 import logging
+import logging.handlers
 import unittest
 
-from feed_to_somewhere.logger import setup_logger
+from feed_to_somewhere.logger import SAMPLED, JsonFormatter, LevelSampler, setup_logger, shutdown_logging
 
 
 class TestLogger(unittest.TestCase):
     """Test cases for logger configuration."""
 
+    def tearDown(self):
+        """Tear down test fixtures."""
+        shutdown_logging()
+        setup_logger()
+
     def test_setup_logger_updates_existing_handler_level(self):
         """Test setup_logger updates the level of an existing handler."""
         logger_name = "feed_to_somewhere.tests.logger"
@@ -18,6 +26,114 @@ class TestLogger(unittest.TestCase):
 
         self.assertEqual(updated_logger.level, logging.DEBUG)
         self.assertEqual(updated_logger.handlers[0].level, logging.DEBUG)
+        self.assertEqual(len(updated_logger.handlers), 1)
+
+    def test_setup_logger_queues_records(self):
+        """Test records go through a queue and are written by the listener."""
+        stream = io.StringIO()
+        logger = setup_logger(name="feed_to_somewhere.tests.queue", stream=stream)
+
+        logger.info("Added page '%s'", "Title")
+        shutdown_logging()
+
+        self.assertIsInstance(logger.handlers[0], logging.handlers.QueueHandler)
+        self.assertIn("feed_to_somewhere.tests.queue - INFO - Added page 'Title'", stream.getvalue())
+
+    def test_setup_logger_merges_arguments_before_queueing(self):
+        """Test later changes to logged arguments do not leak into the output."""
+        stream = io.StringIO()
+        logger = setup_logger(name="feed_to_somewhere.tests.snapshot", stream=stream)
+        links = ["a"]
+
+        logger.info("Links: %s", links)
+        links.append("b")
+        shutdown_logging()
+
+        self.assertIn("Links: ['a']", stream.getvalue())
+
+    def test_setup_logger_json_format(self):
+        """Test the JSON format writes one object per line, with exceptions."""
+        stream = io.StringIO()
+        logger = setup_logger(name="feed_to_somewhere.tests.json", json_format=True, stream=stream)
+
+        logger.warning("Slow host %s", "example.com")
+        try:
+            raise RuntimeError("boom")
+        except RuntimeError:
+            logger.exception("Failed")
+        shutdown_logging()
+
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual(lines[0]["level"], "WARNING")
+        self.assertEqual(lines[0]["logger"], "feed_to_somewhere.tests.json")
+        self.assertEqual(lines[0]["message"], "Slow host example.com")
+        self.assertIn("RuntimeError: boom", lines[1]["exception"])
+
+    def test_setup_logger_samples_marked_messages(self):
+        """Test sampling keeps a share of marked messages and every unmarked one."""
+        stream = io.StringIO()
+        logger = setup_logger(
+            name="feed_to_somewhere.tests.sampled",
+            sample_rates={logging.INFO: 0.25},
+            stream=stream,
+        )
+
+        for index in range(8):
+            logger.info("Entry %d", index, extra=SAMPLED)
+        logger.info("Summary")
+        shutdown_logging()
+
+        output = stream.getvalue()
+        self.assertIn("Entry 0", output)
+        self.assertIn("Entry 4", output)
+        self.assertNotIn("Entry 1", output)
+        self.assertIn("Summary", output)
+
+    def test_setup_logger_replaces_sampler(self):
+        """Test repeated setup does not stack samplers."""
+        logger_name = "feed_to_somewhere.tests.resample"
+        setup_logger(name=logger_name, sample_rates={logging.INFO: 0.5})
+        logger = setup_logger(name=logger_name)
+
+        self.assertFalse(any(isinstance(f, LevelSampler) for f in logger.filters))
+
+
+class TestLevelSampler(unittest.TestCase):
+    """Test cases for the LevelSampler class."""
+
+    def make_record(self, level, sampled=True):
+        """Build a log record."""
+        record = logging.LogRecord("test", level, __file__, 1, "message", None, None)
+        if sampled:
+            record.sampled = True
+        return record
+
+    def test_rate_zero_drops_marked_records(self):
+        """Test a zero rate drops every marked record at that level only."""
+        sampler = LevelSampler({logging.DEBUG: 0})
+
+        self.assertFalse(sampler.filter(self.make_record(logging.DEBUG)))
+        self.assertTrue(sampler.filter(self.make_record(logging.DEBUG, sampled=False)))
+        self.assertTrue(sampler.filter(self.make_record(logging.INFO)))
+
+    def test_rejects_invalid_rate(self):
+        """Test rates must be between 0 and 1."""
+        with self.assertRaises(ValueError):
+            LevelSampler({logging.INFO: 2})
+
+
+class TestJsonFormatter(unittest.TestCase):
+    """Test cases for the JsonFormatter class."""
+
+    def test_format_includes_utc_time(self):
+        """Test records are timestamped in UTC."""
+        record = logging.LogRecord("test", logging.INFO, __file__, 1, "Hello %s", ("world",), None)
+        record.created = 0
+
+        payload = json.loads(JsonFormatter().format(record))
+
+        self.assertEqual(payload["time"], "1970-01-01T00:00:00.000+00:00")
+        self.assertEqual(payload["message"], "Hello world")
 
 
 if __name__ == "__main__":
@@ -1,9 +1,15 @@
 """Tests for the main module."""
 
+import logging
+import os
+import subprocess
+import tempfile
 import unittest
 from unittest.mock import patch, MagicMock
 import sys
 from feed_to_somewhere.main import main, parse_args
+from feed_to_somewhere.sharding import ShardSpec
+from feed_to_somewhere.work_queue import WorkQueue
 
 
 class TestMain(unittest.TestCase):
@@ -22,6 +28,9 @@ class TestMain(unittest.TestCase):
             self.assertEqual(args.feed_file, "feed_list.csv")
             self.assertEqual(args.max_workers, 10)
             self.assertEqual(args.log_level, "INFO")
+            self.assertEqual(args.min_content_length, 0)
+            self.assertTrue(args.detect_truncation)
+            self.assertFalse(args.stream_feeds)
 
     def test_parse_args_custom(self):
         """Test parse_args with custom values."""
@@ -37,9 +46,32 @@ class TestMain(unittest.TestCase):
             "2",
             "--max-entries",
             "3",
+            "--time-budget",
+            "90",
+            "--grace-period",
+            "5",
+            "--article-timeout",
+            "20",
+            "--entry-timeout",
+            "45",
+            "--hedge-percentile",
+            "95",
+            "--hedge-budget",
+            "0.1",
             "--dry-run",
+            "--update-existing",
+            "--min-content-length",
+            "200",
+            "--no-truncation-detection",
+            "--stream-feeds",
             "--log-level",
             "DEBUG",
+            "--log-format",
+            "json",
+            "--log-sample",
+            "info=0.1",
+            "--log-sample",
+            "DEBUG=0",
         ])
 
         # Assert
@@ -48,14 +80,86 @@ class TestMain(unittest.TestCase):
         self.assertEqual(args.max_workers, 5)
         self.assertEqual(args.max_feeds, 2)
         self.assertEqual(args.max_entries, 3)
-        self.assertTrue(args.dry_run)
+        self.assertEqual(args.time_budget, 90.0)
+        self.assertEqual(args.grace_period, 5.0)
+        self.assertEqual(args.article_timeout, 20.0)
+        self.assertEqual(args.entry_timeout, 45.0)
+        self.assertEqual(args.hedge_percentile, 95.0)
+        self.assertEqual(args.hedge_budget, 0.1)
+        self.assertEqual(args.dry_run, "fetch")
+        self.assertTrue(args.update_existing)
+        self.assertEqual(args.min_content_length, 200)
+        self.assertFalse(args.detect_truncation)
+        self.assertTrue(args.stream_feeds)
         self.assertEqual(args.log_level, "DEBUG")
+        self.assertEqual(args.log_format, "json")
+        self.assertEqual(args.log_sample, [(logging.INFO, 0.1), (logging.DEBUG, 0.0)])
 
     def test_parse_args_rejects_non_positive_max_workers(self):
         """Test parse_args rejects non-positive worker counts."""
         with self.assertRaises(SystemExit):
             parse_args(["--max-workers", "0"])
 
+    def test_parse_args_rejects_non_positive_time_budget(self):
+        """Test parse_args rejects a time budget of zero seconds."""
+        with self.assertRaises(SystemExit):
+            parse_args(["--time-budget", "0"])
+
+    def test_parse_args_rejects_non_positive_article_timeout(self):
+        """Test parse_args rejects an article timeout of zero seconds."""
+        with self.assertRaises(SystemExit):
+            parse_args(["--article-timeout", "0"])
+
+    def test_parse_args_rejects_out_of_range_hedging(self):
+        """Test parse_args rejects hedge percentiles and budgets out of range."""
+        with self.assertRaises(SystemExit):
+            parse_args(["--hedge-percentile", "100"])
+        with self.assertRaises(SystemExit):
+            parse_args(["--hedge-budget", "2"])
+
+    def test_parse_args_rejects_invalid_log_sample(self):
+        """Test parse_args rejects malformed log sampling rules."""
+        with self.assertRaises(SystemExit):
+            parse_args(["--log-sample", "INFO"])
+        with self.assertRaises(SystemExit):
+            parse_args(["--log-sample", "VERBOSE=0.5"])
+
+    def test_parse_args_validates_shards(self):
+        """Test shard options must be complete and consistent."""
+        args = parse_args(["--shard-index", "1", "--shard-count", "3", "--processes", "4"])
+
+        self.assertEqual((args.shard_index, args.shard_count, args.processes), (1, 3, 4))
+        with self.assertRaises(SystemExit):
+            parse_args(["--shard-index", "1"])
+        with self.assertRaises(SystemExit):
+            parse_args(["--shard-index", "3", "--shard-count", "3"])
+        with self.assertRaises(SystemExit):
+            parse_args(["--processes", "2", "--feed-url", "http://example.com/feed"])
+        with self.assertRaises(SystemExit):
+            parse_args(["--processes", "2", "--work-queue", "queue.db", "--state-dir", "state"])
+        args = parse_args(["--processes", "2", "--work-queue", "queue.db", "--state-dir", ""])
+        self.assertEqual(args.processes, 2)
+
+    def test_parse_args_routes(self):
+        """Test routing rules are parsed and validated."""
+        args = parse_args(["--route", "team_b:title=(?i)kubernetes", "--route", "team_c:feed=example"])
+
+        self.assertEqual([rule.data_source_id for rule in args.routes], ["team_b", "team_c"])
+        with self.assertRaises(SystemExit):
+            parse_args(["--route", "team_b:body=x"])
+
+    def test_parse_args_enqueue_requires_work_queue(self):
+        """Test --enqueue needs a queue to write to."""
+        with self.assertRaises(SystemExit):
+            parse_args(["--enqueue"])
+        with self.assertRaises(SystemExit):
+            parse_args(["--work-queue", "jobs.db", "--lease-seconds", "0"])
+
+    def test_parse_args_rejects_negative_grace_period(self):
+        """Test parse_args rejects a negative grace period."""
+        with self.assertRaises(SystemExit):
+            parse_args(["--grace-period", "-1"])
+
     def test_parse_args_supports_version_flag(self):
         """Test parse_args supports the version flag."""
         with self.assertRaises(SystemExit) as exc:
@@ -78,7 +182,7 @@ class TestMain(unittest.TestCase):
 
         # Assert
         self.assertEqual(exit_code, 0)
-        mock_setup_logger.assert_called_once()
+        mock_setup_logger.assert_called_once_with(level=logging.INFO, json_format=False, sample_rates={})
         mock_notion_class.assert_called_once()
         mock_processor_class.assert_called_once()
         mock_processor.process_feeds.assert_called_once_with("test.csv", max_feeds=None)
@@ -120,6 +224,38 @@ class TestMain(unittest.TestCase):
         mock_processor_class.assert_called_once()
         mock_processor.process_feed_urls.assert_called_once_with(["https://example.com/feed"], max_feeds=None)
 
+    @patch("feed_to_somewhere.main.setup_logger")
+    @patch("feed_to_somewhere.main.NotionClient")
+    @patch("feed_to_somewhere.main.FeedProcessor")
+    def test_main_extract_dry_run_reports_plan(self, mock_processor_class, mock_notion_class, mock_setup_logger):
+        """Test the extract dry run writes only to a plan sink and prints its report."""
+        mock_processor = MagicMock()
+        mock_processor_class.return_value = mock_processor
+        mock_processor.process_feed_urls.return_value = 1
+
+        with patch("builtins.print") as mock_print:
+            exit_code = main(["--feed-url", "https://example.com/feed", "--dry-run", "extract"])
+
+        self.assertEqual(exit_code, 0)
+        mock_notion_class.assert_not_called()
+        kwargs = mock_processor_class.call_args.kwargs
+        self.assertFalse(kwargs["dry_run"])
+        self.assertEqual([sink.name for sink in kwargs["sinks"]], ["plan"])
+        mock_print.assert_called_once_with("No entries would be written.")
+
+    @patch("feed_to_somewhere.main.setup_logger")
+    @patch("feed_to_somewhere.main.FeedHealthStore")
+    @patch("feed_to_somewhere.main.FeedProcessor")
+    def test_main_dry_runs_keep_state_untouched(self, mock_processor_class, mock_store_class, mock_setup_logger):
+        """Test neither dry-run mode gets a health store that would record feed state."""
+        mock_processor_class.return_value.process_feed_urls.return_value = 1
+
+        for mode in ("fetch", "extract"):
+            with patch("builtins.print"):
+                main(["--feed-url", "https://example.com/feed", "--state-dir", "state", "--dry-run", mode])
+
+            self.assertIsNone(mock_processor_class.call_args.kwargs["health_store"])
+
     @patch("feed_to_somewhere.main.setup_logger")
     @patch("feed_to_somewhere.main.NotionClient")
     @patch("feed_to_somewhere.main.FeedProcessor")
@@ -142,6 +278,299 @@ class TestMain(unittest.TestCase):
         mock_processor.process_feeds.assert_called_once_with("test.csv", max_feeds=None)
         mock_logger.error.assert_called_once()
 
+    @patch("feed_to_somewhere.main.setup_logger")
+    @patch("feed_to_somewhere.main.FeedHealthStore")
+    @patch("feed_to_somewhere.main.NotionClient")
+    @patch("feed_to_somewhere.main.FeedProcessor")
+    def test_main_health_report(self, mock_processor_class, mock_notion_class, mock_store_class, mock_setup_logger):
+        """Test main prints the health report without processing feeds."""
+        mock_store_class.from_state_dir.return_value.format_report.return_value = "report"
+
+        with patch("builtins.print") as mock_print:
+            exit_code = main(["--state-dir", "/tmp/state", "--health-report"])
+
+        self.assertEqual(exit_code, 0)
+        mock_store_class.from_state_dir.assert_called_once_with("/tmp/state")
+        mock_print.assert_called_once_with("report")
+        mock_notion_class.assert_not_called()
+        mock_processor_class.assert_not_called()
+
+    @patch("feed_to_somewhere.main.setup_logger")
+    @patch("feed_to_somewhere.main.logger")
+    def test_main_health_report_requires_state_dir(self, mock_logger, mock_setup_logger):
+        """Test the health report fails without a state directory."""
+        with patch("feed_to_somewhere.main.FeedHealthStore") as mock_store_class:
+            exit_code = main(["--state-dir", "", "--health-report"])
+
+        self.assertEqual(exit_code, 1)
+        mock_store_class.from_state_dir.assert_not_called()
+        mock_logger.error.assert_called_once()
+
+    @patch("feed_to_somewhere.main.setup_logger")
+    @patch("feed_to_somewhere.main.NotionClient")
+    @patch("feed_to_somewhere.main.FeedProcessor")
+    def test_main_file_sink_skips_notion_client(self, mock_processor_class, mock_notion_class, mock_setup_logger):
+        """Test main does not create a Notion client when only file sinks are used."""
+        mock_processor = MagicMock()
+        mock_processor_class.return_value = mock_processor
+        mock_processor.process_feeds.return_value = 1
+
+        exit_code = main(["--feed-file", "test.csv", "--sink", "jsonl:out.jsonl"])
+
+        self.assertEqual(exit_code, 0)
+        mock_notion_class.assert_not_called()
+        sinks = mock_processor_class.call_args.kwargs["sinks"]
+        self.assertEqual([sink.name for sink in sinks], ["jsonl"])
+        mock_processor.close.assert_called_once()
+
+    @patch("feed_to_somewhere.main.setup_logger")
+    @patch("feed_to_somewhere.main.PipelineProfiler")
+    @patch("feed_to_somewhere.main.FeedProcessor")
+    def test_main_profile_writes_report(self, mock_processor_class, mock_profiler_class, mock_setup_logger):
+        """Test --profile hands a profiler to the processor and writes its report."""
+        mock_processor = MagicMock()
+        mock_processor_class.return_value = mock_processor
+        mock_processor.process_feeds.return_value = 1
+
+        exit_code = main(["--feed-file", "test.csv", "--sink", "jsonl:out.jsonl", "--profile", "prof", "--profile-memory"])
+
+        self.assertEqual(exit_code, 0)
+        mock_profiler_class.assert_called_once_with("prof", trace_memory=True)
+        profiler = mock_profiler_class.return_value
+        self.assertIs(mock_processor_class.call_args.kwargs["profiler"], profiler)
+        profiler.write_report.assert_called_once()
+        profiler.close.assert_called_once()
+
+    @patch("feed_to_somewhere.main.setup_logger")
+    @patch("feed_to_somewhere.main.ShutdownController")
+    @patch("feed_to_somewhere.main.FeedProcessor")
+    def test_main_shutdown_requested(self, mock_processor_class, mock_shutdown_class, mock_setup_logger):
+        """Test an interrupted run exits with an error after closing the processor."""
+        mock_processor = MagicMock()
+        mock_processor_class.return_value = mock_processor
+        mock_processor.process_feeds.return_value = 3
+        shutdown = mock_shutdown_class.return_value
+        shutdown.requested = True
+
+        exit_code = main(["--feed-file", "test.csv", "--sink", "jsonl:out.jsonl", "--grace-period", "10"])
+
+        self.assertEqual(exit_code, 1)
+        mock_shutdown_class.assert_called_once_with(grace_period=10.0)
+        self.assertIs(mock_processor_class.call_args.kwargs["shutdown"], shutdown)
+        shutdown.install.assert_called_once()
+        shutdown.complete.assert_called_once()
+        shutdown.restore.assert_called_once()
+        mock_processor.close.assert_called_once()
+
+    @patch("feed_to_somewhere.main.setup_logger")
+    @patch("feed_to_somewhere.main.FeedProcessor")
+    def test_main_passes_node_and_process_shards(self, mock_processor_class, mock_setup_logger):
+        """Test shard options reach the processor, node shard first."""
+        mock_processor_class.return_value.process_feeds.return_value = 1
+
+        main(["--sink", "jsonl:out.jsonl", "--shard-index", "1", "--shard-count", "3", "--process-shard", "0/2"])
+
+        self.assertEqual(
+            mock_processor_class.call_args.kwargs["shards"],
+            [ShardSpec(1, 3), ShardSpec(0, 2, salt="process")],
+        )
+
+    @patch("feed_to_somewhere.main.setup_logger")
+    @patch("feed_to_somewhere.main.run_shard_processes", return_value=0)
+    @patch("feed_to_somewhere.main.FeedProcessor")
+    def test_main_launches_processes(self, mock_processor_class, mock_run, mock_setup_logger):
+        """Test --processes hands the run to child processes that share one claim ledger."""
+        argv = ["--feed-file", "feeds.csv", "--processes", "3", "--state-dir", "state"]
+
+        exit_code = main(argv)
+
+        self.assertEqual(exit_code, 0)
+        mock_run.assert_called_once_with(
+            argv + ["--claim-ledger", os.path.join("state", "claims.db")],
+            3,
+            state_dir="state",
+            profile_dir=None,
+        )
+        mock_processor_class.assert_not_called()
+
+    @patch("feed_to_somewhere.main.setup_logger")
+    @patch("feed_to_somewhere.main.ClaimLedger")
+    @patch("feed_to_somewhere.main.NotionClient")
+    @patch("feed_to_somewhere.main.FeedProcessor")
+    def test_main_passes_claim_ledger_to_notion_client(
+        self, mock_processor_class, mock_notion_class, mock_ledger_class, mock_setup_logger
+    ):
+        """Test the Notion client claims links in the given ledger, which is closed afterwards."""
+        mock_processor_class.return_value.process_feeds.return_value = 1
+
+        main(["--feed-file", "test.csv", "--claim-ledger", "claims.db"])
+
+        mock_ledger_class.assert_called_once_with("claims.db")
+        mock_notion_class.assert_called_once_with(
+            update_existing=False,
+            claim_ledger=mock_ledger_class.return_value,
+            limiter=None,
+        )
+        mock_ledger_class.return_value.close.assert_called_once()
+
+    @patch("feed_to_somewhere.main.setup_logger")
+    @patch("feed_to_somewhere.main.FingerprintIndex")
+    @patch("feed_to_somewhere.main.FeedProcessor")
+    def test_main_skips_near_duplicates(self, mock_processor_class, mock_index_class, mock_setup_logger):
+        """Test --skip-near-duplicates gives the processor a fingerprint index in the state directory."""
+        mock_processor_class.return_value.process_feeds.return_value = 1
+        mock_index_class.FILE_NAME = "fingerprints.db"
+
+        main([
+            "--feed-file", "test.csv", "--sink", "jsonl:out.jsonl", "--state-dir", "state",
+            "--skip-near-duplicates", "--near-duplicate-distance", "2",
+        ])
+
+        mock_index_class.assert_called_once_with(os.path.join("state", "fingerprints.db"), max_distance=2)
+        self.assertIs(
+            mock_processor_class.call_args.kwargs["fingerprint_index"],
+            mock_index_class.return_value,
+        )
+        mock_index_class.return_value.close.assert_called_once()
+
+    @patch("feed_to_somewhere.main.setup_logger")
+    @patch("feed_to_somewhere.main.RedirectCache")
+    @patch("feed_to_somewhere.main.FeedProcessor")
+    def test_main_resolves_redirects(self, mock_processor_class, mock_cache_class, mock_setup_logger):
+        """Test --resolve-redirects gives the processor a redirect cache in the state directory."""
+        mock_processor_class.return_value.process_feeds.return_value = 1
+        mock_cache_class.FILE_NAME = "redirects.db"
+
+        main([
+            "--feed-file", "test.csv", "--sink", "jsonl:out.jsonl", "--state-dir", "state",
+            "--resolve-redirects", "--redirect-cache-ttl", "2",
+        ])
+
+        mock_cache_class.assert_called_once_with(os.path.join("state", "redirects.db"), ttl=7200.0)
+        self.assertIs(mock_processor_class.call_args.kwargs["redirect_cache"], mock_cache_class.return_value)
+        mock_cache_class.return_value.close.assert_called_once()
+
+    @patch("feed_to_somewhere.main.setup_logger")
+    @patch("feed_to_somewhere.main.FeedProcessor")
+    def test_main_near_duplicates_require_index_path(self, mock_processor_class, mock_setup_logger):
+        """Test --skip-near-duplicates fails without a place to keep fingerprints."""
+        exit_code = main(["--feed-file", "test.csv", "--state-dir", "", "--skip-near-duplicates"])
+
+        self.assertEqual(exit_code, 1)
+        mock_processor_class.assert_not_called()
+
+    @patch("feed_to_somewhere.main.setup_logger")
+    @patch("feed_to_somewhere.main.run_shard_processes", return_value=0)
+    def test_main_processes_share_fingerprint_index(self, mock_run, mock_setup_logger):
+        """Test child processes check near-duplicates against one shared index."""
+        argv = ["--feed-file", "feeds.csv", "--processes", "2", "--state-dir", "state", "--skip-near-duplicates"]
+
+        main(argv)
+
+        self.assertEqual(
+            mock_run.call_args.args[0],
+            argv + [
+                "--claim-ledger", os.path.join("state", "claims.db"),
+                "--fingerprint-index", os.path.join("state", "fingerprints.db"),
+            ],
+        )
+
+    @patch("feed_to_somewhere.main.setup_logger")
+    @patch("feed_to_somewhere.main.FeedProcessor")
+    def test_main_enqueues_feeds(self, mock_processor_class, mock_setup_logger):
+        """Test --enqueue writes the feeds to the work queue without processing them."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "jobs.db")
+
+            exit_code = main([
+                "--work-queue", path, "--enqueue",
+                "--feed-url", "http://example.com/a", "--feed-url", "http://example.com/b",
+            ])
+
+            queue = WorkQueue(path)
+            counts = queue.counts()
+            queue.close()
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(counts, {"pending": 2})
+        mock_processor_class.assert_not_called()
+
+    @patch("feed_to_somewhere.main.setup_logger")
+    def test_main_enqueue_keeps_highest_priority_feeds(self, mock_setup_logger):
+        """Test --enqueue with --max-feeds keeps the highest priority feeds, not the first ones."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "jobs.db")
+            feed_file = os.path.join(temp_dir, "feeds.csv")
+            with open(feed_file, "w", encoding="utf-8") as f:
+                f.write("http://example.com/low\n")
+                f.write("http://example.com/high,priority=5\n")
+                f.write("http://example.com/tie\n")
+                f.write("http://example.com/mid,priority=1\n")
+
+            exit_code = main([
+                "--work-queue", path, "--enqueue", "--max-feeds", "3", "--feed-file", feed_file,
+            ])
+
+            queue = WorkQueue(path)
+            urls = []
+            while (lease := queue.claim()) is not None:
+                urls.append(lease.source.url)
+            queue.close()
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(urls, ["http://example.com/high", "http://example.com/mid", "http://example.com/low"])
+
+    @patch("feed_to_somewhere.main.setup_logger")
+    @patch("feed_to_somewhere.main.NotionClient")
+    @patch("feed_to_somewhere.main.FeedProcessor")
+    def test_main_enables_adaptive_concurrency(self, mock_processor_class, mock_notion_class, mock_setup_logger):
+        """Test --adaptive-concurrency limits Notion requests and origin fetches up to --max-workers."""
+        mock_processor_class.return_value.process_feeds.return_value = 1
+
+        main(["--feed-file", "test.csv", "--max-workers", "16", "--adaptive-concurrency"])
+
+        limiter = mock_notion_class.call_args.kwargs["limiter"]
+        self.assertEqual((limiter.limit, limiter.max_limit), (4, 16))
+        self.assertTrue(mock_processor_class.call_args.kwargs["adaptive_concurrency"])
+
+    @patch("feed_to_somewhere.main.setup_logger")
+    @patch("feed_to_somewhere.main.WorkQueue")
+    @patch("feed_to_somewhere.main.FeedProcessor")
+    def test_main_processes_work_queue(self, mock_processor_class, mock_queue_class, mock_setup_logger):
+        """Test --work-queue claims feeds from the queue and succeeds when it is empty."""
+        mock_processor = mock_processor_class.return_value
+        mock_processor.process_work_queue.return_value = 0
+        mock_processor.stats.get.return_value = 0
+
+        exit_code = main(["--sink", "jsonl:out.jsonl", "--work-queue", "jobs.db", "--lease-seconds", "60"])
+
+        self.assertEqual(exit_code, 0)
+        mock_queue_class.assert_called_once_with("jobs.db", lease_seconds=60.0)
+        mock_processor.process_work_queue.assert_called_once_with(mock_queue_class.return_value, max_feeds=None)
+        mock_processor.process_feeds.assert_not_called()
+        mock_queue_class.return_value.close.assert_called_once()
+
+    def test_importing_main_defers_heavy_dependencies(self):
+        """Test the CLI entry point starts without importing network and parsing libraries."""
+        heavy_modules = ["bs4", "feedparser", "httpx", "notion_client", "requests"]
+        script = (
+            "import sys\n"
+            "import feed_to_somewhere.main\n"
+            f"print(','.join(name for name in {heavy_modules!r} if name in sys.modules))\n"
+        )
+        src_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join([src_path, os.environ.get("PYTHONPATH", "")]))
+
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            text=True,
+            env=env,
+            check=True,
+        )
+
+        self.assertEqual(result.stdout.strip(), "")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,48 @@
+"""Tests for the metrics module."""
+
+import threading
+import unittest
+
+from feed_to_somewhere.metrics import RunStats
+
+
+class TestRunStats(unittest.TestCase):
+    """Test cases for the RunStats class."""
+
+    def test_increment_and_get(self):
+        """Test counters start at zero and accumulate."""
+        stats = RunStats()
+
+        self.assertEqual(stats.get("article_fetches"), 0)
+        stats.increment("article_fetches")
+        stats.increment("article_fetches", 2)
+        self.assertEqual(stats.get("article_fetches"), 3)
+
+    def test_increment_is_thread_safe(self):
+        """Test concurrent increments are not lost."""
+        stats = RunStats()
+
+        def work():
+            for _ in range(1000):
+                stats.increment("entries")
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(stats.get("entries"), 4000)
+
+    def test_format_summary_is_sorted(self):
+        """Test the summary lists counters in name order."""
+        stats = RunStats()
+        stats.increment("b")
+        stats.increment("a", 2)
+
+        self.assertEqual(stats.format_summary(), "a=2, b=1")
+        self.assertEqual(stats.snapshot(), {"a": 2, "b": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
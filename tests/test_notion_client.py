@@ -1,7 +1,12 @@
 """Tests for the notion_client module."""
 
+import os
+import sqlite3
+import tempfile
 import unittest
 from unittest.mock import patch, MagicMock
+from feed_to_somewhere.claims import ClaimLedger
+from feed_to_somewhere.concurrency import AdaptiveLimiter
 from feed_to_somewhere.notion_client import NotionClient
 from notion_client.errors import APIResponseError
 
@@ -35,7 +40,7 @@ class TestNotionClient(unittest.TestCase):
         self.mock_logger = self.logger_patcher.start()
 
         # Create a patcher for the Client
-        self.client_patcher = patch("feed_to_somewhere.notion_client.Client")
+        self.client_patcher = patch("feed_to_somewhere.notion_client.notion_sdk.Client")
         self.mock_client_class = self.client_patcher.start()
         self.mock_client = MagicMock()
         self.mock_client_class.return_value = self.mock_client
@@ -55,7 +60,63 @@ class TestNotionClient(unittest.TestCase):
         self.assertEqual(self.notion_client.database_id, self.database_id)
         self.assertEqual(self.notion_client.data_source_id, self.data_source_id)
         self.assertEqual(self.notion_client.chunk_size, 2000)
-        self.mock_client_class.assert_called_once_with(auth=self.token)
+        self.mock_client_class.assert_called_once_with(client=self.notion_client.http)
+
+    def test_init_with_token_pool(self):
+        """Test comma-separated tokens share one SDK client, the first being the default."""
+        client = NotionClient(token="secret_a, secret_b")
+
+        self.assertEqual(client.tokens, ["secret_a", "secret_b"])
+        self.assertEqual(client.token, "secret_a")
+        self.assertEqual(len(client.token_pool), 2)
+        self.mock_client_class.assert_called_with(client=client.http)
+
+    def test_requests_round_robin_across_tokens(self):
+        """Test requests alternate between the pooled tokens."""
+        client = NotionClient(token="secret_a,secret_b")
+        self.mock_client.data_sources.query.reset_mock()
+
+        for index in range(4):
+            client.check_page_exists(f"https://example.com/{index}")
+
+        self.assertEqual(
+            [call.kwargs["auth"] for call in self.mock_client.data_sources.query.call_args_list],
+            ["secret_a", "secret_b", "secret_a", "secret_b"],
+        )
+
+    def test_rate_limited_request_fails_over_to_other_token(self):
+        """Test a 429 on one token retries on the next and skips the throttled token."""
+        client = NotionClient(token="secret_a,secret_b")
+        error = MockAPIResponseError("Rate limited")
+        error.status = 429
+        error.headers = {"retry-after": "30"}
+
+        def create(auth, **kwargs):
+            if auth == "secret_a":
+                raise error
+            return {"id": "page_id"}
+
+        self.mock_client.pages.create.side_effect = create
+
+        self.assertEqual(client._call("pages.create", parent={}), {"id": "page_id"})
+        self.assertEqual(client._call("pages.create", parent={}), {"id": "page_id"})
+
+        self.assertEqual(
+            [call.kwargs["auth"] for call in self.mock_client.pages.create.call_args_list],
+            ["secret_a", "secret_b", "secret_b"],
+        )
+        self.assertEqual(client.token_pool.stats.get("token1_throttled"), 1)
+
+    def test_rate_limit_on_every_token_is_raised(self):
+        """Test the error surfaces once every token is throttled."""
+        error = MockAPIResponseError("Rate limited")
+        error.status = 429
+        self.mock_client.pages.create.side_effect = error
+
+        with self.assertRaises(MockAPIResponseError):
+            self.notion_client._call("pages.create", parent={})
+
+        self.mock_client.pages.create.assert_called_once()
 
     def test_init_with_custom_database_values(self):
         """Test initialization with custom database values."""
@@ -69,8 +130,7 @@ class TestNotionClient(unittest.TestCase):
         self.assertEqual(notion_client.token, custom_token)
         self.assertEqual(notion_client.database_id, custom_database_id)
         self.assertEqual(notion_client.data_source_id, "resolved_data_source_id")
-        self.mock_client_class.assert_called_with(auth=custom_token)
-        self.mock_client.databases.retrieve.assert_called_once_with(database_id=custom_database_id)
+        self.mock_client.databases.retrieve.assert_called_once_with(auth=custom_token, database_id=custom_database_id)
 
     def test_init_with_custom_data_source_id(self):
         """Test initialization with an explicit data source ID."""
@@ -91,7 +151,7 @@ class TestNotionClient(unittest.TestCase):
         notion_client = NotionClient()
 
         self.assertEqual(notion_client.data_source_id, "resolved_data_source_id")
-        self.mock_client.databases.retrieve.assert_called_once_with(database_id=self.database_id)
+        self.mock_client.databases.retrieve.assert_called_once_with(auth=self.token, database_id=self.database_id)
 
     def test_init_requires_a_parent_identifier(self):
         """Test initialization requires either a data source ID or a database ID."""
@@ -277,6 +337,378 @@ class TestNotionClient(unittest.TestCase):
             self.mock_client.pages.create.assert_called_once()
             self.mock_logger.error.assert_called_once()
 
+    def test_check_page_exists_remembers_page_id_and_hash(self):
+        """Test check_page_exists records the matched page for update mode."""
+        self.mock_client.data_sources.query.return_value = {
+            "results": [
+                {
+                    "id": "page_id",
+                    "properties": {
+                        "Content Hash": {"rich_text": [{"plain_text": "abc.def"}]},
+                    },
+                }
+            ]
+        }
+
+        self.assertTrue(self.notion_client.check_page_exists("https://example.com"))
+
+        self.assertEqual(
+            self.notion_client.get_known_page("https://example.com"),
+            {"id": "page_id", "hash": "abc.def"},
+        )
+
+    def test_add_page_update_mode_stores_content_hash(self):
+        """Test add_page stores the content hash on new pages in update mode."""
+        self.notion_client.update_existing = True
+        self.mock_client.pages.create.return_value = {"id": "new_page_id"}
+
+        with patch.object(self.notion_client, "check_page_exists", return_value=False):
+            self.notion_client.add_page("Test Title", "https://example.com", "Test Body", "2023-01-01")
+
+        properties = self.mock_client.pages.create.call_args.kwargs["properties"]
+        self.assertEqual(
+            properties["Content Hash"]["rich_text"][0]["text"]["content"],
+            NotionClient.build_content_hash("Test Title", "Test Body", "2023-01-01"),
+        )
+
+    def test_add_page_without_update_mode_omits_content_hash(self):
+        """Test add_page does not require the hash property outside update mode."""
+        self.mock_client.pages.create.return_value = {"id": "new_page_id"}
+
+        with patch.object(self.notion_client, "check_page_exists", return_value=False):
+            self.notion_client.add_page("Test Title", "https://example.com", "Test Body", "2023-01-01")
+
+        properties = self.mock_client.pages.create.call_args.kwargs["properties"]
+        self.assertNotIn("Content Hash", properties)
+
+    def _existing_page(self, title, body, date):
+        """Build a query payload for an existing page with a stored hash."""
+        return {
+            "results": [
+                {
+                    "id": "page_id",
+                    "properties": {
+                        "Content Hash": {
+                            "rich_text": [
+                                {"plain_text": NotionClient.build_content_hash(title, body, date)}
+                            ]
+                        },
+                    },
+                }
+            ]
+        }
+
+    def test_add_page_update_mode_skips_unchanged_page(self):
+        """Test update mode performs no writes when the content hash matches."""
+        self.notion_client.update_existing = True
+        self.mock_client.data_sources.query.return_value = self._existing_page(
+            "Test Title", "Test Body", "2023-01-01"
+        )
+
+        result = self.notion_client.add_page("Test Title", "https://example.com", "Test Body", "2023-01-01")
+
+        self.assertIsNone(result)
+        self.mock_client.pages.create.assert_not_called()
+        self.mock_client.pages.update.assert_not_called()
+        self.mock_client.blocks.children.append.assert_not_called()
+        self.mock_client.blocks.delete.assert_not_called()
+
+    def test_add_page_update_mode_updates_properties_only(self):
+        """Test update mode keeps the body when only the title changed."""
+        self.notion_client.update_existing = True
+        self.mock_client.data_sources.query.return_value = self._existing_page(
+            "Old Title", "Test Body", "2023-01-01"
+        )
+        self.mock_client.pages.update.return_value = {"id": "page_id"}
+
+        result = self.notion_client.add_page("New Title", "https://example.com", "Test Body", "2023-01-01")
+
+        self.assertEqual(result, {"id": "page_id"})
+        self.mock_client.pages.update.assert_called_once()
+        self.assertEqual(self.mock_client.pages.update.call_args.kwargs["page_id"], "page_id")
+        self.mock_client.blocks.children.list.assert_not_called()
+        self.mock_client.blocks.children.append.assert_not_called()
+
+    def test_add_page_update_mode_replaces_changed_body(self):
+        """Test update mode replaces the body when it changed."""
+        self.notion_client.update_existing = True
+        self.mock_client.data_sources.query.return_value = self._existing_page(
+            "Test Title", "Old Body", "2023-01-01"
+        )
+        self.mock_client.blocks.children.list.side_effect = [
+            {"results": [{"id": "block_1"}], "has_more": True, "next_cursor": "cursor"},
+            {"results": [{"id": "block_2"}], "has_more": False},
+        ]
+        self.mock_client.pages.update.return_value = {"id": "page_id"}
+
+        result = self.notion_client.add_page("Test Title", "https://example.com", "New Body", "2023-01-01")
+
+        self.assertEqual(result, {"id": "page_id"})
+        self.mock_client.pages.create.assert_not_called()
+        self.assertEqual(self.mock_client.blocks.delete.call_count, 2)
+        self.mock_client.blocks.children.append.assert_called_once()
+        self.mock_client.pages.update.assert_called_once()
+
+    def test_update_page_keeps_old_hash_when_body_replacement_fails(self):
+        """Test update_page does not stamp the new hash after a failed body write."""
+        self.mock_client.blocks.children.list.side_effect = MockAPIResponseError()
+
+        result = self.notion_client.update_page(
+            "page_id", "Test Title", "https://example.com", "Body", "2023-01-01", previous_hash="stale.hash"
+        )
+
+        self.assertIsNone(result)
+        self.mock_client.pages.update.assert_not_called()
+
+    def test_update_page_only_stamps_missing_hash(self):
+        """Test a page created before hashes were stored is stamped, not rewritten."""
+        self.mock_client.pages.update.return_value = {"id": "page_id"}
+
+        outcome, page = self.notion_client._update_page(
+            "page_id", "Test Title", "https://example.com", "Body", "2023-01-01", None, None
+        )
+
+        self.assertIsNone(outcome)
+        self.assertEqual(page, {"id": "page_id"})
+        self.assertEqual(
+            self.mock_client.pages.update.call_args.kwargs["properties"],
+            {
+                "Content Hash": {
+                    "rich_text": [
+                        {"text": {"content": NotionClient.build_content_hash("Test Title", "Body", "2023-01-01")}}
+                    ]
+                }
+            },
+        )
+        self.mock_client.blocks.children.list.assert_not_called()
+        self.mock_client.blocks.children.append.assert_not_called()
+
+    def test_update_mode_leaves_date_of_undated_entries_alone(self):
+        """Test an undated entry is created with today's date but updated without a date."""
+        self.notion_client.update_existing = True
+        self.mock_client.pages.create.return_value = {"id": "new_page_id"}
+
+        with patch.object(self.notion_client, "check_page_exists", return_value=False):
+            self.notion_client.add_page("Test Title", "https://example.com", "Test Body", None)
+
+        properties = self.mock_client.pages.create.call_args.kwargs["properties"]
+        self.assertIn("Date", properties)
+        self.assertEqual(
+            properties["Content Hash"]["rich_text"][0]["text"]["content"],
+            NotionClient.build_content_hash("Test Title", "Test Body", None),
+        )
+
+        self.mock_client.pages.update.return_value = {"id": "page_id"}
+        self.notion_client.update_page(
+            "page_id",
+            "New Title",
+            "https://example.com",
+            "Test Body",
+            None,
+            previous_hash=NotionClient.build_content_hash("Test Title", "Test Body", None),
+        )
+
+        self.assertNotIn("Date", self.mock_client.pages.update.call_args.kwargs["properties"])
+
+    def test_write_page_reports_unchanged_page_as_skipped(self):
+        """Test write_page tells unchanged pages apart from failed writes."""
+        self.notion_client.update_existing = True
+        self.mock_client.data_sources.query.return_value = self._existing_page(
+            "Test Title", "Test Body", "2023-01-01"
+        )
+
+        self.assertIsNone(
+            self.notion_client.write_page("Test Title", "https://example.com", "Test Body", "2023-01-01")
+        )
+
+        with patch.object(self.notion_client, "check_page_exists", return_value=None):
+            self.assertFalse(
+                self.notion_client.write_page("Other", "https://example.com/other", "Body", "2023-01-01")
+            )
+
+    def test_add_page_targets_explicit_data_source(self):
+        """Test add_page queries and creates pages in the requested data source."""
+        self.mock_client.data_sources.query.return_value = {"results": []}
+        self.mock_client.pages.create.return_value = {"id": "new_page_id"}
+
+        self.notion_client.add_page(
+            "Test Title", "https://example.com", "Test Body", "2023-01-01", data_source_id="other_source"
+        )
+
+        self.assertEqual(
+            self.mock_client.data_sources.query.call_args.kwargs["data_source_id"],
+            "other_source",
+        )
+        self.assertEqual(
+            self.mock_client.pages.create.call_args.kwargs["parent"],
+            {"data_source_id": "other_source"},
+        )
+
+    def test_pending_links_are_tracked_per_data_source(self):
+        """Test the same link can be written to two data sources concurrently."""
+        self.assertTrue(self.notion_client._mark_link_pending("https://example.com"))
+        self.assertFalse(self.notion_client._mark_link_pending("https://example.com"))
+        self.assertTrue(self.notion_client._mark_link_pending("https://example.com", "other_source"))
+
+    def test_pending_links_are_claimed_across_clients(self):
+        """Test two clients sharing a claim ledger never create the same link at once."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "claims.db")
+            first = NotionClient(claim_ledger=ClaimLedger(path))
+            second = NotionClient(claim_ledger=ClaimLedger(path))
+
+            self.assertTrue(first._mark_link_pending("https://example.com"))
+            self.assertFalse(second._mark_link_pending("https://example.com"))
+            self.assertTrue(second._mark_link_pending("https://example.com/other"))
+
+            first._clear_pending_link("https://example.com")
+            self.assertTrue(second._mark_link_pending("https://example.com"))
+            self.assertFalse(first._mark_link_pending("https://example.com"))
+
+            first.claim_ledger.close()
+            second.claim_ledger.close()
+
+    def test_created_pages_stay_claimed_for_other_processes(self):
+        """Test a process with a stale batch check neither creates a page another process created nor trusts the cache."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "claims.db")
+            first = NotionClient(claim_ledger=ClaimLedger(path))
+            second = NotionClient(claim_ledger=ClaimLedger(path))
+            self.mock_client.data_sources.query.return_value = {"results": []}
+            self.mock_client.pages.create.return_value = {"id": "new_page_id"}
+            first.find_existing_links(["https://example.com"])
+            second.find_existing_links(["https://example.com"])
+
+            self.assertIsNotNone(first.add_page("Title", "https://example.com", "Body", "2023-01-01"))
+            self.assertIsNone(second.add_page("Title", "https://example.com", "Body", "2023-01-01"))
+
+            # Once the claim has gone, the stale batch result is checked again live.
+            first.claim_ledger.release("\0".join(first._page_key("https://example.com")))
+            self.mock_client.data_sources.query.reset_mock()
+            self.mock_client.data_sources.query.return_value = {"results": [{"id": "new_page_id"}]}
+            self.assertIsNone(second.add_page("Title", "https://example.com", "Body", "2023-01-01"))
+
+            self.mock_client.data_sources.query.assert_called_once()
+            self.mock_client.pages.create.assert_called_once()
+            first.claim_ledger.close()
+            second.claim_ledger.close()
+
+    def test_pending_links_fall_back_when_claim_ledger_fails(self):
+        """Test a broken claim ledger only logs a warning."""
+        ledger = MagicMock(path="claims.db")
+        ledger.try_claim.side_effect = sqlite3.OperationalError("disk I/O error")
+        client = NotionClient(claim_ledger=ledger)
+
+        self.assertTrue(client._mark_link_pending("https://example.com"))
+        self.assertFalse(client._mark_link_pending("https://example.com"))
+        self.mock_logger.warning.assert_called_once()
+
+    def test_api_calls_back_off_on_rate_limit(self):
+        """Test a 429 from Notion cuts the adaptive limit and is still raised."""
+        limiter = AdaptiveLimiter(initial_limit=8)
+        client = NotionClient(limiter=limiter)
+        error = MockAPIResponseError("Rate limited")
+        error.status = 429
+        self.mock_client.pages.create.side_effect = error
+
+        result = client.add_page("Title", "https://example.com", "Body", "2024-01-01")
+
+        self.assertIsNone(result)
+        self.assertEqual(limiter.limit, 4)
+        self.assertEqual(limiter.in_flight, 0)
+
+    def test_title_property_comes_from_cached_schema(self):
+        """Test each data source's schema is retrieved once and names its title property."""
+        schemas = {
+            "test_data_source_id": {"properties": {"Title": {"type": "title"}, "URL": {"type": "url"}}},
+            "other_source": {"properties": {"Headline": {"type": "title"}}},
+        }
+        self.mock_client.data_sources.retrieve.side_effect = lambda data_source_id, auth: schemas[data_source_id]
+
+        first = self.notion_client._build_properties("Title", "https://example.com", "2024-01-01", None)
+        again = self.notion_client._build_properties("Title", "https://example.com", "2024-01-01", None)
+        other = self.notion_client._build_properties(
+            "Title", "https://example.com", "2024-01-01", None, "other_source"
+        )
+
+        self.assertIn("Title", first)
+        self.assertEqual(first, again)
+        self.assertIn("Headline", other)
+        self.assertEqual(self.mock_client.data_sources.retrieve.call_count, 2)
+
+    def test_schema_falls_back_when_retrieval_fails(self):
+        """Test a failed schema lookup keeps the default title property."""
+        self.mock_client.data_sources.retrieve.side_effect = MockAPIResponseError("Forbidden")
+
+        properties = self.notion_client._build_properties("Title", "https://example.com", "2024-01-01", None)
+
+        self.assertIn("Name", properties)
+        self.mock_logger.warning.assert_called_once()
+
+    def test_find_existing_links_uses_or_filter_batches(self):
+        """Test find_existing_links checks links in compound-filter batches."""
+        links = [f"https://example.com/{index}" for index in range(150)]
+        self.mock_client.data_sources.query.side_effect = [
+            {"results": [{"id": "page_1", "properties": {"URL": {"url": links[1]}}}], "has_more": False},
+            {"results": [{"id": "page_120", "properties": {"URL": {"url": links[120]}}}], "has_more": False},
+        ]
+
+        existing = self.notion_client.find_existing_links(links + [links[0], ""])
+
+        self.assertEqual(existing, {links[1], links[120]})
+        self.assertEqual(self.mock_client.data_sources.query.call_count, 2)
+        first_filter = self.mock_client.data_sources.query.call_args_list[0].kwargs["filter"]
+        self.assertEqual(len(first_filter["or"]), 100)
+        self.assertEqual(first_filter["or"][0], {"property": "URL", "url": {"equals": links[0]}})
+
+    def test_find_existing_links_follows_pagination(self):
+        """Test find_existing_links pages through large result sets."""
+        self.mock_client.data_sources.query.side_effect = [
+            {
+                "results": [{"id": "page_a", "properties": {"URL": {"url": "https://example.com/a"}}}],
+                "has_more": True,
+                "next_cursor": "cursor",
+            },
+            {
+                "results": [{"id": "page_b", "properties": {"URL": {"url": "https://example.com/b"}}}],
+                "has_more": False,
+            },
+        ]
+
+        existing = self.notion_client.find_existing_links(["https://example.com/a", "https://example.com/b"])
+
+        self.assertEqual(existing, {"https://example.com/a", "https://example.com/b"})
+        self.assertEqual(
+            self.mock_client.data_sources.query.call_args_list[1].kwargs["start_cursor"],
+            "cursor",
+        )
+
+    def test_check_page_exists_reuses_batched_results(self):
+        """Test links checked in a batch need no further query."""
+        self.mock_client.data_sources.query.return_value = {
+            "results": [{"id": "page_a", "properties": {"URL": {"url": "https://example.com/a"}}}],
+            "has_more": False,
+        }
+        self.notion_client.find_existing_links(["https://example.com/a", "https://example.com/b"])
+        self.mock_client.data_sources.query.reset_mock()
+
+        self.assertTrue(self.notion_client.check_page_exists("https://example.com/a"))
+        self.assertFalse(self.notion_client.check_page_exists("https://example.com/b"))
+        self.mock_client.data_sources.query.assert_not_called()
+        self.assertEqual(self.notion_client.get_known_page("https://example.com/a")["id"], "page_a")
+
+    def test_find_existing_links_error(self):
+        """Test find_existing_links returns None when a query fails."""
+        self.mock_client.data_sources.query.side_effect = MockAPIResponseError()
+
+        self.assertIsNone(self.notion_client.find_existing_links(["https://example.com/a"]))
+        self.mock_logger.error.assert_called_once()
+
+        self.mock_client.data_sources.query.side_effect = None
+        self.mock_client.data_sources.query.return_value = {"results": []}
+        self.assertFalse(self.notion_client.check_page_exists("https://example.com/a"))
+        self.mock_client.data_sources.query.assert_called()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,136 @@
+"""Tests for the profiling module."""
+
+import json
+import os
+import tempfile
+import threading
+import tracemalloc
+import unittest
+from unittest.mock import patch
+
+from feed_to_somewhere.profiling import PipelineProfiler, profile_stage
+
+
+def busy_work(size=2000):
+    """Do a little measurable work."""
+    return sum(index * index for index in range(size))
+
+
+class TestPipelineProfiler(unittest.TestCase):
+    """Test cases for the PipelineProfiler class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.logger_patcher = patch("feed_to_somewhere.profiling.logger")
+        self.mock_logger = self.logger_patcher.start()
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Tear down test fixtures."""
+        self.logger_patcher.stop()
+        self.temp_dir.cleanup()
+
+    def test_stage_collects_timings(self):
+        """Test stage runs are counted and timed per stage name."""
+        profiler = PipelineProfiler(self.temp_dir.name)
+
+        for _ in range(3):
+            with profiler.stage("extract"):
+                busy_work()
+        with profiler.stage("fetch"):
+            busy_work()
+
+        summary = profiler.summary()
+        self.assertEqual(list(summary), ["extract", "fetch"])
+        self.assertEqual(summary["extract"]["calls"], 3)
+        self.assertGreater(summary["extract"]["total"], 0)
+        self.assertGreaterEqual(summary["extract"]["total"], summary["extract"]["max"])
+
+    def test_stage_records_failures(self):
+        """Test a stage that raises is still recorded and the error propagates."""
+        profiler = PipelineProfiler(self.temp_dir.name)
+
+        with self.assertRaises(RuntimeError):
+            with profiler.stage("write_notion"):
+                raise RuntimeError("boom")
+
+        self.assertEqual(profiler.summary()["write_notion"]["calls"], 1)
+
+    def test_nested_stages_are_timed(self):
+        """Test nested stages in the same thread do not start a second profiler."""
+        profiler = PipelineProfiler(self.temp_dir.name)
+
+        with profiler.stage("fetch"):
+            with profiler.stage("extract"):
+                busy_work()
+
+        self.assertEqual(set(profiler.summary()), {"fetch", "extract"})
+
+    def test_write_report_merges_thread_profiles(self):
+        """Test the report holds the stage table and one merged profile per stage."""
+        profiler = PipelineProfiler(self.temp_dir.name)
+
+        def worker():
+            with profiler.stage("extract"):
+                busy_work()
+
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        written = profiler.write_report()
+
+        with open(os.path.join(self.temp_dir.name, PipelineProfiler.SUMMARY_FILE), encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["extract"]["calls"], 3)
+        with open(os.path.join(self.temp_dir.name, PipelineProfiler.REPORT_FILE), encoding="utf-8") as f:
+            self.assertTrue(f.readline().startswith("STAGE"))
+
+        if profiler.cprofile_enabled:
+            self.assertIn(os.path.join(self.temp_dir.name, "extract.pstats"), written)
+            with open(os.path.join(self.temp_dir.name, "extract.txt"), encoding="utf-8") as f:
+                self.assertIn("busy_work", f.read())
+
+    @patch.object(PipelineProfiler, "PER_THREAD_PROFILING", False)
+    def test_whole_run_profile_without_per_thread_profiling(self):
+        """Test one profile of the whole run is written where per-stage profilers are unavailable."""
+        profiler = PipelineProfiler(self.temp_dir.name)
+
+        with profiler.stage("extract"):
+            busy_work()
+        written = profiler.write_report()
+        profiler.close()
+
+        self.assertFalse(profiler.cprofile_enabled)
+        self.assertNotIn(os.path.join(self.temp_dir.name, "extract.pstats"), written)
+        self.assertIn(os.path.join(self.temp_dir.name, "run.pstats"), written)
+        with open(os.path.join(self.temp_dir.name, "run.txt"), encoding="utf-8") as f:
+            self.assertIn("busy_work", f.read())
+        with open(os.path.join(self.temp_dir.name, PipelineProfiler.SUMMARY_FILE), encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["extract"]["calls"], 1)
+
+    def test_trace_memory_reports_peaks_and_allocations(self):
+        """Test memory tracing records stage peaks and writes allocation sites."""
+        was_tracing = tracemalloc.is_tracing()
+        profiler = PipelineProfiler(self.temp_dir.name, trace_memory=True)
+
+        with profiler.stage("extract"):
+            data = [bytes(1000) for _ in range(1000)]
+        del data
+
+        self.assertGreater(profiler.summary()["extract"]["peak_memory"], 1_000_000)
+        profiler.write_report()
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir.name, PipelineProfiler.MEMORY_FILE)))
+
+        profiler.close()
+        self.assertEqual(tracemalloc.is_tracing(), was_tracing)
+
+    def test_profile_stage_without_profiler_is_a_no_op(self):
+        """Test profile_stage does nothing when profiling is disabled."""
+        with profile_stage(None, "fetch"):
+            busy_work()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+"""Tests for the redirects module."""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from feed_to_somewhere.redirects import RedirectCache, canonicalize_url
+
+
+class TestCanonicalizeUrl(unittest.TestCase):
+    """Test cases for canonicalize_url."""
+
+    def test_removes_tracking_parameters_and_fragment(self):
+        """Test tracking parameters and fragments are dropped while other parameters stay."""
+        self.assertEqual(
+            canonicalize_url("HTTPS://Example.COM/Story?id=7&utm_source=rss&UTM_Medium=feed&fbclid=x#comments"),
+            "https://example.com/Story?id=7",
+        )
+
+    def test_keeps_clean_urls(self):
+        """Test URLs without tracking parameters are unchanged."""
+        self.assertEqual(canonicalize_url("https://example.com/a?page=2"), "https://example.com/a?page=2")
+
+    def test_keeps_remaining_query_parameters_verbatim(self):
+        """Test blank values, encodings and parameter order survive removing tracking parameters."""
+        self.assertEqual(
+            canonicalize_url("https://example.com/search?q=a%20b&utm_source=rss&a=&b&c=x+y"),
+            "https://example.com/search?q=a%20b&a=&b&c=x+y",
+        )
+        self.assertEqual(
+            canonicalize_url("https://example.com/search?z=1&a=&b&utm%5Fmedium=feed"),
+            "https://example.com/search?z=1&a=&b",
+        )
+
+
+class TestRedirectCache(unittest.TestCase):
+    """Test cases for the RedirectCache class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.clock = MagicMock(return_value=1_000_000.0)
+        self.caches = []
+
+    def tearDown(self):
+        """Tear down test fixtures."""
+        for cache in self.caches:
+            cache.close()
+        self.temp_dir.cleanup()
+
+    def make_cache(self, **kwargs):
+        """Open a cache in the temporary state directory."""
+        kwargs.setdefault("clock", self.clock)
+        cache = RedirectCache.from_state_dir(self.temp_dir.name, **kwargs)
+        self.caches.append(cache)
+        return cache
+
+    def test_init_rejects_non_positive_ttl(self):
+        """Test the TTL must be positive."""
+        with self.assertRaises(ValueError):
+            RedirectCache(":memory:", ttl=0)
+
+    def test_persists_links_and_their_canonical_urls(self):
+        """Test a resolved link and its canonical URL are found by a later run."""
+        self.make_cache().put("https://t.co/abc", "https://example.com/story")
+
+        cache = self.make_cache()
+
+        self.assertEqual(cache.get("https://t.co/abc"), "https://example.com/story")
+        self.assertEqual(cache.get("https://example.com/story"), "https://example.com/story")
+        self.assertIsNone(cache.get("https://t.co/other"))
+        self.assertEqual(cache.path, os.path.join(self.temp_dir.name, "redirects.db"))
+
+    def test_links_expire_after_ttl(self):
+        """Test links are resolved again once their TTL has passed."""
+        cache = self.make_cache(ttl=60)
+        cache.put("https://t.co/abc", "https://example.com/story")
+
+        self.clock.return_value += 60
+        self.assertEqual(cache.get("https://t.co/abc"), "https://example.com/story")
+        self.clock.return_value += 1
+        self.assertIsNone(cache.get("https://t.co/abc"))
+
+    def test_in_memory_cache(self):
+        """Test a cache without a file works for a single run."""
+        cache = RedirectCache(":memory:", clock=self.clock)
+        self.caches.append(cache)
+
+        cache.put("https://t.co/abc", "https://example.com/story")
+
+        self.assertEqual(cache.get("https://t.co/abc"), "https://example.com/story")
+
+
+if __name__ == "__main__":
+    unittest.main()
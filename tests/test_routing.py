@@ -0,0 +1,50 @@
+"""Tests for the routing module."""
+
+import unittest
+
+from feed_to_somewhere.feed_sources import FeedSource
+from feed_to_somewhere.routing import RoutingRule, route_entry
+
+
+class TestRoutingRule(unittest.TestCase):
+    """Test cases for the RoutingRule class."""
+
+    def test_parse_and_match(self):
+        """Test rules match their field with a regular expression search."""
+        rule = RoutingRule.parse("team_b:title=(?i)kubernetes")
+
+        self.assertEqual(rule.data_source_id, "team_b")
+        self.assertTrue(rule.matches("Scaling Kubernetes", "https://example.com/1", "https://example.com/feed"))
+        self.assertFalse(rule.matches("Scaling Postgres", "https://example.com/k8s", "https://example.com/feed"))
+
+    def test_parse_rejects_malformed_rules(self):
+        """Test rules need a data source, a known field and a valid pattern."""
+        for value in ["team_b", "team_b:title", ":title=x", "team_b:body=x", "team_b:title=("]:
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    RoutingRule.parse(value)
+
+
+class TestRouteEntry(unittest.TestCase):
+    """Test cases for route_entry."""
+
+    def test_defaults_to_default_data_source(self):
+        """Test entries of feeds without data sources go to the default one."""
+        self.assertEqual(route_entry("Title", "https://example.com/1", FeedSource("https://example.com/feed")), [None])
+
+    def test_feed_targets_and_rules_fan_out(self):
+        """Test feed targets come first and matching rules add targets once."""
+        source = FeedSource("https://example.com/feed", data_source_id="team_a|team_b")
+        rules = [
+            RoutingRule.parse("team_b:link=example"),
+            RoutingRule.parse("team_c:feed=example\\.com"),
+            RoutingRule.parse("team_d:title=^Nope"),
+        ]
+
+        targets = route_entry("Title", "https://example.com/1", source, rules)
+
+        self.assertEqual(targets, ["team_a", "team_b", "team_c"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+"""Tests for the sharding module."""
+
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+from feed_to_somewhere.sharding import ShardSpec, filter_shards, run_shard_processes
+
+
+URLS = [f"https://example{index}.com/feed.xml" for index in range(400)]
+
+
+class TestShardSpec(unittest.TestCase):
+    """Test cases for the ShardSpec class."""
+
+    def test_shards_partition_urls(self):
+        """Test every URL is owned by exactly one shard, spread roughly evenly."""
+        shards = [ShardSpec(index, 4) for index in range(4)]
+
+        owned = [filter_shards(URLS, [shard]) for shard in shards]
+
+        self.assertEqual(sorted(url for subset in owned for url in subset), sorted(URLS))
+        for subset in owned:
+            self.assertGreater(len(subset), 60)
+
+    def test_ownership_is_stable_when_feeds_are_added(self):
+        """Test adding feeds never moves existing feeds to another shard."""
+        shard = ShardSpec(1, 3)
+        before = filter_shards(URLS[:200], [shard])
+
+        after = filter_shards(URLS, [shard])
+
+        self.assertEqual(after[:len(before)], before)
+
+    def test_changing_shard_count_moves_few_feeds(self):
+        """Test growing from 4 to 5 shards only moves feeds to the new shard."""
+        moved = [url for url in URLS if ShardSpec(0, 4).owner(url) != ShardSpec(0, 5).owner(url)]
+
+        self.assertTrue(all(ShardSpec(0, 5).owner(url) == 4 for url in moved))
+        self.assertLess(len(moved), len(URLS) * 0.35)
+
+    def test_levels_are_independent(self):
+        """Test process shards split each node shard again."""
+        node = ShardSpec(0, 2)
+        processes = [ShardSpec(index, 3, salt="process") for index in range(3)]
+        node_urls = filter_shards(URLS, [node])
+
+        owned = [filter_shards(URLS, [node, process]) for process in processes]
+
+        self.assertEqual(sorted(url for subset in owned for url in subset), sorted(node_urls))
+        self.assertTrue(all(subset for subset in owned))
+
+    def test_parse(self):
+        """Test INDEX/COUNT descriptions are parsed."""
+        self.assertEqual(ShardSpec.parse("2/4", salt="process"), ShardSpec(2, 4, "process"))
+        self.assertEqual(str(ShardSpec(2, 4)), "2/4")
+
+        with self.assertRaises(ValueError):
+            ShardSpec.parse("2")
+        with self.assertRaises(ValueError):
+            ShardSpec.parse("4/4")
+
+    def test_single_shard_owns_everything(self):
+        """Test a single shard keeps every URL."""
+        self.assertEqual(filter_shards(URLS, [ShardSpec(0, 1)]), URLS)
+
+
+class TestRunShardProcesses(unittest.TestCase):
+    """Test cases for run_shard_processes."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.logger_patcher = patch("feed_to_somewhere.sharding.logger")
+        self.mock_logger = self.logger_patcher.start()
+
+    def tearDown(self):
+        """Tear down test fixtures."""
+        self.logger_patcher.stop()
+
+    @patch("feed_to_somewhere.sharding.subprocess.Popen")
+    def test_starts_one_child_per_process_shard(self, mock_popen):
+        """Test children get their process shard and their own state directory."""
+        mock_popen.return_value.wait.return_value = 0
+
+        exit_code = run_shard_processes(["--feed-file", "feeds.csv", "--processes", "2"], 2, state_dir="state")
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(mock_popen.call_count, 2)
+        command = mock_popen.call_args_list[1].args[0]
+        self.assertEqual(command[:3], [sys.executable, "-m", "feed_to_somewhere.main"])
+        self.assertEqual(
+            command[3:],
+            [
+                "--feed-file", "feeds.csv", "--processes", "2",
+                "--processes", "1", "--process-shard", "1/2",
+                "--state-dir", os.path.join("state", "process-1-of-2"),
+            ],
+        )
+
+    @patch("feed_to_somewhere.sharding.subprocess.Popen")
+    def test_reports_failed_children(self, mock_popen):
+        """Test a failing child makes the launcher fail."""
+        children = [MagicMock(), MagicMock()]
+        children[0].wait.return_value = 0
+        children[1].wait.return_value = 3
+        mock_popen.side_effect = children
+
+        exit_code = run_shard_processes([], 2)
+
+        self.assertEqual(exit_code, 3)
+        self.mock_logger.error.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
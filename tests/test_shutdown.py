@@ -0,0 +1,210 @@
+"""Tests for the shutdown module."""
+
+import os
+import signal
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from feed_to_somewhere.shutdown import PendingEntryJournal, ShutdownController
+from feed_to_somewhere.sinks import EntryRecord
+
+
+def make_record(index):
+    """Build an entry record for the tests."""
+    return EntryRecord(
+        title=f"Entry {index}",
+        link=f"http://example.com/{index}",
+        body="Body",
+        date="2024-01-01",
+        feed_url="http://example.com/feed",
+    )
+
+
+class TestShutdownController(unittest.TestCase):
+    """Test cases for the ShutdownController class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.logger_patcher = patch("feed_to_somewhere.shutdown.logger")
+        self.mock_logger = self.logger_patcher.start()
+        self.exit_called = threading.Event()
+        self.exit_func = MagicMock(side_effect=lambda code: self.exit_called.set())
+
+    def tearDown(self):
+        """Tear down test fixtures."""
+        self.logger_patcher.stop()
+
+    def test_rejects_negative_grace_period(self):
+        """Test a negative grace period is rejected."""
+        with self.assertRaises(ValueError):
+            ShutdownController(grace_period=-1)
+
+    def test_request_runs_callbacks(self):
+        """Test requesting shutdown runs the registered callbacks on the watcher thread."""
+        controller = ShutdownController(grace_period=5, exit_func=self.exit_func)
+        ran = threading.Event()
+        controller.add_callback(ran.set)
+
+        controller.request("test")
+
+        self.assertTrue(controller.requested)
+        self.assertEqual(controller.reason, "test")
+        self.assertTrue(ran.wait(2))
+        controller.complete()
+        self.assertFalse(self.exit_called.wait(0.1))
+
+    def test_callback_added_after_request_runs_immediately(self):
+        """Test callbacks registered after the request still run."""
+        controller = ShutdownController(grace_period=5, exit_func=self.exit_func)
+        first = threading.Event()
+        controller.add_callback(first.set)
+        controller.request()
+        self.assertTrue(first.wait(2))
+
+        late = MagicMock()
+        controller.add_callback(late)
+
+        late.assert_called_once()
+        controller.complete()
+
+    def test_removed_callback_does_not_run(self):
+        """Test removed callbacks are skipped."""
+        controller = ShutdownController(grace_period=5, exit_func=self.exit_func)
+        removed = MagicMock()
+        kept = threading.Event()
+        controller.add_callback(removed)
+        controller.add_callback(kept.set)
+        controller.remove_callback(removed)
+
+        controller.request()
+
+        self.assertTrue(kept.wait(2))
+        removed.assert_not_called()
+        controller.complete()
+
+    @patch("feed_to_somewhere.shutdown.shutdown_logging")
+    def test_grace_period_expiry_forces_exit(self, mock_shutdown_logging):
+        """Test force-exit hooks run, queued logs are flushed and the process exits."""
+        controller = ShutdownController(grace_period=0.05, exit_func=self.exit_func)
+        hook = MagicMock()
+        controller.add_force_exit_hook(hook)
+        self.exit_func.side_effect = lambda code: (
+            self.assertTrue(mock_shutdown_logging.called),
+            self.exit_called.set(),
+        )
+
+        controller.request()
+
+        self.assertTrue(self.exit_called.wait(2))
+        hook.assert_called_once()
+        mock_shutdown_logging.assert_called_once_with()
+        self.exit_func.assert_called_once_with(1)
+
+    def test_complete_without_request_stops_watcher(self):
+        """Test a completed run never forces an exit."""
+        controller = ShutdownController(grace_period=0, exit_func=self.exit_func)
+
+        controller.complete()
+        controller._watcher.join(2)
+
+        self.assertFalse(controller._watcher.is_alive())
+        self.assertFalse(controller.requested)
+        self.exit_func.assert_not_called()
+
+    def test_failing_callback_is_logged(self):
+        """Test callback errors are logged and do not stop other callbacks."""
+        controller = ShutdownController(grace_period=5, exit_func=self.exit_func)
+        kept = threading.Event()
+        controller.add_callback(MagicMock(side_effect=RuntimeError("boom")))
+        controller.add_callback(kept.set)
+
+        controller.request()
+
+        self.assertTrue(kept.wait(2))
+        message, *args = self.mock_logger.error.call_args.args
+        self.assertEqual(message % tuple(args), "Shutdown callback failed: boom")
+        controller.complete()
+
+    def test_install_and_restore_signal_handlers(self):
+        """Test signal handlers are installed and restored."""
+        controller = ShutdownController(exit_func=self.exit_func)
+        previous = signal.getsignal(signal.SIGTERM)
+
+        controller.install([signal.SIGTERM])
+        try:
+            self.assertEqual(signal.getsignal(signal.SIGTERM), controller._handle_signal)
+            controller._handle_signal(signal.SIGTERM, None)
+            self.assertTrue(controller.requested)
+            self.assertEqual(controller.reason, "SIGTERM")
+        finally:
+            controller.complete()
+            controller.restore()
+
+        self.assertEqual(signal.getsignal(signal.SIGTERM), previous)
+
+
+class TestPendingEntryJournal(unittest.TestCase):
+    """Test cases for the PendingEntryJournal class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.logger_patcher = patch("feed_to_somewhere.shutdown.logger")
+        self.mock_logger = self.logger_patcher.start()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.journal = PendingEntryJournal.from_state_dir(self.temp_dir.name)
+
+    def tearDown(self):
+        """Tear down test fixtures."""
+        self.logger_patcher.stop()
+        self.temp_dir.cleanup()
+
+    def test_save_and_load_round_trip(self):
+        """Test saved entries are loaded by a new journal."""
+        self.journal.append(make_record(1))
+        self.journal.append(make_record(2))
+        self.journal.save()
+
+        reloaded = PendingEntryJournal.from_state_dir(self.temp_dir.name)
+
+        self.assertEqual(reloaded.load(), [make_record(1), make_record(2)])
+        self.assertEqual(len(reloaded), 2)
+
+    def test_discarded_entries_are_not_saved(self):
+        """Test written entries are removed before saving."""
+        self.journal.append(make_record(1))
+        self.journal.append(make_record(2))
+        self.journal.discard(make_record(1))
+        self.journal.save()
+
+        reloaded = PendingEntryJournal.from_state_dir(self.temp_dir.name)
+
+        self.assertEqual(reloaded.load(), [make_record(2)])
+
+    def test_save_removes_file_when_empty(self):
+        """Test saving an empty journal removes the file."""
+        self.journal.append(make_record(1))
+        self.journal.save()
+        self.assertTrue(os.path.exists(self.journal.path))
+
+        self.journal.discard(make_record(1))
+        self.journal.save()
+
+        self.assertFalse(os.path.exists(self.journal.path))
+
+    def test_load_missing_file(self):
+        """Test loading without a saved journal returns nothing."""
+        self.assertEqual(self.journal.load(), [])
+
+    def test_load_ignores_unreadable_file(self):
+        """Test a corrupt journal is ignored with a warning."""
+        with open(self.journal.path, "w", encoding="utf-8") as f:
+            f.write("not json\n")
+
+        self.assertEqual(self.journal.load(), [])
+        self.mock_logger.warning.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,339 @@
+"""Tests for the sinks module."""
+
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch, MagicMock
+
+from requests.exceptions import RequestException
+
+from feed_to_somewhere.sinks import (
+    EntryRecord,
+    JsonlSink,
+    NotionSink,
+    PlanSink,
+    Sink,
+    SinkDispatcher,
+    SqliteSink,
+    WebhookSink,
+    build_sink,
+)
+
+
+def make_record(index=1, **overrides):
+    """Build a test record."""
+    values = {
+        "title": f"Title {index}",
+        "link": f"https://example.com/{index}",
+        "body": f"Body {index}",
+        "date": "2023-01-01",
+        "feed_url": "https://example.com/feed",
+    }
+    values.update(overrides)
+    return EntryRecord(**values)
+
+
+class RecordingSink(Sink):
+    """In-memory sink used to observe dispatcher behavior."""
+
+    def __init__(self, name="recording", batch_size=1, result=True):
+        self.name = name
+        self.batch_size = batch_size
+        self.result = result
+        self.batches = []
+        self.closed = False
+
+    def write_batch(self, records):
+        self.batches.append(list(records))
+        return [self.result] * len(records)
+
+    def close(self):
+        self.closed = True
+
+
+class TestSinks(unittest.TestCase):
+    """Test cases for the individual sinks."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.logger_patcher = patch("feed_to_somewhere.sinks.logger")
+        self.mock_logger = self.logger_patcher.start()
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Tear down test fixtures."""
+        self.logger_patcher.stop()
+        self.temp_dir.cleanup()
+
+    def test_notion_sink_creates_pages(self):
+        """Test the Notion sink reports the outcome per page and drops fallback dates."""
+        notion_client = MagicMock()
+        notion_client.write_page.side_effect = [True, None, False]
+        sink = NotionSink(notion_client)
+
+        results = sink.write_batch(
+            [make_record(1), make_record(2, dated=False), make_record(3, data_source_id="other")]
+        )
+
+        self.assertEqual(results, [True, None, False])
+        self.assertIsNone(notion_client.write_page.call_args_list[1].args[3])
+        self.assertEqual(notion_client.write_page.call_args.kwargs["data_source_id"], "other")
+
+    def test_notion_sink_find_existing(self):
+        """Test the Notion sink reports existing links except in update mode."""
+        notion_client = MagicMock()
+        notion_client.update_existing = False
+        notion_client.find_existing_links.return_value = {"https://example.com/1"}
+        sink = NotionSink(notion_client)
+
+        self.assertEqual(sink.find_existing(["https://example.com/1"], "source"), {"https://example.com/1"})
+        notion_client.find_existing_links.assert_called_once_with(["https://example.com/1"], "source")
+
+        notion_client.update_existing = True
+        self.assertEqual(sink.find_existing(["https://example.com/1"]), set())
+        self.assertEqual(notion_client.find_existing_links.call_count, 2)
+
+        notion_client.update_existing = False
+        notion_client.find_existing_links.return_value = None
+        self.assertEqual(sink.find_existing(["https://example.com/1"]), set())
+
+    def test_jsonl_sink_appends_lines(self):
+        """Test the JSONL sink appends one object per record."""
+        path = os.path.join(self.temp_dir.name, "out", "entries.jsonl")
+        sink = JsonlSink(path)
+
+        self.assertEqual(sink.write_batch([make_record(1)]), [True])
+        self.assertEqual(sink.write_batch([make_record(2)]), [True])
+
+        with open(path, encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual([line["link"] for line in lines], ["https://example.com/1", "https://example.com/2"])
+
+    def test_jsonl_sink_finds_existing_links(self):
+        """Test the JSONL sink indexes entries from earlier runs and new writes."""
+        path = os.path.join(self.temp_dir.name, "entries.jsonl")
+        JsonlSink(path).write_batch([make_record(1), make_record(2, data_source_id="other")])
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("not json\n")
+        sink = JsonlSink(path)
+
+        links = ["https://example.com/1", "https://example.com/2", "https://example.com/3"]
+        self.assertEqual(sink.find_existing(links), {"https://example.com/1"})
+        self.assertEqual(sink.find_existing(links, "other"), {"https://example.com/2"})
+
+        sink.write_batch([make_record(3)])
+        self.assertEqual(sink.find_existing(links), {"https://example.com/1", "https://example.com/3"})
+        self.assertEqual(JsonlSink(os.path.join(self.temp_dir.name, "missing.jsonl")).find_existing(links), set())
+
+    def test_jsonl_sink_reports_write_errors(self):
+        """Test the JSONL sink reports failure when the file cannot be written."""
+        sink = JsonlSink(self.temp_dir.name)
+
+        self.assertEqual(sink.write_batch([make_record()]), [False])
+        self.mock_logger.error.assert_called_once()
+
+    def test_sqlite_sink_upserts_entries(self):
+        """Test the SQLite sink keeps one row per link and data source."""
+        path = os.path.join(self.temp_dir.name, "entries.sqlite3")
+        sink = SqliteSink(path)
+
+        sink.write_batch([make_record(1), make_record(2)])
+        sink.write_batch([make_record(1, title="Updated")])
+        sink.close()
+
+        with sqlite3.connect(path) as connection:
+            rows = connection.execute("SELECT link, title FROM entries ORDER BY link").fetchall()
+        self.assertEqual(rows, [("https://example.com/1", "Updated"), ("https://example.com/2", "Title 2")])
+
+    def test_sqlite_sink_finds_existing_links(self):
+        """Test the SQLite sink looks up links per data source."""
+        sink = SqliteSink(os.path.join(self.temp_dir.name, "entries.sqlite3"))
+        sink.write_batch([make_record(1), make_record(2, data_source_id="other")])
+
+        links = [f"https://example.com/{index}" for index in range(SqliteSink.LOOKUP_BATCH_SIZE + 10)]
+        self.assertEqual(sink.find_existing(links), {"https://example.com/1"})
+        self.assertEqual(sink.find_existing(links, "other"), {"https://example.com/2"})
+        sink.close()
+
+    @patch("feed_to_somewhere.sinks.requests.post")
+    def test_webhook_sink_posts_batch(self, mock_post):
+        """Test the webhook sink posts the whole batch in one request."""
+        sink = WebhookSink("http://localhost:8080/hook")
+
+        results = sink.write_batch([make_record(1), make_record(2)])
+
+        self.assertEqual(results, [True, True])
+        mock_post.assert_called_once()
+        self.assertEqual(len(mock_post.call_args.kwargs["json"]["entries"]), 2)
+
+    @patch("feed_to_somewhere.sinks.requests.post")
+    def test_webhook_sink_reports_request_errors(self, mock_post):
+        """Test the webhook sink reports failure for every record on errors."""
+        mock_post.side_effect = RequestException("refused")
+
+        self.assertEqual(WebhookSink("http://localhost:8080/hook").write_batch([make_record()]), [False])
+        self.mock_logger.error.assert_called_once()
+
+    def test_plan_sink_estimates_notion_writes(self):
+        """Test the plan sink counts blocks and requests without writing anything."""
+        sink = PlanSink(chunk_size=10)
+        links = [f"https://example.com/{index}" for index in range(150)]
+
+        self.assertIsNone(sink.find_existing(links))
+        self.assertEqual(
+            sink.write_batch([make_record(1, body="x" * 25), make_record(2, body="short")]),
+            [True, True],
+        )
+
+        # Two existence queries, then one create plus one append per block.
+        self.assertEqual(sink.estimated_requests(), 2 + (1 + 3) + (1 + 1))
+        report = sink.format_report(elapsed_seconds=2.0)
+        self.assertIn("Blocks: 4 (chunk size 10)", report)
+        self.assertIn("Estimated Notion requests: 8", report)
+        self.assertIn("median=15", report)
+        self.assertIn("1.00 entries/s", report)
+
+    def test_plan_sink_report_without_entries(self):
+        """Test the plan sink report when nothing would be written."""
+        self.assertEqual(PlanSink().format_report(), "No entries would be written.")
+
+    def test_build_sink_parses_specs(self):
+        """Test build_sink creates the requested sink types."""
+        factory = MagicMock()
+
+        self.assertIsInstance(build_sink("notion", factory), NotionSink)
+        factory.assert_called_once()
+        self.assertIsInstance(build_sink("jsonl:out.jsonl", factory), JsonlSink)
+        self.assertIsInstance(build_sink("sqlite:out.db", factory), SqliteSink)
+        self.assertEqual(build_sink("webhook:http://localhost/x", factory).url, "http://localhost/x")
+
+    def test_build_sink_rejects_invalid_specs(self):
+        """Test build_sink rejects unknown sinks and missing targets."""
+        for spec in ("ftp:x", "jsonl", "sqlite:"):
+            with self.subTest(spec=spec):
+                with self.assertRaises(ValueError):
+                    build_sink(spec, MagicMock())
+
+
+class TestSinkDispatcher(unittest.TestCase):
+    """Test cases for the SinkDispatcher class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.logger_patcher = patch("feed_to_somewhere.sinks.logger")
+        self.mock_logger = self.logger_patcher.start()
+
+    def tearDown(self):
+        """Tear down test fixtures."""
+        self.logger_patcher.stop()
+
+    def test_write_returns_result_of_unbatched_sinks(self):
+        """Test an entry succeeds only when every unbatched sink succeeds."""
+        ok_sink = RecordingSink("ok")
+        failing_sink = RecordingSink("failing", result=False)
+
+        self.assertTrue(SinkDispatcher([ok_sink]).write(make_record()))
+        self.assertFalse(SinkDispatcher([ok_sink, failing_sink]).write(make_record()))
+
+    def test_batched_sinks_buffer_until_batch_size_or_flush(self):
+        """Test batched sinks receive full batches and a final partial batch."""
+        sink = RecordingSink(batch_size=2)
+        dispatcher = SinkDispatcher([sink])
+
+        for index in range(3):
+            self.assertTrue(dispatcher.write(make_record(index)))
+        dispatcher.close()
+
+        self.assertEqual([len(batch) for batch in sink.batches], [2, 1])
+        self.assertTrue(sink.closed)
+        self.assertEqual(dispatcher.stats.get("sink_recording_written"), 3)
+
+    def test_slow_batched_sink_does_not_block_other_sinks(self):
+        """Test a blocked batched sink does not delay unbatched writes."""
+        release = threading.Event()
+
+        class SlowSink(RecordingSink):
+            def write_batch(self, records):
+                release.wait(5)
+                return super().write_batch(records)
+
+        fast_sink = RecordingSink("fast")
+        slow_sink = SlowSink("slow", batch_size=2)
+        dispatcher = SinkDispatcher([fast_sink, slow_sink])
+
+        dispatcher.write(make_record(1))
+        dispatcher.write(make_record(2))
+        self.assertTrue(dispatcher.write(make_record(3)))
+        self.assertEqual(len(fast_sink.batches), 3)
+        self.assertEqual(slow_sink.batches, [])
+
+        release.set()
+        dispatcher.close()
+        self.assertEqual(sum(len(batch) for batch in slow_sink.batches), 3)
+
+    def test_find_existing_requires_every_sink_that_can_tell(self):
+        """Test a link is only skipped when every sink able to tell already holds it."""
+        notion_like = RecordingSink("notion")
+        notion_like.find_existing = MagicMock(return_value={"a", "b"})
+        other = RecordingSink("other")
+        other.find_existing = MagicMock(return_value={"b"})
+        broken = RecordingSink("broken")
+        broken.find_existing = MagicMock(side_effect=RuntimeError("boom"))
+        unknown = RecordingSink("unknown")
+
+        self.assertEqual(SinkDispatcher([notion_like]).find_existing(["a", "b", "c"]), {"a", "b"})
+        self.assertEqual(SinkDispatcher([notion_like, other]).find_existing(["a", "b", "c"]), {"b"})
+        self.assertEqual(SinkDispatcher([notion_like, unknown]).find_existing(["a", "b", "c"]), {"a", "b"})
+        self.assertEqual(SinkDispatcher([notion_like, broken]).find_existing(["a", "b", "c"]), set())
+        self.assertEqual(SinkDispatcher([unknown]).find_existing(["a"]), set())
+        self.assertEqual(SinkDispatcher([]).find_existing(["a"]), set())
+
+    def test_find_existing_in_update_mode_ignores_file_sinks(self):
+        """Test links a file sink holds are still written when Notion updates existing pages."""
+        notion_client = MagicMock()
+        notion_client.update_existing = True
+        notion_client.find_existing_links.return_value = {"https://example.com/1"}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            jsonl_sink = JsonlSink(os.path.join(temp_dir, "entries.jsonl"))
+            jsonl_sink.write_batch([make_record(1)])
+            dispatcher = SinkDispatcher([NotionSink(notion_client), jsonl_sink])
+
+            self.assertEqual(dispatcher.find_existing(["https://example.com/1", "https://example.com/2"]), set())
+
+    def test_new_entries_only_sinks_skip_held_and_failed_entries(self):
+        """Test sinks taking new entries only get records the other sinks just wrote."""
+        notifier = RecordingSink("notifier")
+        notifier.new_entries_only = True
+
+        for result, expected in ((True, True), (None, True), (False, False)):
+            primary = RecordingSink("primary", result=result)
+            self.assertEqual(SinkDispatcher([notifier, primary]).write(make_record()), expected)
+
+        self.assertEqual(len(notifier.batches), 1)
+
+    def test_skipped_records_count_as_success(self):
+        """Test records a sink already holds are counted as skipped, not failed."""
+        dispatcher = SinkDispatcher([RecordingSink("existing", result=None)])
+
+        self.assertTrue(dispatcher.write(make_record()))
+        self.assertEqual(dispatcher.stats.get("sink_existing_skipped"), 1)
+        self.assertEqual(dispatcher.stats.get("sink_existing_failed"), 0)
+
+    def test_sink_exceptions_count_as_failures(self):
+        """Test unexpected sink errors are logged and reported as failures."""
+        class BrokenSink(RecordingSink):
+            def write_batch(self, records):
+                raise RuntimeError("boom")
+
+        dispatcher = SinkDispatcher([BrokenSink("broken")])
+
+        self.assertFalse(dispatcher.write(make_record()))
+        self.assertEqual(dispatcher.stats.get("sink_broken_failed"), 1)
+        self.mock_logger.error.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
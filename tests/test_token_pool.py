@@ -0,0 +1,56 @@
+"""Tests for the token_pool module."""
+
+import unittest
+from unittest.mock import MagicMock
+
+from feed_to_somewhere.token_pool import TokenPool
+
+
+class TestTokenPool(unittest.TestCase):
+    """Test cases for the TokenPool class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.clock = MagicMock(return_value=100.0)
+
+    def test_round_robin(self):
+        """Test tokens are handed out in turn and counted."""
+        pool = TokenPool(3, clock=self.clock)
+
+        self.assertEqual([pool.next_index() for _ in range(4)], [0, 1, 2, 0])
+        self.assertEqual(pool.stats.get("token1_requests"), 2)
+
+    def test_throttled_token_is_skipped_until_it_recovers(self):
+        """Test a throttled token is skipped for its Retry-After time."""
+        pool = TokenPool(2, clock=self.clock)
+        pool.throttle(0, retry_after=10)
+
+        self.assertEqual([pool.next_index() for _ in range(3)], [1, 1, 1])
+        self.clock.return_value += 10
+        self.assertEqual(pool.next_index(), 0)
+        self.assertEqual(pool.stats.get("token1_throttled"), 1)
+
+    def test_retries_do_not_reuse_tried_or_throttled_tokens(self):
+        """Test retries only go to untried tokens that are not throttled."""
+        pool = TokenPool(3, clock=self.clock)
+        pool.throttle(1)
+
+        self.assertEqual(pool.next_index(exclude=[0]), 2)
+        self.assertIsNone(pool.next_index(exclude=[0, 2]))
+
+    def test_all_throttled_uses_first_to_recover(self):
+        """Test a first attempt still gets the token that recovers soonest."""
+        pool = TokenPool(2, clock=self.clock)
+        pool.throttle(0, retry_after=30)
+        pool.throttle(1, retry_after=5)
+
+        self.assertEqual(pool.next_index(), 1)
+
+    def test_rejects_empty_pool(self):
+        """Test a pool needs at least one token."""
+        with self.assertRaises(ValueError):
+            TokenPool(0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,18 @@
 """Tests for the utils module."""
 
+import json
+import sys
 import unittest
 from datetime import datetime
-from feed_to_somewhere.utils import clean_text, format_date, chunk_text, get_current_date_iso
+from feed_to_somewhere.utils import (
+    LazyModule,
+    chunk_text,
+    clean_text,
+    content_hash,
+    format_date,
+    get_current_date_iso,
+    lazy_import,
+)
 
 
 class TestUtils(unittest.TestCase):
@@ -83,6 +93,31 @@ class TestUtils(unittest.TestCase):
         self.assertTrue(valid_format)
         self.assertEqual(len(date_str), 10)  # YYYY-MM-DD is 10 characters
 
+    def test_content_hash_is_stable_and_order_sensitive(self):
+        """Test content_hash returns the same digest for the same parts."""
+        self.assertEqual(content_hash("a", "b"), content_hash("a", "b"))
+        self.assertNotEqual(content_hash("a", "b"), content_hash("b", "a"))
+        self.assertNotEqual(content_hash("ab"), content_hash("a", "b"))
+        self.assertEqual(len(content_hash("a")), 16)
+
+    def test_lazy_import_returns_loaded_modules(self):
+        """Test lazy_import reuses modules that are already imported."""
+        self.assertIs(lazy_import("json"), json)
+
+    def test_lazy_module_forwards_attributes(self):
+        """Test a lazy stand-in imports the module on first attribute access."""
+        module = LazyModule("json")
+
+        self.assertIs(module.dumps, json.dumps)
+        self.assertIs(sys.modules["json"], json)
+
+    def test_lazy_module_reports_missing_modules_on_use(self):
+        """Test a missing module fails on first use rather than on creation."""
+        module = lazy_import("feed_to_somewhere_missing_module")
+
+        with self.assertRaises(ModuleNotFoundError):
+            module.anything
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,211 @@
+"""Tests for the work_queue module."""
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from feed_to_somewhere.feed_sources import FeedSource
+from feed_to_somewhere.work_queue import WorkQueue
+
+
+class TestWorkQueue(unittest.TestCase):
+    """Test cases for the WorkQueue class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.logger_patcher = patch("feed_to_somewhere.work_queue.logger")
+        self.mock_logger = self.logger_patcher.start()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "queue", "jobs.db")
+        self.clock = MagicMock(return_value=1000.0)
+        self.queue = self.make_queue()
+
+    def tearDown(self):
+        """Tear down test fixtures."""
+        self.queue.close()
+        self.logger_patcher.stop()
+        self.temp_dir.cleanup()
+
+    def make_queue(self, **kwargs):
+        """Open another handle on the shared queue, as a second worker would."""
+        kwargs.setdefault("lease_seconds", 60)
+        kwargs.setdefault("clock", self.clock)
+        return WorkQueue(self.path, **kwargs)
+
+    def test_claims_by_priority_then_enqueue_order(self):
+        """Test higher-priority feeds are claimed first, then in enqueue order."""
+        self.queue.enqueue([
+            FeedSource("https://a.example.com/feed"),
+            FeedSource("https://b.example.com/feed", priority=5, max_entries=3),
+            FeedSource("https://c.example.com/feed"),
+        ])
+
+        claimed = []
+        while True:
+            lease = self.queue.claim()
+            if lease is None:
+                break
+            claimed.append(lease.source)
+
+        self.assertEqual(
+            [source.url for source in claimed],
+            ["https://b.example.com/feed", "https://a.example.com/feed", "https://c.example.com/feed"],
+        )
+        self.assertEqual(claimed[0].max_entries, 3)
+        self.assertEqual(self.queue.counts(), {"leased": 3})
+
+    def test_database_uses_wal(self):
+        """Test the queue runs in WAL mode so workers can read while one writes."""
+        self.queue.enqueue([FeedSource("https://a.example.com/feed")])
+
+        mode = self.queue._connect().execute("PRAGMA journal_mode").fetchone()[0]
+
+        self.assertEqual(mode, "wal")
+
+    def test_expired_lease_is_claimed_again(self):
+        """Test a feed held by a crashed worker is recovered after its lease expires."""
+        self.queue.enqueue([FeedSource("https://a.example.com/feed")])
+        crashed = self.queue.claim()
+        other = self.make_queue()
+
+        self.assertIsNone(other.claim())
+        self.clock.return_value += 61
+        recovered = other.claim()
+        other.close()
+
+        self.assertEqual(recovered.source.url, "https://a.example.com/feed")
+        self.assertEqual(recovered.attempts, 2)
+        self.assertFalse(self.queue.complete(crashed))
+        self.assertFalse(self.queue.renew(crashed))
+
+    def test_renew_extends_lease(self):
+        """Test renewed leases are not reclaimed."""
+        self.queue.enqueue([FeedSource("https://a.example.com/feed")])
+        lease = self.queue.claim()
+
+        self.clock.return_value += 50
+        self.assertTrue(self.queue.renew(lease))
+        self.clock.return_value += 50
+
+        self.assertIsNone(self.queue.claim())
+
+    def test_complete_and_release(self):
+        """Test completed feeds are done and released feeds can be claimed right away."""
+        self.queue.enqueue([FeedSource("https://a.example.com/feed"), FeedSource("https://b.example.com/feed")])
+        first = self.queue.claim()
+        second = self.queue.claim()
+
+        self.assertTrue(self.queue.complete(first))
+        self.assertTrue(self.queue.release(second))
+
+        self.assertEqual(self.queue.claim().source.url, second.source.url)
+        self.assertEqual(self.queue.counts(), {"done": 1, "leased": 1})
+
+    def test_repeatedly_expired_feed_is_failed(self):
+        """Test a feed whose lease keeps expiring stops being retried."""
+        queue = self.make_queue(max_attempts=2)
+        queue.enqueue([FeedSource("https://a.example.com/feed")])
+
+        for _ in range(2):
+            self.assertIsNotNone(queue.claim())
+            self.clock.return_value += 61
+
+        self.assertIsNone(queue.claim())
+        self.assertEqual(queue.counts(), {"failed": 1})
+        queue.close()
+
+    def test_repeatedly_failing_feed_is_failed(self):
+        """Test a feed released after failing is not claimed again once it used up its attempts."""
+        queue = self.make_queue(max_attempts=2)
+        queue.enqueue([FeedSource("https://a.example.com/feed")])
+
+        for _ in range(2):
+            lease = queue.claim()
+            self.assertIsNotNone(lease)
+            self.assertTrue(queue.release(lease))
+
+        self.assertIsNone(queue.claim())
+        self.assertEqual(queue.counts(), {"failed": 1})
+        queue.close()
+
+    def test_release_without_failure_keeps_attempts(self):
+        """Test a feed given back during shutdown does not use up an attempt."""
+        queue = self.make_queue(max_attempts=1)
+        queue.enqueue([FeedSource("https://a.example.com/feed")])
+
+        for _ in range(3):
+            lease = queue.claim()
+            self.assertEqual(lease.attempts, 1)
+            queue.release(lease, failed=False)
+
+        self.assertEqual(queue.counts(), {"pending": 1})
+        queue.close()
+
+    def test_enqueue_resets_finished_feeds_but_keeps_active_leases(self):
+        """Test a new cycle makes finished feeds pending without stealing held leases."""
+        self.queue.enqueue([FeedSource("https://a.example.com/feed"), FeedSource("https://b.example.com/feed")])
+        done = self.queue.claim()
+        self.queue.complete(done)
+        held = self.queue.claim()
+
+        self.queue.enqueue([FeedSource("https://a.example.com/feed"), FeedSource("https://b.example.com/feed")])
+
+        self.assertEqual(self.queue.counts(), {"leased": 1, "pending": 1})
+        self.assertTrue(self.queue.complete(held))
+
+    def test_concurrent_workers_claim_each_feed_once(self):
+        """Test workers racing for jobs never claim the same feed twice."""
+        urls = [f"https://example{index}.com/feed" for index in range(40)]
+        self.queue.enqueue([FeedSource(url) for url in urls])
+        claimed = []
+        claimed_lock = threading.Lock()
+
+        def work():
+            queue = self.make_queue(clock=time.time)
+            try:
+                while True:
+                    lease = queue.claim()
+                    if lease is None:
+                        return
+                    with claimed_lock:
+                        claimed.append(lease.source.url)
+                    queue.complete(lease)
+            finally:
+                queue.close()
+
+        workers = [threading.Thread(target=work) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        self.assertEqual(sorted(claimed), sorted(urls))
+
+    def test_keep_alive_renews_in_background(self):
+        """Test leases are renewed while work is in progress."""
+        queue = self.make_queue(lease_seconds=0.06, clock=time.time)
+        queue.enqueue([FeedSource("https://a.example.com/feed")])
+        lease = queue.claim()
+
+        with patch.object(queue, "renew", wraps=queue.renew) as mock_renew:
+            with queue.keep_alive(lease) as lost:
+                time.sleep(0.15)
+
+        self.assertGreaterEqual(mock_renew.call_count, 2)
+        self.assertFalse(lost.is_set())
+        self.assertTrue(queue.complete(lease))
+        queue.close()
+
+    def test_rejects_invalid_settings(self):
+        """Test lease length and attempts must be positive."""
+        with self.assertRaises(ValueError):
+            WorkQueue(self.path, lease_seconds=0)
+        with self.assertRaises(ValueError):
+            WorkQueue(self.path, max_attempts=0)
+
+
+if __name__ == "__main__":
+    unittest.main()